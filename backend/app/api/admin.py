@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Optional
@@ -697,12 +697,10 @@ class ColdOutreachEmailRequest(BaseModel):
 @router.post("/cold-outreach/send")
 async def send_cold_outreach_email(
     request: ColdOutreachEmailRequest,
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin)
 ):
     """Sendet eine Kaltakquise-E-Mail mit optionalen Anhängen"""
-    from app.models.email_log import EmailLog
-    from app.services.email_service import EmailService
+    from app.services.email_service import EmailService, log_email
     
     email_service = EmailService()
     
@@ -748,35 +746,20 @@ async def send_cold_outreach_email(
             use_gmail=request.use_gmail,
         )
 
-        # Log erstellen
-        log = EmailLog(
-            email_type="cold_outreach",
-            recipient_email=request.to,
-            subject=request.subject,
-            success=1 if success else 0,
-            sent_by_user_id=current_user.id,
-            sender_email=effective_sender,
-        )
-        db.add(log)
-        db.commit()
+        # Log mit Mitarbeiter und Absender (gepuffert). success = zum Versand angenommen
+        # (SendGrid-Weg: in der Outbox); das Zustell-Ergebnis loggt der Versand selbst
+        log_email("cold_outreach", request.to, request.subject, success,
+                  sent_by_user_id=current_user.id, sender_email=effective_sender)
 
         if success:
-            return {"success": True, "message": "E-Mail gesendet"}
+            return {"success": True, "message": "E-Mail zum Versand übergeben"}
         else:
             raise HTTPException(status_code=500, detail="E-Mail konnte nicht gesendet werden")
 
     except Exception as e:
         # Fehler loggen
-        log = EmailLog(
-            email_type="cold_outreach",
-            recipient_email=request.to,
-            subject=request.subject,
-            success=0,
-            sent_by_user_id=current_user.id,
-            sender_email=(request.from_email or "business@jobon.work"),
-        )
-        db.add(log)
-        db.commit()
+        log_email("cold_outreach", request.to, request.subject, False,
+                  sent_by_user_id=current_user.id, sender_email=(request.from_email or "business@jobon.work"))
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -805,9 +788,12 @@ async def check_cold_outreach_recipients(
     db: Session = Depends(get_db),
 ):
     """Prüft eine Empfängerliste: normalisiert, entfernt Dubletten/ungültige und
-    trennt in 'neu' vs. 'bereits kontaktiert' (anhand des Kaltakquise-Logs)."""
+    trennt in 'neu' vs. 'bereits kontaktiert' (anhand des Kaltakquise-Logs inkl.
+    noch gepufferter Einträge und wartender Outbox-Mails)."""
     import re as _re
     from app.models.email_log import EmailLog
+    from app.models.email_outbox import EmailOutbox
+    from app.services.email_log_service import email_log_buffer
 
     email_re = _re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
     seen: set = set()
@@ -829,6 +815,17 @@ async def check_cold_outreach_recipients(
 
     contacted: dict = {}
     if cleaned:
+        # Gepufferte Log-Einträge (bis zu EMAIL_LOG_FLUSH_SECONDS noch nicht in
+        # email_logs) zuerst – sie sind die neuesten
+        wanted = set(cleaned)
+        for r in reversed(email_log_buffer.pending("cold_outreach")):
+            key = (r["recipient_email"] or "").lower()
+            if key not in wanted:
+                continue
+            if key not in contacted:
+                contacted[key] = {"last": r["created_at"], "cnt": 0, "sender": r["sender_email"]}
+            contacted[key]["cnt"] += 1
+
         logs = db.query(
             EmailLog.recipient_email, EmailLog.created_at, EmailLog.sender_email,
         ).filter(
@@ -844,6 +841,20 @@ async def check_cold_outreach_recipients(
                 contacted[key] = {"last": r.created_at, "cnt": 0, "sender": r.sender_email}
             contacted[key]["cnt"] += 1
 
+        # Wartende Outbox-Mails (Log liegt evtl. im Puffer eines anderen Workers):
+        # zählen nur für sonst unbekannte Adressen, sonst doppelt
+        queued = db.query(
+            EmailOutbox.to_email, EmailOutbox.created_at, EmailOutbox.from_email,
+        ).filter(
+            EmailOutbox.email_type == "cold_outreach",
+            EmailOutbox.status.in_(("pending", "sending")),
+            func.lower(EmailOutbox.to_email).in_(cleaned),
+        ).order_by(EmailOutbox.created_at.desc()).all()
+        for r in queued:
+            key = (r.to_email or "").lower()
+            if key and key not in contacted:
+                contacted[key] = {"last": r.created_at, "cnt": 1, "sender": r.from_email}
+
     new = [e for e in cleaned if e not in contacted]
     already = [
         {"email": e, "last_sent_at": contacted[e]["last"], "times": contacted[e]["cnt"], "last_sender": contacted[e]["sender"]}
@@ -1340,6 +1351,7 @@ class AdminUpdateJobRequest(BaseModel):
 async def admin_update_job(
     job_id: int,
     request: AdminUpdateJobRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
@@ -1411,6 +1423,8 @@ async def admin_update_job(
             job.published_at = datetime.utcnow()
 
     job.updated_at = datetime.utcnow()
+    from app.services.match_score_service import invalidate_job_scores, job_scoring_changed
+    scoring_changed = job_scoring_changed(job)
     db.commit()
     db.refresh(job)
 
@@ -1421,12 +1435,13 @@ async def admin_update_job(
 
     # Bewerber benachrichtigen wenn Job jetzt aktiv ist (und vorher nicht war)
     if request.is_active and not was_active:
-        try:
-            from app.services.job_notification_service import notify_applicants_about_new_job
-            notify_applicants_about_new_job(job, db)
-        except Exception as exc:
-            import logging
-            logging.getLogger(__name__).warning(f"Bewerber-Benachrichtigung fehlgeschlagen: {exc}")
+        from app.services.task_queue_service import enqueue_tasks, publish_job_tasks
+        enqueue_tasks(db, publish_job_tasks(job, index=False), created_by_user_id=current_user.id)
+
+    # Spalte dieser Stelle in match_scores nur bei bewertungsrelevanten Änderungen
+    # verwerfen (im Hintergrund); neu berechnet wird beim nächsten Lesen
+    if scoring_changed:
+        background_tasks.add_task(invalidate_job_scores, job.id)
 
     return {"message": "Stellenangebot aktualisiert", "id": job.id}
 
@@ -3512,3 +3527,108 @@ async def test_email_digest(
         "jobs_count": len(matching_jobs),
         "jobs": [{"title": j["job"].title, "score": j["score"]} for j in matching_jobs]
     }
+
+
+# ========== TASK-QUEUE (Hintergrund-Aufgaben) ==========
+
+@router.get("/tasks")
+async def list_background_tasks(
+    ids: Optional[str] = Query(None, description="Kommagetrennte Task-IDs, z.B. 12,13,14"),
+    status_filter: Optional[str] = Query(None, alias="status", description="pending | running | done | failed"),
+    task_type: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Fortschritt der Task-Queue: Anzahl je Status und die (gefilterten) Tasks,
+    neueste zuerst. Mit ids lässt sich z.B. eine Sammel-Freigabe verfolgen."""
+    from app.models.task_queue import QueuedTask
+    from app.services.task_queue_service import serialize_task
+
+    query = db.query(QueuedTask)
+    if ids:
+        try:
+            id_list = [int(i) for i in ids.split(",") if i.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Ungültige Task-IDs")
+        query = query.filter(QueuedTask.id.in_(id_list))
+    if task_type:
+        query = query.filter(QueuedTask.task_type == task_type)
+
+    counts = dict(
+        query.with_entities(QueuedTask.status, func.count(QueuedTask.id)).group_by(QueuedTask.status).all()
+    )
+    if status_filter:
+        query = query.filter(QueuedTask.status == status_filter)
+    tasks = query.order_by(QueuedTask.id.desc()).limit(limit).all()
+
+    return {
+        "counts": {s: counts.get(s, 0) for s in ("pending", "running", "done", "failed")},
+        "tasks": [serialize_task(t) for t in tasks],
+    }
+
+
+@router.get("/tasks/{task_id}")
+async def get_background_task(
+    task_id: int,
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Status, Ergebnis bzw. letzter Fehler eines Hintergrund-Tasks."""
+    from app.models.task_queue import QueuedTask
+    from app.services.task_queue_service import serialize_task
+
+    task = db.query(QueuedTask).filter(QueuedTask.id == task_id).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task nicht gefunden")
+    return serialize_task(task)
+
+
+# ========== SCHEDULER (periodische Jobs) ==========
+
+@router.get("/scheduler")
+async def list_scheduled_jobs(
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Zustand der periodischen Jobs: letzter/nächster Slot, Status, Dauer, Fehler und
+    welcher Prozess (Leader) zuletzt ausgeführt hat."""
+    from app.models.scheduled_job import ScheduledJob
+    from app.services.scheduler_service import serialize_scheduled_job
+
+    rows = db.query(ScheduledJob).order_by(ScheduledJob.name).all()
+    return {"jobs": [serialize_scheduled_job(row) for row in rows]}
+
+
+# ========== BACKFILLS (Daten-Nachträge) ==========
+
+@router.get("/backfills")
+async def list_backfill_runs(
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Alle Backfills mit Stand des letzten Laufs: Status, Checkpoint (last_id von
+    max_id), Fortschritt, geänderte Zeilen und letzter Fehler."""
+    from app.services.backfill_service import list_backfills
+
+    return {"backfills": list_backfills(db)}
+
+
+@router.post("/backfills/{name}")
+async def request_backfill_run(
+    name: str,
+    batch_size: Optional[int] = Query(None, ge=1, le=10000, description="IDs pro Block/Commit"),
+    restart: bool = Query(False, description="Checkpoint verwerfen und bei ID 1 beginnen"),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Fordert einen Backfill an. Abgearbeitet vom Scheduler-Job "backfills" (innerhalb
+    einer Minute); fehlgeschlagene Läufe setzen beim Checkpoint fort."""
+    from app.services.backfill_service import get_backfill, request_backfill, serialize_backfill
+
+    try:
+        definition = get_backfill(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Backfill nicht gefunden")
+    run = request_backfill(db, name, batch_size=batch_size, restart=restart)
+    return serialize_backfill(run, definition)
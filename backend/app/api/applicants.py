@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List
+import asyncio
 import logging
 import io
 
@@ -46,6 +47,7 @@ async def get_my_profile(
 @router.post("/me", response_model=ApplicantResponse)
 async def create_my_profile(
     profile_data: ApplicantCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -71,12 +73,16 @@ async def create_my_profile(
     db.add(applicant)
     db.commit()
     db.refresh(applicant)
+    # Matching-Scores des neuen Profils im Hintergrund materialisieren
+    from app.services.match_score_service import refresh_applicant_scores
+    background_tasks.add_task(refresh_applicant_scores, applicant.id)
     return applicant
 
 
 @router.put("/me", response_model=ApplicantResponse)
 async def update_my_profile(
     profile_data: ApplicantUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -116,6 +122,9 @@ async def update_my_profile(
 
     db.commit()
     db.refresh(applicant)
+    # Nur die Zeile dieses Bewerbers in match_scores neu berechnen (im Hintergrund)
+    from app.services.match_score_service import refresh_applicant_scores
+    background_tasks.add_task(refresh_applicant_scores, applicant.id)
     return applicant
 
 
@@ -166,6 +175,7 @@ async def get_applicant(
 
 @router.post("/parse-cv")
 async def parse_cv(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -246,6 +256,19 @@ async def parse_cv(
                 db.commit()
                 cv_saved = True
                 logger.info(f"CV automatisch als Dokument gespeichert für Bewerber {applicant.id}")
+
+                # Geparste Daten für das Matching cachen (Worker-Thread, nicht im Event-Loop)
+                try:
+                    from app.services.cv_cache_service import content_hash, parse_cv_file, upsert_parsed_cv
+                    _, parsed = await asyncio.to_thread(parse_cv_file, content)
+                    upsert_parsed_cv(db, new_doc, content_hash(content), parsed)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.warning(f"Parsed-CV-Cache failed for document {new_doc.id}: {e}")
+
+                from app.services.match_score_service import refresh_applicant_scores
+                background_tasks.add_task(refresh_applicant_scores, applicant.id)
             else:
                 logger.warning(f"CV Upload fehlgeschlagen: {error}")
             
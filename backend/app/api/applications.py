@@ -221,8 +221,7 @@ async def create_application(
     
     if is_company_matching_enabled(db):
         try:
-            match_result = calculate_match_score(applicant, job, db=db)
-            match_score = match_result.get("total_score", 0)
+            match_score = calculate_match_score(applicant, job, db=db, score_only=True)
             
             # Score-Filter prüfen: Ist der Score unter dem Schwellenwert?
             # Nur für Premium-Firmen – Nicht-Premium bekommt keine Aufteilung.
@@ -17,6 +17,7 @@ from app.models.job_posting import JobPosting
 from app.services.settings_service import get_setting, set_setting
 from app.services.ba_scraper_service import scrape_ba_jobs, check_configuration, backfill_descriptions
 from app.services.google_indexing_service import google_indexing_service
+from app.services.task_queue_service import enqueue_tasks, publish_job_tasks
 
 router = APIRouter(prefix="/admin/ba-scraper", tags=["Admin BA-Scraper"])
 
@@ -221,25 +222,21 @@ async def approve_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job nicht gefunden")
 
+    # Bereits freigegeben (wiederholte Freigabe) -> Bewerber nicht erneut benachrichtigen
+    was_live = job.is_active and not job.is_draft
     job.is_draft = False
     job.is_active = True
     db.commit()
     db.refresh(job)
 
-    # Google Indexing
-    if google_indexing_service.is_configured():
-        asyncio.create_task(google_indexing_service.index_job(job.slug, job.id))
-    else:
+    # Bewerber benachrichtigen + Google Indexing als Hintergrund-Tasks
+    indexing = google_indexing_service.is_configured()
+    tasks = enqueue_tasks(db, publish_job_tasks(job, notify=not was_live, index=indexing),
+                          created_by_user_id=current_user.id)
+    if not indexing:
         asyncio.create_task(google_indexing_service.ping_sitemap())
 
-    # Bewerber benachrichtigen
-    try:
-        from app.services.job_notification_service import notify_applicants_about_new_job
-        notify_applicants_about_new_job(job, db)
-    except Exception as exc:
-        logger.warning(f"Bewerber-Benachrichtigung fehlgeschlagen: {exc}")
-
-    return {"id": job.id, "title": job.title, "approved": True}
+    return {"id": job.id, "title": job.title, "approved": True, "task_ids": [t.id for t in tasks]}
 
 
 @router.post("/approve-all")
@@ -262,19 +259,17 @@ async def approve_all_jobs(
         count += 1
     db.commit()
 
-    for job in jobs:
-        if google_indexing_service.is_configured():
-            asyncio.create_task(google_indexing_service.index_job(job.slug, job.id))
-        try:
-            from app.services.job_notification_service import notify_applicants_about_new_job
-            notify_applicants_about_new_job(job, db)
-        except Exception:
-            pass
-
-    if not google_indexing_service.is_configured() and count:
+    # Nebenwirkungen aller Stellen als Tasks mit EINEM Insert – Fortschritt über /admin/tasks
+    indexing = google_indexing_service.is_configured()
+    tasks = enqueue_tasks(
+        db, [task for job in jobs for task in publish_job_tasks(job, index=indexing)],
+        created_by_user_id=current_user.id,
+    )
+
+    if not indexing and count:
         asyncio.create_task(google_indexing_service.ping_sitemap())
 
-    return {"approved": count}
+    return {"approved": count, "task_ids": [t.id for t in tasks]}
 
 
 @router.delete("/pending/{job_id}")
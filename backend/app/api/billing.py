@@ -13,12 +13,12 @@ gesetzt – nie clientseitig. Der Admin-Toggle bleibt als manueller Override.
 import logging
 from datetime import datetime, timedelta
 
-import stripe
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.lazy_import import lazy_module
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
@@ -29,6 +29,9 @@ from app.services.settings_service import get_setting, set_setting
 
 logger = logging.getLogger(__name__)
 
+# Stripe-SDK (inkl. requests) erst beim ersten Billing-Aufruf laden
+stripe = lazy_module("stripe")
+
 router = APIRouter(prefix="/billing", tags=["Billing"])
 
 # Aktive Abo-Status, bei denen Premium gilt
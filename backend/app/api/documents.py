@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form, Query, Request
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import asyncio
 import os
 
 from app.core.database import get_db
@@ -116,6 +117,7 @@ async def get_all_document_requirements(db: Session = Depends(get_db)):
 
 @router.post("")
 async def upload_document(
+    background_tasks: BackgroundTasks,
     document_type: DocumentType = Form(...),
     description: str = Form(None),
     file: UploadFile = File(...),
@@ -161,13 +163,30 @@ async def upload_document(
         db=db
     )
 
-    # CV hochgeladen → leere Profilfelder automatisch aus CV befüllen
+    # CV hochgeladen → geparste Daten für das Matching cachen und
+    # leere Profilfelder automatisch aus CV befüllen. Das PDF wird genau einmal
+    # geparst – in einem Worker-Thread, nicht im Event-Loop.
     if document_type == DocumentType.CV:
+        import logging
+        from app.services.cv_cache_service import content_hash, parse_cv_file, upsert_parsed_cv
+
+        text, parsed = "", None
         try:
-            await _enrich_profile_from_cv(applicant, file_bytes, db)
+            text, parsed = await asyncio.to_thread(parse_cv_file, file_bytes)
+            upsert_parsed_cv(db, document, content_hash(file_bytes), parsed)
+            db.commit()
         except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"CV auto-enrich failed for applicant {applicant.id}: {e}")
+            db.rollback()
+            logging.getLogger(__name__).warning(f"Parsed-CV-Cache failed for document {document.id}: {e}")
+        if text:
+            try:
+                await _enrich_profile_from_cv(applicant, text, parsed, db)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"CV auto-enrich failed for applicant {applicant.id}: {e}")
+
+        # Neuer CV und ggf. ergänzte Profilfelder ändern die Scores
+        from app.services.match_score_service import refresh_applicant_scores
+        background_tasks.add_task(refresh_applicant_scores, applicant.id)
 
     return {
         "id": document.id,
@@ -180,18 +199,22 @@ async def upload_document(
     }
 
 
-async def _enrich_profile_from_cv(applicant: Applicant, file_bytes: bytes, db: Session) -> None:
+async def _enrich_profile_from_cv(applicant: Applicant, text: str, parsed: Optional[dict], db: Session) -> None:
     """
-    Parst das hochgeladene CV und befüllt NUR leere Profilfelder.
+    Wertet den bereits extrahierten CV-Text aus (parsed: Regex-Ergebnis des Uploads als
+    Fallback) und befüllt NUR leere Profilfelder.
     Vorhandene Daten werden NIEMALS überschrieben.
     """
-    from app.services.cv_parser_service import parse_cv
+    from app.services.cv_parser_service import parse_cv_text
     from app.core.config import settings
 
-    cv_data = await parse_cv(
-        pdf_bytes=file_bytes,
-        openai_key=getattr(settings, "OPENAI_API_KEY", ""),
-        gemini_key=getattr(settings, "GOOGLE_API_KEY", ""),
+    # KI-Aufrufe sind synchron – im Worker-Thread, nicht im Event-Loop
+    cv_data = await asyncio.to_thread(
+        parse_cv_text,
+        text,
+        getattr(settings, "OPENAI_API_KEY", ""),
+        getattr(settings, "GOOGLE_API_KEY", ""),
+        parsed,
     )
     if not cv_data:
         return
@@ -514,6 +537,7 @@ def _friendly_filename(document, db: Session) -> str:
 @router.delete("/{document_id}")
 async def delete_document(
     document_id: int,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -537,6 +561,11 @@ async def delete_document(
             detail="Dokument nicht gefunden"
         )
     
+    is_cv = document.document_type == DocumentType.CV
     await DocumentService.delete_file(document, db)
+    if is_cv:
+        # Ohne CV ändern sich die Scores (CV-Analyse entfällt)
+        from app.services.match_score_service import refresh_applicant_scores
+        background_tasks.add_task(refresh_applicant_scores, applicant.id)
     
     return {"message": "Dokument gelöscht"}
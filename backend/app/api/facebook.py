@@ -698,6 +698,7 @@ async def generate_boosted_job_post(
 @router.post("/boosted-jobs/{job_id}/send-emails")
 def send_boost_emails(
     job_id: int,
+    background: bool = Query(False, description="Als Hintergrund-Task (boost_job) einreihen"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -710,6 +711,14 @@ def send_boost_emails(
     if not job:
         raise HTTPException(status_code=404, detail="Stelle nicht gefunden")
 
+    if background:
+        # Höchstens ein Boost-Versand pro Stelle und Tag
+        from app.services.task_queue_service import enqueue_task
+        task = enqueue_task(db, "boost_job", {"job_id": job_id},
+                            idempotency_key=f"boost_job:{job_id}:{datetime.utcnow().date().isoformat()}",
+                            created_by_user_id=current_user.id)
+        return {"queued": True, "task_id": task.id, "status": task.status}
+
     result = send_boost_emails_for_job(job, db)
     if result.get("error"):
         raise HTTPException(status_code=400, detail=result["error"])
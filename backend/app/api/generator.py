@@ -11,7 +11,6 @@ from app.models.job_posting import JobPosting
 from app.models.company import Company
 from app.models.company_member import CompanyMember
 from app.models.application import Application
-from app.services.document_generator import DocumentGenerator
 
 router = APIRouter(prefix="/generate", tags=["Dokument-Generierung"])
 
@@ -72,6 +71,8 @@ async def generate_arbeitserlaubnis(
                     Company.id == job_posting.company_id
                 ).first()
     
+    # reportlab erst bei Bedarf laden (nicht beim Worker-Start)
+    from app.services.document_generator import DocumentGenerator
     pdf_buffer = DocumentGenerator.generate_arbeitserlaubnis_antrag(
         applicant=applicant,
         job_posting=job_posting,
@@ -108,6 +109,7 @@ async def generate_lebenslauf(
             detail="Bitte erstellen Sie zuerst Ihr Bewerber-Profil"
         )
     
+    from app.services.document_generator import DocumentGenerator
     pdf_buffer = DocumentGenerator.generate_lebenslauf(applicant)
     
     filename = f"Lebenslauf_{applicant.last_name}_{applicant.first_name}.pdf"
@@ -174,6 +176,7 @@ async def generate_stellenbescheinigung(
         Company.id == job_posting.company_id
     ).first()
     
+    from app.services.document_generator import DocumentGenerator
     pdf_buffer = DocumentGenerator.generate_arbeitserlaubnis_antrag(
         applicant=applicant,
         job_posting=job_posting,
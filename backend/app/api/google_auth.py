@@ -5,8 +5,6 @@ from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from datetime import datetime, timezone
 
 from app.core.database import get_db
@@ -53,6 +51,10 @@ async def google_login(
             detail="Google Login ist nicht konfiguriert"
         )
     
+    # google-auth (+ requests) erst beim ersten Google-Login laden
+    from google.oauth2 import id_token
+    from google.auth.transport import requests
+
     try:
         # Google ID Token verifizieren
         idinfo = id_token.verify_oauth2_token(
@@ -754,25 +754,11 @@ async def create_job(
     update_job_slug(job, db)
     db.refresh(job)
     
-    # Notify matching applicants about new job (if active and not draft)
+    # Notify matching applicants + Google Indexing (if active and not draft) – als Hintergrund-Tasks
     if job.is_active and not job.is_draft:
-        try:
-            from app.services.job_notification_service import notify_applicants_about_new_job
-            notify_applicants_about_new_job(job, db)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).error(f"Job notification failed: {e}")
-        
-        # Google Indexing: Neue Stelle zur Indexierung anmelden
-        try:
-            import asyncio
-            asyncio.create_task(google_indexing_service.request_indexing(
-                f"https://www.jobon.work/jobs/{job.slug}-{job.id}",
-                "URL_UPDATED"
-            ))
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Google Indexing request failed: {e}")
+        from app.services.task_queue_service import enqueue_tasks, publish_job_tasks
+        enqueue_tasks(db, publish_job_tasks(job), created_by_user_id=current_user.id)
+        # match_scores der neuen Stelle füllt notify_new_job (get_matching_applicants)
     
     return job
 
@@ -781,6 +767,7 @@ async def create_job(
 async def update_job(
     job_id: int,
     job_data: JobPostingUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -827,6 +814,8 @@ async def update_job(
     if job.is_active and not job.is_draft:
         _validate_required_job_fields(job.title, job.description)
 
+    from app.services.match_score_service import invalidate_job_scores, job_scoring_changed
+    scoring_changed = job_scoring_changed(job)
     db.commit()
 
     # SEO: Slug aktualisieren wenn relevante Felder geändert wurden
@@ -839,12 +828,13 @@ async def update_job(
     # Bewerber-Benachrichtigungen nachholen. Feuert nur beim ERSTEN Live-Gehen
     # (danach ist is_draft False), also kein Re-Broadcast bei späteren Edits.
     if published_from_draft and job.is_active and not job.is_draft:
-        try:
-            from app.services.job_notification_service import notify_applicants_about_new_job
-            notify_applicants_about_new_job(job, db)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).error(f"Job-Benachrichtigung (Entwurf veröffentlicht) fehlgeschlagen: {e}")
+        from app.services.task_queue_service import enqueue_tasks, publish_job_tasks
+        enqueue_tasks(db, publish_job_tasks(job, index=False), created_by_user_id=current_user.id)
+
+    # Spalte dieser Stelle in match_scores nur bei bewertungsrelevanten Änderungen
+    # verwerfen (im Hintergrund); neu berechnet wird beim nächsten Lesen
+    if scoring_changed:
+        background_tasks.add_task(invalidate_job_scores, job.id)
 
     return job
 
@@ -1000,16 +990,9 @@ async def reactivate_job(
     db.commit()
     db.refresh(job)
 
-    # Google Indexing: Reaktivierte Stelle zur Indexierung anmelden
-    try:
-        import asyncio
-        asyncio.create_task(google_indexing_service.request_indexing(
-            f"https://www.jobon.work/jobs/{job.slug}-{job.id}",
-            "URL_UPDATED"
-        ))
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Google Indexing request failed: {e}")
+    # Google Indexing: Reaktivierte Stelle zur Indexierung anmelden (Hintergrund-Task)
+    from app.services.task_queue_service import enqueue_tasks, publish_job_tasks
+    enqueue_tasks(db, publish_job_tasks(job, notify=False), created_by_user_id=current_user.id)
     
     return job
 
@@ -1190,10 +1173,11 @@ async def translate_job(
 ):
     """
     Firma übersetzt ihre eigene Stellenanzeige in die gewählten Sprachen.
-    Verwendet DeepL API.
+    Verwendet DeepL API – als Hintergrund-Task translate_job, die Antwort wartet nicht
+    auf DeepL (Ergebnis danach in translations / available_languages der Stelle).
     """
-    from app.services.translation_service import translate_job_fields, get_deepl_status
-    from sqlalchemy.orm.attributes import flag_modified
+    from app.services.task_queue_service import enqueue_tasks
+    from app.services.translation_service import get_deepl_status
     
     # Firma prüfen
     company = get_company_for_user(current_user, db)
@@ -1223,49 +1207,19 @@ async def translate_job(
     if not languages_to_translate:
         raise HTTPException(status_code=400, detail="Keine gültigen Sprachen angegeben")
     
-    # Bestehende Übersetzungen laden oder initialisieren
-    translations = job.translations or {}
-    available_languages = job.available_languages or ["de"]
-    
-    translated_languages = []
-    errors = []
-    
-    for target_lang in languages_to_translate:
-        try:
-            # Übersetzen
-            translated = await translate_job_fields(
-                title=job.title,
-                description=job.description,
-                tasks=job.tasks,
-                requirements=job.requirements,
-                benefits=job.benefits,
-                target_lang=target_lang,
-                source_lang='de'
-            )
-            
-            if translated and translated.get('title'):
-                translations[target_lang] = translated
-                if target_lang not in available_languages:
-                    available_languages.append(target_lang)
-                translated_languages.append(target_lang)
-            else:
-                errors.append(f"{target_lang}: Übersetzung fehlgeschlagen")
-                
-        except Exception as e:
-            errors.append(f"{target_lang}: {str(e)}")
-    
-    # Job aktualisieren
-    if translated_languages:
-        job.translations = translations
-        job.available_languages = available_languages
-        flag_modified(job, "translations")
-        flag_modified(job, "available_languages")
-        db.commit()
-    
+    # Gleiche Stelle + Sprachen nur einmal offen; nach Abschluss neu ansetzbar (geänderter Text)
+    task = enqueue_tasks(db, [{
+        "task_type": "translate_job",
+        "payload": {"job_id": job.id, "languages": languages_to_translate},
+        "idempotency_key": f"translate_job:{job.id}:{','.join(sorted(languages_to_translate))}",
+        "replace_finished": True,
+    }], created_by_user_id=current_user.id)[0]
+
     return {
-        "success": len(translated_languages) > 0,
-        "translated_languages": translated_languages,
-        "errors": errors,
+        "queued": True,
+        "task_id": task.id,
+        "status": task.status,
+        "languages": languages_to_translate,
         "available_languages": job.available_languages
     }
 
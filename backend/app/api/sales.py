@@ -7,7 +7,6 @@ Ermöglicht Admins:
 - Massen-E-Mails für Kaltakquise zu versenden
 """
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
 from datetime import datetime
@@ -16,7 +15,6 @@ import io
 import re
 import logging
 
-from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models import User
 from app.models.user import UserRole
@@ -53,7 +51,7 @@ class SendSalesEmailRequest(BaseModel):
 class SendSalesEmailResponse(BaseModel):
     success: bool
     total: int
-    sent: int
+    sent: int  # zum Versand angenommen (Outbox); das Zustell-Ergebnis steht im E-Mail-Log
     failed: int
     errors: List[dict]
 
@@ -167,8 +165,7 @@ async def parse_email_csv(
 @router.post("/send", response_model=SendSalesEmailResponse)
 async def send_sales_emails(
     data: SendSalesEmailRequest,
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(require_admin)
 ):
     """
     Sendet Kaltakquise-E-Mails an die angegebenen Empfänger.
@@ -209,54 +206,29 @@ async def send_sales_emails(
             errors=[]
         )
     
-    # Massen-Versand
-    from app.models.email_log import EmailLog, EmailType
-    
-    sent = 0
-    failed = 0
+    # Massen-Versand: eine Vorlage, bis zu 1000 Empfänger pro SendGrid-Request. Der
+    # Sammelversand loggt jeden Empfänger selbst (als Kaltakquise, mit Zustell-Ergebnis)
     errors = []
+    try:
+        success = email_service.send_sales_emails(
+            to_emails=valid_recipients,
+            subject=data.subject,
+            html_content=content,
+            is_html=data.is_html,
+            email_type="cold_outreach",
+            sent_by_user_id=current_user.id
+        )
+        if not success:
+            errors = [{"email": email, "error": "Versand fehlgeschlagen"} for email in valid_recipients]
+    except Exception as e:
+        success = False
+        errors = [{"email": email, "error": str(e)} for email in valid_recipients]
+        logger.error(f"Fehler beim Sammelversand an {len(valid_recipients)} Empfänger: {e}")
     
-    for email in valid_recipients:
-        try:
-            success = email_service.send_sales_email(
-                to_email=email,
-                subject=data.subject,
-                html_content=content,
-                is_html=data.is_html
-            )
-            
-            # Logge die E-Mail für Statistiken
-            email_log = EmailLog(
-                email_type="cold_outreach",
-                recipient_email=email,
-                subject=data.subject,
-                success=1 if success else 0,
-                sent_by_user_id=current_user.id
-            )
-            db.add(email_log)
-            
-            if success:
-                sent += 1
-                logger.info(f"Sales-E-Mail gesendet an: {email}")
-            else:
-                failed += 1
-                errors.append({"email": email, "error": "Versand fehlgeschlagen"})
-        except Exception as e:
-            failed += 1
-            errors.append({"email": email, "error": str(e)})
-            logger.error(f"Fehler beim Senden an {email}: {e}")
-            
-            # Auch fehlgeschlagene E-Mails loggen
-            email_log = EmailLog(
-                email_type="cold_outreach",
-                recipient_email=email,
-                subject=data.subject,
-                success=0,
-                sent_by_user_id=current_user.id
-            )
-            db.add(email_log)
-    
-    db.commit()
+    sent = len(valid_recipients) if success else 0
+    failed = len(valid_recipients) - sent
+    if success:
+        logger.info(f"Sales-E-Mail an {sent} Empfänger übergeben")
     
     return SendSalesEmailResponse(
         success=failed == 0,
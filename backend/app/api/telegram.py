@@ -4,6 +4,7 @@ Telegram-Bot-Endpunkte.
 - POST /telegram/webhook : Empfängt Updates von Telegram (öffentlich, per Secret-Header abgesichert).
 - Admin-Endpunkte        : Status, Webhook setzen, Testnachricht, Gruppen-Sprache.
 """
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
@@ -283,13 +284,14 @@ def telegram_promo_now(current_user: User = Depends(require_admin), db: Session
 
 
 @router.post("/boost/{job_id}")
-def telegram_boost_job(
+async def telegram_boost_job(
     job_id: int,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """Telegram-Boost: postet eine Stelle (erneut) in die Gruppe UND an passende
-    Abonnenten – analog zum E-Mail-Boost an passende Bewerber."""
+    Abonnenten – analog zum E-Mail-Boost an passende Bewerber. Der Versand läuft
+    rate-limitiert im Hintergrund; die Antwort nennt Gruppe und Empfängerzahl."""
     from app.models.job_posting import JobPosting
 
     if not tg.is_configured():
@@ -300,10 +302,17 @@ def telegram_boost_job(
     if not job.is_active or getattr(job, "is_draft", False):
         raise HTTPException(status_code=400, detail="Stelle ist inaktiv oder Entwurf")
 
-    result = tg.broadcast_new_job(job, db)
-    if not result.get("sent_group") and not result.get("sent_subscribers"):
+    # Teaser (KI) + Abonnenten-Query im Thread, nicht auf dem Event-Loop
+    plan = await asyncio.to_thread(tg.prepare_broadcast, job, db)
+    if not plan["group"] and not plan["recipients"]:
         raise HTTPException(
             status_code=400,
             detail="Nichts gesendet – ist eine Gruppe verbunden (/hier_posten) bzw. gibt es passende Abonnenten?",
         )
-    return {"ok": True, **result}
+    tg.start_broadcast(plan)
+    return {
+        "ok": True,
+        "queued": True,
+        "group": plan["group"] is not None,
+        "subscribers": len(plan["recipients"]),
+    }
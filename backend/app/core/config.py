@@ -18,6 +18,9 @@ class Settings(BaseSettings):
     
     # Database (SQLite für Entwicklung, PostgreSQL/MySQL für Produktion)
     DATABASE_URL: str = "sqlite:///./ijp_portal.db"
+    # Ausstehende Migrationen beim API-Start anwenden statt nur die Version zu prüfen
+    # (Standard: `python migrate.py` vor dem Start; im DEBUG-Modus immer automatisch)
+    MIGRATE_ON_STARTUP: bool = False
     
     # JWT - WICHTIG: SECRET_KEY muss in Produktion über Environment Variable gesetzt werden!
     SECRET_KEY: str = _DEFAULT_SECRET_KEY
@@ -57,6 +60,15 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = ""  # SendGrid API Key
     FROM_EMAIL: str = "noreply@internationaljobplacement.com"
     FROM_NAME: str = "International Job Placement"
+    # E-Mails über die email_outbox + Delivery-Worker versenden (False = synchron im Aufrufer,
+    # z.B. für Skripte, die ohne laufende App E-Mails verschicken)
+    EMAIL_OUTBOX_ENABLED: bool = True
+
+    # Periodische Jobs (Scheduler): Sync-Jobs laufen in einem begrenzten Pool, damit
+    # Digests/Cleanup den Event-Loop der API nicht blockieren.
+    # "thread" = Threads im API-Prozess, "process" = eigene Worker-Prozesse (ohne GIL-Konkurrenz)
+    SCHEDULER_EXECUTOR: str = "thread"
+    SCHEDULER_WORKERS: int = 2
 
     # Optionaler separater SMTP-Versand NUR für Kaltakquise/Vertrieb (z.B. Gmail).
     # Wenn OUTREACH_SMTP_USER + OUTREACH_SMTP_PASSWORD gesetzt sind, laufen Cold-
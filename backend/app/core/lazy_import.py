@@ -0,0 +1,41 @@
+"""
+Lazy-Imports für schwere, selten genutzte Abhängigkeiten
+
+    stripe = lazy_module("stripe")
+
+verhält sich wie `import stripe`, importiert das Paket aber erst beim ersten
+Attributzugriff (auch Zuweisungen wie stripe.api_key = ...). Der Worker-Start lädt es
+damit nicht mehr; siehe `python startup_profile.py` für die Import-Kosten je Paket.
+"""
+import importlib
+from types import ModuleType
+
+
+class LazyModule:
+    """Platzhalter, der beim ersten Zugriff das echte Modul importiert und delegiert."""
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            # importlib serialisiert parallele Erst-Imports über den Import-Lock
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "geladen" if self.__dict__["_module"] is not None else "noch nicht geladen"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -0,0 +1,402 @@
+"""
+Versionierte Migrationen (Fast-Start)
+
+Die API prüft beim Start nur noch die Schema-Version (eine Query auf schema_migrations,
+check_schema_version). DDL, Daten-Korrekturen und Seeds laufen einmalig per
+`python migrate.py` (Dockerfile: vor uvicorn) in dieser Reihenfolge:
+
+Baseline (abgeschlossen, nicht mehr ändern):
+1. create_all       – fehlende Tabellen laut Modellen
+2. SQL-Dateien      – backend/migrations/ (SQL_MIGRATIONS, historische Reihenfolge). Nur
+                      Postgres; auf SQLite übersprungen, dort erzeugt create_all bereits
+                      das aktuelle Schema. Manuelle Daten-Korrekturen (MANUAL_SQL) laufen
+                      nie automatisch.
+3. Python-Schritte  – die früheren Start-Schritte (app.core.schema_steps.PYTHON_STEPS)
+Danach:
+4. MIGRATIONS       – neue Migrationen: Dateiname in backend/migrations/ oder Funktion.
+                      SQL-Dateien laufen nur auf Postgres; auf SQLite legt stattdessen
+                      create_all neu hinzugekommene Tabellen an.
+
+Version = Position in dieser Folge, neue Migrationen werden daher nur an MIGRATIONS
+angehängt. Parallel gestartete Runner serialisiert ein Postgres-Advisory-Lock.
+
+Bestehende Installationen (Tabellen vorhanden, aber noch kein schema_migrations) haben
+die BASELINE_SQL-Dateien früher von Hand bekommen: der erste Lauf trägt sie nur als
+angewendet ein (stamp_baseline), statt sie erneut auszuführen.
+"""
+import hashlib
+import importlib
+import logging
+import os
+import pkgutil
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from app.core.database import Base, SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "migrations")
+
+# Advisory-Lock des Runners ("JOBOM" als Zahl, verschieden vom Scheduler-Lock)
+MIGRATION_LOCK_KEY = 0x4A4F424F4D
+
+# SQL-Dateien aus der Zeit vor dem Runner (in Produktion von Hand ausgeführt), historische
+# Reihenfolge (Datum im Kopf, sonst Commit-Reihenfolge)
+BASELINE_SQL = [
+    "add_job_posting_fields.sql",
+    "add_multilingual_jobs.sql",
+    "fix_enum_values_to_lowercase.sql",
+    "add_employment_type_values.sql",
+    "add_featured_job_fields.sql",
+    "add_paid_promotion_fields.sql",
+    "add_admin_translation_fields.sql",
+    "add_draft_and_keep_archived.sql",
+    "fix_active_draft_jobs.sql",
+    "add_last_login_at.sql",
+    "add_whatsapp_contact.sql",
+    "add_email_preferences.sql",
+    "add_email_logs.sql",
+    "add_job_deletion_reason.sql",
+    "fix_job_deletion_reason_enum.sql",
+    "add_blog_language.sql",
+    "add_crm_contacts.sql",
+    "add_anabin_and_invite_source_fields.sql",
+    "add_applicant_invite_tokens.sql",
+    "add_company_digest_and_filter_fields.sql",
+    "add_published_at_to_job_postings.sql",
+    "add_application_indexes.sql",
+]
+
+# Einmalige Daten-Korrekturen ("Backup vor Ausführung", "in Render → Query ausführen") –
+# nie automatisch; bleiben in der Folge, damit die Versionsnummern stabil sind
+MANUAL_SQL = {
+    "fix_enum_values_to_lowercase.sql",
+    "fix_active_draft_jobs.sql",
+    "fix_job_deletion_reason_enum.sql",
+}
+
+SQL_MIGRATIONS = BASELINE_SQL + [
+    "add_parsed_cvs.sql",
+    "add_match_scores.sql",
+    "add_text_tokens.sql",
+    "add_match_filter_columns.sql",
+    "add_email_outbox.sql",
+    "add_email_outbox_bulk.sql",
+    "add_task_queue.sql",
+    "add_scheduled_jobs.sql",
+    "add_scheduled_jobs_timing.sql",
+    "add_schema_migrations.sql",
+]
+
+def request_parsed_cvs_backfill() -> None:
+    """Alt-Lebensläufe ohne parsed_cvs-Eintrag per Backfill nachparsen (vorher beim
+    ersten Matching-Zugriff, mitten im Scoring)."""
+    from app.services.backfill_service import request_backfill
+
+    db = SessionLocal()
+    try:
+        request_backfill(db, "parsed_cvs")
+    finally:
+        db.close()
+
+
+def request_text_tokens_backfills() -> None:
+    """Fehlende text_tokens per Backfill nachtragen (vorher beim Aufbau des
+    Keyword-Index, auf der Session des Aufrufers)."""
+    from app.services.backfill_service import request_backfill
+
+    db = SessionLocal()
+    try:
+        request_backfill(db, "job_text_tokens")
+        request_backfill(db, "applicant_text_tokens")
+    finally:
+        db.close()
+
+
+def request_match_filter_backfills() -> None:
+    """SQL-Vorfilter-Spalten (add_match_filter_columns.sql) für den Altbestand per Backfill
+    befüllen; bis dahin lassen die Filter Zeilen ohne Werte durch."""
+    from app.services.backfill_service import request_backfill
+
+    db = SessionLocal()
+    try:
+        request_backfill(db, "applicant_match_filters")
+        request_backfill(db, "job_match_filters")
+    finally:
+        db.close()
+
+
+# Neue Migrationen nach der Baseline – nur anhängen
+MIGRATIONS: List[Union[str, Callable[[], None]]] = [
+    "add_backfill_runs.sql",
+    request_parsed_cvs_backfill,
+    request_text_tokens_backfills,
+    request_match_filter_backfills,
+    "add_notification_reference_index.sql",
+]
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[], bool]  # Returns: True = angewendet, False = übersprungen
+    sql_file: Optional[str] = None
+
+    def checksum(self) -> Optional[str]:
+        if not self.sql_file:
+            return None
+        with open(os.path.join(MIGRATIONS_DIR, self.sql_file), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_models() -> None:
+    """Registriert alle Modelle und Mapper-Events (wie app.main), damit create_all und die
+    Daten-Schritte ohne die API-Router vollständig sind."""
+    import app.models
+    from app.services import keyword_index, match_filters  # noqa: F401
+
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
+
+
+def _create_all() -> bool:
+    load_models()
+    Base.metadata.create_all(bind=engine)
+    return True
+
+
+def _sql_step(filename: str) -> Callable[[], bool]:
+    def apply() -> bool:
+        if filename in MANUAL_SQL:
+            logger.info(f"{filename}: manuelles Skript – nicht automatisch ausgeführt")
+            return False
+        if engine.dialect.name != "postgresql":
+            # SQLite: neue Tabellen aus den Modellen (bestehende bleiben unverändert)
+            Base.metadata.create_all(bind=engine)
+            logger.info(f"{filename}: übersprungen (nur Postgres)")
+            return False
+        with open(os.path.join(MIGRATIONS_DIR, filename), encoding="utf-8") as f:
+            sql = f.read()
+        # Roh über den DB-Treiber: mehrere Statements, DO $$ … $$ und ::casts wie in psql
+        with engine.begin() as conn:
+            conn.connection.cursor().execute(sql)
+        return True
+    return apply
+
+
+def _python_step(step: Callable[[], None]) -> Callable[[], bool]:
+    # Fehler des Schritts werden nicht abgefangen: run_migrations bricht ab, ohne die
+    # Version einzutragen
+    def apply() -> bool:
+        if getattr(step, "postgres_only", False) and engine.dialect.name != "postgresql":
+            logger.info(f"{step.__name__}: übersprungen (nur Postgres)")
+            return False
+        step()
+        return True
+    return apply
+
+
+def get_migrations() -> List[Migration]:
+    from app.core.schema_steps import PYTHON_STEPS
+
+    steps = [("create_all", _create_all, None)]
+    steps += [(f"sql:{name}", _sql_step(name), name) for name in SQL_MIGRATIONS]
+    for step in PYTHON_STEPS + MIGRATIONS:
+        if isinstance(step, str):
+            steps.append((f"sql:{step}", _sql_step(step), step))
+        else:
+            steps.append((f"py:{step.__name__}", _python_step(step), None))
+    return [Migration(version, name, apply, sql_file)
+            for version, (name, apply, sql_file) in enumerate(steps, start=1)]
+
+
+def latest_version() -> int:
+    """Version, die der Code erwartet (ohne SQL-Dateien zu lesen)."""
+    from app.core.schema_steps import PYTHON_STEPS
+
+    return 1 + len(SQL_MIGRATIONS) + len(PYTHON_STEPS) + len(MIGRATIONS)
+
+
+def current_version() -> Optional[int]:
+    """Höchste angewendete Version (None = schema_migrations fehlt, DB nie migriert)."""
+    from app.models.schema_migration import SchemaMigration
+
+    # Core-Select: braucht keine konfigurierten Mapper (läuft vor allen anderen Imports)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(SchemaMigration.__table__.c.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+@contextmanager
+def _migration_lock():
+    """Serialisiert parallel gestartete Runner (mehrere Instanzen beim Deployment)."""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.commit()
+
+
+def _applied(db) -> Dict[int, object]:
+    from app.models.schema_migration import SchemaMigration
+
+    return {row.version: row for row in db.query(SchemaMigration).all()}
+
+
+def _existing_install() -> bool:
+    """Datenbank mit App-Tabellen (Stand vor dem Runner)?"""
+    return inspect(engine).has_table("users")
+
+
+def _stamp_baseline(db) -> List[str]:
+    from app.models.schema_migration import SchemaMigration
+
+    applied = _applied(db)
+    stamped = []
+    for migration in get_migrations():
+        if migration.sql_file in BASELINE_SQL and migration.version not in applied:
+            db.add(SchemaMigration(version=migration.version, name=migration.name,
+                                   checksum=migration.checksum(), skipped=True, duration_ms=0))
+            stamped.append(migration.name)
+    db.commit()
+    if stamped:
+        logger.info(f"Baseline: {len(stamped)} SQL-Dateien als angewendet eingetragen (nicht ausgeführt)")
+    return stamped
+
+
+def stamp_baseline() -> List[str]:
+    """Trägt die BASELINE_SQL-Dateien als angewendet ein, ohne sie auszuführen (nur wenn
+    noch nicht eingetragen). Für Installationen, die sie früher von Hand bekommen haben.
+
+    Returns: Namen der eingetragenen Migrationen
+    """
+    from app.models.schema_migration import SchemaMigration
+
+    load_models()
+    with _migration_lock():
+        SchemaMigration.__table__.create(bind=engine, checkfirst=True)
+        db = SessionLocal()
+        try:
+            return _stamp_baseline(db)
+        finally:
+            db.close()
+
+
+def migration_status() -> List[dict]:
+    """Alle Migrationen mit Status (für `python migrate.py --status`)."""
+    from app.models.schema_migration import SchemaMigration
+
+    load_models()
+    SchemaMigration.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        applied = _applied(db)
+    finally:
+        db.close()
+    status = []
+    for migration in get_migrations():
+        row = applied.get(migration.version)
+        entry = {"version": migration.version, "name": migration.name,
+                 "applied": row is not None, "skipped": bool(row and row.skipped),
+                 "applied_at": row.applied_at if row else None, "changed": False}
+        if row and migration.sql_file and row.checksum and row.checksum != migration.checksum():
+            entry["changed"] = True
+        if row and row.name != migration.name:
+            entry["mismatch"] = row.name
+        status.append(entry)
+    return status
+
+
+def run_migrations(target: Optional[int] = None) -> List[str]:
+    """Wendet alle ausstehenden Migrationen (bis target) an, jede mit eigenem Eintrag.
+
+    Ein fehlgeschlagener Schritt bricht den Lauf ab (Ausnahme des Schritts); seine Version
+    wird nicht eingetragen, der nächste Lauf beginnt dort erneut.
+
+    Returns: Namen der angewendeten Migrationen
+    Raises: RuntimeError, wenn die DB eine andere Migration unter einer Version führt
+    """
+    from app.models.schema_migration import SchemaMigration
+
+    load_models()
+    migrations = get_migrations()
+    done = []
+    with _migration_lock():
+        SchemaMigration.__table__.create(bind=engine, checkfirst=True)
+        db = SessionLocal()
+        try:
+            applied = _applied(db)
+            if not applied and _existing_install():
+                # Erster Lauf auf der Bestands-DB: historische SQL-Dateien nicht erneut ausführen
+                _stamp_baseline(db)
+                applied = _applied(db)
+            for migration in migrations:
+                row = applied.get(migration.version)
+                if row is not None and row.name != migration.name:
+                    raise RuntimeError(
+                        f"Version {migration.version} ist in der DB '{row.name}', im Code "
+                        f"'{migration.name}' – Migrationen dürfen nur angehängt werden"
+                    )
+            for migration in migrations:
+                if migration.version in applied or (target is not None and migration.version > target):
+                    continue
+                started = time.monotonic()
+                logger.info(f"Migration {migration.version}: {migration.name}")
+                try:
+                    ran = migration.apply()
+                except Exception:
+                    logger.error(f"Migration {migration.version} ({migration.name}) fehlgeschlagen – "
+                                 f"abgebrochen, Version nicht eingetragen")
+                    raise
+                db.add(SchemaMigration(
+                    version=migration.version,
+                    name=migration.name,
+                    checksum=migration.checksum(),
+                    skipped=not ran,
+                    duration_ms=int((time.monotonic() - started) * 1000),
+                ))
+                db.commit()
+                done.append(migration.name)
+        finally:
+            db.close()
+    return done
+
+
+def check_schema_version(auto_migrate: bool = False) -> Optional[int]:
+    """Start-Prüfung der API: nur die Versionsnummer vergleichen.
+
+    auto_migrate: ausstehende Migrationen direkt anwenden (Entwicklung, MIGRATE_ON_STARTUP)
+    Raises: RuntimeError, wenn das Schema veraltet ist und nicht migriert werden soll
+    """
+    version = current_version()
+    expected = latest_version()
+    if version == expected:
+        logger.info(f"Schema-Version {version} aktuell")
+        return version
+    if version is not None and version > expected:
+        # z.B. Rollback auf älteren Code: Migrationen sind additiv, weiterlaufen
+        logger.warning(f"Schema-Version {version} ist neuer als der Code ({expected})")
+        return version
+    if auto_migrate:
+        logger.info(f"Schema-Version {version or 0} < {expected}: wende Migrationen an...")
+        run_migrations()
+        return expected
+    raise RuntimeError(
+        f"Datenbank-Schema veraltet (Version {version or 0}, erwartet {expected}) – "
+        f"vor dem Start `python migrate.py` ausführen"
+    )
@@ -0,0 +1,819 @@
+"""
+Schema- und Daten-Schritte, die früher bei jedem Import von app.main liefen
+(information_schema-Prüfungen, ALTER TABLE, Daten-Korrekturen, Seeds).
+
+Sie laufen jetzt einmalig über den Migrations-Runner (app.core.migrations,
+`python migrate.py`) – als versionierte Python-Schritte in der bisherigen
+Reihenfolge (PYTHON_STEPS). Alle Schritte sind idempotent. Schlägt ein Schritt fehl,
+wird zurückgerollt und die Ausnahme weitergereicht: der Runner bricht ab und trägt die
+Version nicht ein, der nächste Lauf versucht sie erneut. Daten-Nachträge über
+viele Zeilen laufen nicht hier, sondern werden als Backfill angefordert
+(app.services.backfill_service, in ID-Blöcken mit Checkpoint).
+"""
+import logging
+
+from app.core.database import SessionLocal, engine
+from app.services.backfill_service import request_backfill
+
+logger = logging.getLogger(__name__)
+
+
+def postgres_only(step):
+    """Markiert einen Schritt als Postgres-DDL (information_schema, ALTER … IF NOT EXISTS):
+    auf SQLite überspringt ihn der Runner, dort erzeugt create_all das aktuelle Schema."""
+    step.postgres_only = True
+    return step
+
+
+# SEO: Slug-Spalte hinzufügen falls nicht vorhanden
+@postgres_only
+def ensure_slug_column():
+    """Fügt die slug Spalte zur job_postings Tabelle hinzu falls nicht vorhanden"""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        # Prüfen ob Spalte existiert
+        result = db.execute(text("""
+            SELECT column_name 
+            FROM information_schema.columns 
+            WHERE table_name = 'job_postings' AND column_name = 'slug'
+        """))
+        if not result.fetchone():
+            logger.info("Adding 'slug' column to job_postings table...")
+            db.execute(text("ALTER TABLE job_postings ADD COLUMN slug VARCHAR(255)"))
+            db.execute(text("CREATE INDEX IF NOT EXISTS ix_job_postings_slug ON job_postings (slug)"))
+            db.commit()
+            request_backfill(db, "job_slugs")
+            logger.info("'slug' column added, slug backfill requested")
+        else:
+            logger.info("'slug' column already exists")
+    except Exception as e:
+        logger.error(f"Error adding slug column: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Google OAuth: google_id Spalte hinzufügen falls nicht vorhanden
+@postgres_only
+def ensure_google_id_column():
+    """Fügt die google_id Spalte zur users Tabelle hinzu falls nicht vorhanden"""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        # Prüfen ob Spalte existiert
+        result = db.execute(text("""
+            SELECT column_name 
+            FROM information_schema.columns 
+            WHERE table_name = 'users' AND column_name = 'google_id'
+        """))
+        if not result.fetchone():
+            logger.info("Adding 'google_id' column to users table...")
+            db.execute(text("ALTER TABLE users ADD COLUMN google_id VARCHAR(255)"))
+            db.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_google_id ON users (google_id)"))
+            # password_hash nullable machen für OAuth-User
+            db.execute(text("ALTER TABLE users ALTER COLUMN password_hash DROP NOT NULL"))
+            db.commit()
+            logger.info("'google_id' column added successfully")
+        else:
+            logger.info("'google_id' column already exists")
+    except Exception as e:
+        logger.error(f"Error adding google_id column: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def ensure_new_application_columns():
+    """Fügt neue Spalten zur applications Tabelle hinzu falls nicht vorhanden"""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        # is_filtered: Score-Filter Flag (Boolean, default False)
+        try:
+            db.execute(text("ALTER TABLE applications ADD COLUMN is_filtered BOOLEAN DEFAULT FALSE"))
+            db.commit()
+            logger.info("'is_filtered' column added to applications table")
+        except Exception:
+            db.rollback()  # Spalte existiert bereits oder anderer Fehler - OK
+
+    except Exception as e:
+        logger.error(f"Error in ensure_new_application_columns: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def ensure_external_job_columns():
+    """Fügt Spalten für externe Jobs (BA-Scraper) hinzu, falls noch nicht vorhanden."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        db_url = str(engine.url)
+        is_sqlite = db_url.startswith("sqlite")
+
+        new_columns = [
+            ("job_postings", "is_external", "BOOLEAN DEFAULT FALSE"),
+            ("job_postings", "external_source", "VARCHAR(50)"),
+            ("job_postings", "external_url", "VARCHAR(500)"),
+            ("job_postings", "external_id", "VARCHAR(100)"),
+            ("job_postings", "external_employer_name", "VARCHAR(255)"),
+            ("job_postings", "enrichment_source", "VARCHAR(50)"),
+            ("job_postings", "country", "VARCHAR(2) DEFAULT 'DE'"),
+            ("job_postings", "expiry_reminder_sent_at", "DATE"),
+            ("job_postings", "email_click_count", "INTEGER DEFAULT 0"),
+            ("job_postings", "phone_click_count", "INTEGER DEFAULT 0"),
+            ("job_postings", "work_authorization_requirement", "VARCHAR(20) DEFAULT 'not_relevant'"),
+            ("job_postings", "german_importance", "VARCHAR(12) DEFAULT 'required'"),
+            ("job_postings", "english_importance", "VARCHAR(12) DEFAULT 'required'"),
+            ("applicants", "work_authorized", "BOOLEAN"),
+            ("applicants", "work_support_needed", "JSON"),
+            ("applicants", "needs_employer_support", "BOOLEAN"),
+            ("applications", "work_authorized", "BOOLEAN"),
+            ("applications", "needs_employer_support", "BOOLEAN"),
+            ("companies", "is_scraped", "BOOLEAN DEFAULT FALSE"),
+            ("companies", "weekly_report_enabled", "BOOLEAN DEFAULT TRUE"),
+            ("companies", "expiry_reminder_enabled", "BOOLEAN DEFAULT TRUE"),
+            ("users", "preferred_language", "VARCHAR(5)"),
+            ("email_logs", "sender_email", "VARCHAR(255)"),
+        ]
+        allowed_tables = {t for t, _, _ in new_columns}
+        allowed_cols = {c for _, c, _ in new_columns}
+
+        for table, col, col_def in new_columns:
+            assert table in allowed_tables and col in allowed_cols
+            if is_sqlite:
+                result = db.execute(text(f"PRAGMA table_info({table})"))
+                existing = {row[1] for row in result.fetchall()}
+                if col not in existing:
+                    db.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {col_def}"))
+                    db.commit()
+                    logger.info(f"Spalte '{col}' zu '{table}' hinzugefügt")
+            else:
+                # PostgreSQL: parametrisierte SELECT-Query
+                result = db.execute(text("""
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_name = :table AND column_name = :col
+                """), {"table": table, "col": col})
+                if not result.fetchone():
+                    db.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {col_def}"))
+                    db.commit()
+                    logger.info(f"Spalte '{col}' zu '{table}' hinzugefügt (PostgreSQL)")
+
+        # Index für externe Job-Deduplizierung (funktioniert für beide DBs)
+        db.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_job_postings_external_id ON job_postings (external_id)"
+        ))
+        db.commit()
+
+    except Exception as exc:
+        logger.error(f"Fehler in ensure_external_job_columns: {exc}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def ensure_applicant_invite_columns():
+    """Fügt Spalten für Bewerber-Einladungs-Tracking hinzu, falls noch nicht vorhanden."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        db_url = str(engine.url)
+        is_sqlite = db_url.startswith("sqlite")
+
+        new_columns = [
+            ("applicants", "invite_source", "VARCHAR(255)"),
+            ("applicants", "invite_source_country", "VARCHAR(100)"),
+            ("applicants", "invite_token_id", "INTEGER"),
+            ("applicants", "portal", "VARCHAR(20) DEFAULT 'jobon'"),
+            ("applicant_invite_tokens", "portal_type", "VARCHAR(20) DEFAULT 'jobon'"),
+        ]
+        allowed_tables = {t for t, _, _ in new_columns}
+        allowed_cols = {c for _, c, _ in new_columns}
+
+        for table, col, col_def in new_columns:
+            assert table in allowed_tables and col in allowed_cols
+            if is_sqlite:
+                result = db.execute(text(f"PRAGMA table_info({table})"))
+                existing = {row[1] for row in result.fetchall()}
+                if col not in existing:
+                    db.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {col_def}"))
+                    db.commit()
+                    logger.info(f"Spalte '{col}' zu '{table}' hinzugefügt")
+            else:
+                # PostgreSQL: parametrisierte SELECT-Query
+                result = db.execute(text("""
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_name = :table AND column_name = :col
+                """), {"table": table, "col": col})
+                if not result.fetchone():
+                    db.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {col_def}"))
+                    db.commit()
+                    logger.info(f"Spalte '{col}' zu '{table}' hinzugefügt (PostgreSQL)")
+
+    except Exception as exc:
+        logger.error(f"Fehler in ensure_applicant_invite_columns: {exc}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_published_at_column():
+    """Fügt published_at Spalte zu job_postings hinzu; das Befüllen für aktive Stellen
+    übernimmt der Backfill "published_at".
+    """
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        result = db.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'job_postings' AND column_name = 'published_at'
+        """))
+        if not result.fetchone():
+            logger.info("Adding 'published_at' column to job_postings table...")
+            db.execute(text("ALTER TABLE job_postings ADD COLUMN published_at TIMESTAMP WITH TIME ZONE"))
+            db.commit()
+            request_backfill(db, "published_at")
+            logger.info("'published_at' column added, backfill requested")
+        else:
+            logger.info("'published_at' column already exists")
+    except Exception as e:
+        logger.error(f"Error adding published_at column: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_telegram_posted_at_column():
+    """Fügt telegram_posted_at zu job_postings hinzu. Beim ERSTEN Anlegen werden ALLE
+    bestehenden Stellen als 'bereits gepostet' markiert -> kein Telegram-Backlog-Spam;
+    danach werden nur neu veröffentlichte Stellen (mit Verzögerung) gepostet."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        result = db.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'job_postings' AND column_name = 'telegram_posted_at'
+        """))
+        if not result.fetchone():
+            logger.info("Adding 'telegram_posted_at' column to job_postings...")
+            db.execute(text("ALTER TABLE job_postings ADD COLUMN telegram_posted_at TIMESTAMP WITH TIME ZONE"))
+            db.commit()
+            # Bestand als erledigt markieren, damit der Deferred-Poster nichts nachträglich spammt
+            request_backfill(db, "telegram_posted_at")
+            logger.info("'telegram_posted_at' added, backfill for existing jobs requested")
+    except Exception as e:
+        logger.error(f"Error adding telegram_posted_at column: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_external_click_count_column():
+    """Fügt external_click_count Spalte zu job_postings hinzu"""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        result = db.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'job_postings' AND column_name = 'external_click_count'
+        """))
+        if not result.fetchone():
+            logger.info("Adding 'external_click_count' column to job_postings table...")
+            db.execute(text("ALTER TABLE job_postings ADD COLUMN external_click_count INTEGER DEFAULT 0"))
+            db.commit()
+            logger.info("'external_click_count' column added successfully")
+        else:
+            logger.info("'external_click_count' column already exists")
+    except Exception as e:
+        logger.error(f"Error adding external_click_count column: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_notification_key_columns():
+    """Fügt notification_key und notification_params Spalten zur notifications Tabelle hinzu"""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        result = db.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = 'notifications' AND column_name = 'notification_key'
+        """))
+        if not result.fetchone():
+            logger.info("Adding 'notification_key' and 'notification_params' columns to notifications table...")
+            db.execute(text("ALTER TABLE notifications ADD COLUMN notification_key VARCHAR(100)"))
+            db.execute(text("ALTER TABLE notifications ADD COLUMN notification_params TEXT"))
+            db.commit()
+            logger.info("notification_key columns added successfully")
+        else:
+            logger.info("'notification_key' column already exists")
+    except Exception as e:
+        logger.error(f"Error adding notification_key columns: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def fix_active_draft_jobs():
+    """Setzt is_draft=False für Jobs die aktiviert wurden aber noch als Draft markiert sind."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        result = db.execute(text(
+            "UPDATE job_postings SET is_draft = FALSE, "
+            "published_at = COALESCE(published_at, updated_at, created_at) "
+            "WHERE is_active = TRUE AND is_draft = TRUE AND is_archived = FALSE"
+        ))
+        if result.rowcount > 0:
+            db.commit()
+            import logging
+            logging.getLogger(__name__).info(f"fix_active_draft_jobs: {result.rowcount} Jobs korrigiert")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_blog_language_column():
+    """Fügt language-Spalte zu blog_posts hinzu falls noch nicht vorhanden."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        db.execute(text(
+            "ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS language VARCHAR(5) NOT NULL DEFAULT 'de'"
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def seed_ijp_templates_on_startup():
+    """Schreibt fehlende IJP-Vorlagen in die DB (nur beim allerersten Start)."""
+    db = SessionLocal()
+    try:
+        from app.api.ijp import seed_ijp_templates
+        seed_ijp_templates(db)
+    except Exception as e:
+        logger.error(f"Fehler beim Seeden der IJP-Vorlagen: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_crm_columns():
+    """Fügt CRM-Spalten zu ijp_betriebe hinzu und erstellt crm_contacts Tabelle."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        new_cols = [
+            ("ijp_betriebe", "website", "VARCHAR(500)"),
+            ("ijp_betriebe", "industry", "VARCHAR(100)"),
+            ("ijp_betriebe", "status", "VARCHAR(50)"),
+            ("ijp_betriebe", "country", "VARCHAR(100)"),
+            ("ijp_betriebe", "notes", "TEXT"),
+            ("ijp_betriebe", "bezeichnung", "VARCHAR(255)"),
+            ("company_documents", "kind", "VARCHAR(20) DEFAULT 'template'"),
+        ]
+        allowed_tables = {t for t, _, _ in new_cols}
+        allowed_cols = {c for _, c, _ in new_cols}
+        for table, col, col_def in new_cols:
+            assert table in allowed_tables and col in allowed_cols
+            result = db.execute(text("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name = :table AND column_name = :col
+            """), {"table": table, "col": col})
+            if not result.fetchone():
+                db.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {col_def}"))
+                db.commit()
+                logger.info(f"CRM: Spalte '{col}' zu '{table}' hinzugefügt")
+
+        # Nullable constraints für bestehende Pflichtfelder
+        for col in ("contact_person", "street", "postal_code", "city"):
+            db.execute(text(f"ALTER TABLE ijp_betriebe ALTER COLUMN {col} DROP NOT NULL"))
+            db.commit()
+
+        # crm_contacts Tabelle
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS crm_contacts (
+                id SERIAL PRIMARY KEY,
+                company_id INTEGER NOT NULL REFERENCES ijp_betriebe(id) ON DELETE CASCADE,
+                first_name VARCHAR(100),
+                last_name VARCHAR(100),
+                salutation VARCHAR(20),
+                title VARCHAR(100),
+                department VARCHAR(100),
+                email VARCHAR(255),
+                phone VARCHAR(50),
+                mobile VARCHAR(50),
+                is_primary BOOLEAN DEFAULT FALSE,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+            )
+        """))
+        db.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_crm_contacts_company_id ON crm_contacts (company_id)"
+        ))
+        db.commit()
+        logger.info("CRM: crm_contacts Tabelle bereit")
+    except Exception as e:
+        logger.error(f"Fehler in ensure_crm_columns: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_job_request_public_status_column():
+    """Fügt public_status Spalte zu job_requests hinzu."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        result = db.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'job_requests' AND column_name = 'public_status'
+        """))
+        if not result.fetchone():
+            db.execute(text("ALTER TABLE job_requests ADD COLUMN public_status VARCHAR(100) DEFAULT NULL"))
+            db.commit()
+            logger.info("job_requests: Spalte 'public_status' hinzugefügt")
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"job_requests public_status: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_job_request_status_enum_values():
+    """Ergänzt fehlende Werte im Postgres-Enum 'jobrequeststatus'.
+
+    Die internen Status (zav_requested, visa_received …) wurden später im Code
+    ergänzt, der DB-Enum-Typ kannte sie aber noch nicht -> Speichern schlug fehl.
+    ALTER TYPE ... ADD VALUE IF NOT EXISTS ist idempotent (Postgres 12+).
+    Auf SQLite/lokal gibt es keinen Enum-Typ -> Fehler wird ignoriert.
+    """
+    from sqlalchemy import text
+    from app.models.job_request import JobRequestStatus
+    db = SessionLocal()
+    try:
+        for st in JobRequestStatus:
+            db.execute(text(f"ALTER TYPE jobrequeststatus ADD VALUE IF NOT EXISTS '{st.value}'"))
+            db.commit()
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_job_request_assigned_betrieb_column():
+    """Fügt assigned_betrieb_id (intern zugeteilter Arbeitgeber) zu job_requests hinzu."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        result = db.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'job_requests' AND column_name = 'assigned_betrieb_id'
+        """))
+        if not result.fetchone():
+            db.execute(text("ALTER TABLE job_requests ADD COLUMN assigned_betrieb_id INTEGER REFERENCES ijp_betriebe(id) ON DELETE SET NULL"))
+            db.commit()
+            logger.info("job_requests: Spalte 'assigned_betrieb_id' hinzugefügt")
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"job_requests assigned_betrieb_id: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_partner_links_table():
+    """Erstellt die partner_links Tabelle falls sie noch nicht existiert."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS partner_links (
+                id SERIAL PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                partner_source VARCHAR(255) NOT NULL,
+                token VARCHAR(64) UNIQUE NOT NULL,
+                is_active BOOLEAN DEFAULT TRUE,
+                notes VARCHAR(500),
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                last_accessed_at TIMESTAMP WITH TIME ZONE
+            )
+        """))
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_partner_links_token ON partner_links (token)"))
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_partner_links_partner_source ON partner_links (partner_source)"))
+        db.commit()
+        logger.info("partner_links: Tabelle sichergestellt")
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"partner_links: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_company_premium_column():
+    """Fügt is_premium zu companies hinzu. Bestehende Firmen werden einmalig
+    auf Premium gesetzt (Bestandskunden), neue Firmen sind standardmäßig False."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        result = db.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'companies' AND column_name = 'is_premium'
+        """))
+        if not result.fetchone():
+            db.execute(text("ALTER TABLE companies ADD COLUMN is_premium BOOLEAN DEFAULT FALSE"))
+            # Bestandskunden: alle bisher existierenden Firmen auf Premium
+            db.execute(text("UPDATE companies SET is_premium = TRUE"))
+            db.commit()
+            logger.info("companies: Spalte 'is_premium' hinzugefügt, Bestandsfirmen auf Premium gesetzt")
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"companies is_premium: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_company_stripe_columns():
+    """Fügt die Stripe-Abo-Spalten zu companies hinzu (idempotent)."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        cols = {
+            "stripe_customer_id": "VARCHAR(255)",
+            "stripe_subscription_id": "VARCHAR(255)",
+            "premium_status": "VARCHAR(50)",
+            "premium_until": "TIMESTAMP NULL",
+            "premium_cancel_at_period_end": "BOOLEAN DEFAULT FALSE",
+        }
+        for col, ddl in cols.items():
+            result = db.execute(text("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name = 'companies' AND column_name = :col
+            """), {"col": col})
+            if not result.fetchone():
+                db.execute(text(f"ALTER TABLE companies ADD COLUMN {col} {ddl}"))
+                logger.info(f"companies: Spalte '{col}' hinzugefügt")
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"companies stripe columns: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_premium_cancellations_table():
+    """Erstellt die Tabelle premium_cancellations (idempotent)."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS premium_cancellations (
+                id SERIAL PRIMARY KEY,
+                company_id INTEGER,
+                company_name VARCHAR(255),
+                stripe_subscription_id VARCHAR(255),
+                feedback VARCHAR(100),
+                comment TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        db.commit()
+        logger.info("Tabelle 'premium_cancellations' sichergestellt")
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"premium_cancellations table: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_facebook_job_posts_table():
+    """Erstellt facebook_job_posts + kind-Spalte auf facebook_posts (idempotent)."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS facebook_job_posts (
+                id SERIAL PRIMARY KEY,
+                job_id INTEGER NOT NULL UNIQUE,
+                content_de TEXT,
+                content_es TEXT,
+                comment_text TEXT,
+                generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP
+            )
+        """))
+        res = db.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'facebook_posts' AND column_name = 'kind'
+        """))
+        if not res.fetchone():
+            db.execute(text("ALTER TABLE facebook_posts ADD COLUMN kind VARCHAR(20) DEFAULT 'post'"))
+        db.commit()
+        logger.info("facebook_job_posts/kind sichergestellt")
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"facebook_job_posts table: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_facebook_schema():
+    """Fügt fehlende Spalten zu den facebook_* Tabellen hinzu (Schema-Drift-Fix).
+    create_all legt nur neue Tabellen an, ergänzt aber keine Spalten in bestehenden."""
+    from sqlalchemy import text
+    fb_columns = {
+        "facebook_groups": [
+            "facebook_group_id VARCHAR(100)",
+            "type VARCHAR(50) DEFAULT 'external'",
+            "cluster VARCHAR(100)",
+            "members INTEGER DEFAULT 0",
+            "notes TEXT",
+            "last_posted_at TIMESTAMP",
+            "is_active BOOLEAN DEFAULT TRUE",
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "updated_at TIMESTAMP",
+        ],
+        "facebook_post_templates": [
+            "category VARCHAR(100)",
+            "is_default BOOLEAN DEFAULT FALSE",
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "updated_at TIMESTAMP",
+        ],
+        "facebook_posts": [
+            "title VARCHAR(255)",
+            "kind VARCHAR(20) DEFAULT 'post'",
+            "template_id INTEGER",
+            "variables JSON",
+            "is_favorite BOOLEAN DEFAULT FALSE",
+            "times_used INTEGER DEFAULT 0",
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "updated_at TIMESTAMP",
+        ],
+        "facebook_post_logs": [
+            "post_id INTEGER",
+            "group_id INTEGER",
+            "group_name VARCHAR(255)",
+            "content TEXT",
+            "status VARCHAR(50) DEFAULT 'manual'",
+            "facebook_post_id VARCHAR(100)",
+            "error_message TEXT",
+            "posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+        ],
+        "facebook_job_posts": [
+            "boost_emails_sent_at TIMESTAMP",
+            "boost_emails_count INTEGER DEFAULT 0",
+        ],
+    }
+    db = SessionLocal()
+    try:
+        for table, cols in fb_columns.items():
+            for col_def in cols:
+                db.execute(text(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col_def}'))
+        db.commit()
+        logger.info("facebook_* Spalten sichergestellt")
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"ensure_facebook_schema: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_telegram_schema():
+    """Fügt fehlende Telegram-bezogene Spalten hinzu (Schema-Drift-Fix)."""
+    from sqlalchemy import text
+    table_cols = {
+        "telegram_subscribers": ["language VARCHAR DEFAULT 'de'"],
+        "job_postings": ["telegram_teaser JSON"],
+    }
+    db = SessionLocal()
+    try:
+        for table, cols in table_cols.items():
+            for col_def in cols:
+                db.execute(text(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col_def}'))
+        db.commit()
+        logger.info("Telegram-Spalten sichergestellt")
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"ensure_telegram_schema: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@postgres_only
+def ensure_job_promotions_table():
+    """Erstellt die job_promotions Tabelle und last_boosted_at auf job_postings."""
+    from sqlalchemy import text
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS job_promotions (
+                id SERIAL PRIMARY KEY,
+                company_id INTEGER NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+                job_id INTEGER NOT NULL REFERENCES job_postings(id) ON DELETE CASCADE,
+                kind VARCHAR(20) NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+            )
+        """))
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_job_promotions_company ON job_promotions (company_id)"))
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_job_promotions_created ON job_promotions (created_at)"))
+        res = db.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'job_postings' AND column_name = 'last_boosted_at'
+        """))
+        if not res.fetchone():
+            db.execute(text("ALTER TABLE job_postings ADD COLUMN last_boosted_at TIMESTAMP WITH TIME ZONE"))
+        db.commit()
+        logger.info("job_promotions: Tabelle + last_boosted_at sichergestellt")
+    except Exception as e:
+        db.rollback()
+        logger.debug(f"job_promotions: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def backfill_is_filtered():
+    """
+    Fordert den Backfill "is_filtered" an (app.services.backfills): setzt is_filtered für
+    bestehende Bewerbungen bei Firmen mit Auto-Reject und berechnet fehlende Scores –
+    in ID-Blöcken mit Checkpoint statt in einem Durchlauf.
+    """
+    db = SessionLocal()
+    try:
+        request_backfill(db, "is_filtered")
+    finally:
+        db.close()
+
+
+# Reihenfolge wie bisher beim Import von app.main – nur anhängen (Version = Position)
+PYTHON_STEPS = [
+    ensure_slug_column,
+    ensure_google_id_column,
+    ensure_new_application_columns,
+    ensure_external_job_columns,
+    ensure_applicant_invite_columns,
+    ensure_published_at_column,
+    ensure_telegram_posted_at_column,
+    ensure_external_click_count_column,
+    ensure_notification_key_columns,
+    fix_active_draft_jobs,
+    ensure_blog_language_column,
+    seed_ijp_templates_on_startup,
+    ensure_crm_columns,
+    ensure_job_request_public_status_column,
+    ensure_job_request_status_enum_values,
+    ensure_job_request_assigned_betrieb_column,
+    ensure_partner_links_table,
+    ensure_company_premium_column,
+    ensure_company_stripe_columns,
+    ensure_premium_cancellations_table,
+    ensure_facebook_job_posts_table,
+    ensure_facebook_schema,
+    ensure_telegram_schema,
+    ensure_job_promotions_table,
+    backfill_is_filtered,
+]
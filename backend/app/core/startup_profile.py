@@ -0,0 +1,138 @@
+"""
+Startup-Profil: Import-Zeit und RSS-Zuwachs pro Modul
+
+profile_import("app.main") importiert ein Modul mit einem Meta-Path-Hook und misst
+für jedes dabei erstmals ausgeführte Modul die Wanduhr-Zeit und den Zuwachs des
+Resident Set Size – inklusive (mit allem, was dieser Import nachlädt) und eigen (ohne
+die verschachtelten Imports). Grundlage von `python startup_profile.py`; sinnvoll nur
+in einem frischen Prozess, da bereits geladene Module nicht mehr auftauchen.
+"""
+import importlib
+import importlib.abc
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    parent: Optional[str]
+    total_ms: float = 0.0
+    self_ms: float = 0.0
+    rss_kb: int = 0       # inklusive
+    self_rss_kb: int = 0
+    children: List[str] = field(default_factory=list)
+
+
+def current_rss_kb() -> int:
+    """Aktueller Resident Set Size in KB (Linux: /proc, sonst Spitzenwert aus getrusage)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class _ProfilingLoader:
+    """Delegiert an den echten Loader und misst exec_module (alle anderen Attribute
+    wie get_data / get_resource_reader werden durchgereicht)."""
+
+    def __init__(self, loader, profiler: "_Profiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler.measure(module.__spec__.name, self._loader.exec_module, module)
+
+
+class _Profiler(importlib.abc.MetaPathFinder):
+    """Meta-Path-Finder: fragt die übrigen Finder und hängt den messenden Loader ein –
+    erfasst damit jeden Modul-Import (import, from-Listen, importlib.import_module)."""
+
+    def __init__(self):
+        self.records: Dict[str, ImportRecord] = {}
+        self._stack: List[ImportRecord] = []
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _ProfilingLoader(spec.loader, self)
+                return spec
+        return None
+
+    def measure(self, name: str, func, *args):
+        record = ImportRecord(name=name, parent=self._stack[-1].name if self._stack else None)
+        self.records[name] = record
+        if self._stack:
+            self._stack[-1].children.append(name)
+        self._stack.append(record)
+        rss_before = current_rss_kb()
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            record.total_ms = (time.perf_counter() - started) * 1000
+            record.rss_kb = current_rss_kb() - rss_before
+            self._stack.pop()
+
+
+def profile_import(module: str) -> Dict[str, object]:
+    """Importiert module und misst alle dabei erstmals geladenen Module.
+
+    Returns: {"module", "total_ms", "rss_before_kb", "rss_after_kb", "records": {name: ImportRecord}}
+    """
+    profiler = _Profiler()
+    rss_before = current_rss_kb()
+    started = time.perf_counter()
+    sys.meta_path.insert(0, profiler)
+    try:
+        importlib.import_module(module)
+    finally:
+        sys.meta_path.remove(profiler)
+    total_ms = (time.perf_counter() - started) * 1000
+
+    records = profiler.records
+    for record in records.values():
+        children = [records[c] for c in record.children]
+        record.self_ms = max(record.total_ms - sum(c.total_ms for c in children), 0.0)
+        record.self_rss_kb = record.rss_kb - sum(c.rss_kb for c in children)
+
+    return {"module": module, "total_ms": total_ms, "rss_before_kb": rss_before,
+            "rss_after_kb": current_rss_kb(), "records": records}
+
+
+def _importer(records: Dict[str, ImportRecord], record: ImportRecord) -> Optional[str]:
+    """Nächstes app.*-Modul in der Import-Kette (wer das Paket lädt)."""
+    parent = record.parent
+    while parent and not parent.startswith("app."):
+        parent = records[parent].parent
+    return parent
+
+
+def by_package(records: Dict[str, ImportRecord]) -> List[dict]:
+    """Eigene Zeit/RSS summiert je Top-Level-Paket (app.* je Modul), teuerste zuerst.
+    "via": das app-Modul, dessen Import das Paket als erstes geladen hat."""
+    totals: Dict[str, dict] = {}
+    for record in records.values():
+        key = record.name if record.name.startswith("app.") else record.name.split(".")[0]
+        entry = totals.setdefault(key, {"name": key, "ms": 0.0, "rss_kb": 0, "modules": 0,
+                                        "via": _importer(records, record)})
+        entry["ms"] += record.self_ms
+        entry["rss_kb"] += record.self_rss_kb
+        entry["modules"] += 1
+    return sorted(totals.values(), key=lambda e: -e["ms"])
@@ -19,6 +19,13 @@ from app.models.notification import Notification
 from app.models.applicant_invite import ApplicantInviteToken
 from app.models.job_promotion import JobPromotion
 from app.models.telegram_subscriber import TelegramSubscriber
+from app.models.parsed_cv import ParsedCV
+from app.models.match_score import MatchScore
+from app.models.email_outbox import EmailOutbox
+from app.models.task_queue import QueuedTask
+from app.models.scheduled_job import ScheduledJob
+from app.models.schema_migration import SchemaMigration
+from app.models.backfill_run import BackfillRun
 
 __all__ = [
     "User", "Applicant", "Company", "CompanyMember", "CompanyRole", "JobPosting",
@@ -26,5 +33,6 @@ __all__ = [
     "Interview", "InterviewStatus", "GlobalSettings", "CompanyRequest",
     "CompanyRequestType", "CompanyRequestStatus", "JobTemplate", "InviteToken",
     "JobInteraction", "InteractionType", "ReportReason", "Notification",
-    "ApplicantInviteToken", "JobPromotion", "TelegramSubscriber"
+    "ApplicantInviteToken", "JobPromotion", "TelegramSubscriber", "ParsedCV", "MatchScore",
+    "EmailOutbox", "QueuedTask", "ScheduledJob", "SchemaMigration", "BackfillRun"
 ]
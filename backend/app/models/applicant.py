@@ -143,6 +143,15 @@ class Applicant(Base):
     # "jobon" = normales öffentliches Portal, "ijp" = abgeschottetes IJP-Studenten-Unterportal.
     # IJP-Bewerber werden JobOn-weit (Admin-Listen, Job-Alerts, Firmen-Sicht) ausgeschlossen.
     portal = Column(String(20), default="jobon", server_default="jobon", nullable=False)
+
+    # ========== MATCHING ==========
+    # Normalisierte, um Synonyme erweiterte Keywords für den Text-Match
+    # (wird beim Speichern automatisch gesetzt, siehe services/keyword_index.py)
+    text_tokens = Column(JSON, nullable=True)
+    # SQL-Vorfilter (beim Speichern gesetzt, siehe services/match_filters.py)
+    position_mask = Column(Integer, nullable=True, index=True)  # Bits aller passenden Stellenarten
+    german_level_ord = Column(Integer, nullable=True, index=True)  # Deutschniveau als Zahl
+    english_level_ord = Column(Integer, nullable=True, index=True)  # Englischniveau als Zahl
     
     # Relationships
     user = relationship("User", back_populates="applicant", foreign_keys=[user_id])
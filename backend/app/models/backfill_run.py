@@ -0,0 +1,33 @@
+"""
+Backfills: Zustand der benannten Daten-Nachträge (is_filtered, Slugs, published_at,
+telegram_posted_at), ein Eintrag pro Backfill.
+
+Ein Lauf arbeitet den Primärschlüssel-Bereich 1..max_id (beim Anfordern festgehalten)
+in Blöcken von batch_size IDs ab; Daten und Checkpoint (last_id) werden pro Block
+gemeinsam committet. Abgebrochene oder fehlgeschlagene Läufe setzen daher nach
+last_id fort. Ausgeführt von app.services.backfill_service (Scheduler-Job oder CLI).
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from app.core.database import Base, utc_now
+
+
+class BackfillRun(Base):
+    __tablename__ = "backfill_runs"
+
+    name = Column(String(100), primary_key=True)
+
+    # pending (angefordert / pausiert) -> running -> done | failed (setzt bei last_id fort)
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")
+    last_id = Column(Integer, nullable=False, default=0, server_default="0")  # Checkpoint: bis hier erledigt
+    max_id = Column(Integer, nullable=True)  # Obergrenze des Laufs (höchste ID beim Anfordern)
+    batch_size = Column(Integer, nullable=False, default=500, server_default="500")
+
+    batches = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_count = Column(Integer, nullable=False, default=0, server_default="0")  # geänderte Zeilen
+
+    owner = Column(String(100), nullable=True)  # "<host>:<pid>" des ausführenden Prozesses
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # nach jedem Block
+    requested_at = Column(DateTime(timezone=True), default=utc_now)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(String(500), nullable=True)
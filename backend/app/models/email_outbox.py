@@ -0,0 +1,40 @@
+"""
+E-Mail-Outbox: fertig gerenderte E-Mails, die auf den Versand warten.
+
+EmailService.send_email legt Nachrichten hier mit einem INSERT ab, statt SendGrid
+synchron im Request aufzurufen. Der Delivery-Worker (app.services.email_outbox_service)
+arbeitet die Tabelle mit begrenzter Parallelität ab, wiederholt Fehlschläge mit
+Backoff und hält das Ergebnis fest.
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from app.core.database import Base, utc_now
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(500), nullable=False)
+    html_content = Column(Text, nullable=False)
+    text_content = Column(Text, nullable=True)
+    email_type = Column(String(50), nullable=False, default="other")
+    from_email = Column(String(255), nullable=True)  # None = Standard-Absender
+    from_name = Column(String(255), nullable=True)
+    attachments = Column(JSON, nullable=True)  # [{filename, content (base64), type}]
+    # Sammelversand (EmailService.send_bulk): subject/html_content sind dann Vorlagen,
+    # {"recipients": [{to_email, substitutions}], "sections": {...}} – to_email = erster Empfänger
+    bulk_payload = Column(JSON, nullable=True)
+
+    # pending -> sending -> sent | failed (pending nach Fehlschlag mit Backoff)
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), default=utc_now)
+    locked_at = Column(DateTime(timezone=True), nullable=True)  # Beginn des laufenden Versuchs
+    last_error = Column(String(500), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utc_now)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
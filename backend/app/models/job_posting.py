@@ -190,6 +190,14 @@ class JobPosting(Base):
 
     # KI-Teaser für Telegram (1 knackiger Satz je Sprache): {"de": "...", "en": "...", ...}
     telegram_teaser = Column(JSON, default={})
+
+    # Normalisierte, um Synonyme erweiterte Keywords für den Text-Match
+    # (wird beim Speichern automatisch gesetzt, siehe services/keyword_index.py)
+    text_tokens = Column(JSON, nullable=True)
+    # SQL-Vorfilter (beim Speichern gesetzt, siehe services/match_filters.py)
+    position_mask = Column(Integer, nullable=True, index=True)  # Bit der Stellenart
+    german_required_ord = Column(Integer, nullable=True)  # gefordertes Deutschniveau als Zahl (0 = nicht gefordert)
+    english_required_ord = Column(Integer, nullable=True)  # gefordertes Englischniveau als Zahl
     
     # Relationships
     company = relationship("Company", back_populates="job_postings")
@@ -0,0 +1,28 @@
+"""
+Materialisierte Matching-Scores (Bewerber × Stelle).
+
+Eine Zeile pro Paar mit dem total_score aus matching_service und der
+Scorer-Version, mit der er berechnet wurde. Lesepfade (Digest, Admin-Matching)
+holen die Scores per indizierter Query statt sie live zu berechnen.
+Gepflegt von app.services.match_score_service.
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UniqueConstraint, Index
+from app.core.database import Base, utc_now
+
+
+class MatchScore(Base):
+    __tablename__ = "match_scores"
+
+    id = Column(Integer, primary_key=True, index=True)
+    applicant_id = Column(Integer, ForeignKey("applicants.id", ondelete="CASCADE"), nullable=False)
+    job_id = Column(Integer, ForeignKey("job_postings.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Integer, nullable=False)
+    # z.B. "1:cv" – SCORER_VERSION + ob der CV mit einfließt (matching_always_analyze_cv)
+    scorer_version = Column(String(20), nullable=False)
+    computed_at = Column(DateTime(timezone=True), default=utc_now)
+
+    __table_args__ = (
+        UniqueConstraint('applicant_id', 'job_id', name='uq_match_scores_applicant_job'),
+        Index('ix_match_scores_job_score', 'job_id', 'score'),
+        Index('ix_match_scores_applicant_score', 'applicant_id', 'score'),
+    )
@@ -1,7 +1,7 @@
 """
 Notification Model - Benachrichtigungen für Bewerber über neue passende Stellen
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -38,3 +38,8 @@ class Notification(Base):
 
     # Relationships
     user = relationship("User", backref="notifications")
+
+    __table_args__ = (
+        # notify_new_job: schon benachrichtigte Nutzer je Stelle
+        Index('ix_notifications_reference', 'reference_id', 'type'),
+    )
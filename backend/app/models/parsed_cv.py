@@ -0,0 +1,22 @@
+"""
+Parsed-CV-Cache: strukturierte Daten eines hochgeladenen Lebenslaufs.
+
+Wird beim Upload befüllt (documents.upload_document) und über den Content-Hash
+an die Datei gebunden. Das Matching liest nur noch diese Tabelle und muss den
+Lebenslauf weder aus R2 laden noch erneut parsen. Beim Ersetzen/Löschen des
+Dokuments wird der Eintrag mitgelöscht (DocumentService.delete_file).
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from app.core.database import Base, utc_now
+
+
+class ParsedCV(Base):
+    __tablename__ = "parsed_cvs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    applicant_id = Column(Integer, ForeignKey("applicants.id", ondelete="CASCADE"), nullable=False, index=True)
+    content_hash = Column(String(64), nullable=False)  # SHA-256 der PDF-Bytes
+    # Ergebnis von parse_cv_regex; None = Datei enthielt keinen lesbaren Text
+    data = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utc_now)
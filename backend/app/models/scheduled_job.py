@@ -0,0 +1,33 @@
+"""
+Scheduler-Zustand: ein Eintrag pro periodischem Hintergrund-Job (Cleanup, Digests,
+Reports, Blog-Writer, Telegram).
+
+Nur der Scheduler-Leader (app.services.scheduler_service) führt Jobs aus. Ein Lauf wird
+beansprucht, indem last_scheduled_for per bedingtem UPDATE auf den fälligen Slot
+vorgerückt wird – jeder Slot läuft damit genau einmal, auch über Neustarts und
+mehrere Prozesse hinweg. Zeiten naiv in UTC (wie datetime.utcnow der Jobs).
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from app.core.database import Base
+
+
+class ScheduledJob(Base):
+    __tablename__ = "scheduled_jobs"
+
+    name = Column(String(100), primary_key=True)
+    # Zuletzt beanspruchter Slot; der nächste Slot wird daraus berechnet (Catch-up)
+    last_scheduled_for = Column(DateTime, nullable=False)
+    next_run_at = Column(DateTime, nullable=True)  # nur zur Anzeige, None = deaktiviert
+
+    # idle -> running -> done | failed | interrupted (Prozess während des Laufs beendet)
+    status = Column(String(20), nullable=False, default="idle", server_default="idle")
+    owner = Column(String(100), nullable=True)  # "<host>:<pid>" des ausführenden Prozesses
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    last_duration_ms = Column(Integer, nullable=True)  # Gesamtdauer (Wanduhr)
+    last_wait_ms = Column(Integer, nullable=True)      # Wartezeit im Job-Pool
+    last_cpu_ms = Column(Integer, nullable=True)       # CPU-Zeit des Handlers (nur Sync-Jobs)
+    last_error = Column(String(500), nullable=True)
+    last_result = Column(JSON, nullable=True)
+    run_count = Column(Integer, nullable=False, default=0, server_default="0")
+    skipped_count = Column(Integer, nullable=False, default=0, server_default="0")
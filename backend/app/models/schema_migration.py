@@ -0,0 +1,19 @@
+"""
+Schema-Version: ein Eintrag pro angewendeter Migration (app.core.migrations).
+
+Die API liest beim Start nur max(version) und vergleicht mit der Code-Version;
+angewendet wird per `python migrate.py`.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from app.core.database import Base, utc_now
+
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(200), nullable=False)
+    checksum = Column(String(64), nullable=True)  # SHA-256 der SQL-Datei (Python-Schritte: None)
+    skipped = Column(Boolean, nullable=False, default=False, server_default="false")  # nicht ausgeführt: SQL auf SQLite, manuell, Baseline-Stamp
+    duration_ms = Column(Integer, nullable=True)
+    applied_at = Column(DateTime(timezone=True), default=utc_now)
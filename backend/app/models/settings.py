@@ -85,6 +85,16 @@ DEFAULT_SETTINGS = {
         "value": "true",
         "value_type": "boolean",
         "description": "CV immer analysieren (nicht nur als Fallback wenn Profil leer ist)"
+    },
+    "matching_parallel_enabled": {
+        "value": "true",
+        "value_type": "boolean",
+        "description": "Bulk-Matching (Digest, Backfill, Score-Tabelle) auf mehrere CPU-Kerne verteilen (aus = ein Prozess)"
+    },
+    "matching_parallel_workers": {
+        "value": "0",
+        "value_type": "integer",
+        "description": "Anzahl Prozesse für paralleles Matching (0 = Anzahl CPU-Kerne)"
     }
 }
 
@@ -0,0 +1,37 @@
+"""
+Task-Queue: persistente Hintergrund-Aufgaben (Veröffentlichungs-Nebenwirkungen).
+
+Routen legen typisierte Tasks (notify_new_job, index_job, translate_job, boost_job)
+mit einem INSERT ab und antworten sofort. Der Worker (app.services.task_queue_service)
+arbeitet sie mit begrenzter Parallelität ab, wiederholt Fehlschläge mit Backoff und
+hält Ergebnis bzw. Fehler fest – der Fortschritt ist über /admin/tasks abrufbar.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from app.core.database import Base, utc_now
+
+
+class QueuedTask(Base):
+    __tablename__ = "task_queue"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_type = Column(String(50), nullable=False, index=True)
+    payload = Column(JSON, nullable=True)
+    # Gleicher Schlüssel = derselbe Task (z.B. "notify_new_job:123"), Doppel-Klicks
+    # und wiederholte Freigaben erzeugen keine zweite Ausführung (replace_finished:
+    # ein abgeschlossener Task wird beim nächsten Anlegen neu angesetzt)
+    idempotency_key = Column(String(255), nullable=True, unique=True)
+    created_by_user_id = Column(Integer, nullable=True)
+
+    # pending -> running -> done | failed (pending nach Fehlschlag mit Backoff)
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), default=utc_now)
+    locked_at = Column(DateTime(timezone=True), nullable=True)  # Heartbeat des laufenden Versuchs
+    last_error = Column(String(500), nullable=True)
+    result = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utc_now)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_task_queue_status_next_attempt', 'status', 'next_attempt_at'),
+    )
@@ -3,17 +3,19 @@ Anabin University Verification Service
 
 Durchsucht eine lokale Kopie der anabin-Datenbank (Usbekistan & Kirgisistan)
 mit Fuzzy-Matching für Universitätsnamen.
+
+Die JSON-Datenbank und rapidfuzz werden erst bei der ersten Suche bzw. Abfrage
+geladen, nicht beim Import.
 """
 import json
 import logging
 import os
 import re
+import threading
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
 
-from rapidfuzz import fuzz, process
-
 logger = logging.getLogger(__name__)
 
 # Pfad zur lokalen Datenbank
@@ -47,23 +49,41 @@ class AnabinService:
     """Service für lokale Anabin-Datenbankabfragen"""
     
     def __init__(self):
-        self.universities = []
-        self.loaded = False
-        self._load_database()
-    
+        self._universities = None  # None = noch nicht geladen
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._universities is None:
+            with self._load_lock:
+                if self._universities is None:
+                    self._load_database()
+
+    @property
+    def universities(self) -> List[Dict[str, Any]]:
+        self._ensure_loaded()
+        return self._universities
+
+    @property
+    def loaded(self) -> bool:
+        self._ensure_loaded()
+        return self._loaded
+
     def _load_database(self):
-        """Lädt die lokale Datenbank"""
+        """Lädt die lokale Datenbank (auch zum Neuladen nach Scrape/Bearbeitung)"""
+        universities = self._universities if self._universities is not None else []
         try:
             if os.path.exists(ANABIN_DB_FILE):
                 with open(ANABIN_DB_FILE, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    self.universities = data.get('universities', [])
-                    self.loaded = True
-                    logger.info(f"Anabin-Datenbank geladen: {len(self.universities)} Universitäten")
+                    universities = data.get('universities', [])
+                    self._loaded = True
+                    logger.info(f"Anabin-Datenbank geladen: {len(universities)} Universitäten")
             else:
                 logger.warning(f"Anabin-Datenbank nicht gefunden: {ANABIN_DB_FILE}")
         except Exception as e:
             logger.error(f"Fehler beim Laden der Anabin-Datenbank: {e}")
+        self._universities = universities
     
     def normalize_text(self, text: str) -> str:
         """Normalisiert Text für besseres Matching"""
@@ -146,6 +166,8 @@ class AnabinService:
         if not self.loaded or not self.universities:
             logger.warning("Anabin-Datenbank nicht geladen")
             return []
+
+        from rapidfuzz import fuzz
         
         if not query:
             return []
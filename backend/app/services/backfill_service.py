@@ -0,0 +1,260 @@
+"""
+Backfill-Service: benannte, fortsetzbare Daten-Nachträge
+
+- @backfill(name, model):  registriert einen Backfill; der Handler bekommt (db, lo, hi)
+                           und ändert die Zeilen mit lo <= id <= hi (Rückgabe: Anzahl)
+- request_backfill:        fordert einen Lauf an (status -> pending, max_id = höchste ID)
+- run_backfill:            arbeitet einen Lauf ab – ID-Block für ID-Block, Daten und
+                           Checkpoint (last_id) in EINEM Commit pro Block
+- run_pending_backfills:   Scheduler-Job "backfills": angeforderte Läufe mit Zeitbudget
+- serialize_backfill:      Status für /admin/backfills und backfill.py
+
+Definitionen stehen in app.services.backfills. Ein Lauf wird per bedingtem UPDATE
+beansprucht (nie zweimal parallel); stehen gebliebene Läufe abgestürzter Prozesse
+werden nach STALE_RUNNING_MINUTES übernommen und setzen bei last_id fort.
+"""
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, utc_now
+from app.models.backfill_run import BackfillRun
+
+logger = logging.getLogger(__name__)
+
+# IDs pro Block (ein Commit pro Block)
+DEFAULT_BATCH_SIZE = 500
+
+# Zeitbudget des Scheduler-Jobs pro Durchlauf; danach pausiert der Lauf (pending)
+TICK_SECONDS = 50
+
+# Heartbeat nach jedem Block; "running" ohne Heartbeat gilt danach als abgebrochen
+STALE_RUNNING_MINUTES = 10
+
+
+@dataclass
+class BackfillDefinition:
+    name: str
+    model: type
+    handler: Callable[[Session, int, int], int]
+    description: str = ""
+    batch_size: int = DEFAULT_BATCH_SIZE
+
+
+BACKFILLS: Dict[str, BackfillDefinition] = {}
+
+
+def backfill(name: str, model: type, description: str = "", batch_size: int = DEFAULT_BATCH_SIZE):
+    """Registriert einen Backfill über die Primärschlüssel von model."""
+    def decorator(func):
+        BACKFILLS[name] = BackfillDefinition(name, model, func, description or " ".join((func.__doc__ or "").split()),
+                                             batch_size)
+        return func
+    return decorator
+
+
+def _load_definitions() -> None:
+    from app.services import backfills  # noqa: F401 – registriert die Definitionen
+
+
+def get_backfill(name: str) -> BackfillDefinition:
+    """Raises: KeyError für unbekannte Namen"""
+    _load_definitions()
+    return BACKFILLS[name]
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+def _max_id(db: Session, definition: BackfillDefinition) -> int:
+    return db.query(func.max(definition.model.id)).scalar() or 0
+
+
+def request_backfill(db: Session, name: str, batch_size: Optional[int] = None,
+                     restart: bool = False) -> BackfillRun:
+    """Fordert einen Lauf an (committet).
+
+    Angehaltene oder fehlgeschlagene Läufe setzen bei last_id fort (max_id wächst auf
+    die aktuell höchste ID); abgeschlossene (oder restart=True) beginnen neu bei ID 1.
+    Ein laufender Lauf bleibt unverändert.
+    """
+    definition = get_backfill(name)
+    run = db.query(BackfillRun).filter(BackfillRun.name == name).first()
+    if run is None:
+        run = BackfillRun(name=name, last_id=0, batches=0, updated_count=0)
+        db.add(run)
+    elif run.status == "running":
+        return run
+
+    if run.status in (None, "done") or restart or run.max_id is None:
+        run.last_id = 0
+        run.batches = 0
+        run.updated_count = 0
+        run.started_at = None
+        run.finished_at = None
+    run.max_id = max(run.max_id or 0, _max_id(db, definition)) if run.last_id else _max_id(db, definition)
+    run.status = "pending"
+    run.batch_size = batch_size or run.batch_size or definition.batch_size
+    run.requested_at = utc_now()
+    run.last_error = None
+    try:
+        db.commit()
+    except IntegrityError:
+        # Gleichzeitig angelegt (zweiter Prozess) – dessen Eintrag gilt
+        db.rollback()
+        run = db.query(BackfillRun).filter(BackfillRun.name == name).first()
+    return run
+
+
+def _claim(db: Session, name: str, owner: str) -> bool:
+    """pending/failed bzw. stehen gebliebenes running -> running (genau ein Prozess)."""
+    now = utc_now()
+    claimed = db.query(BackfillRun).filter(
+        BackfillRun.name == name,
+        or_(
+            BackfillRun.status.in_(("pending", "failed")),
+            (BackfillRun.status == "running")
+            & (BackfillRun.heartbeat_at < now - timedelta(minutes=STALE_RUNNING_MINUTES)),
+        ),
+    ).update({"status": "running", "owner": owner, "heartbeat_at": now}, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+def run_backfill(name: str, batch_size: Optional[int] = None,
+                 max_seconds: Optional[float] = None) -> dict:
+    """Arbeitet einen angeforderten Lauf ab (eigene Session, blockierend).
+
+    max_seconds: nach Ablauf pausieren (status pending), der nächste Aufruf setzt fort
+    Returns: serialisierter Stand; "claimed": False, wenn nicht angefordert oder
+    bereits in einem anderen Prozess laufend
+    """
+    definition = get_backfill(name)
+    owner = _owner()
+    db = SessionLocal()
+    try:
+        if not _claim(db, name, owner):
+            run = db.query(BackfillRun).filter(BackfillRun.name == name).first()
+            return {**serialize_backfill(run, definition), "claimed": False}
+
+        run = db.query(BackfillRun).filter(BackfillRun.name == name).one()
+        if batch_size:
+            run.batch_size = batch_size
+        if run.started_at is None:
+            run.started_at = utc_now()
+        db.commit()
+        logger.info(f"Backfill {name}: IDs {run.last_id + 1}..{run.max_id} in Blöcken à {run.batch_size}")
+
+        started = time.monotonic()
+        while run.last_id < run.max_id:
+            if max_seconds is not None and time.monotonic() - started >= max_seconds:
+                run.status = "pending"
+                db.commit()
+                logger.info(f"Backfill {name}: pausiert bei ID {run.last_id}/{run.max_id}")
+                return {**serialize_backfill(run, definition), "claimed": True}
+
+            lo = run.last_id + 1
+            hi = min(run.last_id + run.batch_size, run.max_id)
+            try:
+                updated = definition.handler(db, lo, hi) or 0
+                # Checkpoint im selben Commit wie die Daten des Blocks
+                run.last_id = hi
+                run.batches += 1
+                run.updated_count += updated
+                run.heartbeat_at = utc_now()
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Backfill {name}: Fehler in IDs {lo}..{hi}: {e}")
+                run.status = "failed"
+                run.last_error = str(e)[:500]
+                run.heartbeat_at = utc_now()
+                db.commit()
+                return {**serialize_backfill(run, definition), "claimed": True}
+
+        run.status = "done"
+        run.finished_at = utc_now()
+        db.commit()
+        logger.info(f"Backfill {name}: fertig, {run.updated_count} Zeilen geändert")
+        return {**serialize_backfill(run, definition), "claimed": True}
+    finally:
+        db.close()
+
+
+def run_pending_backfills(max_seconds: float = TICK_SECONDS) -> List[str]:
+    """Arbeitet angeforderte (und stehen gebliebene) Läufe nacheinander ab, insgesamt
+    höchstens max_seconds. Returns: Namen der bearbeiteten Backfills"""
+    db = SessionLocal()
+    try:
+        stale = utc_now() - timedelta(minutes=STALE_RUNNING_MINUTES)
+        names = [name for (name,) in db.query(BackfillRun.name).filter(or_(
+            BackfillRun.status == "pending",
+            (BackfillRun.status == "running") & (BackfillRun.heartbeat_at < stale),
+        )).order_by(BackfillRun.requested_at).all()]
+    finally:
+        db.close()
+
+    deadline = time.monotonic() + max_seconds
+    processed = []
+    for name in names:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            get_backfill(name)
+        except KeyError:
+            logger.warning(f"Backfill {name}: keine Definition (entfernt?), übersprungen")
+            continue
+        result = run_backfill(name, max_seconds=remaining)
+        if result.get("claimed"):
+            processed.append(name)
+    return processed
+
+
+def serialize_backfill(run: Optional[BackfillRun], definition: BackfillDefinition) -> dict:
+    def iso(value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value else None
+
+    if run is None:
+        return {"name": definition.name, "description": definition.description,
+                "table": definition.model.__tablename__, "status": None}
+    progress = None
+    if run.max_id:
+        progress = round(100 * min(run.last_id, run.max_id) / run.max_id, 1)
+    elif run.status == "done":
+        progress = 100.0
+    return {
+        "name": run.name,
+        "description": definition.description,
+        "table": definition.model.__tablename__,
+        "status": run.status,
+        "last_id": run.last_id,
+        "max_id": run.max_id,
+        "progress_percent": progress,
+        "batch_size": run.batch_size,
+        "batches": run.batches,
+        "updated_count": run.updated_count,
+        "owner": run.owner,
+        "requested_at": iso(run.requested_at),
+        "started_at": iso(run.started_at),
+        "finished_at": iso(run.finished_at),
+        "heartbeat_at": iso(run.heartbeat_at),
+        "last_error": run.last_error,
+    }
+
+
+def list_backfills(db: Session) -> List[dict]:
+    """Alle registrierten Backfills mit ihrem letzten Lauf."""
+    _load_definitions()
+    runs = {run.name: run for run in db.query(BackfillRun).all()}
+    return [serialize_backfill(runs.get(name), definition)
+            for name, definition in sorted(BACKFILLS.items())]
@@ -0,0 +1,174 @@
+"""
+Backfill-Definitionen (registriert per @backfill beim Import)
+
+Jeder Handler bekommt einen ID-Block (lo..hi) und ändert nur Zeilen darin; Commit und
+Checkpoint übernimmt app.services.backfill_service. Angefordert von den Migrationen
+(app.core.schema_steps), über POST /admin/backfills/{name} oder `python backfill.py`;
+abgearbeitet vom Scheduler-Job "backfills" bzw. direkt im CLI – nie beim API-Start.
+"""
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.core.database import utc_now
+from app.models.applicant import Applicant
+from app.models.application import Application
+from app.models.company import Company
+from app.models.document import Document, DocumentType
+from app.models.job_posting import JobPosting
+from app.models.match_score import MatchScore
+from app.models.parsed_cv import ParsedCV
+from app.services.backfill_service import backfill
+
+logger = logging.getLogger(__name__)
+
+
+@backfill("is_filtered", Application, batch_size=200)
+def backfill_is_filtered(db: Session, lo: int, hi: int) -> int:
+    """is_filtered für Bewerbungen bei Firmen mit Auto-Reject (Score unter Schwellenwert);
+    fehlende Scores werden berechnet und gespeichert"""
+    from app.services.matching_service import MatchingContext, calculate_match_scores_batch
+    from app.services.settings_service import is_company_matching_enabled
+
+    if not is_company_matching_enabled(db):
+        return 0
+
+    rows = db.query(Application, Company.auto_reject_threshold).join(
+        JobPosting, Application.job_posting_id == JobPosting.id
+    ).join(
+        Company, JobPosting.company_id == Company.id
+    ).filter(
+        Application.id.between(lo, hi),
+        Company.auto_reject_enabled == True,
+        Application.is_filtered == False
+    ).all()
+    if not rows:
+        return 0
+
+    # Score fehlt → pro Stelle im Batch berechnen und persistieren
+    missing_by_job = {}
+    for app, _ in rows:
+        if app.match_score is None and app.applicant and app.job_posting:
+            missing_by_job.setdefault(app.job_posting_id, []).append(app)
+    ctx = MatchingContext.build(db) if missing_by_job else None
+    for job_apps in missing_by_job.values():
+        totals = calculate_match_scores_batch(
+            job_apps[0].job_posting, [a.applicant for a in job_apps], db=db, ctx=ctx
+        )
+        for app, total in zip(job_apps, totals):
+            if total is not None:
+                app.match_score = int(round(total))
+
+    updated = 0
+    for app, threshold in rows:
+        if app.match_score is not None and app.match_score < (threshold or 50):
+            app.is_filtered = True
+            updated += 1
+    return updated
+
+
+@backfill("job_slugs", JobPosting)
+def backfill_job_slugs(db: Session, lo: int, hi: int) -> int:
+    """SEO-Slug für Stellen ohne Slug (Titel + Ort + Unterkunft)"""
+    from app.services.slug_service import generate_job_slug
+
+    jobs = db.query(JobPosting).filter(
+        JobPosting.id.between(lo, hi),
+        (JobPosting.slug == None) | (JobPosting.slug == "")
+    ).all()
+    for job in jobs:
+        job.slug = generate_job_slug(job.title, job.location, job.accommodation_provided)
+    return len(jobs)
+
+
+@backfill("published_at", JobPosting, batch_size=2000)
+def backfill_published_at(db: Session, lo: int, hi: int) -> int:
+    """published_at = created_at für aktive Stellen ohne Veröffentlichungsdatum"""
+    return db.query(JobPosting).filter(
+        JobPosting.id.between(lo, hi),
+        JobPosting.is_active == True,
+        JobPosting.published_at == None
+    ).update({JobPosting.published_at: JobPosting.created_at}, synchronize_session=False)
+
+
+@backfill("telegram_posted_at", JobPosting, batch_size=2000)
+def backfill_telegram_posted_at(db: Session, lo: int, hi: int) -> int:
+    """Bestand als 'bereits in Telegram gepostet' markieren (kein Backlog-Spam des
+    Deferred-Posters); nur Stellen bis max_id beim Anfordern"""
+    return db.query(JobPosting).filter(
+        JobPosting.id.between(lo, hi),
+        JobPosting.telegram_posted_at == None
+    ).update({JobPosting.telegram_posted_at: utc_now()}, synchronize_session=False)
+
+
+@backfill("parsed_cvs", Document, batch_size=50)
+def backfill_parsed_cvs(db: Session, lo: int, hi: int) -> int:
+    """Lebensläufe aus der Zeit vor dem Parsed-CV-Cache aus dem Storage laden und parsen;
+    match_scores der betroffenen Bewerber werden verworfen (ohne CV berechnet)"""
+    from app.services.cv_cache_service import content_hash, parse_cv_file, read_document_bytes, upsert_parsed_cv
+
+    docs = db.query(Document).outerjoin(
+        ParsedCV, ParsedCV.document_id == Document.id
+    ).filter(
+        Document.id.between(lo, hi),
+        Document.document_type == DocumentType.CV,
+        Document.file_path != None,
+        ParsedCV.id == None
+    ).all()
+
+    parsed = 0
+    applicant_ids = set()
+    for doc in docs:
+        # Einzelne unlesbare Dateien überspringen statt den ganzen Lauf anzuhalten
+        try:
+            content = read_document_bytes(doc)
+            if not content:
+                continue
+            _, data = parse_cv_file(content)
+        except Exception as e:
+            logger.warning(f"Parsed-CV für Dokument {doc.id} übersprungen: {e}")
+            continue
+        upsert_parsed_cv(db, doc, content_hash(content), data)
+        applicant_ids.add(doc.applicant_id)
+        parsed += 1
+
+    if applicant_ids:
+        db.query(MatchScore).filter(
+            MatchScore.applicant_id.in_(applicant_ids)
+        ).delete(synchronize_session=False)
+    return parsed
+
+
+def _fill_text_tokens(db: Session, model, tokenize, lo: int, hi: int) -> int:
+    objs = db.query(model).filter(model.id.between(lo, hi), model.text_tokens == None).all()
+    for obj in objs:
+        obj.text_tokens = sorted(tokenize(obj))
+    return len(objs)
+
+
+@backfill("job_text_tokens", JobPosting)
+def backfill_job_text_tokens(db: Session, lo: int, hi: int) -> int:
+    """text_tokens (Keyword-Index) für Stellen aus der Zeit vor der Spalte"""
+    from app.services.keyword_index import job_text_tokens
+    return _fill_text_tokens(db, JobPosting, job_text_tokens, lo, hi)
+
+
+@backfill("applicant_text_tokens", Applicant)
+def backfill_applicant_text_tokens(db: Session, lo: int, hi: int) -> int:
+    """text_tokens (Keyword-Index) für Bewerber aus der Zeit vor der Spalte"""
+    from app.services.keyword_index import applicant_text_tokens
+    return _fill_text_tokens(db, Applicant, applicant_text_tokens, lo, hi)
+
+
+@backfill("applicant_match_filters", Applicant)
+def backfill_applicant_match_filters(db: Session, lo: int, hi: int) -> int:
+    """SQL-Vorfilter-Spalten (position_mask, Sprachniveau) für Bewerber aus der Zeit vor den Spalten"""
+    from app.services.match_filters import fill_filter_columns
+    return fill_filter_columns(db, Applicant, lo, hi)
+
+
+@backfill("job_match_filters", JobPosting)
+def backfill_job_match_filters(db: Session, lo: int, hi: int) -> int:
+    """SQL-Vorfilter-Spalten (position_mask, gefordertes Sprachniveau) für Stellen aus der Zeit vor den Spalten"""
+    from app.services.match_filters import fill_filter_columns
+    return fill_filter_columns(db, JobPosting, lo, hi)
@@ -2,6 +2,7 @@
 Automatische Blog-Post-Generierung mit Anthropic Claude.
 Unterstützt Deutsch (de), Englisch (en) und Spanisch (es).
 """
+import asyncio
 import os
 import re
 import random
@@ -217,7 +218,10 @@ async def generate_and_publish_blog_post(
         import anthropic
         client = anthropic.Anthropic(api_key=api_key)
 
-        message = client.messages.create(
+        # Sync-SDK im Thread: der Aufruf dauert bis zu einer Minute und würde sonst
+        # den Event-Loop (API-Requests) blockieren
+        message = await asyncio.to_thread(
+            client.messages.create,
             model="claude-haiku-4-5-20251001",
             max_tokens=4096,
             system=SYSTEM_PROMPTS[lang],
@@ -274,7 +278,6 @@ async def generate_and_publish_blog_post(
         if auto_publish:
             try:
                 from app.services.google_indexing_service import google_indexing_service
-                import asyncio
                 path = f"/blog/{post.slug}" if lang == "de" else f"/blog/{lang}/{post.slug}"
                 asyncio.create_task(google_indexing_service.request_indexing(
                     f"https://www.jobon.work{path}", "URL_UPDATED"
@@ -0,0 +1,255 @@
+"""
+Firmen-Digest-Service
+
+- send_company_applicant_digests: täglicher Bewerber-Digest an Firmen. Ausgewählt
+                                  werden nur Firmen, deren applicant_digest_days/
+                                  applicant_digest_hour auf den aktuellen Slot passen
+                                  (in SQL); ihre neuen Bewerbungen kommen mit EINER
+                                  Query inkl. gespeichertem match_score, versendet wird
+                                  als Sammelversand.
+- send_company_weekly_reports:    wöchentlicher Stellen-Report. Bewerbungen und
+                                  Merkungen aller Report-Stellen kommen aus EINER
+                                  gruppierten Aggregation (company_id, job_id); die Zeilen
+                                  werden nach Firma sortiert gestreamt und je Firma als
+                                  E-Mail versendet.
+
+Ist niemand fällig, kostet ein stündlicher Lauf genau eine (leere) Query.
+"""
+import logging
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import String, func, literal, select
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.applicant import Applicant
+from app.models.application import Application
+from app.models.company import Company
+from app.models.job_interaction import InteractionType, JobInteraction
+from app.models.job_posting import JobPosting
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Defaults wie im Company-Modell bzw. GET /companies/digest-settings
+DEFAULT_DIGEST_DAYS = "1,2,3,4,5"  # 0=So, 1=Mo, ..., 6=Sa
+DEFAULT_DIGEST_HOUR = 8            # UTC
+
+
+def _digest_day(now: datetime) -> int:
+    """Python-Wochentag (0=Mo) im Format von applicant_digest_days (0=So, 1=Mo)."""
+    return (now.weekday() + 1) % 7
+
+
+def _due_digest_companies(db: Session, now: datetime) -> List[tuple]:
+    """Firmen, deren Digest im aktuellen Slot (Wochentag + Stunde) fällig ist.
+
+    Returns: [(company_id, company_name, email)]
+    """
+    # ",1,2,3," LIKE "%,<tag>,%" – Leerzeichen aus "1, 2" entfernt, leer = Default
+    days = func.coalesce(func.nullif(Company.applicant_digest_days, ""), DEFAULT_DIGEST_DAYS)
+    days = literal(",", String) + func.replace(days, " ", "") + ","
+    return db.query(Company.id, Company.company_name, User.email).join(
+        User, Company.user_id == User.id
+    ).filter(
+        Company.applicant_digest_enabled == True,
+        Company.is_scraped == False,
+        func.coalesce(Company.applicant_digest_hour, DEFAULT_DIGEST_HOUR) == now.hour,
+        days.like(f"%,{_digest_day(now)},%"),
+        User.email.isnot(None),
+    ).all()
+
+
+def _fill_missing_scores(db: Session, application_ids: List[int]) -> Dict[int, int]:
+    """Berechnet fehlende match_scores (Altbestand) pro Stelle im Batch und speichert sie.
+
+    Returns: {application_id: score}
+    """
+    from app.services.matching_service import MatchingContext, calculate_match_scores_batch
+
+    apps = db.query(Application).options(
+        joinedload(Application.applicant), joinedload(Application.job_posting)
+    ).filter(Application.id.in_(application_ids)).all()
+
+    by_job: Dict[int, List[Application]] = {}
+    for app in apps:
+        if app.applicant and app.job_posting:
+            by_job.setdefault(app.job_posting_id, []).append(app)
+
+    ctx = MatchingContext.build(db)
+    scores = {}
+    for job_apps in by_job.values():
+        try:
+            totals = calculate_match_scores_batch(job_apps[0].job_posting, [a.applicant for a in job_apps], ctx=ctx)
+        except Exception as e:
+            logger.warning(f"Matching-Score für Digest nicht berechenbar (Stelle {job_apps[0].job_posting_id}): {e}")
+            continue
+        for app, total in zip(job_apps, totals):
+            if total is not None:
+                app.match_score = int(round(total))
+                scores[app.id] = app.match_score
+    if scores:
+        db.commit()
+    return scores
+
+
+def collect_company_applicant_digests(db: Session, now: Optional[datetime] = None) -> List[dict]:
+    """Digests aller im aktuellen Slot fälligen Firmen.
+
+    Returns: [{"to_email", "company_name", "applicants_data"}] (nur Firmen mit neuen Bewerbungen)
+    """
+    now = now or datetime.utcnow()
+    companies = _due_digest_companies(db, now)
+    if not companies:
+        return []
+
+    # Neue Bewerbungen der letzten 24h aller fälligen Firmen in EINER Query
+    rows = db.query(
+        JobPosting.company_id,
+        Application.id,
+        Application.applied_at,
+        Application.match_score,
+        Applicant.first_name,
+        Applicant.last_name,
+        JobPosting.title,
+    ).join(
+        JobPosting, Application.job_posting_id == JobPosting.id
+    ).join(
+        Applicant, Application.applicant_id == Applicant.id
+    ).filter(
+        JobPosting.company_id.in_([company_id for company_id, _, _ in companies]),
+        Application.applied_at >= now - timedelta(hours=24),
+    ).order_by(JobPosting.company_id, Application.id).all()
+    if not rows:
+        return []
+
+    missing = [row.id for row in rows if row.match_score is None]
+    filled = _fill_missing_scores(db, missing) if missing else {}
+
+    by_company: Dict[int, List[dict]] = {}
+    for row in rows:
+        score = row.match_score if row.match_score is not None else filled.get(row.id, 0)
+        by_company.setdefault(row.company_id, []).append({
+            'name': f"{row.first_name} {row.last_name}",
+            'job_title': row.title or '-',
+            'matching_score': score,
+            'applied_at': row.applied_at.strftime('%d.%m.%Y') if row.applied_at else '-',
+            'application_id': row.id,
+        })
+
+    return [
+        {"to_email": email, "company_name": company_name, "applicants_data": by_company[company_id]}
+        for company_id, company_name, email in companies
+        if company_id in by_company
+    ]
+
+
+def send_company_applicant_digests(db: Session, now: Optional[datetime] = None) -> int:
+    """Versendet die fälligen Bewerber-Digests als Sammelversand.
+
+    Returns: Anzahl Firmen, an die ein Digest ging
+    """
+    from app.services.email_service import email_service
+
+    digests = collect_company_applicant_digests(db, now)
+    if not digests:
+        return 0
+    email_service.send_company_applicant_digests(digests)
+    for d in digests:
+        logger.info(f"Bewerber-Digest an {d['company_name']} gesendet ({len(d['applicants_data'])} Bewerber)")
+    return len(digests)
+
+
+# Zeilen pro Fetch beim Streamen der Report-Daten
+WEEKLY_REPORT_FETCH = 1000
+
+
+def _report_job_filter():
+    return (
+        JobPosting.is_active == True,
+        JobPosting.is_draft == False,
+        JobPosting.is_archived == False,
+    )
+
+
+def iter_company_weekly_reports(db: Session) -> Iterator[dict]:
+    """Report-Daten aller Firmen mit aktiviertem Wochen-Report und aktiven Stellen.
+
+    Eine Query: Stellen + Firma + E-Mail, per LEFT JOIN an die nach Stelle gruppierten
+    Bewerbungs- und Merkungs-Zahlen; sortiert nach (company_id, job_id) gestreamt.
+
+    Yields: {"to_email", "company_name", "open_count", "jobs_stats"}
+    """
+    report_jobs = select(JobPosting.id).join(
+        Company, JobPosting.company_id == Company.id
+    ).where(
+        Company.weekly_report_enabled == True,
+        Company.is_scraped == False,
+        *_report_job_filter(),
+    )
+    apps = select(
+        Application.job_posting_id.label("job_id"),
+        func.count(Application.id).label("count"),
+    ).where(Application.job_posting_id.in_(report_jobs)).group_by(Application.job_posting_id).subquery()
+    likes = select(
+        JobInteraction.job_posting_id.label("job_id"),
+        func.count(JobInteraction.id).label("count"),
+    ).where(
+        JobInteraction.job_posting_id.in_(report_jobs),
+        JobInteraction.interaction_type == InteractionType.LIKE,
+    ).group_by(JobInteraction.job_posting_id).subquery()
+
+    rows = db.query(
+        Company.id.label("company_id"),
+        Company.company_name,
+        User.email,
+        JobPosting.title,
+        JobPosting.view_count,
+        func.coalesce(apps.c.count, 0).label("applications"),
+        func.coalesce(likes.c.count, 0).label("likes"),
+    ).select_from(JobPosting).join(
+        Company, JobPosting.company_id == Company.id
+    ).join(
+        User, Company.user_id == User.id
+    ).outerjoin(
+        apps, apps.c.job_id == JobPosting.id
+    ).outerjoin(
+        likes, likes.c.job_id == JobPosting.id
+    ).filter(
+        Company.weekly_report_enabled == True,
+        Company.is_scraped == False,
+        User.email.isnot(None),
+        User.email != "",
+        *_report_job_filter(),
+    ).order_by(Company.id, JobPosting.id).yield_per(WEEKLY_REPORT_FETCH)
+
+    for _, company_rows in groupby(rows, key=lambda row: row.company_id):
+        company_rows = list(company_rows)
+        first = company_rows[0]
+        yield {
+            "to_email": first.email,
+            "company_name": first.company_name,
+            "open_count": len(company_rows),
+            "jobs_stats": [{
+                "title": row.title,
+                "clicks": row.view_count or 0,
+                "applications": row.applications,
+                "likes": row.likes,
+            } for row in company_rows],
+        }
+
+
+def send_company_weekly_reports(db: Session) -> int:
+    """Versendet den Wochen-Report an alle Firmen, die ihn aktiviert haben.
+
+    Returns: Anzahl Firmen, an die ein Report ging
+    """
+    from app.services.email_service import email_service
+
+    sent = 0
+    for report in iter_company_weekly_reports(db):
+        email_service.send_company_weekly_report(**report)
+        logger.info(f"Wochen-Report an {report['company_name']} gesendet ({report['open_count']} Stellen)")
+        sent += 1
+    return sent
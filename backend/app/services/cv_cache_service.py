@@ -0,0 +1,111 @@
+"""
+Parsed-CV-Cache
+
+Hält die per Regex geparsten Lebenslauf-Daten je Dokument in der Tabelle
+parsed_cvs. Befüllt wird beim Upload; das Matching liest ausschließlich aus der
+DB. Lebensläufe, die vor Einführung des Caches hochgeladen wurden, parst der
+Backfill "parsed_cvs" (app.services.backfills) nach – bis dahin gelten sie beim
+Matching als nicht vorhanden.
+"""
+import hashlib
+import logging
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.document import Document, DocumentType
+from app.models.parsed_cv import ParsedCV
+
+logger = logging.getLogger(__name__)
+
+# Chunk-Größe für IN-Listen beim Vorladen
+_PRELOAD_CHUNK = 1000
+
+
+def content_hash(file_bytes: bytes) -> str:
+    """SHA-256 der Datei – bindet den Cache-Eintrag an genau diesen Inhalt."""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def parse_cv_file(file_bytes: bytes) -> Tuple[str, Optional[dict]]:
+    """PDF → (Text, Regex-Parse). Synchron und CPU-lastig – aus async-Handlern per
+    asyncio.to_thread aufrufen."""
+    from app.services.cv_parser_service import extract_text_from_pdf, parse_cv_regex
+
+    text = extract_text_from_pdf(file_bytes)
+    if not text:
+        return "", None
+    return text, parse_cv_regex(text)
+
+
+def read_document_bytes(doc: Document) -> Optional[bytes]:
+    """Liest die Datei synchron (boto3 bei R2, sonst lokales Filesystem)."""
+    from app.services.storage_service import storage_service
+
+    if storage_service.use_r2 and storage_service.s3_client:
+        response = storage_service.s3_client.get_object(
+            Bucket=storage_service.bucket_name,
+            Key=doc.file_path,
+        )
+        return response["Body"].read()
+    if os.path.exists(doc.file_path):
+        with open(doc.file_path, "rb") as f:
+            return f.read()
+    return None
+
+
+def upsert_parsed_cv(db: Session, document: Document, digest: str, data: Optional[dict]) -> None:
+    """Legt den Cache-Eintrag mit bereits geparsten Daten an bzw. aktualisiert ihn
+    (ohne Commit)."""
+    entry = db.query(ParsedCV).filter(ParsedCV.document_id == document.id).first()
+    if entry:
+        if entry.content_hash != digest:
+            entry.content_hash = digest
+            entry.data = data
+        return
+    db.add(ParsedCV(
+        document_id=document.id,
+        applicant_id=document.applicant_id,
+        content_hash=digest,
+        data=data,
+    ))
+
+
+def invalidate_parsed_cv(db: Session, document_id: int) -> None:
+    """Entfernt den Cache-Eintrag eines Dokuments (ohne Commit)."""
+    db.query(ParsedCV).filter(ParsedCV.document_id == document_id).delete(synchronize_session=False)
+
+
+def get_parsed_cv(applicant_id: int, db: Session) -> Optional[dict]:
+    """Geparste Daten des aktuellsten Lebenslaufs eines Bewerbers."""
+    row = db.query(ParsedCV.data).select_from(Document).outerjoin(
+        ParsedCV, ParsedCV.document_id == Document.id
+    ).filter(
+        Document.applicant_id == applicant_id,
+        Document.document_type == DocumentType.CV,
+    ).order_by(Document.uploaded_at.desc()).first()
+
+    return row.data if row else None
+
+
+def preload_parsed_cvs(applicant_ids: Iterable[int], db: Session) -> Dict[int, Optional[dict]]:
+    """Geparste Daten des jeweils aktuellsten Lebenslaufs für viele Bewerber –
+    eine Query pro Chunk statt eine pro Bewerber. Bewerber ohne Lebenslauf
+    fehlen im Ergebnis; noch nicht geparste Alt-Lebensläufe ergeben None."""
+    ids = list(dict.fromkeys(applicant_ids))
+    result: Dict[int, Optional[dict]] = {}
+    for i in range(0, len(ids), _PRELOAD_CHUNK):
+        chunk = ids[i:i + _PRELOAD_CHUNK]
+        rows = db.query(Document.applicant_id, ParsedCV.data).outerjoin(
+            ParsedCV, ParsedCV.document_id == Document.id
+        ).filter(
+            Document.applicant_id.in_(chunk),
+            Document.document_type == DocumentType.CV,
+        ).order_by(Document.applicant_id, Document.uploaded_at.desc()).all()
+
+        for applicant_id, data in rows:
+            if applicant_id in result:
+                continue  # nur der aktuellste Lebenslauf zählt
+            result[applicant_id] = data
+    return result
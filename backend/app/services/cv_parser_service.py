@@ -491,13 +491,11 @@ def parse_cv_regex(text: str) -> dict:
     return result
 
 
-async def parse_cv(pdf_bytes: bytes, openai_key: str = "", gemini_key: str = "") -> Optional[dict]:
-    """Hauptfunktion: PDF → Text → AI → bereinigte Profildaten.
-    Versucht zuerst OpenAI, dann Gemini, dann Regex-Parser."""
-    text = extract_text_from_pdf(pdf_bytes)
-    if not text:
-        return None
-
+def parse_cv_text(text: str, openai_key: str = "", gemini_key: str = "",
+                  regex_data: Optional[dict] = None) -> Optional[dict]:
+    """Bereits extrahierter CV-Text → bereinigte Profildaten (synchron, KI-Aufrufe
+    blockieren). regex_data: vorhandenes Ergebnis von parse_cv_regex(text) für den
+    Fallback, damit der Text nicht erneut geparst wird."""
     raw_data = None
 
     # 1. OpenAI (bevorzugt)
@@ -513,7 +511,14 @@ async def parse_cv(pdf_bytes: bytes, openai_key: str = "", gemini_key: str = "")
 
     # 3. Starker Regex-Fallback (kein API-Key nötig)
     logger.info("AI parsing unavailable, using regex fallback")
-    result = parse_cv_regex(text)
+    result = regex_data if regex_data is not None else parse_cv_regex(text)
     return result if result else None
 
-    return sanitize_parsed_data(raw_data)
+
+async def parse_cv(pdf_bytes: bytes, openai_key: str = "", gemini_key: str = "") -> Optional[dict]:
+    """Hauptfunktion: PDF → Text → AI → bereinigte Profildaten.
+    Versucht zuerst OpenAI, dann Gemini, dann Regex-Parser."""
+    text = extract_text_from_pdf(pdf_bytes)
+    if not text:
+        return None
+    return parse_cv_text(text, openai_key, gemini_key)
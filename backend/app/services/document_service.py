@@ -148,6 +148,11 @@ class DocumentService:
             ApplicationDocument.document_id == document.id
         ).delete(synchronize_session=False)
 
+        # Parsed-CV-Cache des Dokuments invalidieren
+        if document.document_type == DocumentType.CV:
+            from app.services.cv_cache_service import invalidate_parsed_cv
+            invalidate_parsed_cv(db, document.id)
+
         db.delete(document)
         db.commit()
 
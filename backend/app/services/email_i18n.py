@@ -174,3 +174,24 @@ def et(lang: str | None, key: str, **kwargs) -> str:
 def status_label(lang: str | None, status: str) -> str:
     """Lokalisierter Bewerbungsstatus-Name."""
     return et(lang, f"st_{status}") if EMAIL_I18N["de"].get(f"st_{status}") else status
+
+
+# Booster-Digest (Bewerber, Default Englisch) – eigene Texte je Profilsprache
+BOOST_DIGEST_TEXTS = {
+    "en": {"head": "Recommended jobs for you", "sub": "handpicked matches",
+           "hi": "Hi", "intro": "These currently featured jobs match your profile:",
+           "view": "View", "cta": "See all jobs", "jobs": "recommended jobs",
+           "foot": "You receive this email because you enabled job notifications. Unsubscribe in your profile."},
+    "de": {"head": "Empfohlene Stellen für dich", "sub": "handverlesen",
+           "hi": "Hallo", "intro": "Diese aktuell hervorgehobenen Stellen passen zu deinem Profil:",
+           "view": "Jetzt ansehen", "cta": "Alle Stellen ansehen", "jobs": "empfohlene Stellen",
+           "foot": "Du erhältst diese E-Mail, weil du Job-Benachrichtigungen aktiviert hast. Abmelden im Profil."},
+    "es": {"head": "Empleos recomendados para ti", "sub": "seleccionados a mano",
+           "hi": "Hola", "intro": "Estos empleos destacados coinciden con tu perfil:",
+           "view": "Ver ahora", "cta": "Ver todos los empleos", "jobs": "empleos recomendados",
+           "foot": "Recibes este correo porque activaste las notificaciones de empleo. Puedes darte de baja en tu perfil."},
+    "ru": {"head": "Рекомендованные вакансии для вас", "sub": "подобрано вручную",
+           "hi": "Здравствуйте", "intro": "Эти актуальные вакансии подходят вашему профилю:",
+           "view": "Смотреть", "cta": "Все вакансии", "jobs": "рекомендованных вакансий",
+           "foot": "Вы получили это письмо, потому что включили уведомления о вакансиях. Отписаться можно в профиле."},
+}
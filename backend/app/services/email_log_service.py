@@ -0,0 +1,124 @@
+"""
+E-Mail-Log-Service: gepuffertes Schreiben der email_logs
+
+log_email (und die Kaltakquise-/Vertriebs-Routen) legen Einträge nur im Speicher ab.
+Geschrieben wird mit EINEM Multi-Row-INSERT pro Batch:
+- sobald EMAIL_LOG_BATCH Einträge beisammen sind,
+- spätestens nach EMAIL_LOG_FLUSH_SECONDS (Background-Task email_log_flusher in main.py),
+- beim Shutdown (lifespan) bzw. Prozessende (atexit).
+
+Ein Massenversand belegt so nicht mehr eine DB-Session + Commit pro E-Mail.
+"""
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import insert
+
+from app.models.email_log import EmailLog
+
+logger = logging.getLogger(__name__)
+
+# Einträge pro INSERT bzw. maximale Verweildauer im Puffer
+EMAIL_LOG_BATCH = 200
+EMAIL_LOG_FLUSH_SECONDS = 5.0
+
+
+class EmailLogBuffer:
+    """Thread-sicherer Puffer für EmailLog-Zeilen (Outbox-Worker, Threadpools, Requests)."""
+
+    def __init__(self, batch_size: int = EMAIL_LOG_BATCH, max_age: float = EMAIL_LOG_FLUSH_SECONDS):
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self._rows: List[dict] = []
+        # Gerade im INSERT (bis zum Commit für andere Sessions unsichtbar), siehe pending
+        self._in_flight: List[dict] = []
+        self._first_at: Optional[float] = None
+        self._lock = threading.Lock()
+        # Serialisiert die INSERTs, damit die Reihenfolge der Batches erhalten bleibt
+        self._flush_lock = threading.Lock()
+
+    def add(
+        self,
+        email_type: str,
+        recipient: str,
+        subject: Optional[str],
+        success: bool = True,
+        sent_by_user_id: Optional[int] = None,
+        sender_email: Optional[str] = None,
+    ) -> None:
+        row = {
+            "email_type": email_type.lower() if email_type else "other",
+            "recipient_email": recipient,
+            "subject": subject[:500] if subject else None,
+            "success": 1 if success else 0,
+            "sent_by_user_id": sent_by_user_id,
+            "sender_email": sender_email,
+            # Zeitpunkt des Versands, nicht des Flushs
+            "created_at": datetime.now(timezone.utc),
+        }
+        with self._lock:
+            self._rows.append(row)
+            if self._first_at is None:
+                self._first_at = time.monotonic()
+            due = len(self._rows) >= self.batch_size
+        if due:
+            self.flush()
+
+    def flush_if_due(self) -> int:
+        """Schreibt den Puffer, wenn der älteste Eintrag max_age erreicht hat."""
+        with self._lock:
+            due = self._first_at is not None and time.monotonic() - self._first_at >= self.max_age
+        return self.flush() if due else 0
+
+    def flush(self) -> int:
+        """Schreibt alle gepufferten Einträge mit einem INSERT; Returns: Anzahl Zeilen."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+                self._in_flight = rows
+                self._first_at = None
+            if not rows:
+                return 0
+
+            from app.core.database import SessionLocal
+
+            db = SessionLocal()
+            try:
+                db.execute(insert(EmailLog), rows)
+                db.commit()
+                return len(rows)
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"{len(rows)} E-Mail-Log(s) konnten nicht gespeichert werden: {e}")
+                return 0
+            finally:
+                db.close()
+                with self._lock:
+                    self._in_flight = []
+
+    def pending(self, email_type: Optional[str] = None) -> List[dict]:
+        """Noch nicht in email_logs sichtbare Einträge dieses Prozesses (Kopien, älteste
+        zuerst) – für Abfragen, die frisch geloggte Versände mitzählen müssen."""
+        with self._lock:
+            rows = self._in_flight + self._rows
+        return [dict(r) for r in rows if email_type is None or r["email_type"] == email_type]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+
+email_log_buffer = EmailLogBuffer()
+
+
+def flush_email_logs() -> int:
+    """Schreibt alle gepufferten E-Mail-Logs sofort (Shutdown, Tests, Skripte)."""
+    return email_log_buffer.flush()
+
+
+# Skripte/CLI ohne lifespan verlieren beim Beenden keine Einträge
+atexit.register(flush_email_logs)
@@ -0,0 +1,207 @@
+"""
+E-Mail-Outbox-Service
+
+- enqueue_email:   legt eine fertig gerenderte E-Mail (oder einen Sammelversand mit
+                   bulk_payload) mit EINEM Insert in email_outbox ab
+- deliver_pending: Delivery-Worker – holt fällige Nachrichten, versendet sie mit
+                   begrenzter Parallelität über EmailService.deliver_email und hält das
+                   Ergebnis fest (sent / Retry mit exponentiellem Backoff / failed).
+                   Ins E-Mail-Log kommt nur das Endergebnis (Erfolg oder "failed").
+
+Der Request-Pfad wartet so nie auf SendGrid; ein SendGrid-Ausfall staut nur die
+Outbox, Registrierungen usw. laufen weiter. Mehrere App-Prozesse können parallel
+abarbeiten: Nachrichten werden per SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL)
+beansprucht und auf "sending" gesetzt.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.database import utc_now
+from app.models.email_outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# Nachrichten pro Worker-Durchlauf und gleichzeitige SendGrid-Requests
+DELIVERY_BATCH = 50
+DELIVERY_CONCURRENCY = 4
+
+# Retry: 30s, 1min, 2min, ... höchstens 1h; nach MAX_ATTEMPTS endgültig "failed"
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+# "sending"-Einträge, deren Worker abgestürzt ist, nach dieser Zeit erneut freigeben
+STALE_SENDING_MINUTES = 15
+
+
+def enqueue_email(
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None,
+    email_type: str = "other",
+    from_email: Optional[str] = None,
+    from_name: Optional[str] = None,
+    attachments: Optional[List[dict]] = None,
+    bulk_payload: Optional[dict] = None,
+) -> bool:
+    """Legt eine E-Mail in der Outbox ab (eigene DB-Session).
+
+    bulk_payload: Sammelversand (siehe EmailService.send_bulk) – subject und
+    html_content sind dann Vorlagen mit Platzhaltern.
+
+    Returns: True bei Erfolg, False wenn die Outbox nicht beschreibbar ist
+    (der Aufrufer versendet dann direkt).
+    """
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.add(EmailOutbox(
+            to_email=to_email,
+            subject=subject[:500] if subject else "",
+            html_content=html_content,
+            text_content=text_content,
+            email_type=(email_type or "other").lower(),
+            from_email=from_email,
+            from_name=from_name,
+            attachments=attachments or None,
+            bulk_payload=bulk_payload,
+        ))
+        db.commit()
+        return True
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"E-Mail konnte nicht in die Outbox gelegt werden ({to_email}): {e}")
+        return False
+    finally:
+        db.close()
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS))
+
+
+def _is_permanent(error: Exception) -> bool:
+    """4xx von SendGrid (außer 429 Rate-Limit) wird durch Wiederholen nicht besser."""
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+
+def _claim(db: Session, limit: int) -> List[dict]:
+    """Beansprucht fällige Nachrichten (status -> sending) und gibt ihre Daten zurück."""
+    now = utc_now()
+    # Von abgestürzten Workern liegen gebliebene Einträge wieder freigeben
+    db.query(EmailOutbox).filter(
+        EmailOutbox.status == "sending",
+        EmailOutbox.locked_at < now - timedelta(minutes=STALE_SENDING_MINUTES),
+    ).update({"status": "pending"}, synchronize_session=False)
+
+    rows = db.query(EmailOutbox).filter(
+        EmailOutbox.status == "pending",
+        EmailOutbox.next_attempt_at <= now,
+    ).order_by(EmailOutbox.id).limit(limit).with_for_update(skip_locked=True).all()
+    claimed = []
+    for row in rows:
+        row.status = "sending"
+        row.locked_at = now
+        claimed.append({
+            "id": row.id,
+            "attempts": row.attempts,
+            "message": {
+                "to_email": row.to_email,
+                "subject": row.subject,
+                "html_content": row.html_content,
+                "text_content": row.text_content,
+                "email_type": row.email_type,
+                "from_email": row.from_email,
+                "from_name": row.from_name,
+                "attachments": row.attachments,
+                "bulk_payload": row.bulk_payload,
+            },
+        })
+    db.commit()
+    return claimed
+
+
+def _deliver(message: dict) -> Optional[Exception]:
+    """Ein Versandversuch; None bei Erfolg, sonst der Fehler."""
+    from app.services.email_service import email_service
+
+    message = dict(message)
+    bulk = message.pop("bulk_payload", None)
+    try:
+        if bulk:
+            message.pop("to_email")
+            message.pop("attachments")
+            ok = email_service.deliver_bulk(
+                recipients=bulk["recipients"], sections=bulk.get("sections"),
+                sent_by_user_id=bulk.get("sent_by_user_id"), **message)
+        else:
+            ok = email_service.deliver_email(**message)
+        if ok:
+            return None
+        return RuntimeError("SendGrid hat die Nachricht nicht angenommen")
+    except Exception as e:
+        return e
+
+
+def _log_failure(message: dict) -> None:
+    """E-Mail-Log erst für den endgültigen Fehlschlag, nicht je Versuch."""
+    from app.services.email_service import log_failed_delivery
+
+    try:
+        log_failed_delivery(message["to_email"], message["subject"], message["email_type"],
+                            bulk_payload=message.get("bulk_payload"))
+    except Exception as e:
+        logger.warning(f"E-Mail-Log fehlgeschlagen: {e}")
+
+
+def deliver_pending(db: Session, limit: int = DELIVERY_BATCH, concurrency: int = DELIVERY_CONCURRENCY) -> int:
+    """Ein Durchlauf des Delivery-Workers.
+
+    Returns: Anzahl bearbeiteter Nachrichten (0 = Outbox leer/nichts fällig).
+    """
+    claimed = _claim(db, limit)
+    if not claimed:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(claimed)))) as pool:
+        errors = list(pool.map(lambda item: _deliver(item["message"]), claimed))
+
+    now = utc_now()
+    sent_ids = [item["id"] for item, error in zip(claimed, errors) if error is None]
+    if sent_ids:
+        db.query(EmailOutbox).filter(EmailOutbox.id.in_(sent_ids)).update({
+            "status": "sent", "sent_at": now, "locked_at": None, "last_error": None,
+            "attempts": EmailOutbox.attempts + 1,
+        }, synchronize_session=False)
+
+    for item, error in zip(claimed, errors):
+        if error is None:
+            continue
+        attempts = item["attempts"] + 1
+        final = attempts >= MAX_ATTEMPTS or _is_permanent(error)
+        db.query(EmailOutbox).filter(EmailOutbox.id == item["id"]).update({
+            "status": "failed" if final else "pending",
+            "attempts": attempts,
+            "next_attempt_at": now + _backoff(attempts),
+            "locked_at": None,
+            "last_error": f"{type(error).__name__}: {error}"[:500],
+        }, synchronize_session=False)
+        if final:
+            logger.error(f"❌ E-Mail an {item['message']['to_email']} endgültig fehlgeschlagen "
+                         f"nach {attempts} Versuch(en): {error}")
+            _log_failure(item["message"])
+        else:
+            logger.warning(f"E-Mail an {item['message']['to_email']} fehlgeschlagen "
+                           f"(Versuch {attempts}), neuer Versuch später: {error}")
+    db.commit()
+
+    if len(sent_ids) < len(claimed):
+        logger.info(f"Outbox: {len(sent_ids)}/{len(claimed)} E-Mail(s) versendet")
+    return len(claimed)
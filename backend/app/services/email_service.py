@@ -2,35 +2,66 @@
 E-Mail Service mit SendGrid HTTP API - CRASH-SAFE
 """
 import logging
-from typing import Optional, List
+import re
+from typing import Dict, Optional, List
 from app.core.config import settings  # modul-weit, damit nie ein NameError 'settings' auftritt
+from app.services.email_i18n import BOOST_DIGEST_TEXTS
+from app.services.email_templates import neutralize_bulk_tags, render_fragment
 
 logger = logging.getLogger(__name__)
 
+# SendGrid v3 Mail Send: höchstens 1000 Personalizations pro Request und ~10 KB
+# Substitutionen pro Personalization (größere Empfänger werden einzeln versendet)
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+SENDGRID_MAX_SUBSTITUTION_BYTES = 10000
 
-def log_email(email_type: str, recipient: str, subject: str, success: bool = True):
-    """Speichert E-Mail-Log für Statistiken"""
+_BULK_TAG_RE = re.compile(r"\[\[[^\[\]]+\]\]")
+
+
+def bulk_tag(key: str) -> str:
+    """Platzhalter für Substitutionen/Sections im Sammelversand, z.B. [[name]]."""
+    return f"[[{key}]]"
+
+
+def render_bulk(template: str, substitutions: Optional[Dict[str, str]] = None,
+                sections: Optional[Dict[str, str]] = None) -> str:
+    """Ersetzt Platzhalter lokal wie SendGrid: erst die Substitutionen des
+    Empfängers, dann die darin referenzierten Sections. Unbekannte bleiben stehen."""
+    substitutions = substitutions or {}
+    sections = sections or {}
+    text = _BULK_TAG_RE.sub(lambda m: substitutions.get(m.group(0), m.group(0)), template)
+    return _BULK_TAG_RE.sub(lambda m: sections.get(m.group(0), m.group(0)), text)
+
+
+def _substitution_bytes(substitutions: Dict[str, str]) -> int:
+    return sum(len(k.encode("utf-8")) + len(str(v).encode("utf-8")) for k, v in substitutions.items())
+
+
+def log_email(email_type: str, recipient: str, subject: str, success: bool = True,
+              sent_by_user_id: Optional[int] = None, sender_email: Optional[str] = None):
+    """Speichert E-Mail-Log für Statistiken (gepuffert, siehe email_log_service)"""
     try:
-        from app.core.database import SessionLocal
-        from app.models.email_log import EmailLog
-        
-        db = SessionLocal()
-        try:
-            # email_type ist jetzt ein String (nicht mehr Enum)
-            log_entry = EmailLog(
-                email_type=email_type.lower() if email_type else "other",
-                recipient_email=recipient,
-                subject=subject[:500] if subject else None,
-                success=1 if success else 0
-            )
-            db.add(log_entry)
-            db.commit()
-        finally:
-            db.close()
+        from app.services.email_log_service import email_log_buffer
+
+        email_log_buffer.add(email_type, recipient, subject, success,
+                             sent_by_user_id=sent_by_user_id, sender_email=sender_email)
     except Exception as e:
         logger.warning(f"E-Mail-Log konnte nicht gespeichert werden: {e}")
 
 
+def log_failed_delivery(to_email: str, subject: str, email_type: str = "other",
+                        bulk_payload: Optional[dict] = None):
+    """E-Mail-Log für einen endgültig fehlgeschlagenen Versand (nach dem letzten Versuch;
+    Zwischenversuche des Outbox-Workers werden nicht geloggt). Sammelversand: eine Zeile
+    je Empfänger mit dessen Betreff und Absender-Mitarbeiter."""
+    if not bulk_payload:
+        log_email(email_type, to_email, subject, False)
+        return
+    for r in bulk_payload.get("recipients") or []:
+        log_email(email_type, r["to_email"], render_bulk(subject, r.get("substitutions")), False,
+                  sent_by_user_id=bulk_payload.get("sent_by_user_id"))
+
+
 def _safe_email_call(func):
     """Decorator der ALLE E-Mail-Fehler abfängt - App darf NIEMALS crashen!"""
     import asyncio
@@ -70,6 +101,8 @@ class EmailService:
             self.from_name = getattr(settings, 'FROM_NAME', 'International Job Placement')
             self.debug = getattr(settings, 'DEBUG', False)
             self.enabled = bool(self.api_key and self.api_key.startswith('SG.'))
+            # Versand über email_outbox + Delivery-Worker statt synchron im Request
+            self.use_outbox = bool(getattr(settings, 'EMAIL_OUTBOX_ENABLED', True))
 
             # Optionaler separater SMTP-Weg für Kaltakquise (z.B. Gmail)
             self.outreach_smtp_host = getattr(settings, 'OUTREACH_SMTP_HOST', 'smtp.gmail.com')
@@ -80,6 +113,8 @@ class EmailService:
             self.outreach_from_name = getattr(settings, 'OUTREACH_FROM_NAME', '') or 'IJP International Job Placement'
             # Aktiv, sobald Benutzer + Passwort (App-Passwort) hinterlegt sind
             self.outreach_smtp_enabled = bool(self.outreach_smtp_user and self.outreach_smtp_password)
+            # Ein SendGrid-Client für alle Versandwege (wird beim ersten Versand angelegt)
+            self._sendgrid = None
 
             if self.enabled:
                 logger.info(f"E-Mail-Service AKTIVIERT (SendGrid API) - From: {self.from_email}")
@@ -92,7 +127,9 @@ class EmailService:
             self.enabled = False
             self.debug = False
             self.api_key = ''
+            self.use_outbox = False
             self.outreach_smtp_enabled = False
+            self._sendgrid = None
     
     @_safe_email_call
     def send_email(
@@ -108,15 +145,19 @@ class EmailService:
     ) -> bool:
         """Sendet eine E-Mail über SendGrid HTTP API - CRASH-SAFE
         
+        Die Nachricht wird in die email_outbox gelegt und vom Delivery-Worker
+        versendet (kein SendGrid-Roundtrip im Aufrufer). Ist die Outbox
+        abgeschaltet oder nicht beschreibbar, wird direkt versendet.
+        
         attachments: Liste von dicts mit keys: filename, content (base64), type (mime)
+        Returns: True = zum Versand angenommen (in der Outbox abgelegt bzw. direkt
+        zugestellt), NICHT "zugestellt". Das Zustell-Ergebnis steht nach dem letzten
+        Versuch in email_logs (bzw. email_outbox.status).
         """
         
-        # Verwende übergebene Absender oder Standard
-        sender_email = from_email or self.from_email
-        sender_name = from_name or self.from_name
-        
         # Debug-Modus: Nur loggen
         if self.debug:
+            sender_email = from_email or self.from_email
             att_info = f" + {len(attachments)} Anhänge" if attachments else ""
             logger.info(f"[DEBUG-EMAIL] Von: {sender_email} | An: {to_email} | Betreff: {subject}{att_info}")
             try:
@@ -130,8 +171,45 @@ class EmailService:
             logger.warning(f"E-Mail übersprungen (SendGrid nicht konfiguriert): {to_email}")
             return True
         
+        if self.use_outbox:
+            from app.services.email_outbox_service import enqueue_email
+            if enqueue_email(
+                to_email=to_email, subject=subject, html_content=html_content,
+                text_content=text_content, email_type=email_type,
+                from_email=from_email, from_name=from_name, attachments=attachments,
+            ):
+                return True
+            # Outbox nicht verfügbar -> direkt senden
+        
+        return self._deliver_once(
+            self.deliver_email, {"to_email": to_email, "subject": subject, "email_type": email_type},
+            to_email=to_email, subject=subject, html_content=html_content,
+            text_content=text_content, email_type=email_type,
+            from_email=from_email, from_name=from_name, attachments=attachments,
+        )
+    
+    def deliver_email(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        email_type: str = "other",
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        attachments: Optional[List[dict]] = None
+    ) -> bool:
+        """Versendet eine E-Mail synchron über die SendGrid HTTP API.
+        
+        Wird vom Outbox-Worker aufgerufen (bzw. als Fallback von send_email).
+        Fehler von SendGrid werden NICHT abgefangen – der Worker entscheidet über Retry.
+        Geloggt wird nur der Erfolg; einen endgültigen Fehlschlag loggt der Aufrufer
+        (log_failed_delivery), damit Retries keine zusätzlichen Fehler-Zeilen erzeugen.
+        """
+        sender_email = from_email or self.from_email
+        sender_name = from_name or self.from_name
+        
         # SendGrid API verwenden
-        from sendgrid import SendGridAPIClient
         from sendgrid.helpers.mail import Mail, Email, To, Content, Attachment, FileContent, FileName, FileType, Disposition
         
         message = Mail(
@@ -155,8 +233,7 @@ class EmailService:
                 )
                 message.add_attachment(attachment)
         
-        sg = SendGridAPIClient(self.api_key)
-        response = sg.send(message)
+        response = self._sendgrid_client().send(message)
         
         if response.status_code in [200, 201, 202]:
             att_info = f" + {len(attachments)} Anhänge" if attachments else ""
@@ -168,11 +245,175 @@ class EmailService:
             return True
         else:
             logger.error(f"❌ E-Mail fehlgeschlagen: {response.status_code} - {response.body}")
+            return False
+
+    def _deliver_once(self, deliver, failure: dict, **kwargs) -> bool:
+        """Direktversand ohne Outbox: der einzige Versuch ist der letzte, ein Fehlschlag
+        wird daher sofort geloggt (log_failed_delivery mit den Angaben aus failure)."""
+        try:
+            ok = deliver(**kwargs)
+        except Exception:
+            log_failed_delivery(**failure)
+            raise
+        if not ok:
+            log_failed_delivery(**failure)
+        return ok
+    
+    def _sendgrid_client(self):
+        """Wiederverwendeter SendGridAPIClient (statt einem neuen pro E-Mail)."""
+        if self._sendgrid is None:
+            from sendgrid import SendGridAPIClient
+            self._sendgrid = SendGridAPIClient(self.api_key)
+        return self._sendgrid
+
+    @_safe_email_call
+    def send_bulk(
+        self,
+        subject: str,
+        html_content: str,
+        recipients: List[dict],
+        email_type: str = "other",
+        sections: Optional[Dict[str, str]] = None,
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        sent_by_user_id: Optional[int] = None,
+    ) -> bool:
+        """Sammelversand einer Vorlage an viele Empfänger - CRASH-SAFE
+
+        subject/html_content enthalten Platzhalter (bulk_tag), recipients ist eine
+        Liste von {"to_email": ..., "substitutions": {"[[name]]": ...}}. sections
+        sind gemeinsame Textbausteine, die über Substitutionswerte referenziert werden
+        (z.B. eine Job-Zeile, die in vielen Digests vorkommt). Freitext-Werte (Namen)
+        vorher durch neutralize_bulk_tags leiten, sonst wirken "[[...]]" darin als Platzhalter.
+
+        Bis zu SENDGRID_MAX_PERSONALIZATIONS Empfänger gehen als EIN SendGrid-Request
+        raus (eine Personalization je Empfänger) – über die Outbox bzw. direkt.
+        sent_by_user_id: Absender (Mitarbeiter) im E-Mail-Log der Empfänger.
+        Returns: True = zum Versand angenommen (wie send_email), nicht zugestellt.
+        """
+        sections = sections or {}
+        recipients = [r for r in recipients if r.get("to_email")]
+        if not recipients:
+            return True
+
+        # Debug-Modus / SendGrid nicht konfiguriert: wie send_email je Empfänger
+        if self.debug or not self.enabled:
+            for r in recipients:
+                subs = r.get("substitutions") or {}
+                self.send_email(r["to_email"], render_bulk(subject, subs, sections),
+                                render_bulk(html_content, subs, sections), email_type=email_type,
+                                from_email=from_email, from_name=from_name)
+            return True
+
+        batch = []
+        for r in recipients:
+            subs = r.get("substitutions") or {}
+            if _substitution_bytes(subs) > SENDGRID_MAX_SUBSTITUTION_BYTES:
+                # Über dem SendGrid-Limit -> fertig gerendert einzeln versenden
+                self.send_email(r["to_email"], render_bulk(subject, subs, sections),
+                                render_bulk(html_content, subs, sections), email_type=email_type,
+                                from_email=from_email, from_name=from_name)
+            else:
+                batch.append({"to_email": r["to_email"], "substitutions": subs})
+
+        for start in range(0, len(batch), SENDGRID_MAX_PERSONALIZATIONS):
+            chunk = batch[start:start + SENDGRID_MAX_PERSONALIZATIONS]
+            # Nur die Sections mitschicken, die dieser Request auch referenziert
+            used = set()
+            for r in chunk:
+                for value in r["substitutions"].values():
+                    used.update(_BULK_TAG_RE.findall(str(value)))
+            chunk_sections = {tag: sections[tag] for tag in used if tag in sections}
+
+            if self.use_outbox:
+                from app.services.email_outbox_service import enqueue_email
+                if enqueue_email(
+                    to_email=chunk[0]["to_email"], subject=subject, html_content=html_content,
+                    email_type=email_type, from_email=from_email, from_name=from_name,
+                    bulk_payload={"recipients": chunk, "sections": chunk_sections,
+                                  "sent_by_user_id": sent_by_user_id},
+                ):
+                    continue
+                # Outbox nicht verfügbar -> direkt senden
+            self._deliver_once(
+                self.deliver_bulk,
+                {"to_email": chunk[0]["to_email"], "subject": subject, "email_type": email_type,
+                 "bulk_payload": {"recipients": chunk, "sent_by_user_id": sent_by_user_id}},
+                subject=subject, html_content=html_content, recipients=chunk,
+                sections=chunk_sections, email_type=email_type,
+                from_email=from_email, from_name=from_name, sent_by_user_id=sent_by_user_id,
+            )
+        return True
+
+    def deliver_bulk(
+        self,
+        subject: str,
+        html_content: str,
+        recipients: List[dict],
+        sections: Optional[Dict[str, str]] = None,
+        text_content: Optional[str] = None,
+        email_type: str = "other",
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        sent_by_user_id: Optional[int] = None,
+    ) -> bool:
+        """Versendet einen Sammelversand als EINEN SendGrid-Request (eine
+        Personalization je Empfänger, höchstens SENDGRID_MAX_PERSONALIZATIONS).
+
+        Wie deliver_email: Fehler von SendGrid werden NICHT abgefangen, geloggt wird
+        nur der Erfolg (eine Zeile je Empfänger).
+        """
+        response = self._sendgrid_client().send(self._bulk_request_body(
+            subject, html_content, recipients, sections, text_content, from_email, from_name))
+        if response.status_code not in [200, 201, 202]:
+            logger.error(f"❌ Sammel-E-Mail fehlgeschlagen: {response.status_code} - {response.body}")
+            return False
+        logger.info(f"✅ Sammel-E-Mail an {len(recipients)} Empfänger gesendet (Status: {response.status_code})")
+        for r in recipients:
             try:
-                log_email(email_type, to_email, subject, False)
+                log_email(email_type, r["to_email"], render_bulk(subject, r.get("substitutions")), True,
+                          sent_by_user_id=sent_by_user_id)
             except Exception as e:
                 logger.warning(f"E-Mail-Log fehlgeschlagen: {e}")
-            return False
+        return True
+    
+    def _bulk_request_body(
+        self,
+        subject: str,
+        html_content: str,
+        recipients: List[dict],
+        sections: Optional[Dict[str, str]] = None,
+        text_content: Optional[str] = None,
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+    ) -> dict:
+        """Request-Body (v3 Mail Send) eines Sammelversands als dict – wie Mail.get(),
+        aber ohne ein Helper-Objekt je Empfänger und Substitution."""
+        from_field = {"email": from_email or self.from_email}
+        if from_name or self.from_name:
+            from_field["name"] = from_name or self.from_name
+        content = [{"type": "text/html", "value": html_content}]
+        if text_content:
+            # text/plain muss laut SendGrid vor text/html stehen
+            content.insert(0, {"type": "text/plain", "value": text_content})
+
+        personalizations = []
+        for r in recipients:
+            personalization = {"to": [{"email": r["to_email"]}]}
+            subs = r.get("substitutions")
+            if subs:
+                personalization["substitutions"] = {key: str(value) for key, value in subs.items()}
+            personalizations.append(personalization)
+
+        body = {
+            "from": from_field,
+            "subject": subject,
+            "personalizations": personalizations,
+            "content": content,
+        }
+        if sections:
+            body["sections"] = dict(sections)
+        return body
     
     def _send_via_smtp(
         self,
@@ -1027,6 +1268,21 @@ class EmailService:
         """
         return self.send_email(to_email, subject, html_content, email_type="password_reset")
     
+    def _matching_job_template(self, job_title: str, company_name: str, location: str, job_slug: str):
+        """Betreff und HTML der Sofort-Benachrichtigung mit den Platzhaltern [[name]] und [[score]]."""
+        try:
+            from app.core.config import settings
+            frontend_url = getattr(settings, 'FRONTEND_URL', 'https://www.jobon.work')
+        except:
+            frontend_url = 'https://www.jobon.work'
+        
+        job_url = f"{frontend_url}/jobs/{job_slug}"
+        
+        subject = f"🎯 New Job Match: {neutralize_bulk_tags(job_title)} ([[score]]% match)"
+        html_content = render_fragment("matching_job.html", job_title=job_title, company_name=company_name,
+                                       location=location, job_url=job_url)
+        return subject, html_content
+
     @_safe_email_call
     def send_matching_job_notification(
         self,
@@ -1042,65 +1298,47 @@ class EmailService:
         Notifies an applicant about a new matching job posting.
         Email is in English as applicants are international.
         """
+        subject, html_content = self._matching_job_template(job_title, company_name, location, job_slug)
+        subs = {bulk_tag("name"): neutralize_bulk_tags(applicant_name), bulk_tag("score"): str(match_score)}
+        return self.send_email(to_email, render_bulk(subject, subs), render_bulk(html_content, subs),
+                               email_type="job_match")
+
+    @_safe_email_call
+    def send_matching_job_notifications(
+        self,
+        job_title: str,
+        company_name: str,
+        location: str,
+        job_slug: str,
+        recipients: List[dict],
+    ) -> bool:
+        """Sofort-Benachrichtigung zu EINER Stelle an viele Bewerber als Sammelversand.
+        recipients = [{"to_email", "applicant_name", "match_score"}]."""
+        subject, html_content = self._matching_job_template(job_title, company_name, location, job_slug)
+        return self.send_bulk(subject, html_content, [
+            {"to_email": r["to_email"],
+             "substitutions": {bulk_tag("name"): neutralize_bulk_tags(r["applicant_name"]),
+                               bulk_tag("score"): str(r["match_score"])}}
+            for r in recipients
+        ], email_type="job_match")
+
+    def _boost_job_template(self, job_title: str, company_name: str, location: str, job_slug: str):
+        """Betreff und HTML der Boost-E-Mail mit dem Platzhalter [[name]]."""
         try:
             from app.core.config import settings
             frontend_url = getattr(settings, 'FRONTEND_URL', 'https://www.jobon.work')
-        except:
+        except Exception:
             frontend_url = 'https://www.jobon.work'
-        
+        if not frontend_url or 'localhost' in frontend_url:
+            frontend_url = 'https://www.jobon.work'
+
         job_url = f"{frontend_url}/jobs/{job_slug}"
-        
-        subject = f"🎯 New Job Match: {job_title} ({match_score}% match)"
-        html_content = f"""
-        <html><body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; background: #f3f4f6; padding: 20px;">
-            <div style="background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 30px; text-align: center; border-radius: 12px 12px 0 0;">
-                <h1 style="margin: 0; font-size: 24px;">🎯 Great News!</h1>
-                <p style="margin: 10px 0 0 0; font-size: 16px;">A new job matches your profile</p>
-            </div>
-            <div style="padding: 30px; background: #ffffff; border-radius: 0 0 12px 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                <p style="font-size: 16px; color: #374151;">Hello {applicant_name},</p>
-                
-                <p style="color: #4b5563;">We found a new job opportunity that matches your profile!</p>
-                
-                <div style="background: #ecfdf5; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #10b981;">
-                    <p style="margin: 0 0 10px 0; font-size: 20px; font-weight: bold; color: #065f46;">
-                        {job_title}
-                    </p>
-                    <p style="margin: 0 0 5px 0; color: #047857;">
-                        🏢 {company_name}
-                    </p>
-                    <p style="margin: 0 0 10px 0; color: #047857;">
-                        📍 {location}
-                    </p>
-                    <div style="background: #d1fae5; padding: 10px 15px; border-radius: 20px; display: inline-block; margin-top: 10px;">
-                        <span style="color: #065f46; font-weight: bold; font-size: 18px;">
-                            {match_score}% Match
-                        </span>
-                    </div>
-                </div>
-                
-                <p style="text-align: center; margin: 30px 0;">
-                    <a href="{job_url}" 
-                       style="background: #10b981; color: white; padding: 15px 30px; text-decoration: none; border-radius: 8px; font-weight: bold; display: inline-block;">
-                        View Job Details →
-                    </a>
-                </p>
-                
-                <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 25px 0;">
-                
-                <p style="color: #6b7280; font-size: 14px; margin: 0;">
-                    Best regards,<br>
-                    <strong>Your JobOn Team</strong>
-                </p>
-                
-                <p style="color: #9ca3af; font-size: 12px; margin: 20px 0 0 0;">
-                    IJP International Job Placement UG (haftungsbeschränkt)<br>
-                    Husemannstr. 9, 10435 Berlin
-                </p>
-            </div>
-        </body></html>
-        """
-        return self.send_email(to_email, subject, html_content, email_type="job_match")
+
+        # Bewusst KEIN Match-Score in der Bewerber-Mail (kann niedrig wirken).
+        subject = f"🚀 A job for you: {neutralize_bulk_tags(job_title)}"
+        html_content = render_fragment("boost_job.html", job_title=job_title, company_name=company_name,
+                                       location=location, job_url=job_url)
+        return subject, html_content
 
     def send_boost_job_notification(
         self,
@@ -1117,63 +1355,70 @@ class EmailService:
         the matching-job notification (with match score + direct link). English.
         Independent from the automatic new-job notification.
         """
+        subject, html_content = self._boost_job_template(job_title, company_name, location, job_slug)
+        subs = {bulk_tag("name"): neutralize_bulk_tags(applicant_name)}
+        return self.send_email(to_email, render_bulk(subject, subs), render_bulk(html_content, subs),
+                               email_type="job_boost")
+
+    @_safe_email_call
+    def send_boost_job_notifications(
+        self,
+        job_title: str,
+        company_name: str,
+        location: str,
+        job_slug: str,
+        recipients: List[dict],
+    ) -> bool:
+        """Boost-E-Mail zu EINER Stelle an viele Bewerber als Sammelversand.
+        recipients = [{"to_email", "applicant_name"}]."""
+        subject, html_content = self._boost_job_template(job_title, company_name, location, job_slug)
+        return self.send_bulk(subject, html_content, [
+            {"to_email": r["to_email"], "substitutions": {bulk_tag("name"): neutralize_bulk_tags(r["applicant_name"])}}
+            for r in recipients
+        ], email_type="job_boost")
+
+    # Texte des Booster-Digests je Profilsprache (Default Englisch), siehe email_i18n
+    _BOOST_DIGEST_TEXTS = BOOST_DIGEST_TEXTS
+
+    def _boost_digest_template(self, lang: str):
+        """Betreff, HTML und Sprache des Booster-Digests mit den Platzhaltern
+        [[name]], [[count]] und [[jobs]] (Liste von Job-Sections)."""
         try:
             from app.core.config import settings
             frontend_url = getattr(settings, 'FRONTEND_URL', 'https://www.jobon.work')
         except Exception:
             frontend_url = 'https://www.jobon.work'
-        if not frontend_url or 'localhost' in frontend_url:
-            frontend_url = 'https://www.jobon.work'
-
-        job_url = f"{frontend_url}/jobs/{job_slug}"
-
-        # Bewusst KEIN Match-Score in der Bewerber-Mail (kann niedrig wirken).
-        subject = f"🚀 A job for you: {job_title}"
-        html_content = f"""
-        <html><body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; background: #f3f4f6; padding: 20px;">
-            <div style="background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 30px; text-align: center; border-radius: 12px 12px 0 0;">
-                <h1 style="margin: 0; font-size: 24px;">🚀 A job that fits you!</h1>
-                <p style="margin: 10px 0 0 0; font-size: 16px;">Take a look at this opportunity on JobOn</p>
-            </div>
-            <div style="padding: 30px; background: #ffffff; border-radius: 0 0 12px 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                <p style="font-size: 16px; color: #374151;">Hello {applicant_name},</p>
-
-                <p style="color: #4b5563;">We think this job could be a great match for your profile:</p>
-
-                <div style="background: #ecfdf5; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #10b981;">
-                    <p style="margin: 0 0 10px 0; font-size: 20px; font-weight: bold; color: #065f46;">
-                        {job_title}
-                    </p>
-                    <p style="margin: 0 0 5px 0; color: #047857;">
-                        🏢 {company_name}
-                    </p>
-                    <p style="margin: 0; color: #047857;">
-                        📍 {location}
-                    </p>
-                </div>
-
-                <p style="text-align: center; margin: 30px 0;">
-                    <a href="{job_url}"
-                       style="background: #10b981; color: white; padding: 15px 30px; text-decoration: none; border-radius: 8px; font-weight: bold; display: inline-block;">
-                        View Job &amp; Apply →
-                    </a>
-                </p>
-
-                <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 25px 0;">
+        lang = (lang or "en").lower()
+        if lang not in self._BOOST_DIGEST_TEXTS:
+            lang = "en"
 
-                <p style="color: #6b7280; font-size: 14px; margin: 0;">
-                    Best regards,<br>
-                    <strong>Your JobOn Team</strong>
-                </p>
+        subject = f"[[count]] {self._BOOST_DIGEST_TEXTS[lang]['jobs']} | JobOn"
+        html_content = render_fragment("boost_digest.html", lang=lang, frontend_url=frontend_url)
+        return subject, html_content, lang, frontend_url
 
-                <p style="color: #9ca3af; font-size: 12px; margin: 20px 0 0 0;">
-                    IJP International Job Placement UG (haftungsbeschränkt)<br>
-                    Husemannstr. 9, 10435 Berlin
-                </p>
-            </div>
-        </body></html>
-        """
-        return self.send_email(to_email, subject, html_content, email_type="job_boost")
+    @staticmethod
+    def _boost_digest_recipient(to_email: str, applicant_name: str, matching_jobs: list,
+                                sections: Dict[str, str], lang: str, frontend_url: str) -> dict:
+        """Substitutionen eines Empfängers; neue Job-Sections landen in sections."""
+        tags = []
+        for match in matching_jobs:
+            job = match["job"]
+            tag = bulk_tag(f"job_{job.id}")
+            if tag not in sections:
+                job_url = f"{frontend_url}/jobs/{job.slug}-{job.id}" if job.slug else f"{frontend_url}/jobs/{job.id}"
+                if getattr(job, "is_external", False) and getattr(job, "external_employer_name", None):
+                    company_name = job.external_employer_name
+                else:
+                    company_name = job.company.company_name if job.company else "JobOn"
+                sections[tag] = render_fragment(
+                    "boost_digest_job.html", lang=lang, job_title=job.title, company_name=company_name,
+                    location=job.location or 'Deutschland', job_url=job_url)
+            tags.append(tag)
+        return {"to_email": to_email, "substitutions": {
+            bulk_tag("name"): neutralize_bulk_tags(applicant_name),
+            bulk_tag("count"): str(len(matching_jobs)),
+            bulk_tag("jobs"): "".join(tags),
+        }}
 
     @_safe_email_call
     def send_boost_digest(
@@ -1185,71 +1430,74 @@ class EmailService:
     ) -> bool:
         """Personalisierter Booster-Digest in der Profilsprache des Bewerbers
         (de/en/es/ru, Default Englisch). matching_jobs = [{"job":...}]."""
+        subject, html_content, lang, frontend_url = self._boost_digest_template(lang)
+        sections = {}
+        subs = self._boost_digest_recipient(to_email, applicant_name, matching_jobs, sections, lang, frontend_url)["substitutions"]
+        return self.send_email(to_email, render_bulk(subject, subs, sections),
+                               render_bulk(html_content, subs, sections), email_type="job_match")
+
+    @_safe_email_call
+    def send_boost_digests(self, digests: List[dict]) -> bool:
+        """Booster-Digests vieler Bewerber als Sammelversand (eine Vorlage je Sprache,
+        jede Stelle einmal als Section). digests = [{"to_email", "applicant_name",
+        "matching_jobs", "lang"}]."""
+        by_lang: Dict[str, List[dict]] = {}
+        for d in digests:
+            lang = (d.get("lang") or "en").lower()
+            by_lang.setdefault(lang if lang in self._BOOST_DIGEST_TEXTS else "en", []).append(d)
+
+        for lang, group in by_lang.items():
+            subject, html_content, lang, frontend_url = self._boost_digest_template(lang)
+            sections: Dict[str, str] = {}
+            recipients = [
+                self._boost_digest_recipient(d["to_email"], d["applicant_name"], d["matching_jobs"],
+                                             sections, lang, frontend_url)
+                for d in group
+            ]
+            self.send_bulk(subject, html_content, recipients, email_type="job_match", sections=sections)
+        return True
+
+    # Wochen-Digest: höchstens so viele Stellen pro E-Mail
+    WEEKLY_DIGEST_MAX_JOBS = 10
+
+    def _weekly_digest_template(self):
+        """Betreff und HTML des Wochen-Digests mit den Platzhaltern [[name]], [[count]]
+        und [[jobs]] (Liste von Job-Sections)."""
         try:
             from app.core.config import settings
             frontend_url = getattr(settings, 'FRONTEND_URL', 'https://www.jobon.work')
-        except Exception:
+        except:
             frontend_url = 'https://www.jobon.work'
+        
+        subject = "Your Weekly Job Digest - [[count]] Matching Jobs | JobOn"
+        html_content = render_fragment("weekly_digest.html", frontend_url=frontend_url)
+        return subject, html_content, frontend_url
 
-        T = {
-            "en": {"head": "Recommended jobs for you", "sub": "handpicked matches",
-                   "hi": "Hi", "intro": "These currently featured jobs match your profile:",
-                   "view": "View", "cta": "See all jobs", "jobs": "recommended jobs",
-                   "foot": "You receive this email because you enabled job notifications. Unsubscribe in your profile."},
-            "de": {"head": "Empfohlene Stellen für dich", "sub": "handverlesen",
-                   "hi": "Hallo", "intro": "Diese aktuell hervorgehobenen Stellen passen zu deinem Profil:",
-                   "view": "Jetzt ansehen", "cta": "Alle Stellen ansehen", "jobs": "empfohlene Stellen",
-                   "foot": "Du erhältst diese E-Mail, weil du Job-Benachrichtigungen aktiviert hast. Abmelden im Profil."},
-            "es": {"head": "Empleos recomendados para ti", "sub": "seleccionados a mano",
-                   "hi": "Hola", "intro": "Estos empleos destacados coinciden con tu perfil:",
-                   "view": "Ver ahora", "cta": "Ver todos los empleos", "jobs": "empleos recomendados",
-                   "foot": "Recibes este correo porque activaste las notificaciones de empleo. Puedes darte de baja en tu perfil."},
-            "ru": {"head": "Рекомендованные вакансии для вас", "sub": "подобрано вручную",
-                   "hi": "Здравствуйте", "intro": "Эти актуальные вакансии подходят вашему профилю:",
-                   "view": "Смотреть", "cta": "Все вакансии", "jobs": "рекомендованных вакансий",
-                   "foot": "Вы получили это письмо, потому что включили уведомления о вакансиях. Отписаться можно в профиле."},
-        }
-        t = T.get((lang or "en").lower(), T["en"])
-        n = len(matching_jobs)
-
-        jobs_html = ""
-        for match in matching_jobs:
+    def _weekly_digest_recipient(self, to_email: str, applicant_name: str, matching_jobs: list,
+                                 sections: Dict[str, str], frontend_url: str) -> dict:
+        """Substitutionen eines Empfängers; neue Job-Sections (Stelle + Score) landen
+        in sections – dieselbe Zeile wird so für alle Empfänger nur einmal übertragen."""
+        tags = []
+        for match in matching_jobs[:self.WEEKLY_DIGEST_MAX_JOBS]:
             job = match["job"]
-            job_url = f"{frontend_url}/jobs/{job.slug}-{job.id}" if job.slug else f"{frontend_url}/jobs/{job.id}"
-            if getattr(job, "is_external", False) and getattr(job, "external_employer_name", None):
-                company_name = job.external_employer_name
-            else:
-                company_name = job.company.company_name if job.company else "JobOn"
-            jobs_html += f"""
-            <table cellpadding="0" cellspacing="0" border="0" width="100%" style="background:#fff7ed; border-radius:8px; margin:10px 0; border-left:4px solid #f97316;">
-                <tr><td style="padding:15px;">
-                    <p style="margin:0 0 4px 0; font-size:16px; font-weight:bold; color:#1f2937;">{job.title}</p>
-                    <p style="margin:0; color:#6b7280; font-size:14px;">{company_name} &bull; {job.location or 'Deutschland'}</p>
-                    <p style="margin:10px 0 0 0;"><a href="{job_url}" style="color:#ea580c; text-decoration:none; font-weight:600;">{t['view']} &rarr;</a></p>
-                </td></tr>
-            </table>
-            """
-
-        subject = f"{n} {t['jobs']} | JobOn"
-        html_content = f"""
-        <html><body style="font-family:Arial,sans-serif; max-width:600px; margin:0 auto; background:#f3f4f6; padding:20px;">
-            <div style="background:linear-gradient(135deg,#f97316,#ea580c); color:#fff; padding:28px; text-align:center; border-radius:12px 12px 0 0;">
-                <h1 style="margin:0; font-size:22px;">{t['head']}</h1>
-                <p style="margin:8px 0 0 0; font-size:15px;">{n} &bull; {t['sub']}</p>
-            </div>
-            <div style="padding:28px; background:#ffffff; border-radius:0 0 12px 12px;">
-                <p style="font-size:16px; color:#374151;">{t['hi']} {applicant_name},</p>
-                <p style="color:#4b5563;">{t['intro']}</p>
-                {jobs_html}
-                <p style="text-align:center; margin:24px 0 0 0;">
-                    <a href="{frontend_url}/jobs" style="background:#f97316; color:#fff; padding:12px 26px; text-decoration:none; border-radius:8px; font-weight:bold; display:inline-block;">{t['cta']}</a>
-                </p>
-                <hr style="border:none; border-top:1px solid #e5e7eb; margin:24px 0;">
-                <p style="color:#9ca3af; font-size:12px;">{t['foot']}</p>
-            </div>
-        </body></html>
-        """
-        return self.send_email(to_email, subject, html_content, email_type="job_match")
+            score = match["score"]
+            tag = bulk_tag(f"job_{job.id}_{score}")
+            if tag not in sections:
+                job_url = f"{frontend_url}/jobs/{job.slug}-{job.id}" if job.slug else f"{frontend_url}/jobs/{job.id}"
+                # Bei externen (gescrapten) Jobs den echten Arbeitgeber zeigen, nicht die System-Firma
+                if getattr(job, "is_external", False) and getattr(job, "external_employer_name", None):
+                    company_name = job.external_employer_name
+                else:
+                    company_name = job.company.company_name if job.company else "Unknown"
+                sections[tag] = render_fragment(
+                    "weekly_digest_job.html", job_title=job.title, company_name=company_name,
+                    location=job.location or 'Germany', score=score, job_url=job_url)
+            tags.append(tag)
+        return {"to_email": to_email, "substitutions": {
+            bulk_tag("name"): neutralize_bulk_tags(applicant_name),
+            bulk_tag("count"): str(len(matching_jobs)),
+            bulk_tag("jobs"): "".join(tags),
+        }}
 
     def send_weekly_job_digest(
         self,
@@ -1261,107 +1509,29 @@ class EmailService:
         Sends a weekly digest of matching jobs to an applicant.
         Email is in English as applicants are international.
         """
-        try:
-            from app.core.config import settings
-            frontend_url = getattr(settings, 'FRONTEND_URL', 'https://www.jobon.work')
-        except:
-            frontend_url = 'https://www.jobon.work'
-        
-        # Build job list HTML
-        jobs_html = ""
-        for match in matching_jobs[:10]:  # Max 10 jobs
-            job = match["job"]
-            score = match["score"]
-            job_url = f"{frontend_url}/jobs/{job.slug}-{job.id}" if job.slug else f"{frontend_url}/jobs/{job.id}"
-            # Bei externen (gescrapten) Jobs den echten Arbeitgeber zeigen, nicht die System-Firma
-            if getattr(job, "is_external", False) and getattr(job, "external_employer_name", None):
-                company_name = job.external_employer_name
-            else:
-                company_name = job.company.company_name if job.company else "Unknown"
-            
-            jobs_html += f"""
-            <table cellpadding="0" cellspacing="0" border="0" width="100%" style="background: #f9fafb; border-radius: 8px; margin: 10px 0; border-left: 4px solid #10b981;">
-                <tr>
-                    <td style="padding: 15px;">
-                        <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                            <tr>
-                                <td style="vertical-align: top;">
-                                    <p style="margin: 0 0 5px 0; font-size: 16px; font-weight: bold; color: #1f2937;">
-                                        {job.title}
-                                    </p>
-                                    <p style="margin: 0; color: #6b7280; font-size: 14px;">
-                                        {company_name} &bull; {job.location or 'Germany'}
-                                    </p>
-                                </td>
-                                <td style="vertical-align: top; text-align: right; width: 60px;">
-                                    <span style="background: #d1fae5; color: #065f46; padding: 5px 12px; border-radius: 15px; font-weight: bold; font-size: 14px; display: inline-block;">
-                                        {score}%
-                                    </span>
-                                </td>
-                            </tr>
-                        </table>
-                        <p style="margin: 10px 0 0 0;">
-                            <a href="{job_url}" style="color: #10b981; text-decoration: none; font-weight: 500;">
-                                View Details &rarr;
-                            </a>
-                        </p>
-                    </td>
-                </tr>
-            </table>
-            """
-        
-        subject = f"Your Weekly Job Digest - {len(matching_jobs)} Matching Jobs | JobOn"
-        html_content = f"""
-        <html><body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; background: #f3f4f6; padding: 20px;">
-            <div style="background: linear-gradient(135deg, #2563eb, #1d4ed8); color: white; padding: 30px; text-align: center; border-radius: 12px 12px 0 0;">
-                <h1 style="margin: 0; font-size: 24px;">Your Weekly Job Digest</h1>
-                <p style="margin: 10px 0 0 0; font-size: 16px;">{len(matching_jobs)} jobs match your profile</p>
-            </div>
-            <div style="padding: 30px; background: #ffffff; border-radius: 0 0 12px 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                <p style="font-size: 16px; color: #374151;">Hello {applicant_name},</p>
-                
-                <p style="color: #4b5563;">Here are the latest job opportunities that match your profile:</p>
-                
-                {jobs_html}
-                
-                <p style="text-align: center; margin: 30px 0;">
-                    <a href="{frontend_url}/jobs" 
-                       style="background: #2563eb; color: white; padding: 15px 30px; text-decoration: none; border-radius: 8px; font-weight: bold; display: inline-block;">
-                        Browse All Jobs →
-                    </a>
-                </p>
-                
-                <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 25px 0;">
-                
-                <p style="color: #6b7280; font-size: 14px; margin: 0;">
-                    Best regards,<br>
-                    <strong>Your JobOn Team</strong>
-                </p>
-                
-                <p style="color: #9ca3af; font-size: 12px; margin: 20px 0 0 0;">
-                    IJP International Job Placement UG (haftungsbeschränkt)<br>
-                    Husemannstr. 9, 10435 Berlin<br><br>
-                    <em>You receive this email because you have an active profile on JobOn.work</em>
-                </p>
-            </div>
-        </body></html>
-        """
-        return self.send_email(to_email, subject, html_content, email_type="job_digest")
-
+        subject, html_content, frontend_url = self._weekly_digest_template()
+        sections = {}
+        subs = self._weekly_digest_recipient(to_email, applicant_name, matching_jobs, sections, frontend_url)["substitutions"]
+        return self.send_email(to_email, render_bulk(subject, subs, sections),
+                               render_bulk(html_content, subs, sections), email_type="job_digest")
 
     @_safe_email_call
-    def send_sales_email(
-        self,
-        to_email: str,
-        subject: str,
-        html_content: str,
-        is_html: bool = True
-    ) -> bool:
-        """
-        Sendet eine Kaltakquise/Vertriebs-E-Mail.
-        Verwendet business@jobon.work als Absender.
-        Unterstützt HTML und Volltext-Modus.
-        """
+    def send_weekly_job_digests(self, digests: List[dict]) -> bool:
+        """Wochen-Digests vieler Bewerber als Sammelversand.
+        digests = [{"to_email", "applicant_name", "matching_jobs"}]."""
+        subject, html_content, frontend_url = self._weekly_digest_template()
+        sections: Dict[str, str] = {}
+        recipients = [
+            self._weekly_digest_recipient(d["to_email"], d["applicant_name"], d["matching_jobs"],
+                                          sections, frontend_url)
+            for d in digests
+        ]
+        return self.send_bulk(subject, html_content, recipients, email_type="job_digest", sections=sections)
+
+
+    @staticmethod
+    def _sales_html(html_content: str, is_html: bool) -> str:
+        """Vertriebs-Inhalt im Layout (HTML) bzw. als einfaches HTML (Volltext)."""
         if is_html:
             # HTML-Modus: Wrapper mit professionellem Layout
             full_html = f"""
@@ -1401,16 +1571,53 @@ class EmailService:
             </body>
             </html>
             """
-        
+        return full_html
+
+    @_safe_email_call
+    def send_sales_email(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        is_html: bool = True
+    ) -> bool:
+        """
+        Sendet eine Kaltakquise/Vertriebs-E-Mail.
+        Verwendet business@jobon.work als Absender.
+        Unterstützt HTML und Volltext-Modus.
+        """
         return self.send_email(
             to_email=to_email,
             subject=subject,
-            html_content=full_html,
+            html_content=self._sales_html(html_content, is_html),
             email_type="sales",
             from_email="business@jobon.work",
             from_name="JobOn - International Job Placement"
         )
 
+    @_safe_email_call
+    def send_sales_emails(
+        self,
+        to_emails: List[str],
+        subject: str,
+        html_content: str,
+        is_html: bool = True,
+        email_type: str = "sales",
+        sent_by_user_id: Optional[int] = None
+    ) -> bool:
+        """Dieselbe Vertriebs-E-Mail an viele Empfänger als Sammelversand
+        (ohne Substitutionen, bis zu SENDGRID_MAX_PERSONALIZATIONS pro Request).
+        email_type: Typ im E-Mail-Log (eine Zeile pro Empfänger)."""
+        return self.send_bulk(
+            subject=subject,
+            html_content=self._sales_html(html_content, is_html),
+            recipients=[{"to_email": email} for email in to_emails],
+            email_type=email_type,
+            from_email="business@jobon.work",
+            from_name="JobOn - International Job Placement",
+            sent_by_user_id=sent_by_user_id
+        )
+
 
     @_safe_email_call
     def send_company_weekly_report(
@@ -1536,60 +1743,21 @@ class EmailService:
         """
         return self.send_email(to_email, subject, html_content, email_type="company_expiry_reminder")
 
-    @_safe_email_call
-    def send_company_applicant_digest(
-        self,
-        to_email: str,
-        company_name: str,
-        applicants_data: List[dict]
-    ) -> bool:
-        """
-        Sendet eine tägliche Übersicht neuer Bewerber an eine Firma.
-        applicants_data: Liste von {name, job_title, matching_score, applied_at, application_id}
-        """
-        if not applicants_data:
-            return True  # Keine Bewerber = keine E-Mail nötig
-        
-        # Sortiere nach Matching Score (höchster zuerst)
-        sorted_applicants = sorted(applicants_data, key=lambda x: x.get('matching_score', 0), reverse=True)
-        
-        # Bewerber-Tabelle erstellen
-        applicant_rows = ""
-        for app in sorted_applicants:
-            score = app.get('matching_score', 0)
-            score_color = "#22c55e" if score >= 80 else "#f59e0b" if score >= 60 else "#6b7280"
-            applicant_rows += f"""
-            <tr>
-                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
-                    <strong>{app.get('name', 'Unbekannt')}</strong>
-                </td>
-                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
-                    {app.get('job_title', '-')}
-                </td>
-                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb; text-align: center;">
-                    <span style="background: {score_color}; color: white; padding: 4px 12px; border-radius: 20px; font-weight: bold;">
-                        {score}%
-                    </span>
-                </td>
-                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
-                    {app.get('applied_at', '-')}
-                </td>
-            </tr>
-            """
-        
-        subject = f"📋 {len(applicants_data)} neue Bewerber für {company_name}"
-        
-        html_content = f"""
+    def _company_digest_template(self):
+        """Betreff und HTML des Bewerber-Digests mit den Platzhaltern [[company]],
+        [[count]] und [[rows]] (Tabellenzeilen der Bewerber)."""
+        subject = "📋 [[count]] neue Bewerber für [[company]]"
+        html_content = """
         <html>
         <body style="font-family: Arial, sans-serif; max-width: 700px; margin: 0 auto; background: #f9fafb;">
             <div style="background: linear-gradient(135deg, #2563eb, #1d4ed8); color: white; padding: 30px; text-align: center;">
                 <h1 style="margin: 0;">Neue Bewerber-Übersicht</h1>
-                <p style="margin: 10px 0 0 0; opacity: 0.9;">Täglicher Digest für {company_name}</p>
+                <p style="margin: 10px 0 0 0; opacity: 0.9;">Täglicher Digest für [[company]]</p>
             </div>
             
             <div style="padding: 30px; background: white;">
                 <p style="color: #374151; font-size: 16px;">
-                    Sie haben <strong>{len(applicants_data)} neue Bewerbung(en)</strong> erhalten.
+                    Sie haben <strong>[[count]] neue Bewerbung(en)</strong> erhalten.
                     Die Bewerber sind nach Matching-Score sortiert.
                 </p>
                 
@@ -1603,7 +1771,7 @@ class EmailService:
                         </tr>
                     </thead>
                     <tbody>
-                        {applicant_rows}
+                        [[rows]]
                     </tbody>
                 </table>
                 
@@ -1627,14 +1795,77 @@ class EmailService:
         </body>
         </html>
         """
+        return subject, html_content
+
+    def _company_digest_recipient(self, to_email: str, company_name: str, applicants_data: List[dict]) -> dict:
+        """Substitutionen einer Firma (Bewerber nach Matching-Score sortiert)."""
+        # Sortiere nach Matching Score (höchster zuerst)
+        sorted_applicants = sorted(applicants_data, key=lambda x: x.get('matching_score', 0), reverse=True)
+        
+        # Bewerber-Tabelle erstellen
+        applicant_rows = ""
+        for app in sorted_applicants:
+            score = app.get('matching_score', 0)
+            score_color = "#22c55e" if score >= 80 else "#f59e0b" if score >= 60 else "#6b7280"
+            applicant_rows += f"""
+            <tr>
+                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
+                    <strong>{app.get('name', 'Unbekannt')}</strong>
+                </td>
+                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
+                    {app.get('job_title', '-')}
+                </td>
+                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb; text-align: center;">
+                    <span style="background: {score_color}; color: white; padding: 4px 12px; border-radius: 20px; font-weight: bold;">
+                        {score}%
+                    </span>
+                </td>
+                <td style="padding: 12px; border-bottom: 1px solid #e5e7eb;">
+                    {app.get('applied_at', '-')}
+                </td>
+            </tr>
+            """
         
+        return {"to_email": to_email, "substitutions": {
+            bulk_tag("company"): company_name,
+            bulk_tag("count"): str(len(applicants_data)),
+            bulk_tag("rows"): applicant_rows,
+        }}
+
+    @_safe_email_call
+    def send_company_applicant_digest(
+        self,
+        to_email: str,
+        company_name: str,
+        applicants_data: List[dict]
+    ) -> bool:
+        """
+        Sendet eine tägliche Übersicht neuer Bewerber an eine Firma.
+        applicants_data: Liste von {name, job_title, matching_score, applied_at, application_id}
+        """
+        if not applicants_data:
+            return True  # Keine Bewerber = keine E-Mail nötig
+        
+        subject, html_content = self._company_digest_template()
+        subs = self._company_digest_recipient(to_email, company_name, applicants_data)["substitutions"]
         return self.send_email(
             to_email=to_email,
-            subject=subject,
-            html_content=html_content,
+            subject=render_bulk(subject, subs),
+            html_content=render_bulk(html_content, subs),
             email_type="company_digest"
         )
 
+    @_safe_email_call
+    def send_company_applicant_digests(self, digests: List[dict]) -> bool:
+        """Bewerber-Digests vieler Firmen als Sammelversand.
+        digests = [{"to_email", "company_name", "applicants_data"}]."""
+        subject, html_content = self._company_digest_template()
+        recipients = [
+            self._company_digest_recipient(d["to_email"], d["company_name"], d["applicants_data"])
+            for d in digests if d.get("applicants_data")
+        ]
+        return self.send_bulk(subject, html_content, recipients, email_type="company_digest")
+
 
 # Singleton - CRASH-SAFE initialisiert
 try:
@@ -0,0 +1,78 @@
+"""
+Vorkompilierte E-Mail-Vorlagen (Jinja2) für den Sammelversand
+
+Die Vorlagen liegen in app/templates/email/ und werden einmal kompiliert
+(warm_email_templates beim App-Start). render_fragment rendert eine Vorlage und cacht
+das Ergebnis anhand aller Eingaben:
+- Rahmen (Header, Footer, Texte je Sprache) mit Platzhaltern wie [[name]] -> einmal
+  pro Sprache bzw. Stelle,
+- Job-Karten, die in vielen Digests vorkommen -> einmal pro Stelle (+ Score/Sprache).
+
+Pro Empfänger bleiben so nur die Substitutionen (siehe EmailService.send_bulk).
+Ausgabe ohne Autoescaping – identisch zu den bisherigen f-Strings. Eingesetzte Werte
+(Stellentitel, Firmenname, ...) laufen durch neutralize_bulk_tags, damit sie keine
+Platzhalter einschleusen.
+"""
+import logging
+import os
+import re
+from functools import lru_cache
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
+from app.services.email_i18n import BOOST_DIGEST_TEXTS
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'email')
+
+# Gerenderte Rahmen/Job-Karten im Speicher (Schlüssel = alle Eingaben, daher nie veraltet)
+FRAGMENT_CACHE_SIZE = 4096
+
+_TAG_BRACKETS_RE = re.compile(r"\[{2,}|\]{2,}")
+
+
+def neutralize_bulk_tags(value):
+    """Macht aus "[[" bzw. "]]" in freien Texten (Namen, Stellentitel) ein einzelnes
+    "[" bzw. "]" – sonst würden sie lokal und bei SendGrid als Platzhalter bzw.
+    Section ersetzt ("[[jobs]]" als Bewerbername). Nicht-Strings bleiben unverändert."""
+    if not isinstance(value, str):
+        return value
+    return _TAG_BRACKETS_RE.sub(lambda m: m.group(0)[0], value)
+
+
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=False,
+    keep_trailing_newline=True,
+    undefined=StrictUndefined,
+    auto_reload=False,
+    cache_size=-1,
+    finalize=neutralize_bulk_tags,
+)
+_env.globals["boost_digest_texts"] = BOOST_DIGEST_TEXTS
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def render_fragment(name: str, **context) -> str:
+    """Rendert die Vorlage name (gecacht; Kontextwerte müssen hashbar sein)."""
+    return _env.get_template(name).render(**context)
+
+
+def warm_email_templates() -> int:
+    """Kompiliert alle E-Mail-Vorlagen und rendert die sprachabhängigen Rahmen vor.
+
+    Returns: Anzahl kompilierter Vorlagen
+    """
+    from app.core.config import settings
+
+    names = _env.list_templates(extensions=["html"])
+    for name in names:
+        _env.get_template(name)
+
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'https://www.jobon.work')
+    for lang in BOOST_DIGEST_TEXTS:
+        render_fragment("boost_digest.html", lang=lang, frontend_url=frontend_url)
+    render_fragment("weekly_digest.html", frontend_url=frontend_url)
+    logger.info(f"{len(names)} E-Mail-Vorlagen kompiliert")
+    return len(names)
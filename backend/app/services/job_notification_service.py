@@ -4,60 +4,87 @@ Job Notification Service
 Sends email notifications to applicants when matching jobs are posted.
 Also handles weekly digest emails.
 """
+import json
 import logging
 from typing import List, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session, contains_eager, joinedload
 
 from app.models.applicant import Applicant
 from app.models.job_posting import JobPosting
 from app.models.user import User
-from app.services.matching_service import calculate_match_score, is_core_fit
-from app.services.settings_service import get_setting
-from app.services.position_groups import get_applicant_position_types, position_compatible
+from app.services.matching_service import MatchingContext, is_core_fit
+from app.services.position_groups import (
+    applicant_position_mask,
+    get_applicant_position_types,
+    job_position_mask,
+    position_compatible,
+)
+from app.services.match_filters import applicant_filters_for_job, job_filters_for_applicant
 
 logger = logging.getLogger(__name__)
 
+# Wochen-Digest: Bewerber pro Chunk (Speicher bleibt flach, Scores je Chunk im Batch)
+DIGEST_CHUNK = 1000
 
-def get_matching_applicants(job: JobPosting, db: Session, threshold: int = 85) -> List[Applicant]:
+
+def get_matching_applicants(job: JobPosting, db: Session, threshold: int = 85,
+                            ctx: Optional[MatchingContext] = None) -> List[dict]:
     """
     Finds all applicants whose profile matches the job above the threshold.
+
+    Hard filters (portal, position type, match filter columns) run in SQL; the
+    remaining applicants are scored via match_scores (missing scores are computed
+    in a batch and stored).
     
     Args:
         job: The job posting to match against
         db: Database session
         threshold: Minimum match score (default 85)
+        ctx: Settings snapshot of the current run (built if omitted)
     
     Returns:
-        List of matching applicants
+        List of {"applicant": Applicant, "score": int}, best score first
+        (no "details" – the stored scores carry no breakdown)
     """
     matching_applicants = []
 
     job_type = job.position_type.value if job.position_type else None
 
-    # Get all active applicants (IJP-Unterportal ausgeschlossen – die bekommen keine JobOn-Alerts)
+    # Active applicants (IJP-Unterportal ausgeschlossen – die bekommen keine JobOn-Alerts).
+    # Harter Filter: nur kompatible Stellenarten (Gruppen-Logik) – bereits in SQL
     applicants = db.query(Applicant).join(
         User, Applicant.user_id == User.id
     ).filter(
         User.is_active == True,
-        Applicant.portal != "ijp"
+        Applicant.portal != "ijp",
+        *applicant_filters_for_job(job)
     ).all()
 
-    for applicant in applicants:
-        # Harter Filter: nur kompatible Stellenarten (Gruppen-Logik)
-        if not position_compatible(get_applicant_position_types(applicant), job_type):
-            continue
-        try:
-            match_result = calculate_match_score(applicant, job, db=db)
-            if match_result.get("total_score", 0) >= threshold:
-                matching_applicants.append({
-                    "applicant": applicant,
-                    "score": match_result["total_score"],
-                    "details": match_result.get("details", [])
-                })
-        except Exception as e:
-            logger.warning(f"Error calculating match for applicant {applicant.id}: {e}")
-            continue
+    # Altbestand ohne position_mask in Python nachprüfen
+    candidates = [
+        a for a in applicants
+        if a.position_mask is not None or position_compatible(get_applicant_position_types(a), job_type)
+    ]
+
+    # Scores aus match_scores; fehlende im Batch berechnen und dort speichern (eigene
+    # Session, damit die geladenen Bewerber nicht per Commit verfallen)
+    from app.core.database import SessionLocal
+    from app.services.match_score_service import get_job_scores
+
+    store_db = SessionLocal()
+    try:
+        scores = get_job_scores(db, job, candidates, ctx=ctx, store_db=store_db)
+    finally:
+        store_db.close()
+    for applicant in candidates:
+        score = scores.get(applicant.id)
+        if score is not None and score >= threshold:
+            matching_applicants.append({
+                "applicant": applicant,
+                "score": score,
+            })
     
     # Sort by score descending
     matching_applicants.sort(key=lambda x: x["score"], reverse=True)
@@ -82,23 +109,36 @@ def notify_applicants_about_new_job(job: JobPosting, db: Session) -> int:
         return 0
 
     # Hinweis: Der Telegram-Broadcast läuft NICHT mehr sofort hier, sondern verzögert
-    # (~5 Min) über den Background-Task telegram_post_pending_jobs() – nur für
+    # (~5 Min) über den Scheduler-Job telegram_post_pending_jobs() – nur für
     # ausreichend ausgefüllte Stellen. Schützt vor Spam bei versehentlichen Posts.
 
     from app.services.email_service import email_service
     from app.models.notification import Notification
 
+    # Alle Einstellungen des Laufs in EINER Query (statt get_setting pro Treffer)
+    ctx = MatchingContext.build(db)
+
     # Check if notifications are enabled
-    notifications_enabled = get_setting(db, "job_notifications_enabled", True)
-    if not notifications_enabled:
+    if not ctx.get("job_notifications_enabled"):
         logger.info("Job notifications are disabled in settings")
         return 0
     
     # Get threshold from settings
-    threshold = get_setting(db, "job_notifications_threshold", 85)
+    threshold = ctx.get("job_notifications_threshold")
+    instant_enabled = ctx.get("instant_job_notifications_enabled")
     
     # Find matching applicants
-    matching = get_matching_applicants(job, db, threshold)
+    matching = get_matching_applicants(job, db, threshold, ctx=ctx)
+
+    # Idempotent: wer zu dieser Stelle schon benachrichtigt wurde (erneuter Task-Lauf,
+    # Reaktivierung), bekommt weder eine zweite In-App-Benachrichtigung noch eine E-Mail
+    already_notified = {
+        user_id for (user_id,) in db.query(Notification.user_id).filter(
+            Notification.type == "new_job",
+            Notification.reference_id == job.id,
+        )
+    }
+    matching = [m for m in matching if m["applicant"].user_id not in already_notified]
     
     if not matching:
         logger.info(f"No matching applicants found for job {job.id} (threshold: {threshold})")
@@ -112,62 +152,68 @@ def notify_applicants_about_new_job(job: JobPosting, db: Session) -> int:
     else:
         employer_name = job.company.company_name if job.company else "Unbekannt"
 
-    notifications_created = 0
-    emails_sent = 0
-    
+    # Nutzer aller Treffer in EINER Query (statt User-Lookup pro Bewerber)
+    users = {
+        row.id: row for row in db.query(User.id, User.email, User.email_job_alerts).filter(
+            User.id.in_({match["applicant"].user_id for match in matching})
+        )
+    }
+
+    notification_rows = []
+    email_recipients = []
+    location = job.location or "Deutschland"
     for match in matching:
         applicant = match["applicant"]
         score = match["score"]
-        
-        # Get user
-        user = db.query(User).filter(User.id == applicant.user_id).first()
+        user = users.get(applicant.user_id)
         if not user:
             continue
         
-        # Create in-app notification
-        try:
-            import json as _json
-            company_name = employer_name
-            notification = Notification(
-                user_id=user.id,
-                type="new_job",
-                reference_id=job.id,
-                reference_type="job",
-                title=f"Neue passende Stelle: {job.title}",
-                message=f"{company_name} in {job.location or 'Deutschland'} - {score}% Match",
-                notification_key="notifications.newJob",
-                notification_params=_json.dumps({"jobTitle": job.title, "company": company_name, "location": job.location or "Deutschland", "score": str(score)})
-            )
-            db.add(notification)
-            notifications_created += 1
-        except Exception as e:
-            logger.error(f"Failed to create notification for user {user.id}: {e}")
+        notification_rows.append({
+            "user_id": user.id,
+            "type": "new_job",
+            "reference_id": job.id,
+            "reference_type": "job",
+            "title": f"Neue passende Stelle: {job.title}",
+            "message": f"{employer_name} in {location} - {score}% Match",
+            "notification_key": "notifications.newJob",
+            "notification_params": json.dumps({"jobTitle": job.title, "company": employer_name, "location": location, "score": str(score)}),
+        })
         
         # Send email notification (if instant notifications enabled UND Bewerber hat Jobalert-Mails aktiv)
-        instant_enabled = get_setting(db, "instant_job_notifications_enabled", True)
         wants_emails = user.email_job_alerts if user.email_job_alerts is not None else True
         if instant_enabled and wants_emails and user.email:
-            try:
-                success = email_service.send_matching_job_notification(
-                    to_email=user.email,
-                    applicant_name=f"{applicant.first_name} {applicant.last_name}",
-                    job_title=job.title,
-                    company_name=employer_name,
-                    location=job.location or "Germany",
-                    match_score=score,
-                    job_slug=f"{job.slug}-{job.id}" if job.slug else str(job.id)
-                )
-                if success:
-                    emails_sent += 1
-            except Exception as e:
-                logger.error(f"Failed to send notification to {user.email}: {e}")
+            email_recipients.append({
+                "to_email": user.email,
+                "applicant_name": f"{applicant.first_name} {applicant.last_name}",
+                "match_score": score,
+            })
     
-    # Commit all notifications
-    try:
-        db.commit()
-    except Exception as e:
-        logger.error(f"Failed to commit notifications: {e}")
-        db.rollback()
+    # Alle In-App-Benachrichtigungen mit EINEM Bulk-Insert
+    notifications_created = 0
+    if notification_rows:
+        try:
+            db.execute(insert(Notification), notification_rows)
+            db.commit()
+            notifications_created = len(notification_rows)
+        except Exception as e:
+            logger.error(f"Failed to create notifications for job {job.id}: {e}")
+            db.rollback()
+    
+    # Alle E-Mails als Sammelversand (ein SendGrid-Request je 1000 Empfänger)
+    emails_sent = 0
+    if email_recipients:
+        try:
+            if email_service.send_matching_job_notifications(
+                job_title=job.title,
+                company_name=employer_name,
+                location=job.location or "Germany",
+                job_slug=f"{job.slug}-{job.id}" if job.slug else str(job.id),
+                recipients=email_recipients,
+            ):
+                emails_sent = len(email_recipients)
+        except Exception as e:
+            logger.error(f"Failed to send notifications for job {job.id}: {e}")
     
     logger.info(f"Created {notifications_created} in-app notifications and sent {emails_sent} emails for job {job.id}")
     return notifications_created
@@ -178,11 +224,14 @@ def get_core_fit_applicants(job: JobPosting, db: Session) -> List[dict]:
     (Stellenart + Pflicht-Sprachen + Arbeitsberechtigung), unabhängig von Profil-
     Vollständigkeit (Erfahrung/Text-Match). Der Match-Score wird trotzdem berechnet –
     nur für die Anzeige in der E-Mail und die Sortierung, NICHT als Filter."""
+    # Stellenart, Pflicht-Sprachen Deutsch/Englisch und Arbeitsberechtigung filtert SQL;
+    # is_core_fit prüft die Überlebenden exakt (inkl. weiterer Sprachen)
     applicants = db.query(Applicant).join(
         User, Applicant.user_id == User.id
     ).filter(
         User.is_active == True,
-        Applicant.portal != "ijp"
+        Applicant.portal != "ijp",
+        *applicant_filters_for_job(job, core_fit=True)
     ).all()
 
     # Kein Score-Rechnen hier: der Booster zeigt keinen Score in der Mail und sendet
@@ -260,8 +309,7 @@ def send_boost_digest_to_applicants(db: Session, cap: int = 8) -> dict:
         User, Applicant.user_id == User.id
     ).filter(User.is_active == True, Applicant.portal != "ijp").all()
 
-    sent = 0
-    recipients = 0
+    digests = []
     for applicant in applicants:
         user = applicant.user
         if not user or not user.email or user.email_job_alerts is False:
@@ -269,14 +317,22 @@ def send_boost_digest_to_applicants(db: Session, cap: int = 8) -> dict:
         jobs = _digest_jobs_for_applicant(applicant, boosted, db, cap=cap)
         if not jobs:
             continue
-        recipients += 1
-        lang = getattr(user, "preferred_language", None) or "en"
+        digests.append({
+            "to_email": user.email,
+            "applicant_name": f"{applicant.first_name} {applicant.last_name}",
+            "matching_jobs": jobs,
+            "lang": getattr(user, "preferred_language", None) or "en",
+        })
+
+    # Sammelversand: eine Vorlage je Sprache, bis zu 1000 Empfänger pro SendGrid-Request
+    sent = 0
+    if digests:
         try:
-            if email_service.send_boost_digest(user.email, f"{applicant.first_name} {applicant.last_name}", jobs, lang=lang):
-                sent += 1
+            if email_service.send_boost_digests(digests):
+                sent = len(digests)
         except Exception as e:
-            logger.error(f"Boost-Digest an {user.email} fehlgeschlagen: {e}")
-    return {"boosted_jobs": len(boosted), "recipients": recipients, "sent": sent}
+            logger.error(f"Boost-Digest-Versand fehlgeschlagen: {e}")
+    return {"boosted_jobs": len(boosted), "recipients": len(digests), "sent": sent}
 
 
 def get_boost_digest_preview(db: Session, cap: int = 8) -> dict:
@@ -325,30 +381,33 @@ def send_boost_emails_for_job(job: JobPosting, db: Session) -> dict:
         employer_name = job.company.company_name if job.company else "Unbekannt"
 
     job_slug = f"{job.slug}-{job.id}" if job.slug else str(job.id)
-    sent = 0
+    recipients = []
     for match in matching:
         applicant = match["applicant"]
-        score = match.get("score", 0)
         user = db.query(User).filter(User.id == applicant.user_id).first()
         if not user or not user.email:
             continue
         # Consent: nur Bewerber mit aktiven Jobalert-Mails
         if user.email_job_alerts is False:
             continue
+        recipients.append({
+            "to_email": user.email,
+            "applicant_name": f"{applicant.first_name} {applicant.last_name}",
+        })
+
+    sent = 0
+    if recipients:
         try:
-            ok = email_service.send_boost_job_notification(
-                to_email=user.email,
-                applicant_name=f"{applicant.first_name} {applicant.last_name}",
+            if email_service.send_boost_job_notifications(
                 job_title=job.title,
                 company_name=employer_name,
                 location=job.location or "Germany",
                 job_slug=job_slug,
-                match_score=score,
-            )
-            if ok:
-                sent += 1
+                recipients=recipients,
+            ):
+                sent = len(recipients)
         except Exception as e:
-            logger.error(f"Boost-Mail an {user.email} fehlgeschlagen: {e}")
+            logger.error(f"Boost-Mails für Job {job.id} fehlgeschlagen: {e}")
 
     logger.info(f"Boost-Mails für Job {job.id}: {sent} von {len(matching)} passenden Bewerbern")
     return {"matched": len(matching), "sent": sent}
@@ -396,7 +455,8 @@ def get_boost_recipients_breakdown(job: JobPosting, db: Session) -> dict:
     }
 
 
-def get_matching_jobs_for_applicant(applicant: Applicant, db: Session, threshold: int = 70, days: int = 7) -> List[dict]:
+def get_matching_jobs_for_applicant(applicant: Applicant, db: Session, threshold: int = 70, days: int = 7,
+                                    ctx: Optional[MatchingContext] = None) -> List[dict]:
     """
     Finds all active jobs that match an applicant's profile.
     
@@ -405,6 +465,7 @@ def get_matching_jobs_for_applicant(applicant: Applicant, db: Session, threshold
         db: Database session
         threshold: Minimum match score
         days: Only consider jobs from the last N days
+        ctx: Settings snapshot of the current run (built if omitted)
     
     Returns:
         List of matching jobs with scores
@@ -415,28 +476,31 @@ def get_matching_jobs_for_applicant(applicant: Applicant, db: Session, threshold
 
     # Get active jobs from the last N days
     cutoff_date = datetime.utcnow() - timedelta(days=days)
+    # Harter Filter: nur kompatible Stellenarten (Gruppen-Logik) – bereits in SQL
     jobs = db.query(JobPosting).filter(
         JobPosting.is_active == True,
         JobPosting.is_draft == False,
-        JobPosting.created_at >= cutoff_date
+        JobPosting.created_at >= cutoff_date,
+        *job_filters_for_applicant(applicant)
     ).all()
 
+    # Altbestand ohne position_mask in Python nachprüfen
+    jobs = [
+        job for job in jobs
+        if job.position_mask is not None
+        or position_compatible(applicant_types, job.position_type.value if job.position_type else None)
+    ]
+
+    # Scores aus match_scores lesen (fehlende/veraltete Paare werden nachberechnet)
+    from app.services.match_score_service import get_applicant_scores
+    scores = get_applicant_scores(db, applicant, [job.id for job in jobs], ctx=ctx)
     for job in jobs:
-        # Harter Filter: nur kompatible Stellenarten (Gruppen-Logik)
-        job_type = job.position_type.value if job.position_type else None
-        if not position_compatible(applicant_types, job_type):
-            continue
-        try:
-            match_result = calculate_match_score(applicant, job, db=db)
-            if match_result.get("total_score", 0) >= threshold:
-                matching_jobs.append({
-                    "job": job,
-                    "score": match_result["total_score"],
-                    "details": match_result.get("details", [])
-                })
-        except Exception as e:
-            logger.warning(f"Error calculating match for job {job.id}: {e}")
-            continue
+        score = scores.get(job.id)
+        if score is not None and score >= threshold:
+            matching_jobs.append({
+                "job": job,
+                "score": score,
+            })
     
     # Sort by score descending
     matching_jobs.sort(key=lambda x: x["score"], reverse=True)
@@ -458,73 +522,111 @@ def send_weekly_job_digest(db: Session) -> int:
     
     logger.info("Starting weekly job digest...")
     
+    # Alle Einstellungen des Laufs in EINER Query
+    ctx = MatchingContext.build(db)
+
     # Check if notifications are enabled
-    notifications_enabled = get_setting(db, "job_notifications_enabled", True)
-    if not notifications_enabled:
+    if not ctx.get("job_notifications_enabled"):
         logger.info("Job notifications are disabled - skipping weekly digest")
         return 0
     
     # Check if weekly digest is enabled
-    digest_enabled = get_setting(db, "weekly_digest_enabled", True)
-    if not digest_enabled:
+    if not ctx.get("weekly_digest_enabled"):
         logger.info("Weekly digest is disabled - skipping")
         return 0
     
-    threshold = get_setting(db, "job_notifications_threshold", 85)
+    threshold = ctx.get("job_notifications_threshold")
     logger.info(f"Using threshold: {threshold}%")
     
-    # Get all active applicants (IJP-Unterportal ausgeschlossen)
-    try:
-        applicants = db.query(Applicant).join(
-            User, Applicant.user_id == User.id
-        ).filter(
-            User.is_active == True,
-            Applicant.portal != "ijp"
-        ).all()
-        logger.info(f"Found {len(applicants)} active applicants")
-    except Exception as e:
-        logger.error(f"Error querying applicants: {e}")
-        raise
-    
-    # Count jobs from last 7 days
+    # Stellen der letzten 7 Tage EINMAL laden (inkl. Firma für die E-Mail)
     cutoff_date = datetime.utcnow() - timedelta(days=7)
-    recent_jobs_count = db.query(JobPosting).filter(
+    recent_jobs = db.query(JobPosting).options(joinedload(JobPosting.company)).filter(
         JobPosting.is_active == True,
         JobPosting.is_draft == False,
         JobPosting.created_at >= cutoff_date
-    ).count()
-    logger.info(f"Active jobs from last 7 days: {recent_jobs_count}")
-    
+    ).all()
+    logger.info(f"Active jobs from last 7 days: {len(recent_jobs)}")
+    if not recent_jobs:
+        return 0
+    job_masks = [
+        (job, job_position_mask(job.position_type.value if job.position_type else None))
+        for job in recent_jobs
+    ]
+
+    from app.core.database import SessionLocal
+    from app.services.match_score_service import get_pair_scores
+
+    # Neue Scores über eine eigene Session speichern: die lesende Session committet
+    # so nie, recent_jobs bleiben geladen und werden nicht pro Chunk neu abgefragt
+    store_db = SessionLocal()
     emails_sent = 0
     applicants_with_matches = 0
+    processed = 0
+    last_id = 0
     
-    for applicant in applicants:
-        user = db.query(User).filter(User.id == applicant.user_id).first()
-        if not user or not user.email:
-            continue
-
-        # Consent: nur Bewerber mit aktiven Jobalert-Mails
-        if user.email_job_alerts is False:
-            continue
+    try:
+        while True:
+            # Aktive Bewerber (IJP-Unterportal ausgeschlossen) mit aktiven Jobalert-Mails,
+            # per Keyset-Pagination in Chunks – User per JOIN gleich mitgeladen
+            chunk = db.query(Applicant).join(
+                User, Applicant.user_id == User.id
+            ).options(
+                contains_eager(Applicant.user)
+            ).filter(
+                Applicant.id > last_id,
+                User.is_active == True,
+                Applicant.portal != "ijp",
+                or_(User.email_job_alerts.is_(None), User.email_job_alerts == True),
+            ).order_by(Applicant.id).limit(DIGEST_CHUNK).all()
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            processed += len(chunk)
+
+            # Harter Filter: nur kompatible Stellenarten (Gruppen-Logik), dann Scores
+            # des ganzen Chunks auf einmal (gespeicherte lesen, fehlende berechnen)
+            candidates = []
+            for applicant in chunk:
+                if not applicant.user.email:
+                    continue
+                mask = applicant_position_mask(get_applicant_position_types(applicant))
+                candidates.append((applicant, [job for job, job_mask in job_masks if mask & job_mask]))
+            scores = get_pair_scores(db, candidates, ctx=ctx, store_db=store_db)
+
+            digests = []
+            for applicant, jobs in candidates:
+                matching_jobs = []
+                for job in jobs:
+                    score = scores.get((applicant.id, job.id))
+                    if score is not None and score >= threshold:
+                        matching_jobs.append({"job": job, "score": score})
+                if not matching_jobs:
+                    continue
+                matching_jobs.sort(key=lambda x: x["score"], reverse=True)
+                applicants_with_matches += 1
+
+                digests.append({
+                    "to_email": applicant.user.email,
+                    "applicant_name": f"{applicant.first_name} {applicant.last_name}",
+                    "matching_jobs": matching_jobs,
+                })
 
-        # Find matching jobs from the last 7 days
-        matching_jobs = get_matching_jobs_for_applicant(applicant, db, threshold, days=7)
-        
-        if not matching_jobs:
-            continue
-        
-        applicants_with_matches += 1
-        
-        try:
-            success = email_service.send_weekly_job_digest(
-                to_email=user.email,
-                applicant_name=f"{applicant.first_name} {applicant.last_name}",
-                matching_jobs=matching_jobs
-            )
-            if success:
-                emails_sent += 1
-        except Exception as e:
-            logger.error(f"Failed to send weekly digest to {user.email}: {e}")
+            # Sammelversand des Chunks (Job-Zeilen als gemeinsame Sections)
+            if digests:
+                try:
+                    if email_service.send_weekly_job_digests(digests):
+                        emails_sent += len(digests)
+                except Exception as e:
+                    logger.error(f"Failed to send weekly digests for chunk ending at applicant {last_id}: {e}")
+
+            # Verarbeitete Bewerber aus der Session lösen -> Speicher bleibt flach
+            for applicant in chunk:
+                db.expunge(applicant.user)
+                db.expunge(applicant)
+            ctx.clear_cv_cache()
+            logger.info(f"Weekly digest: {processed} applicants processed, {emails_sent} emails sent")
+    finally:
+        store_db.close()
     
     logger.info(f"Applicants with matching jobs: {applicants_with_matches}")
     logger.info(f"Sent {emails_sent} weekly digest emails")
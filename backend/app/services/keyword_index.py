@@ -0,0 +1,306 @@
+"""
+Keyword-Index für den Text-Match im Matching
+
+- extract_keywords: normalisierte, um Synonyme erweiterte Token-Menge eines Textes
+- job_text_tokens / applicant_text_tokens: Token-Menge einer Stelle / eines Bewerbers.
+  Wird beim Speichern (Mapper-Events) in job_postings.text_tokens bzw.
+  applicants.text_tokens abgelegt, damit der Text-Match nur noch eine
+  Mengen-Schnittmenge ist statt Tokenisierung pro Paar.
+- KeywordIndex: invertierter In-Memory-Index Token -> IDs. Liefert per
+  Posting-Listen alle Kandidaten mit Text-Überschneidung inkl. Trefferzahl.
+  Lädt in eigener, nur lesender Session; Zeilen ohne text_tokens (Altbestand)
+  tragen die Backfills "job_text_tokens" / "applicant_text_tokens" nach.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect
+
+from app.models.applicant import Applicant
+from app.models.job_posting import JobPosting
+
+logger = logging.getLogger(__name__)
+
+# Stoppwörter (Deutsch/Englisch)
+STOPWORDS = frozenset({
+    'der', 'die', 'das', 'und', 'oder', 'für', 'in', 'bei', 'mit', 'von',
+    'zu', 'auf', 'ist', 'im', 'als', 'auch', 'an', 'nach', 'wie', 'aus',
+    'the', 'and', 'or', 'for', 'in', 'at', 'with', 'from', 'to', 'on',
+    'm', 'w', 'd', 'mwd', 'gmbh', 'ag', 'kg', 'ug', 'mbh', 'hotel', 'stelle'
+})
+
+# Synonyme/verwandte Begriffe
+SYNONYMS = {
+    'housekeeping': frozenset({'reinigung', 'zimmerreinigung', 'zimmermädchen', 'roomkeeper', 'cleaning', 'hauswirtschaft'}),
+    'reinigung': frozenset({'housekeeping', 'zimmerreinigung', 'cleaning', 'sauberkeit'}),
+    'zimmerreinigung': frozenset({'housekeeping', 'reinigung', 'zimmermädchen'}),
+    'küche': frozenset({'koch', 'kochen', 'kitchen', 'küchenhilfe', 'gastro'}),
+    'koch': frozenset({'küche', 'kochen', 'kitchen', 'gastro', 'culinary'}),
+    'service': frozenset({'kellner', 'bedienung', 'gastronomie', 'restaurant', 'waiter'}),
+    'kellner': frozenset({'service', 'bedienung', 'gastronomie', 'waiter'}),
+    'rezeption': frozenset({'empfang', 'reception', 'front', 'desk', 'gästebetreuung'}),
+    'empfang': frozenset({'rezeption', 'reception', 'front', 'desk'}),
+    'pflege': frozenset({'altenpflege', 'krankenpflege', 'care', 'betreuung'}),
+    'lager': frozenset({'logistik', 'warehouse', 'kommissionierung', 'versand'}),
+    'büro': frozenset({'office', 'verwaltung', 'administration', 'sekretariat'}),
+}
+
+# Vollständiger Neuaufbau des In-Memory-Index spätestens nach dieser Zeit
+# (übernimmt Änderungen aus anderen Worker-Prozessen; im Hintergrund-Thread)
+INDEX_REBUILD_SECONDS = 600
+
+
+def extract_keywords(text: str) -> set:
+    """
+    Extrahiert relevante Keywords aus einem Text für Matching.
+    Entfernt Stoppwörter und normalisiert.
+    """
+    if not text:
+        return set()
+
+    # Text in Wörter aufteilen
+    words = set()
+    for word in text.lower().replace('-', ' ').replace('/', ' ').split():
+        # Nur Wörter mit mindestens 3 Zeichen
+        word = ''.join(c for c in word if c.isalnum())
+        if len(word) >= 3 and word not in STOPWORDS:
+            words.add(word)
+            # Synonyme hinzufügen
+            synonyms = SYNONYMS.get(word)
+            if synonyms:
+                words.update(synonyms)
+
+    return words
+
+
+def job_text_tokens(job: JobPosting) -> set:
+    """Token-Menge einer Stelle (Titel, Beschreibung, Aufgaben, Anforderungen, Benefits)."""
+    return extract_keywords(" ".join(filter(None, [
+        job.title,
+        job.description,
+        job.tasks,
+        job.requirements,
+        job.benefits
+    ])).lower())
+
+
+def applicant_text_tokens(applicant: Applicant) -> set:
+    """Token-Menge eines Bewerbers (Erfahrung, Zusatzinfos, Beruf/Fachrichtung)."""
+    applicant_texts = []
+
+    # Berufserfahrung (strukturiert)
+    if applicant.work_experiences:
+        try:
+            for exp in applicant.work_experiences:
+                if isinstance(exp, dict):
+                    applicant_texts.append(exp.get("position", ""))
+                    applicant_texts.append(exp.get("description", ""))
+                    applicant_texts.append(exp.get("company", ""))
+        except:
+            pass
+
+    # Berufserfahrung (Freitext)
+    if applicant.work_experience:
+        applicant_texts.append(applicant.work_experience)
+
+    # Zusätzliche Infos
+    if applicant.additional_info:
+        applicant_texts.append(applicant.additional_info)
+
+    # Gewünschter Beruf / Fachrichtung
+    if applicant.profession:
+        applicant_texts.append(applicant.profession)
+    if applicant.desired_profession:
+        applicant_texts.append(applicant.desired_profession)
+    if applicant.preferred_work_area:
+        applicant_texts.append(applicant.preferred_work_area)
+    if applicant.field_of_study:
+        applicant_texts.append(applicant.field_of_study)
+
+    return extract_keywords(" ".join(filter(None, applicant_texts)).lower())
+
+
+def stored_tokens(obj) -> Optional[List[str]]:
+    """Gespeicherte text_tokens, sofern sie zum aktuellen Objektzustand passen.
+
+    None, wenn noch nichts gespeichert ist (Altbestand) oder das Objekt seit dem
+    Laden geändert wurde – dann muss der Aufrufer selbst tokenisieren.
+    """
+    tokens = getattr(obj, "text_tokens", None)
+    if tokens is None:
+        return None
+    state = inspect(obj, raiseerr=False)
+    if state is None or not state.persistent or state.modified:
+        return None
+    return tokens
+
+
+class KeywordIndex:
+    """Invertierter Index Token -> IDs für Stellen ODER Bewerber.
+
+    Neben den Posting-Listen wird pro ID die indizierte Token-Liste gehalten;
+    Aufrufer können damit prüfen, ob der Index zum gerade geladenen Objekt passt,
+    und ansonsten selbst schneiden (Index bleibt so reiner Beschleuniger).
+    """
+
+    def __init__(self, model, tokenize):
+        self._model = model
+        self._tokenize = tokenize
+        self._postings: Dict[str, Set[int]] = {}
+        self._entries: Dict[int, List[str]] = {}
+        self._built_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._refreshing = False
+
+    def _add(self, obj_id: int, tokens: List[str]) -> None:
+        old = self._entries.get(obj_id)
+        if old is not None:
+            for token in old:
+                ids = self._postings.get(token)
+                if ids is not None:
+                    ids.discard(obj_id)
+        self._entries[obj_id] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(obj_id)
+
+    def update(self, obj_id: int, tokens: List[str]) -> None:
+        """Aktualisiert einen Eintrag (nur falls der Index bereits aufgebaut ist)."""
+        if self._built_at is None:
+            return
+        with self._lock:
+            self._add(obj_id, tokens)
+
+    def remove(self, obj_id: int) -> None:
+        with self._lock:
+            for token in self._entries.pop(obj_id, ()):
+                ids = self._postings.get(token)
+                if ids is not None:
+                    ids.discard(obj_id)
+
+    def rebuild(self) -> None:
+        """Lädt alle gespeicherten Token-Listen in eigener Session (ohne Commit) und
+        ersetzt den Index. Zeilen ohne text_tokens fehlen – Aufrufer schneiden dann selbst."""
+        from app.core.database import SessionLocal
+
+        model = self._model
+        db = SessionLocal()
+        try:
+            rows = db.query(model.id, model.text_tokens).all()
+        finally:
+            db.close()
+        with self._lock:
+            self._postings = {}
+            self._entries = {}
+            for obj_id, tokens in rows:
+                if tokens is not None:
+                    self._add(obj_id, tokens)
+            self._built_at = time.monotonic()
+
+    def _refresh(self) -> None:
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.warning(f"Keyword-Index {self._model.__tablename__} nicht neu aufgebaut: {e}")
+        finally:
+            self._refreshing = False
+
+    def ensure_built(self) -> None:
+        """Baut den Index beim ersten Zugriff auf (blockierend, einmal pro Prozess).
+        Nach INDEX_REBUILD_SECONDS wird er im Hintergrund-Thread neu aufgebaut; bis dahin
+        bleibt der bisherige Index in Gebrauch."""
+        if self._built_at is None:
+            with self._build_lock:
+                if self._built_at is None:
+                    self.rebuild()
+            return
+        if time.monotonic() - self._built_at < INDEX_REBUILD_SECONDS or self._refreshing:
+            return
+        with self._build_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name=f"keyword-index-{self._model.__tablename__}",
+                         daemon=True).start()
+
+    def entry(self, obj_id: int) -> Optional[List[str]]:
+        """Indizierte Token-Liste einer ID (None, falls nicht im Index)."""
+        return self._entries.get(obj_id)
+
+    def overlap_counts(self, tokens: Iterable[str]) -> Dict[int, int]:
+        """Anzahl gemeinsamer Tokens je ID – nur IDs mit Überschneidung > 0."""
+        counts: Dict[int, int] = {}
+        with self._lock:
+            for token in tokens:
+                for obj_id in self._postings.get(token, ()):
+                    counts[obj_id] = counts.get(obj_id, 0) + 1
+        return counts
+
+    def candidates(self, tokens: Iterable[str]) -> Set[int]:
+        """IDs mit mindestens einem gemeinsamen Token."""
+        result: Set[int] = set()
+        with self._lock:
+            for token in tokens:
+                result.update(self._postings.get(token, ()))
+        return result
+
+
+job_index = KeywordIndex(JobPosting, job_text_tokens)
+applicant_index = KeywordIndex(Applicant, applicant_text_tokens)
+
+
+# ==================== MAPPER-EVENTS ====================
+# text_tokens werden bei jedem INSERT/UPDATE aus den aktuellen Feldern berechnet
+# und der In-Memory-Index dieses Prozesses nachgezogen.
+
+_JOB_TEXT_FIELDS = ("title", "description", "tasks", "requirements", "benefits")
+_APPLICANT_TEXT_FIELDS = (
+    "work_experiences", "work_experience", "additional_info", "profession",
+    "desired_profession", "preferred_work_area", "field_of_study",
+)
+
+
+def _text_changed(target, fields) -> bool:
+    if target.text_tokens is None:
+        return True
+    attrs = inspect(target).attrs
+    return any(attrs[name].history.has_changes() for name in fields)
+
+
+def _set_job_tokens(mapper, connection, target):
+    # z.B. view_count-Updates nicht neu tokenisieren
+    if _text_changed(target, _JOB_TEXT_FIELDS):
+        target.text_tokens = sorted(job_text_tokens(target))
+
+
+def _set_applicant_tokens(mapper, connection, target):
+    if _text_changed(target, _APPLICANT_TEXT_FIELDS):
+        target.text_tokens = sorted(applicant_text_tokens(target))
+
+
+def _index_job(mapper, connection, target):
+    job_index.update(target.id, target.text_tokens or [])
+
+
+def _index_applicant(mapper, connection, target):
+    applicant_index.update(target.id, target.text_tokens or [])
+
+
+def _unindex_job(mapper, connection, target):
+    job_index.remove(target.id)
+
+
+def _unindex_applicant(mapper, connection, target):
+    applicant_index.remove(target.id)
+
+
+for _evt in ("before_insert", "before_update"):
+    event.listen(JobPosting, _evt, _set_job_tokens)
+    event.listen(Applicant, _evt, _set_applicant_tokens)
+for _evt in ("after_insert", "after_update"):
+    event.listen(JobPosting, _evt, _index_job)
+    event.listen(Applicant, _evt, _index_applicant)
+event.listen(JobPosting, "after_delete", _unindex_job)
+event.listen(Applicant, "after_delete", _unindex_applicant)
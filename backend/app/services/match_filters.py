@@ -0,0 +1,129 @@
+"""
+SQL-Vorfilter für das Matching
+
+Harte Filter (Stellenart-Gruppen, Pflicht-Sprachen, Arbeitsberechtigung) laufen als
+WHERE-Bedingungen in der Datenbank, damit inkompatible Bewerber/Stellen gar nicht
+erst als ORM-Objekte geladen werden. Dafür werden beim Speichern (Mapper-Events)
+denormalisierte Spalten gepflegt:
+
+- position_mask:              Bewerber = Bits aller passenden Stellenarten,
+                              Stelle   = Bit der eigenen Stellenart
+- german_level_ord / english_level_ord:        Sprachniveau des Bewerbers als Zahl
+- german_required_ord / english_required_ord:  gefordertes Niveau der Stelle als Zahl
+
+Die Spalten sind reine Beschleuniger: Zeilen ohne Werte (Altbestand vor dem
+Backfill) werden durchgelassen und vom Aufrufer in Python geprüft.
+"""
+import logging
+from typing import List
+
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session
+
+from app.models.applicant import Applicant
+from app.models.job_posting import JobPosting
+from app.services.matching_service import LANGUAGE_LEVEL_ORDER
+from app.services.position_groups import (
+    applicant_position_mask,
+    get_applicant_position_types,
+    job_position_mask,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sprachniveaus, die "nicht gefordert" bedeuten (wie _language_required_met)
+_NOT_REQUIRED_LEVELS = ("not_required", "none", "keine", "")
+
+
+def level_ordinal(level) -> int:
+    """Sprachniveau (Enum oder String) als Zahl gemäß LANGUAGE_LEVEL_ORDER."""
+    value = level.value if hasattr(level, "value") else level
+    return LANGUAGE_LEVEL_ORDER.get(value or "keine", 0)
+
+
+def required_ordinal(level) -> int:
+    """Gefordertes Sprachniveau als Zahl (0 = nicht gefordert)."""
+    value = level.value if hasattr(level, "value") else level
+    if (value or "not_required") in _NOT_REQUIRED_LEVELS:
+        return 0
+    return LANGUAGE_LEVEL_ORDER.get(value, 0)
+
+
+def _set_applicant_columns(applicant: Applicant) -> None:
+    applicant.position_mask = applicant_position_mask(get_applicant_position_types(applicant))
+    applicant.german_level_ord = level_ordinal(applicant.german_level)
+    applicant.english_level_ord = level_ordinal(applicant.english_level)
+
+
+def _set_job_columns(job: JobPosting) -> None:
+    job.position_mask = job_position_mask(job.position_type.value if job.position_type else None)
+    job.german_required_ord = required_ordinal(job.german_required)
+    job.english_required_ord = required_ordinal(job.english_required)
+
+
+# ==================== SQL-PRÄDIKATE ====================
+
+def _required_language(job_importance, required_ord: int, applicant_ord_column):
+    """Pflicht-Sprache erfüllt (nur wenn wichtig UND gefordert, sonst kein Filter)."""
+    if (job_importance or "required").lower() != "required" or required_ord <= 0:
+        return None
+    return or_(applicant_ord_column.is_(None), applicant_ord_column >= required_ord)
+
+
+def applicant_filters_for_job(job: JobPosting, core_fit: bool = False) -> list:
+    """WHERE-Bedingungen für Bewerber, die zu einer Stelle passen können.
+
+    Immer: Stellenart-Gruppe. core_fit=True zusätzlich die Pflicht-Sprachen
+    Deutsch/Englisch und die Arbeitsberechtigung (wie is_core_fit; weitere
+    Sprachen prüft der Aufrufer in Python).
+    """
+    job_bit = job_position_mask(job.position_type.value if job.position_type else None)
+    if not job_bit:
+        return [Applicant.id.is_(None)]  # ohne Stellenart passt niemand
+    filters = [or_(Applicant.position_mask.is_(None), Applicant.position_mask.op("&")(job_bit) != 0)]
+    if core_fit:
+        for importance, level, column in (
+            (getattr(job, "german_importance", "required"), job.german_required, Applicant.german_level_ord),
+            (getattr(job, "english_importance", "required"), job.english_required, Applicant.english_level_ord),
+        ):
+            condition = _required_language(importance, required_ordinal(level), column)
+            if condition is not None:
+                filters.append(condition)
+        if (getattr(job, "work_authorization_requirement", "not_relevant") or "not_relevant") == "required":
+            filters.append(or_(Applicant.work_authorized.is_(None), Applicant.work_authorized == True))
+    return filters
+
+
+def job_filters_for_applicant(applicant: Applicant) -> list:
+    """WHERE-Bedingungen für Stellen, die zu einem Bewerber passen können: Stellenart-Gruppe
+    (Gegenstück zu applicant_filters_for_job ohne core_fit)."""
+    mask = applicant_position_mask(get_applicant_position_types(applicant))
+    return [or_(JobPosting.position_mask.is_(None), JobPosting.position_mask.op("&")(mask) != 0)]
+
+
+# ==================== BACKFILL ====================
+
+def fill_filter_columns(db: Session, model, lo: int, hi: int) -> int:
+    """Befüllt die Filter-Spalten im ID-Block lo..hi (Zeilen mit position_mask IS NULL),
+    ohne Commit (Backfills "applicant_match_filters" / "job_match_filters").
+    Returns: Anzahl aktualisierter Zeilen."""
+    setter = _set_applicant_columns if model is Applicant else _set_job_columns
+    rows: List = db.query(model).filter(model.id.between(lo, hi), model.position_mask.is_(None)).all()
+    for row in rows:
+        setter(row)
+    return len(rows)
+
+
+# ==================== MAPPER-EVENTS ====================
+
+def _on_applicant_save(mapper, connection, target):
+    _set_applicant_columns(target)
+
+
+def _on_job_save(mapper, connection, target):
+    _set_job_columns(target)
+
+
+for _evt in ("before_insert", "before_update"):
+    event.listen(Applicant, _evt, _on_applicant_save)
+    event.listen(JobPosting, _evt, _on_job_save)
@@ -0,0 +1,357 @@
+"""
+Match-Score-Service
+
+Pflegt die materialisierte Tabelle match_scores (Bewerber × Stelle):
+- Stelle geändert      -> nur die Spalte dieser Stelle wird neu berechnet
+- Profil geändert      -> nur die Zeile dieses Bewerbers wird neu berechnet
+- Scorer-Version neu   -> veraltete Einträge werden beim nächsten Lesen der
+                          betroffenen Spalte/Zeile nachberechnet
+
+Lesepfade fragen nur fehlende/veraltete Paare live an und lesen den Rest per
+indizierter Query (ix_match_scores_job_score / ix_match_scores_applicant_score).
+Fehlen für eine Top-Liste sehr viele Paare (neue Scorer-Version, frische Stelle
+bei 50k Bewerbern), werden nur die Top-K per Schranken-Pruning bewertet – die
+fehlenden Bewerber werden dabei in Blöcken gelesen, nie alle auf einmal.
+
+Stellen-Änderungen verwerfen die Spalte nur, wenn ein bewertungsrelevantes Feld
+betroffen ist (job_scoring_changed); neu berechnet wird erst beim nächsten Lesen.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.applicant import Applicant
+from app.models.job_posting import JobPosting
+from app.models.match_score import MatchScore
+from app.services.matching_service import (
+    MatchingContext,
+    calculate_match_scores_batch,
+    calculate_match_scores_for_applicant,
+    top_k_matches_for_applicant,
+    top_k_matches_for_job,
+)
+
+logger = logging.getLogger(__name__)
+
+# Chunk-Größe für IN-Listen beim Schreiben
+_WRITE_CHUNK = 1000
+
+# Bis zu so vielen fehlenden Paaren füllen Top-Listen die Spalte/Zeile komplett auf,
+# darüber wird per Top-K-Pruning nur das Nötige bewertet
+_EAGER_FILL_LIMIT = 2000
+
+# Fehlende Bewerber einer Stelle pro Block beim Top-K-Pruning
+_READ_CHUNK = 2000
+
+
+def _job_applicants_query(db: Session):
+    """Bewerber, die für Firmenstellen gematcht werden (IJP-Unterportal ausgenommen)."""
+    return db.query(Applicant).filter(Applicant.portal != "ijp")
+
+
+def _applicant_jobs_query(db: Session):
+    """Stellen, die für Bewerber gematcht werden."""
+    return db.query(JobPosting).filter(JobPosting.is_active == True)
+
+
+def _store(db: Session, rows: List[Tuple[int, int, int]], version: str) -> None:
+    """Schreibt (applicant_id, job_id, score)-Tupel; vorhandene Paare werden ersetzt."""
+    if not rows:
+        return
+    try:
+        for i in range(0, len(rows), _WRITE_CHUNK):
+            chunk = rows[i:i + _WRITE_CHUNK]
+            # Ein DELETE je Stelle bzw. je Bewerber – je nachdem, was weniger sind
+            # (Spalte einer Stelle vs. Bewerber-Block aus dem Digest)
+            by_job: Dict[int, List[int]] = {}
+            by_applicant: Dict[int, List[int]] = {}
+            for applicant_id, job_id, _ in chunk:
+                by_job.setdefault(job_id, []).append(applicant_id)
+                by_applicant.setdefault(applicant_id, []).append(job_id)
+            if len(by_job) <= len(by_applicant):
+                for job_id, applicant_ids in by_job.items():
+                    db.query(MatchScore).filter(
+                        MatchScore.job_id == job_id,
+                        MatchScore.applicant_id.in_(applicant_ids),
+                    ).delete(synchronize_session=False)
+            else:
+                for applicant_id, job_ids in by_applicant.items():
+                    db.query(MatchScore).filter(
+                        MatchScore.applicant_id == applicant_id,
+                        MatchScore.job_id.in_(job_ids),
+                    ).delete(synchronize_session=False)
+            db.bulk_insert_mappings(MatchScore, [
+                {"applicant_id": a, "job_id": j, "score": s, "scorer_version": version}
+                for a, j, s in chunk
+            ])
+        db.commit()
+    except Exception as e:
+        # Parallel berechnet (Unique-Konflikt) o.ä. – Scores sind beim nächsten Lesen wieder da
+        db.rollback()
+        logger.warning(f"match_scores konnten nicht gespeichert werden: {e}")
+
+
+def _missing_job_applicants_query(db: Session, job: JobPosting, version: str):
+    current = select(MatchScore.applicant_id).where(
+        MatchScore.job_id == job.id,
+        MatchScore.scorer_version == version,
+    )
+    return _job_applicants_query(db).filter(~Applicant.id.in_(current))
+
+
+def _missing_applicant_jobs_query(db: Session, applicant: Applicant, version: str):
+    current = select(MatchScore.job_id).where(
+        MatchScore.applicant_id == applicant.id,
+        MatchScore.scorer_version == version,
+    )
+    return _applicant_jobs_query(db).filter(~JobPosting.id.in_(current))
+
+
+def ensure_job_scores(db: Session, job: JobPosting, applicant_ids: Optional[Iterable[int]] = None,
+                      ctx: Optional[MatchingContext] = None, missing: Optional[List[Applicant]] = None) -> None:
+    """Berechnet fehlende oder veraltete Scores einer Stelle nach (nur diese Paare)."""
+    ctx = ctx or MatchingContext.build(db)
+    version = ctx.scorer_version
+    if missing is None:
+        query = _missing_job_applicants_query(db, job, version)
+        if applicant_ids is not None:
+            query = query.filter(Applicant.id.in_(list(applicant_ids)))
+        missing = query.all()
+    if not missing:
+        return
+    totals = calculate_match_scores_batch(job, missing, db=db, ctx=ctx)
+    _store(db, [(a.id, job.id, t) for a, t in zip(missing, totals) if t is not None], version)
+
+
+def ensure_applicant_scores(db: Session, applicant: Applicant, job_ids: Optional[Iterable[int]] = None,
+                            ctx: Optional[MatchingContext] = None, missing: Optional[List[JobPosting]] = None) -> None:
+    """Berechnet fehlende oder veraltete Scores eines Bewerbers nach (nur diese Paare)."""
+    ctx = ctx or MatchingContext.build(db)
+    version = ctx.scorer_version
+    if missing is None:
+        query = _missing_applicant_jobs_query(db, applicant, version)
+        if job_ids is not None:
+            query = query.filter(JobPosting.id.in_(list(job_ids)))
+        missing = query.all()
+    if not missing:
+        return
+    totals = calculate_match_scores_for_applicant(applicant, missing, db=db, ctx=ctx)
+    _store(db, [(applicant.id, j.id, t) for j, t in zip(missing, totals) if t is not None], version)
+
+
+def get_applicant_scores(db: Session, applicant: Applicant, job_ids: List[int],
+                         ctx: Optional[MatchingContext] = None) -> Dict[int, int]:
+    """Scores eines Bewerbers für die angegebenen Stellen: {job_id: score}."""
+    if not job_ids:
+        return {}
+    ctx = ctx or MatchingContext.build(db)
+    version = ctx.scorer_version
+    ensure_applicant_scores(db, applicant, job_ids, ctx=ctx)
+    rows = db.query(MatchScore.job_id, MatchScore.score).filter(
+        MatchScore.applicant_id == applicant.id,
+        MatchScore.scorer_version == version,
+        MatchScore.job_id.in_(job_ids),
+    ).all()
+    return {job_id: score for job_id, score in rows}
+
+
+def get_job_scores(db: Session, job: JobPosting, applicants: List[Applicant],
+                   ctx: Optional[MatchingContext] = None,
+                   store_db: Optional[Session] = None) -> Dict[int, int]:
+    """Scores einer Stelle für die angegebenen Bewerber: {applicant_id: score}.
+
+    Vorhandene kommen aus match_scores, fehlende werden im Batch berechnet und
+    gespeichert – in store_db, falls angegeben (wie get_pair_scores).
+    """
+    ctx = ctx or MatchingContext.build(db)
+    version = ctx.scorer_version
+    applicant_ids = [applicant.id for applicant in applicants]
+    scores: Dict[int, int] = {}
+    for i in range(0, len(applicant_ids), _WRITE_CHUNK):
+        rows = db.query(MatchScore.applicant_id, MatchScore.score).filter(
+            MatchScore.job_id == job.id,
+            MatchScore.scorer_version == version,
+            MatchScore.applicant_id.in_(applicant_ids[i:i + _WRITE_CHUNK]),
+        )
+        scores.update({applicant_id: score for applicant_id, score in rows})
+
+    missing = [applicant for applicant in applicants if applicant.id not in scores]
+    if missing:
+        totals = calculate_match_scores_batch(job, missing, db=db, ctx=ctx)
+        fresh = [(a.id, job.id, t) for a, t in zip(missing, totals) if t is not None]
+        scores.update({applicant_id: total for applicant_id, _, total in fresh})
+        _store(store_db or db, fresh, version)
+    return scores
+
+
+def get_pair_scores(db: Session, candidates: List[Tuple[Applicant, List[JobPosting]]],
+                    ctx: Optional[MatchingContext] = None,
+                    store_db: Optional[Session] = None) -> Dict[Tuple[int, int], int]:
+    """Scores für einen Block Bewerber × Stellen (z.B. einen Digest-Chunk):
+    {(applicant_id, job_id): score}.
+
+    Vorhandene Scores kommen aus einer Query je Stellen-Block, fehlende Paare werden
+    pro Bewerber im Batch berechnet (CV-Daten des Blocks vorab in einer Query).
+    Gespeichert wird in store_db, falls angegeben – die lesende Session committet
+    dann nicht, ihre geladenen Objekte bleiben gültig.
+    """
+    ctx = ctx or MatchingContext.build(db)
+    version = ctx.scorer_version
+    applicant_ids = [applicant.id for applicant, jobs in candidates if jobs]
+    job_ids = sorted({job.id for _, jobs in candidates for job in jobs})
+    scores: Dict[Tuple[int, int], int] = {}
+    if not applicant_ids:
+        return scores
+
+    for i in range(0, len(job_ids), _WRITE_CHUNK):
+        rows = db.query(MatchScore.applicant_id, MatchScore.job_id, MatchScore.score).filter(
+            MatchScore.scorer_version == version,
+            MatchScore.applicant_id.in_(applicant_ids),
+            MatchScore.job_id.in_(job_ids[i:i + _WRITE_CHUNK]),
+        )
+        scores.update({(applicant_id, job_id): score for applicant_id, job_id, score in rows})
+
+    missing = [
+        (applicant, [job for job in jobs if (applicant.id, job.id) not in scores])
+        for applicant, jobs in candidates
+    ]
+    missing = [(applicant, jobs) for applicant, jobs in missing if jobs]
+    if not missing:
+        return scores
+
+    ctx.parsed_cvs([applicant.id for applicant, _ in missing if ctx.needs_cv(applicant)], db)
+    fresh: List[Tuple[int, int, int]] = []
+    for applicant, jobs in missing:
+        totals = calculate_match_scores_for_applicant(applicant, jobs, db=db, ctx=ctx)
+        for job, total in zip(jobs, totals):
+            if total is not None:
+                scores[(applicant.id, job.id)] = total
+                fresh.append((applicant.id, job.id, total))
+    _store(store_db or db, fresh, version)
+    return scores
+
+
+def _stored_top_applicants(db: Session, job: JobPosting, version: str, limit: int) -> List[Tuple[int, int]]:
+    rows = db.query(MatchScore.applicant_id, MatchScore.score).join(
+        Applicant, Applicant.id == MatchScore.applicant_id
+    ).filter(
+        MatchScore.job_id == job.id,
+        MatchScore.scorer_version == version,
+        Applicant.portal != "ijp",
+    ).order_by(MatchScore.score.desc()).limit(limit).all()
+    return [(applicant_id, score) for applicant_id, score in rows]
+
+
+def _stored_top_jobs(db: Session, applicant: Applicant, version: str, limit: int) -> List[Tuple[int, int]]:
+    rows = db.query(MatchScore.job_id, MatchScore.score).join(
+        JobPosting, JobPosting.id == MatchScore.job_id
+    ).filter(
+        MatchScore.applicant_id == applicant.id,
+        MatchScore.scorer_version == version,
+        JobPosting.is_active == True,
+    ).order_by(MatchScore.score.desc()).limit(limit).all()
+    return [(job_id, score) for job_id, score in rows]
+
+
+def _merge_top(stored: List[Tuple[int, int]], fresh: List[Tuple[int, int]], limit: int) -> List[Tuple[int, int]]:
+    return sorted(stored + fresh, key=lambda row: row[1], reverse=True)[:limit]
+
+
+def _missing_job_applicant_chunks(db: Session, job: JobPosting, version: str):
+    """Fehlende Bewerber einer Stelle in ID-Blöcken (Keyset, Speicher bleibt flach)."""
+    last_id = 0
+    while True:
+        chunk = _missing_job_applicants_query(db, job, version).filter(
+            Applicant.id > last_id
+        ).order_by(Applicant.id).limit(_READ_CHUNK).all()
+        if not chunk:
+            return
+        last_id = chunk[-1].id
+        yield chunk
+
+
+def top_applicants_for_job(db: Session, job: JobPosting, limit: int = 20,
+                           ctx: Optional[MatchingContext] = None) -> List[Tuple[int, int]]:
+    """Beste Bewerber einer Stelle als [(applicant_id, score)], absteigend nach Score."""
+    ctx = ctx or MatchingContext.build(db)
+    version = ctx.scorer_version
+    if _missing_job_applicants_query(db, job, version).count() <= _EAGER_FILL_LIMIT:
+        ensure_job_scores(db, job, ctx=ctx)
+        return _stored_top_applicants(db, job, version, limit)
+
+    # Viele Lücken (kalte Spalte): je Block nur die Top-K der fehlenden Paare bewerten,
+    # der k-te bisher beste Score (gespeichert oder frisch) dient als Schranke
+    stored = _stored_top_applicants(db, job, version, limit)
+    top: List[Tuple[int, Applicant]] = []
+    for chunk in _missing_job_applicant_chunks(db, job, version):
+        scores = sorted([score for _, score in stored] + [score for score, _ in top], reverse=True)
+        threshold = scores[limit - 1] if len(scores) >= limit else None
+        top = sorted(top + top_k_matches_for_job(job, chunk, limit, db=db, threshold=threshold, ctx=ctx),
+                     key=lambda row: row[0], reverse=True)[:limit]
+    _store(db, [(a.id, job.id, score) for score, a in top], version)
+    return _merge_top(stored, [(a.id, score) for score, a in top], limit)
+
+
+def top_jobs_for_applicant(db: Session, applicant: Applicant, limit: int = 20,
+                           ctx: Optional[MatchingContext] = None) -> List[Tuple[int, int]]:
+    """Beste aktive Stellen eines Bewerbers als [(job_id, score)], absteigend nach Score."""
+    ctx = ctx or MatchingContext.build(db)
+    version = ctx.scorer_version
+    missing = _missing_applicant_jobs_query(db, applicant, version).all()
+    if len(missing) <= _EAGER_FILL_LIMIT:
+        ensure_applicant_scores(db, applicant, ctx=ctx, missing=missing)
+        return _stored_top_jobs(db, applicant, version, limit)
+
+    stored = _stored_top_jobs(db, applicant, version, limit)
+    threshold = stored[-1][1] if len(stored) >= limit else None
+    top = top_k_matches_for_applicant(applicant, missing, limit, db=db, threshold=threshold, ctx=ctx)
+    _store(db, [(applicant.id, j.id, score) for score, j in top], version)
+    return _merge_top(stored, [(j.id, score) for score, j in top], limit)
+
+
+def job_scoring_changed(job: JobPosting) -> bool:
+    """Berührt die noch nicht committete Änderung ein Feld, das der Scorer liest
+    (parallel_matching.JOB_FIELDS)? Vor db.commit() aufrufen."""
+    from app.services.parallel_matching import JOB_FIELDS
+
+    attrs = inspect(job).attrs
+    return any(attrs[field].history.has_changes() for field in JOB_FIELDS if field in attrs)
+
+
+def invalidate_job_scores(job_id: int) -> None:
+    """Verwirft die Spalte einer Stelle (eigene DB-Session, für Background-Tasks nach
+    bewertungsrelevanten Änderungen). Neu berechnet wird erst beim nächsten Lesen und
+    nur, was dort gebraucht wird (Top-Liste, Digest, Benachrichtigung).
+    Best effort – Fehler werden nur geloggt."""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.query(MatchScore).filter(MatchScore.job_id == job_id).delete(synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"match_scores für Stelle {job_id} nicht verworfen: {e}")
+    finally:
+        db.close()
+
+
+def refresh_applicant_scores(applicant_id: int) -> None:
+    """Verwirft die Zeile eines Bewerbers und berechnet sie neu (eigene DB-Session,
+    für Background-Tasks nach Profil-Änderungen). Best effort – Fehler werden nur geloggt."""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.query(MatchScore).filter(MatchScore.applicant_id == applicant_id).delete(synchronize_session=False)
+        db.commit()
+        applicant = db.query(Applicant).filter(Applicant.id == applicant_id).first()
+        if applicant and applicant.portal != "ijp":
+            ensure_applicant_scores(db, applicant)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"match_scores für Bewerber {applicant_id} nicht aktualisiert: {e}")
+    finally:
+        db.close()
@@ -15,10 +15,31 @@ WICHTIG: Keine Berücksichtigung von:
 - etc.
 """
 
-from typing import Optional
+import heapq
+import logging
+import os
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple, Union
 from sqlalchemy.orm import Session
 from app.models.applicant import Applicant, PositionType, LanguageLevel
 from app.models.job_posting import JobPosting, RequiredLanguageLevel
+from app.services.keyword_index import (
+    applicant_index,
+    applicant_text_tokens,
+    extract_keywords as _extract_keywords,
+    job_index,
+    job_text_tokens,
+    stored_tokens,
+)
+
+logger = logging.getLogger(__name__)
+
+# Version der Scoring-Regeln. Bei jeder Änderung an Gewichten/Regeln erhöhen –
+# materialisierte Scores (match_scores) mit älterer Version gelten dann als veraltet.
+SCORER_VERSION = 1
+
+# Top-K: Kandidaten werden in Blöcken dieser Größe voll bewertet (CV-Vorladen je Block)
+TOP_K_CHUNK = 200
 
 
 # Sprachniveau-Mapping für Vergleich
@@ -34,52 +55,144 @@ LANGUAGE_LEVEL_ORDER = {
 }
 
 
-def _get_cv_fallback(applicant_id: int, db: Session) -> Optional[dict]:
-    """
-    Holt das aktuellste CV des Bewerbers und parst es per Regex (vollständig sync).
-    Umgeht den async Storage-Wrapper und liest direkt via boto3 (R2) oder open() (lokal).
-    """
-    try:
-        from app.models.document import Document, DocumentType
-        from app.services.cv_parser_service import extract_text_from_pdf, parse_cv_regex
-        from app.services.storage_service import storage_service
-        import os
-
-        doc = db.query(Document).filter(
-            Document.applicant_id == applicant_id,
-            Document.document_type == DocumentType.CV,
-        ).order_by(Document.uploaded_at.desc()).first()
-
-        if not doc or not doc.file_path:
-            return None
+class MatchingContext:
+    """Snapshot für EINEN Matching-Lauf (Batch, Digest, Benachrichtigung).
 
-        content: Optional[bytes] = None
-
-        if storage_service.use_r2 and storage_service.s3_client:
-            # R2/S3: boto3 ist synchron
-            response = storage_service.s3_client.get_object(
-                Bucket=storage_service.bucket_name,
-                Key=doc.file_path,
-            )
-            content = response["Body"].read()
-        elif os.path.exists(doc.file_path):
-            # Lokales Filesystem
-            with open(doc.file_path, "rb") as f:
-                content = f.read()
-
-        if not content:
-            return None
+    Alle Matching-/Benachrichtigungs-Einstellungen werden mit einer Query geladen
+    und zusammen mit der Scorer-Version und einem CV-Cache (applicant_id ->
+    geparste CV-Daten) durch die Services gereicht – statt get_setting pro Paar.
+    """
 
-        text = extract_text_from_pdf(content)
-        if not text:
-            return None
+    SETTINGS = {
+        "matching_always_analyze_cv": True,
+        "matching_parallel_enabled": True,
+        "matching_parallel_workers": 0,
+        "job_notifications_enabled": True,
+        "job_notifications_threshold": 85,
+        "instant_job_notifications_enabled": True,
+        "weekly_digest_enabled": True,
+    }
 
-        return parse_cv_regex(text)
-    except Exception:
-        return None
+    def __init__(self, settings: dict):
+        self.settings = settings
+        self.always_analyze_cv = bool(settings["matching_always_analyze_cv"])
+        # Scorer-Version inkl. CV-Einstellung – ein Umschalten macht materialisierte Scores veraltet
+        self.scorer_version = f"{SCORER_VERSION}:{'cv' if self.always_analyze_cv else 'profile'}"
+        self._cv_cache: dict = {}
+        self._job_features: dict = {}
+
+    @classmethod
+    def build(cls, db: Session) -> "MatchingContext":
+        from app.services.settings_service import get_settings
+        return cls(get_settings(db, cls.SETTINGS))
+
+    def get(self, key: str):
+        return self.settings[key]
+
+    @property
+    def parallel_workers(self) -> int:
+        """Anzahl Worker-Prozesse für Bulk-Matching (0 = im Prozess rechnen)."""
+        if not self.settings["matching_parallel_enabled"]:
+            return 0
+        workers = self.settings["matching_parallel_workers"] or 0
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        return workers if workers > 1 else 0
+
+    def parsed_cvs(self, applicant_ids: List[int], db: Session) -> dict:
+        """CV-Daten mehrerer Bewerber; nur noch nicht geladene IDs werden abgefragt."""
+        missing = [aid for aid in applicant_ids if aid not in self._cv_cache]
+        if missing:
+            try:
+                from app.services.cv_cache_service import preload_parsed_cvs
+                loaded = preload_parsed_cvs(missing, db)
+            except Exception as e:
+                logger.warning(f"Parsed-CVs konnten nicht vorgeladen werden: {e}")
+                loaded = {}
+            for aid in missing:
+                self._cv_cache[aid] = loaded.get(aid)
+        return {aid: self._cv_cache[aid] for aid in applicant_ids if self._cv_cache.get(aid)}
+
+    def parsed_cv(self, applicant_id: int, db: Session) -> Optional[dict]:
+        return self.parsed_cvs([applicant_id], db).get(applicant_id)
+
+    def needs_cv(self, applicant: Applicant) -> bool:
+        return self.always_analyze_cv or not _profile_has_experience(applicant)
+
+    def clear_cv_cache(self) -> None:
+        """Gibt den CV-Cache frei (Streaming-Läufe: nach jedem Chunk)."""
+        self._cv_cache.clear()
+
+    def job_features(self, job: JobPosting) -> "_JobFeatures":
+        """Job-Merkmale einmal pro Lauf statt einmal pro Bewerber berechnen."""
+        jf = self._job_features.get(job.id)
+        if jf is None or jf._job is not job:
+            jf = self._job_features[job.id] = _JobFeatures(job)
+        return jf
+
+
+def _context(db: Optional[Session], ctx: Optional[MatchingContext]) -> Optional[MatchingContext]:
+    """Übergebenen Kontext nutzen, sonst (mit DB) einen für diesen Aufruf bauen."""
+    if ctx is not None:
+        return ctx
+    return MatchingContext.build(db) if db else None
+
+
+class _JobFeatures:
+    """Job-seitige Merkmale, die pro Stelle nur EINMAL berechnet werden müssen.
+
+    Wird von calculate_match_score und calculate_match_scores_batch gemeinsam genutzt,
+    damit beide Wege garantiert denselben total_score liefern.
+    """
 
+    __slots__ = (
+        "job_type", "position_weight", "german_required", "german_importance",
+        "english_required", "english_importance", "other_reqs", "work_req",
+        "work_auth_required", "_experience_keywords", "_job", "text_keywords",
+    )
 
-def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Session] = None, include_admin_details: bool = False) -> dict:
+    def __init__(self, job: JobPosting):
+        self.job_type = job.position_type.value if job.position_type else None
+        self.position_weight = 50 if self.job_type == "ausbildung" else 30
+        self.german_required = job.german_required.value if job.german_required else "not_required"
+        self.german_importance = getattr(job, "german_importance", "required") or "required"
+        self.english_required = job.english_required.value if job.english_required else "not_required"
+        self.english_importance = getattr(job, "english_importance", "required") or "required"
+
+        # Weitere Sprachen: (name, level, importance) – ungültige Einträge verwerfen
+        self.other_reqs = []
+        for req in (job.other_languages_required or []):
+            if not isinstance(req, dict) or not req.get("language"):
+                continue
+            # Legacy: importance aus altem required-Flag ableiten, falls nicht gesetzt
+            imp = req.get("importance") or ("required" if req.get("required") else "optional")
+            self.other_reqs.append((str(req["language"]).strip().lower(), req.get("level") or "not_required", imp))
+
+        self.work_req = getattr(job, "work_authorization_requirement", "not_relevant") or "not_relevant"
+        self.work_auth_required = self.work_req == "required"
+
+        # Keyword-Sets für Text-Match (alle Texte) und – erst bei Bedarf – Erfahrung
+        # (Top-K braucht sie für weggeprunte Stellen gar nicht)
+        stored = stored_tokens(job)
+        self.text_keywords = set(stored) if stored is not None else job_text_tokens(job)
+        self._job = job
+        self._experience_keywords = None
+
+    @property
+    def experience_keywords(self) -> set:
+        """Keywords aus Titel/Beschreibung/Aufgaben (lazy, einmal pro Stelle)."""
+        if self._experience_keywords is None:
+            job = self._job
+            job_title = (job.title or "").lower()
+            job_desc = (job.description or "").lower()
+            job_tasks = (job.tasks or "").lower()
+            self._experience_keywords = _extract_keywords(f"{job_title} {job_desc} {job_tasks}")
+        return self._experience_keywords
+
+
+def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Session] = None,
+                          include_admin_details: bool = False, score_only: bool = False,
+                          ctx: Optional[MatchingContext] = None) -> Union[dict, int]:
     """
     Berechnet den Matching-Score zwischen Bewerber und Stelle.
     
@@ -93,6 +206,9 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
     
     Args:
         include_admin_details: Wenn True, werden detaillierte Infos für Admins/Firmen hinzugefügt
+        score_only: Wenn True, NUR den total_score als int berechnen – ohne details,
+            data_quality oder admin_details (für Schwellenwert-Vergleiche)
+        ctx: MatchingContext des Laufs (sonst wird bei db einer gebaut)
     
     Returns:
         dict: {
@@ -102,7 +218,17 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
             "data_quality": {...},
             "admin_details": {...}  # Nur wenn include_admin_details=True
         }
+        bzw. int (0-100) bei score_only=True
     """
+    jf = _JobFeatures(job)
+    ctx = _context(db, ctx)
+
+    if score_only:
+        cv_data = None
+        if ctx and ctx.needs_cv(applicant):
+            cv_data = ctx.parsed_cv(applicant.id, db)
+        return _fast_total_score(applicant, job, jf, cv_data)
+
     scores = {
         "position_type": 0,
         "german_level": 0,
@@ -124,12 +250,9 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
         applicant.work_experience
     )
     
-    if db:
-        from app.services.settings_service import get_setting
-        always_analyze_cv = get_setting(db, "matching_always_analyze_cv", True)
-        
-        if always_analyze_cv or not profile_has_experience:
-            cv_data = _get_cv_fallback(applicant.id, db)
+    if ctx:
+        if ctx.always_analyze_cv or not profile_has_experience:
+            cv_data = ctx.parsed_cv(applicant.id, db)
             if cv_data:
                 if not profile_has_experience:
                     cv_used = True
@@ -140,8 +263,7 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
 
     # 1. Positionstyp-Match. Bei Ausbildung stark gewichtet (50 statt 30), weil die
     # passende Stellenart hier entscheidend ist (mehrjährige, spezifische Entscheidung).
-    job_type_val = job.position_type.value if job.position_type else None
-    position_weight = 50 if job_type_val == "ausbildung" else 30
+    position_weight = jf.position_weight
     position_match = _check_position_match(applicant, job, weight=position_weight)
     scores["position_type"] = position_match["score"]
     if position_match["match"]:
@@ -154,8 +276,8 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
     
     # 2. Deutschkenntnisse (25 Punkte, importance-aware)
     applicant_german = applicant.german_level.value if applicant.german_level else "keine"
-    job_german = job.german_required.value if job.german_required else "not_required"
-    german_imp = getattr(job, "german_importance", "required") or "required"
+    job_german = jf.german_required
+    german_imp = jf.german_importance
     german_match = _language_contribution(applicant_german, job_german, german_imp, 25)
     scores["german_level"] = german_match["score"]
     if german_match["meets"]:
@@ -172,8 +294,8 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
 
     # 3. Englischkenntnisse (15 Punkte, importance-aware)
     applicant_english = applicant.english_level.value if applicant.english_level else "keine"
-    job_english = job.english_required.value if job.english_required else "not_required"
-    english_imp = getattr(job, "english_importance", "required") or "required"
+    job_english = jf.english_required
+    english_imp = jf.english_importance
     english_match = _language_contribution(applicant_english, job_english, english_imp, 15)
     scores["english_level"] = english_match["score"]
     if english_match["meets"]:
@@ -190,27 +312,14 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
 
     # 3b. Weitere Sprachen (importance-aware, je Sprache bis 10, gesamt max 20).
     # Nur additiv (Bonus) – verschlechtert bestehende Scores nie.
-    other_reqs = job.other_languages_required or []
-    if other_reqs:
-        appl_other = _applicant_other_lang_map(applicant)
-        other_total = 0
-        for req in other_reqs:
-            if not isinstance(req, dict) or not req.get("language"):
-                continue
-            name = str(req["language"]).strip().lower()
-            lvl = req.get("level") or "not_required"
-            # Legacy: importance aus altem required-Flag ableiten, falls nicht gesetzt
-            imp = req.get("importance") or ("required" if req.get("required") else "optional")
-            c = _language_contribution(appl_other.get(name, "keine"), lvl, imp, 10)
-            other_total += c["score"]
-        other_total = min(20, other_total)
-        if other_total:
-            scores["other_languages"] = other_total
+    other_total = _other_languages_score(applicant, jf)
+    if other_total:
+        scores["other_languages"] = other_total
 
     # 4. Berufserfahrung (20 Punkte) — mit CV-Fallback oder CV-Daten
     # Wenn CV immer analysiert wird, nutze CV-Daten zusätzlich zum Profil
     exp_cv_data = cv_data if cv_data and not cv_used else cv_fallback
-    exp_match = _check_experience_match(applicant, job, cv_fallback=exp_cv_data)
+    exp_match = _check_experience_match(applicant, job, cv_fallback=exp_cv_data, job_keywords=jf.experience_keywords)
     scores["experience"] = exp_match["score"]
     if exp_match["has_experience"]:
         years = exp_match["years"] or 0
@@ -242,7 +351,7 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
         }
     
     # 6. Textvergleich (25 Punkte) - Profil vs. Stellenbeschreibung
-    text_match = _check_text_match(applicant, job)
+    text_match = _check_text_match(applicant, job, job_keywords=jf.text_keywords)
     scores["text_match"] = text_match["score"]
     if text_match["score"] > 0:
         details.append(f"✓ Profil-Keywords passen zur Stelle ({len(text_match.get('matched_keywords', []))} Treffer)")
@@ -260,40 +369,380 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
     # egal wie gut der Rest passt.
     # Wichtig (Abwärtskompatibilität): nur ein ausdrückliches "Nein" ist K.-o.
     # work_authorized=None (nie gefragt) NICHT. "support_offered"/"not_relevant" -> kein K.-o.
-    work_req = getattr(job, "work_authorization_requirement", "not_relevant") or "not_relevant"
-    work_auth_knockout = (work_req == "required" and applicant.work_authorized is False)
+    work_auth_knockout = (jf.work_auth_required and applicant.work_authorized is False)
     if work_auth_knockout:
         details.append("✗ K.-o.: Arbeitsberechtigung fehlt (Stelle setzt bestehende Berechtigung zwingend voraus)")
         if include_admin_details:
             admin_details["work_authorization"] = {
-                "requirement": work_req,
+                "requirement": jf.work_req,
                 "applicant_authorized": False,
                 "knockout": True,
             }
 
-    # Gesamtscore: auf das erreichbare Maximum normalisiert, damit "optional"/nicht
-    # geforderte Kriterien den Score nicht künstlich nach unten ziehen.
-    # Kern-Komponenten zählen immer; Sprachen nach Wichtigkeit:
-    #   required  -> voll im Nenner (nicht erfüllen senkt den Score)
-    #   desirable -> reiner Bonus (nur im Zähler, verschlechtert nie)
-    #   optional  -> zählt gar nicht (weder Zähler noch Nenner)
-    # Der Nenner wird bei 100 gedeckelt: klassische Stellen (alle Sprachen gefordert)
-    # verhalten sich damit identisch zum bisherigen min(100, sum) -> abwärtskompatibel.
+    total_score = _total_score(scores, jf, work_auth_knockout)
+    
+    result = {
+        "total_score": total_score,
+        "breakdown": scores,
+        "details": details,
+        "recommendation": _get_recommendation(total_score),
+        "data_quality": data_quality
+    }
+    
+    if include_admin_details:
+        admin_details["cv_analyzed"] = cv_data is not None
+        admin_details["profile_has_experience"] = profile_has_experience
+        result["admin_details"] = admin_details
+        # Maximalpunkte je Komponente (Positionstyp dynamisch: Ausbildung=50)
+        result["max_scores"] = {
+            "position_type": position_weight, "german_level": 25, "english_level": 15,
+            "experience": 20, "text_match": 25, "availability": 10, "other_languages": 20,
+        }
+    
+    return result
+
+
+def calculate_match_scores_batch(job: JobPosting, applicants: List[Applicant], db: Optional[Session] = None,
+                                 ctx: Optional[MatchingContext] = None) -> List[Optional[int]]:
+    """
+    Berechnet NUR den total_score einer Stelle gegen viele Bewerber in einem Durchlauf.
+
+    Job-seitige Arbeit (Keyword-Sets, Sprachanforderungen, Gewichte) und die
+    Einstellung matching_always_analyze_cv werden einmal pro Lauf statt einmal pro
+    Paar berechnet; details/breakdown/data_quality werden gar nicht erst gebaut.
+    Das Ergebnis ist identisch zu calculate_match_score(...)["total_score"] –
+    für die angezeigten Zeilen ruft der Aufrufer anschließend calculate_match_score auf.
+
+    Returns:
+        Liste der Scores in derselben Reihenfolge wie applicants
+        (None, falls die Berechnung für einen Bewerber fehlschlägt).
+    """
+    jf = _JobFeatures(job)
+    ctx = _context(db, ctx)
+    cv_by_applicant = {}
+    if ctx:
+        # CV-Daten aller betroffenen Bewerber in wenigen Queries aus dem Cache vorladen
+        needs_cv = [a.id for a in applicants if ctx.needs_cv(a)]
+        if needs_cv:
+            cv_by_applicant = ctx.parsed_cvs(needs_cv, db)
+
+    overlap = _applicant_overlap(jf, db)
+    text_counts = [_indexed_text_count(applicant_index, a, overlap) for a in applicants]
+
+    # Große Batches auf mehrere CPU-Kerne verteilen (abschaltbar per Einstellung)
+    if ctx and len(applicants) >= _parallel_min_batch():
+        from app.services.parallel_matching import score_job_parallel
+        workers = ctx.parallel_workers
+        if workers:
+            totals = score_job_parallel(job, applicants, cv_by_applicant, text_counts, workers)
+            if totals is not None:
+                return totals
+
+    totals: List[Optional[int]] = []
+    for applicant, text_count in zip(applicants, text_counts):
+        try:
+            totals.append(_fast_total_score(applicant, job, jf, cv_by_applicant.get(applicant.id), text_count))
+        except Exception as e:
+            logger.warning(f"Batch-Matching für Bewerber {applicant.id} fehlgeschlagen: {e}")
+            totals.append(None)
+    return totals
+
+
+def calculate_match_scores_for_applicant(applicant: Applicant, jobs: List[JobPosting], db: Optional[Session] = None,
+                                        ctx: Optional[MatchingContext] = None) -> List[Optional[int]]:
+    """
+    Gegenstück zu calculate_match_scores_batch: EIN Bewerber gegen viele Stellen.
+    CV-Daten werden einmal geladen statt einmal pro Stelle.
+
+    Returns:
+        Liste der Scores in derselben Reihenfolge wie jobs (None bei Fehler).
+    """
+    ctx = _context(db, ctx)
+    cv_data = None
+    if ctx and ctx.needs_cv(applicant):
+        cv_data = ctx.parsed_cv(applicant.id, db)
+
+    overlap = _job_overlap(applicant, db)
+
+    totals: List[Optional[int]] = []
+    for job in jobs:
+        try:
+            text_count = _indexed_text_count(job_index, job, overlap)
+            jf = ctx.job_features(job) if ctx else _JobFeatures(job)
+            totals.append(_fast_total_score(applicant, job, jf, cv_data, text_count))
+        except Exception as e:
+            logger.warning(f"Batch-Matching für Stelle {job.id} fehlgeschlagen: {e}")
+            totals.append(None)
+    return totals
+
+
+def top_k_matches_for_job(job: JobPosting, applicants: List[Applicant], k: int,
+                          db: Optional[Session] = None, threshold: Optional[int] = None,
+                          ctx: Optional[MatchingContext] = None) -> List[Tuple[int, Applicant]]:
+    """
+    Die k besten Bewerber einer Stelle, ohne alle Bewerber voll zu bewerten.
+
+    Positionstyp, Sprachen und Verfügbarkeit werden exakt berechnet, Erfahrung und
+    (falls der Keyword-Index nicht greift) Text-Match mit ihrem Maximum angesetzt –
+    das ergibt eine obere Schranke je Bewerber. Bewertet wird in absteigender
+    Schranken-Reihenfolge; sobald die Schranke den k-t besten Score nicht mehr
+    schlagen kann, wird abgebrochen. threshold: Score, der ohnehin schon sicher ist
+    (z.B. k-ter gespeicherter Score) – schlechtere Kandidaten werden gar nicht bewertet.
+
+    Returns:
+        [(score, applicant)] absteigend nach Score, höchstens k Einträge.
+    """
+    jf = _JobFeatures(job)
+    ctx = _context(db, ctx)
+    overlap = _applicant_overlap(jf, db)
+
+    candidates = []
+    for seq, applicant in enumerate(applicants):
+        try:
+            cheap = _cheap_scores(applicant, job, jf)
+        except Exception as e:
+            logger.warning(f"Top-K-Matching für Bewerber {applicant.id} fehlgeschlagen: {e}")
+            continue
+        text_count = _indexed_text_count(applicant_index, applicant, overlap)
+        knockout = jf.work_auth_required and applicant.work_authorized is False
+        candidates.append((_score_upper_bound(cheap, jf, text_count, knockout), seq, applicant, (cheap, text_count)))
+
+    def prepare(chunk):
+        # CV-Daten nur für Bewerber vorladen, die tatsächlich voll bewertet werden
+        if not ctx:
+            return {}
+        needs_cv = [c[2].id for c in chunk if ctx.needs_cv(c[2])]
+        return ctx.parsed_cvs(needs_cv, db) if needs_cv else {}
+
+    def evaluate(applicant, ctx, cv_by_applicant):
+        cheap, text_count = ctx
+        return _complete_score(applicant, job, jf, cheap, cv_by_applicant.get(applicant.id), text_count)
+
+    return _pruned_top_k(candidates, k, threshold, prepare, evaluate)
+
+
+def top_k_matches_for_applicant(applicant: Applicant, jobs: List[JobPosting], k: int,
+                                db: Optional[Session] = None, threshold: Optional[int] = None,
+                                ctx: Optional[MatchingContext] = None) -> List[Tuple[int, JobPosting]]:
+    """
+    Gegenstück zu top_k_matches_for_job: die k besten Stellen eines Bewerbers
+    (gleiche Schranken-Logik). CV-Daten werden erst geladen, wenn die erste Stelle
+    voll bewertet wird.
+
+    Returns:
+        [(score, job)] absteigend nach Score, höchstens k Einträge.
+    """
+    ctx = _context(db, ctx)
+    overlap = _job_overlap(applicant, db)
+    knockout_possible = applicant.work_authorized is False
+
+    candidates = []
+    for seq, job in enumerate(jobs):
+        try:
+            jf = _JobFeatures(job)
+            cheap = _cheap_scores(applicant, job, jf)
+        except Exception as e:
+            logger.warning(f"Top-K-Matching für Stelle {job.id} fehlgeschlagen: {e}")
+            continue
+        text_count = _indexed_text_count(job_index, job, overlap)
+        knockout = knockout_possible and jf.work_auth_required
+        candidates.append((_score_upper_bound(cheap, jf, text_count, knockout), seq, job, (jf, cheap, text_count)))
+
+    def prepare(chunk):
+        # CV erst beim ersten voll bewerteten Block laden (danach aus dem Kontext-Cache)
+        if ctx and ctx.needs_cv(applicant):
+            return ctx.parsed_cv(applicant.id, db)
+        return None
+
+    def evaluate(job, ctx, cv_data):
+        jf, cheap, text_count = ctx
+        return _complete_score(applicant, job, jf, cheap, cv_data, text_count)
+
+    return _pruned_top_k(candidates, k, threshold, prepare, evaluate)
+
+
+def _pruned_top_k(candidates: list, k: int, threshold: Optional[int],
+                  prepare: Callable, evaluate: Callable) -> list:
+    """Bewertet Kandidaten (bound, seq, item, ctx) in absteigender Schranken-Reihenfolge
+    und hält die besten k in einem Min-Heap; Abbruch, sobald keine Schranke mehr reicht.
+    Bei Gleichstand gewinnt – wie beim stabilen Sortieren – der frühere Kandidat."""
+    if k <= 0:
+        return []
+    candidates.sort(key=lambda c: (-c[0], c[1]))
+    heap = []  # (score, -seq, item) – heap[0] ist der aktuell schwächste der Top-K
+
+    def floor() -> Optional[int]:
+        worst = heap[0][0] if len(heap) >= k else None
+        if threshold is None:
+            return worst
+        return threshold if worst is None else max(worst, threshold)
+
+    for start in range(0, len(candidates), TOP_K_CHUNK):
+        chunk = candidates[start:start + TOP_K_CHUNK]
+        current = floor()
+        if current is not None:
+            chunk = [c for c in chunk if c[0] > current]
+            if not chunk:
+                break  # sortiert -> auch alle weiteren Blöcke sind chancenlos
+        prepared = prepare(chunk)
+        for bound, seq, item, ctx in chunk:
+            current = floor()
+            if current is not None and bound <= current:
+                break
+            try:
+                score = evaluate(item, ctx, prepared)
+            except Exception as e:
+                logger.warning(f"Top-K-Matching für {item.id} fehlgeschlagen: {e}")
+                continue
+            entry = (score, -seq, item)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+    return [(score, item) for score, _, item in sorted(heap, key=lambda e: (e[0], e[1]), reverse=True)]
+
+
+def _parallel_min_batch() -> int:
+    from app.services.parallel_matching import PARALLEL_MIN_BATCH
+    return PARALLEL_MIN_BATCH
+
+
+def _applicant_overlap(jf: _JobFeatures, db: Optional[Session]) -> Optional[dict]:
+    """Text-Treffer je Bewerber für eine Stelle über den invertierten Keyword-Index."""
+    if not (db and jf.text_keywords):
+        return None
+    try:
+        applicant_index.ensure_built()
+        return applicant_index.overlap_counts(jf.text_keywords)
+    except Exception as e:
+        logger.warning(f"Keyword-Index nicht verfügbar: {e}")
+        return None
+
+
+def _job_overlap(applicant: Applicant, db: Optional[Session]) -> Optional[dict]:
+    """Text-Treffer je Stelle für einen Bewerber über den invertierten Keyword-Index."""
+    if not db:
+        return None
+    try:
+        stored = stored_tokens(applicant)
+        applicant_keywords = set(stored) if stored is not None else applicant_text_tokens(applicant)
+        if not applicant_keywords:
+            return None
+        job_index.ensure_built()
+        return job_index.overlap_counts(applicant_keywords)
+    except Exception as e:
+        logger.warning(f"Keyword-Index nicht verfügbar: {e}")
+        return None
+
+
+def _profile_has_experience(applicant: Applicant) -> bool:
+    return bool(
+        applicant.work_experience_years or
+        applicant.work_experiences or
+        applicant.work_experience
+    )
+
+
+def _indexed_text_count(index, obj, overlap: Optional[dict]) -> Optional[int]:
+    """Text-Treffer aus dem Keyword-Index – nur wenn der Indexeintrag exakt den
+    gespeicherten Tokens des geladenen Objekts entspricht, sonst None (selbst schneiden)."""
+    if overlap is None:
+        return None
+    stored = stored_tokens(obj)
+    if stored is None or index.entry(obj.id) != stored:
+        return None
+    return overlap.get(obj.id, 0)
+
+
+def _fast_total_score(applicant: Applicant, job: JobPosting, jf: _JobFeatures,
+                      cv_data: Optional[dict] = None, text_count: Optional[int] = None) -> int:
+    """total_score ohne Erklärungs-Strukturen (gleiche Regeln wie calculate_match_score).
+    text_count: vorab ermittelte Text-Treffer (Keyword-Index), sonst wird geschnitten."""
+    return _complete_score(applicant, job, jf, _cheap_scores(applicant, job, jf), cv_data, text_count)
+
+
+def _cheap_scores(applicant: Applicant, job: JobPosting, jf: _JobFeatures) -> dict:
+    """Komponenten ohne Keyword-/CV-Arbeit (Positionstyp, Sprachen, Verfügbarkeit)."""
+    return {
+        "position_type": _check_position_match(applicant, job, weight=jf.position_weight)["score"],
+        "german_level": _language_contribution(
+            applicant.german_level.value if applicant.german_level else "keine",
+            jf.german_required, jf.german_importance, 25)["score"],
+        "english_level": _language_contribution(
+            applicant.english_level.value if applicant.english_level else "keine",
+            jf.english_required, jf.english_importance, 15)["score"],
+        "availability": _check_availability_match(applicant, job)["score"],
+        "other_languages": _other_languages_score(applicant, jf),
+    }
+
+
+def _complete_score(applicant: Applicant, job: JobPosting, jf: _JobFeatures, cheap: dict,
+                    cv_data: Optional[dict], text_count: Optional[int]) -> int:
+    """Ergänzt die günstigen Komponenten um Erfahrung und Text-Match -> total_score."""
+    if text_count is not None:
+        text_score = _text_match_points(text_count)
+    else:
+        text_score = _check_text_match(applicant, job, job_keywords=jf.text_keywords)["score"]
+    scores = dict(cheap)
+    scores["experience"] = _check_experience_match(
+        applicant, job, cv_fallback=cv_data or None, job_keywords=jf.experience_keywords)["score"]
+    scores["text_match"] = text_score
+    work_auth_knockout = jf.work_auth_required and applicant.work_authorized is False
+    return _total_score(scores, jf, work_auth_knockout)
+
+
+def _score_upper_bound(cheap: dict, jf: _JobFeatures, text_count: Optional[int], knockout: bool) -> int:
+    """Obere Schranke des total_score: Erfahrung mit Maximum (20), Text-Match exakt
+    aus dem Keyword-Index oder mit Maximum (25). _total_score ist monoton in allen
+    Komponenten, die Schranke ist damit nie kleiner als der echte Score."""
+    if knockout:
+        return 0
+    scores = dict(cheap)
+    scores["experience"] = 20
+    scores["text_match"] = _text_match_points(text_count) if text_count is not None else 25
+    return _total_score(scores, jf, False)
+
+
+def _other_languages_score(applicant: Applicant, jf: _JobFeatures) -> int:
+    """Bonus für weitere Sprachen (je Sprache bis 10, gesamt max 20)."""
+    if not jf.other_reqs:
+        return 0
+    appl_other = _applicant_other_lang_map(applicant)
+    other_total = 0
+    for name, lvl, imp in jf.other_reqs:
+        c = _language_contribution(appl_other.get(name, "keine"), lvl, imp, 10)
+        other_total += c["score"]
+    return min(20, other_total)
+
+
+def _total_score(scores: dict, jf: _JobFeatures, work_auth_knockout: bool) -> int:
+    """Normalisiert die Komponenten-Punkte zum Gesamtscore (0-100).
+
+    Auf das erreichbare Maximum normalisiert, damit "optional"/nicht geforderte
+    Kriterien den Score nicht künstlich nach unten ziehen.
+    Kern-Komponenten zählen immer; Sprachen nach Wichtigkeit:
+      required  -> voll im Nenner (nicht erfüllen senkt den Score)
+      desirable -> reiner Bonus (nur im Zähler, verschlechtert nie)
+      optional  -> zählt gar nicht (weder Zähler noch Nenner)
+    Der Nenner wird bei 100 gedeckelt: klassische Stellen (alle Sprachen gefordert)
+    verhalten sich damit identisch zum bisherigen min(100, sum) -> abwärtskompatibel.
+    """
     numerator = (scores["position_type"] + scores["experience"]
                  + scores["text_match"] + scores["availability"])
-    denominator = position_weight + 20 + 25 + 10  # Positionstyp (Ausbildung=50), Erfahrung, Text-Match, Verfügbarkeit
+    denominator = jf.position_weight + 20 + 25 + 10  # Positionstyp (Ausbildung=50), Erfahrung, Text-Match, Verfügbarkeit
 
-    if german_imp == "optional":
+    if jf.german_importance == "optional":
         pass  # zählt nicht
-    elif german_imp == "desirable":
+    elif jf.german_importance == "desirable":
         numerator += scores["german_level"]  # Bonus
     else:  # required (Default)
         denominator += 25
         numerator += scores["german_level"]
 
-    if english_imp == "optional":
+    if jf.english_importance == "optional":
         pass
-    elif english_imp == "desirable":
+    elif jf.english_importance == "desirable":
         numerator += scores["english_level"]
     else:  # required (Default)
         denominator += 15
@@ -304,30 +753,10 @@ def calculate_match_score(applicant: Applicant, job: JobPosting, db: Optional[Se
 
     denominator = min(100, denominator)
     normalized = round(numerator / denominator * 100) if denominator > 0 else 0
-    total_score = max(0, min(100, normalized))
     # K.-o.: fehlende zwingend geforderte Arbeitsberechtigung -> Gesamtscore 0
     if work_auth_knockout:
-        total_score = 0
-    
-    result = {
-        "total_score": total_score,
-        "breakdown": scores,
-        "details": details,
-        "recommendation": _get_recommendation(total_score),
-        "data_quality": data_quality
-    }
-    
-    if include_admin_details:
-        admin_details["cv_analyzed"] = cv_data is not None
-        admin_details["profile_has_experience"] = profile_has_experience
-        result["admin_details"] = admin_details
-        # Maximalpunkte je Komponente (Positionstyp dynamisch: Ausbildung=50)
-        result["max_scores"] = {
-            "position_type": position_weight, "german_level": 25, "english_level": 15,
-            "experience": 20, "text_match": 25, "availability": 10, "other_languages": 20,
-        }
-    
-    return result
+        return 0
+    return max(0, min(100, normalized))
 
 
 def _check_position_match(applicant: Applicant, job: JobPosting, weight: int = 30) -> dict:
@@ -467,20 +896,26 @@ def is_core_fit(applicant: Applicant, job: JobPosting, db: Optional[Session] = N
     return True
 
 
-def _check_experience_match(applicant: Applicant, job: JobPosting, cv_fallback: Optional[dict] = None) -> dict:
+@lru_cache(maxsize=20000)
+def _experience_keywords(exp_text: str) -> frozenset:
+    """Keywords eines Erfahrungseintrags – derselbe Bewerber wird gegen viele Stellen
+    bewertet, der Eintrag also nur einmal statt einmal pro Stelle tokenisiert."""
+    return frozenset(_extract_keywords(exp_text))
+
+
+def _check_experience_match(applicant: Applicant, job: JobPosting, cv_fallback: Optional[dict] = None,
+                            job_keywords: Optional[set] = None) -> dict:
     """
     Prüft Berufserfahrung (20 Punkte).
     Nutzt cv_fallback wenn Profilfelder leer sind.
+    job_keywords: vorberechnete Job-Keywords (Batch), sonst aus der Stelle extrahiert.
     """
     # Profilfelder bevorzugen, CV als Fallback
     years = applicant.work_experience_years or (cv_fallback.get("work_experience_years") if cv_fallback else None) or 0
     experiences = applicant.work_experiences or (cv_fallback.get("work_experiences") if cv_fallback else None) or []
 
-    job_title = (job.title or "").lower()
-    job_desc = (job.description or "").lower()
-    job_tasks = (job.tasks or "").lower()
-
-    job_keywords = _extract_keywords(f"{job_title} {job_desc} {job_tasks}")
+    if job_keywords is None:
+        job_keywords = _JobFeatures(job).experience_keywords
 
     relevant_experience = 0
     total_experience = 0
@@ -498,7 +933,7 @@ def _check_experience_match(applicant: Applicant, job: JobPosting, cv_fallback:
                     
                     # Prüfe ob Erfahrung relevant ist
                     exp_text = f"{position} {company} {description}"
-                    exp_keywords = _extract_keywords(exp_text)
+                    exp_keywords = _experience_keywords(exp_text)
                     
                     # Berechne Übereinstimmung
                     if job_keywords and exp_keywords:
@@ -535,53 +970,7 @@ def _check_experience_match(applicant: Applicant, job: JobPosting, cv_fallback:
     }
 
 
-def _extract_keywords(text: str) -> set:
-    """
-    Extrahiert relevante Keywords aus einem Text für Matching.
-    Entfernt Stoppwörter und normalisiert.
-    """
-    if not text:
-        return set()
-    
-    # Stoppwörter (Deutsch/Englisch)
-    stopwords = {
-        'der', 'die', 'das', 'und', 'oder', 'für', 'in', 'bei', 'mit', 'von',
-        'zu', 'auf', 'ist', 'im', 'als', 'auch', 'an', 'nach', 'wie', 'aus',
-        'the', 'and', 'or', 'for', 'in', 'at', 'with', 'from', 'to', 'on',
-        'm', 'w', 'd', 'mwd', 'gmbh', 'ag', 'kg', 'ug', 'mbh', 'hotel', 'stelle'
-    }
-    
-    # Synonyme/verwandte Begriffe
-    synonyms = {
-        'housekeeping': {'reinigung', 'zimmerreinigung', 'zimmermädchen', 'roomkeeper', 'cleaning', 'hauswirtschaft'},
-        'reinigung': {'housekeeping', 'zimmerreinigung', 'cleaning', 'sauberkeit'},
-        'zimmerreinigung': {'housekeeping', 'reinigung', 'zimmermädchen'},
-        'küche': {'koch', 'kochen', 'kitchen', 'küchenhilfe', 'gastro'},
-        'koch': {'küche', 'kochen', 'kitchen', 'gastro', 'culinary'},
-        'service': {'kellner', 'bedienung', 'gastronomie', 'restaurant', 'waiter'},
-        'kellner': {'service', 'bedienung', 'gastronomie', 'waiter'},
-        'rezeption': {'empfang', 'reception', 'front', 'desk', 'gästebetreuung'},
-        'empfang': {'rezeption', 'reception', 'front', 'desk'},
-        'pflege': {'altenpflege', 'krankenpflege', 'care', 'betreuung'},
-        'lager': {'logistik', 'warehouse', 'kommissionierung', 'versand'},
-        'büro': {'office', 'verwaltung', 'administration', 'sekretariat'},
-    }
-    
-    # Text in Wörter aufteilen
-    words = set()
-    for word in text.lower().replace('-', ' ').replace('/', ' ').split():
-        # Nur Wörter mit mindestens 3 Zeichen
-        word = ''.join(c for c in word if c.isalnum())
-        if len(word) >= 3 and word not in stopwords:
-            words.add(word)
-            # Synonyme hinzufügen
-            if word in synonyms:
-                words.update(synonyms[word])
-    
-    return words
-
-
-def _check_text_match(applicant: Applicant, job: JobPosting) -> dict:
+def _check_text_match(applicant: Applicant, job: JobPosting, job_keywords: Optional[set] = None) -> dict:
     """
     Vergleicht Bewerber-Profil mit Stellenbeschreibung (25 Punkte) - NEU.
     
@@ -593,50 +982,13 @@ def _check_text_match(applicant: Applicant, job: JobPosting) -> dict:
     matched_keywords = []
     score = 0
     
-    # Job-Text zusammenstellen
-    job_text = " ".join(filter(None, [
-        job.title,
-        job.description,
-        job.tasks,
-        job.requirements,
-        job.benefits
-    ])).lower()
-    job_keywords = _extract_keywords(job_text)
-    
-    # Bewerber-Text zusammenstellen
-    applicant_texts = []
-    
-    # Berufserfahrung (strukturiert)
-    if applicant.work_experiences:
-        try:
-            for exp in applicant.work_experiences:
-                if isinstance(exp, dict):
-                    applicant_texts.append(exp.get("position", ""))
-                    applicant_texts.append(exp.get("description", ""))
-                    applicant_texts.append(exp.get("company", ""))
-        except:
-            pass
-    
-    # Berufserfahrung (Freitext)
-    if applicant.work_experience:
-        applicant_texts.append(applicant.work_experience)
+    # Job-Keywords (im Batch vorberechnet)
+    if job_keywords is None:
+        job_keywords = _JobFeatures(job).text_keywords
     
-    # Zusätzliche Infos
-    if applicant.additional_info:
-        applicant_texts.append(applicant.additional_info)
-    
-    # Gewünschter Beruf / Fachrichtung
-    if applicant.profession:
-        applicant_texts.append(applicant.profession)
-    if applicant.desired_profession:
-        applicant_texts.append(applicant.desired_profession)
-    if applicant.preferred_work_area:
-        applicant_texts.append(applicant.preferred_work_area)
-    if applicant.field_of_study:
-        applicant_texts.append(applicant.field_of_study)
-    
-    applicant_text = " ".join(filter(None, applicant_texts)).lower()
-    applicant_keywords = _extract_keywords(applicant_text)
+    # Bewerber-Keywords (beim Speichern vorberechnet, sonst aus dem Profil extrahiert)
+    stored = stored_tokens(applicant)
+    applicant_keywords = set(stored) if stored is not None else applicant_text_tokens(applicant)
     
     # Übereinstimmungen berechnen
     if job_keywords and applicant_keywords:
@@ -644,17 +996,7 @@ def _check_text_match(applicant: Applicant, job: JobPosting) -> dict:
         matched_keywords = list(matches)[:10]  # Max 10 für Anzeige
         
         # Score basierend auf Anzahl der Matches
-        match_count = len(matches)
-        if match_count >= 8:
-            score = 25  # Sehr viele Übereinstimmungen
-        elif match_count >= 5:
-            score = 20
-        elif match_count >= 3:
-            score = 15
-        elif match_count >= 2:
-            score = 10
-        elif match_count >= 1:
-            score = 5
+        score = _text_match_points(len(matches))
     
     return {
         "score": score,
@@ -664,6 +1006,21 @@ def _check_text_match(applicant: Applicant, job: JobPosting) -> dict:
     }
 
 
+def _text_match_points(match_count: int) -> int:
+    """Punkte für den Text-Match nach Anzahl gemeinsamer Keywords (max 25)."""
+    if match_count >= 8:
+        return 25  # Sehr viele Übereinstimmungen
+    elif match_count >= 5:
+        return 20
+    elif match_count >= 3:
+        return 15
+    elif match_count >= 2:
+        return 10
+    elif match_count >= 1:
+        return 5
+    return 0
+
+
 def _calculate_data_quality(applicant: Applicant, job: JobPosting) -> dict:
     """
     Berechnet die Datenqualität für den Matching-Score.
@@ -755,48 +1112,66 @@ def _get_recommendation(score: int) -> str:
 
 
 def get_top_matches_for_job(db: Session, job_id: int, limit: int = 20) -> list:
-    """Findet die besten Bewerber-Matches für eine Stelle"""
+    """Findet die besten Bewerber-Matches für eine Stelle.
+
+    Die Rangfolge kommt aus den materialisierten match_scores (eine indizierte
+    Query); die volle Erklärung wird nur für die angezeigten Treffer berechnet.
+    Bewertet wird wie überall im Matching mit DB-Zugriff, also inkl. Lebenslauf-Analyse
+    gemäß matching_always_analyze_cv (früher hier ohne CV – Scores und Rangfolge
+    können daher von älteren Ansichten abweichen).
+    """
+    from app.services.match_score_service import top_applicants_for_job
+
     job = db.query(JobPosting).filter(JobPosting.id == job_id).first()
     if not job:
         return []
-    
-    # IJP-Bewerber gehören nicht ins JobOn-Matching für Firmenstellen
-    applicants = db.query(Applicant).filter(Applicant.portal != "ijp").all()
+
+    ctx = MatchingContext.build(db)
+    # IJP-Bewerber gehören nicht ins JobOn-Matching für Firmenstellen (Filter im Service)
+    ranked = top_applicants_for_job(db, job, limit, ctx=ctx)
+    applicants = {
+        a.id: a for a in db.query(Applicant).filter(Applicant.id.in_([aid for aid, _ in ranked])).all()
+    } if ranked else {}
+
     matches = []
-    
-    for applicant in applicants:
-        match = calculate_match_score(applicant, job)
+    for applicant_id, _ in ranked:
+        applicant = applicants.get(applicant_id)
+        if not applicant:
+            continue
+        match = calculate_match_score(applicant, job, db=db, ctx=ctx)
         matches.append({
             "applicant_id": applicant.id,
             "applicant_name": f"{applicant.first_name} {applicant.last_name}",
             **match
         })
-    
-    # Nach Score sortieren
-    matches.sort(key=lambda x: x["total_score"], reverse=True)
-    return matches[:limit]
+    return matches
 
 
 def get_top_matches_for_applicant(db: Session, applicant_id: int, limit: int = 20) -> list:
-    """Findet die besten Stellen-Matches für einen Bewerber"""
+    """Findet die besten Stellen-Matches für einen Bewerber (Rangfolge aus match_scores,
+    Bewertung inkl. Lebenslauf-Analyse wie get_top_matches_for_job)."""
+    from app.services.match_score_service import top_jobs_for_applicant
+
     applicant = db.query(Applicant).filter(Applicant.id == applicant_id).first()
     if not applicant:
         return []
-    
-    jobs = db.query(JobPosting).filter(JobPosting.is_active == True).all()
+
+    ctx = MatchingContext.build(db)
+    ranked = top_jobs_for_applicant(db, applicant, limit, ctx=ctx)
+    jobs = {
+        j.id: j for j in db.query(JobPosting).filter(JobPosting.id.in_([jid for jid, _ in ranked])).all()
+    } if ranked else {}
+
     matches = []
-    
-    for job in jobs:
-        match = calculate_match_score(applicant, job)
+    for job_id, _ in ranked:
+        job = jobs.get(job_id)
+        if not job:
+            continue
+        match = calculate_match_score(applicant, job, db=db, ctx=ctx)
         matches.append({
             "job_id": job.id,
             "job_title": job.title,
             "company_id": job.company_id,
             **match
         })
-    
-    # Nach Score sortieren
-    matches.sort(key=lambda x: x["total_score"], reverse=True)
-    return matches[:limit]
-
-
+    return matches
@@ -0,0 +1,129 @@
+"""
+Paralleles Bulk-Matching über einen ProcessPoolExecutor
+
+Digest, Backfill und das Auffüllen von match_scores bewerten tausende Paare
+(CPU-gebundenes Python). Statt ORM-Objekten werden schlanke Feature-Records
+(SimpleNamespace mit genau den Feldern, die der Scorer liest) an die Worker
+geschickt; CV-Daten und Text-Treffer (Keyword-Index) ermittelt der Hauptprozess
+vorab, die Worker brauchen also keine DB.
+
+Einstellungen (gelesen über MatchingContext.parallel_workers):
+- matching_parallel_enabled: aus = alles im aufrufenden Prozess (Fallback)
+- matching_parallel_workers:  Anzahl Prozesse (0 = Anzahl CPU-Kerne)
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from typing import List, Optional
+
+from app.models.applicant import Applicant
+from app.models.job_posting import JobPosting
+
+logger = logging.getLogger(__name__)
+
+# Unterhalb dieser Batch-Größe lohnt sich das Verteilen nicht (Pickling/IPC-Overhead)
+PARALLEL_MIN_BATCH = 500
+# Paare pro Worker-Aufgabe
+PARALLEL_CHUNK = 250
+
+# Felder, die der Scorer liest (calculate_match_score / _fast_total_score)
+APPLICANT_FIELDS = (
+    "id", "position_types", "position_type", "german_level", "english_level",
+    "other_languages", "work_experience_years", "work_experiences", "work_experience",
+    "additional_info", "profession", "desired_profession", "preferred_work_area",
+    "field_of_study", "semester_break_start", "semester_break_end", "available_from",
+    "work_authorized",
+)
+JOB_FIELDS = (
+    "id", "title", "description", "tasks", "requirements", "benefits", "position_type",
+    "german_required", "english_required", "german_importance", "english_importance",
+    "other_languages_required", "work_authorization_requirement", "start_date",
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def applicant_record(applicant: Applicant) -> SimpleNamespace:
+    """Picklebarer Feature-Record eines Bewerbers (keine Relationships, keine Session)."""
+    return SimpleNamespace(**{field: getattr(applicant, field, None) for field in APPLICANT_FIELDS})
+
+
+def job_record(job: JobPosting) -> SimpleNamespace:
+    """Picklebarer Feature-Record einer Stelle."""
+    return SimpleNamespace(**{field: getattr(job, field, None) for field in JOB_FIELDS})
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            # spawn statt fork: der Webserver-Prozess hat Threads und offene DB-Verbindungen
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown_executor() -> None:
+    """Beendet den Prozess-Pool (App-Shutdown)."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+            _executor_workers = 0
+
+
+def _score_chunk(job: SimpleNamespace, items: list) -> List[Optional[int]]:
+    """Worker: bewertet (applicant_record, cv_data, text_count)-Tupel gegen eine Stelle."""
+    from app.services.matching_service import _JobFeatures, _fast_total_score
+
+    jf = _JobFeatures(job)
+    totals: List[Optional[int]] = []
+    for applicant, cv_data, text_count in items:
+        try:
+            totals.append(_fast_total_score(applicant, job, jf, cv_data, text_count))
+        except Exception:
+            totals.append(None)
+    return totals
+
+
+def score_job_parallel(job: JobPosting, applicants: List[Applicant], cv_by_applicant: dict,
+                       text_counts: List[Optional[int]], workers: int) -> Optional[List[Optional[int]]]:
+    """Verteilt die Bewertung einer Stelle gegen viele Bewerber auf den Prozess-Pool.
+
+    Returns:
+        Scores in Reihenfolge der applicants – oder None, wenn der Pool nicht
+        nutzbar ist (der Aufrufer rechnet dann selbst im Prozess).
+    """
+    job_rec = job_record(job)
+    items = [
+        (applicant_record(a), cv_by_applicant.get(a.id), count)
+        for a, count in zip(applicants, text_counts)
+    ]
+    try:
+        executor = _get_executor(workers)
+        futures = [
+            executor.submit(_score_chunk, job_rec, items[i:i + PARALLEL_CHUNK])
+            for i in range(0, len(items), PARALLEL_CHUNK)
+        ]
+        totals: List[Optional[int]] = []
+        for future in futures:
+            totals.extend(future.result())
+        return totals
+    except BrokenProcessPool as e:
+        logger.warning(f"Matching-Prozess-Pool defekt, rechne im Prozess weiter: {e}")
+        shutdown_executor()
+        return None
+    except Exception as e:
+        logger.warning(f"Paralleles Matching fehlgeschlagen, rechne im Prozess weiter: {e}")
+        return None
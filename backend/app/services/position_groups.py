@@ -21,6 +21,18 @@ from typing import Iterable, List, Optional
 # "Allgemein / Sonstige" – wirkt in beide Richtungen als Wildcard.
 GENERAL = "general"
 
+# Bit je Stellenart für die SQL-Vorfilterung (applicants.position_mask / job_postings.position_mask).
+# Reihenfolge NIE ändern – die Werte stehen in der Datenbank.
+POSITION_BITS = {
+    "studentenferienjob": 1 << 0,
+    "saisonjob": 1 << 1,
+    "workandholiday": 1 << 2,
+    "fachkraft": 1 << 3,
+    "ausbildung": 1 << 4,
+    GENERAL: 1 << 5,
+}
+ALL_POSITIONS_MASK = sum(POSITION_BITS.values())
+
 # Gerichtete Erweiterungen (Ober-Kategorien): Wer den Schlüssel-Typ sucht, ist auch
 # für die Werte-Typen offen – aber NICHT umgekehrt.
 POSITION_EXPANSIONS = {
@@ -68,3 +80,23 @@ def position_compatible(applicant_types: List[str], job_type: Optional[str]) ->
     if GENERAL in applicant_types:
         return True  # Allgemein-Bewerber: offen für alle Stellenarten
     return job_type in expand_position_types(applicant_types)
+
+
+def applicant_position_mask(applicant_types: List[str]) -> int:
+    """Bitmaske aller Stellenarten, für die ein Bewerber offen ist (inkl. Erweiterungen).
+
+    Entspricht position_compatible: ohne Präferenz oder mit "general" alle Bits,
+    sonst die erweiterten Wünsche plus das general-Bit (general-Jobs sind für alle offen).
+    Damit gilt: position_compatible(types, job_type) <=> mask & job_position_mask(job_type) != 0
+    """
+    if not applicant_types or GENERAL in applicant_types:
+        return ALL_POSITIONS_MASK
+    mask = POSITION_BITS[GENERAL]
+    for t in expand_position_types(applicant_types):
+        mask |= POSITION_BITS.get(t, 0)
+    return mask
+
+
+def job_position_mask(job_type: Optional[str]) -> int:
+    """Bit der Stellenart eines Jobs (0 ohne Stellenart -> passt zu niemandem)."""
+    return POSITION_BITS.get(job_type, 0) if job_type else 0
@@ -0,0 +1,351 @@
+"""
+Periodische Hintergrund-Jobs (Cleanup, Digests, Reports, Blog-Writer, Telegram, Backfills)
+
+Registriert per @scheduled_job beim Import; ausgeführt vom Scheduler
+(app.services.scheduler_service): nur der per Advisory-Lock gewählte Leader-Prozess,
+jeder Slot genau einmal, verpasste Slots werden innerhalb von max_delay nachgeholt.
+Der Handler bekommt den Slot (scheduled_for).
+
+Sync-Handler laufen im begrenzten Job-Pool (Threads oder – SCHEDULER_EXECUTOR=process –
+eigene Prozesse, die nur dieses Modul importieren), async-Handler auf dem Event-Loop;
+sie dürfen daher nicht blockieren (DB-Arbeit per asyncio.to_thread).
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, date
+
+from app.core.database import SessionLocal
+# Alle Mapper + Mapper-Events wie in app.main – auch im Job-Prozess (SCHEDULER_EXECUTOR=process)
+from app.models import ijp, contract, facebook_post  # noqa: F401
+from app.services import keyword_index, match_filters  # noqa: F401
+from app.services.scheduler_service import scheduled_job, every, hourly, daily_at, next_daily_slot
+
+logger = logging.getLogger(__name__)
+
+
+def cleanup_jobs():
+    """
+    Cleanup-Funktion für Jobs:
+    1. Archiviert Stellen, deren Deadline abgelaufen ist
+    2. Löscht Stellen endgültig, die seit mehr als X Tagen archiviert sind (konfigurierbar, Standard: 90 Tage)
+    """
+    db = SessionLocal()
+    try:
+        from app.models.job_posting import JobPosting
+        from app.models.application import Application
+        from app.services.settings_service import get_setting
+        
+        today = date.today()
+        
+        # Archiv-Löschfrist aus Einstellungen laden (Standard: 90 Tage = 3 Monate)
+        archive_deletion_days = get_setting(db, "archive_deletion_days", 90)
+        deletion_cutoff = datetime.utcnow() - timedelta(days=archive_deletion_days)
+        
+        logger.info(f"Job-Cleanup: Archiv-Löschfrist ist {archive_deletion_days} Tage")
+        
+        # 1. Abgelaufene Stellen archivieren
+        from app.models.job_posting import JobDeletionReason
+        
+        expired_jobs = db.query(JobPosting).filter(
+            JobPosting.is_archived == False,
+            JobPosting.deadline != None,
+            JobPosting.deadline < today
+        ).all()
+        
+        for job in expired_jobs:
+            job.is_active = False
+            job.is_archived = True
+            job.archived_at = datetime.utcnow()
+            job.deletion_reason = JobDeletionReason.EXPIRED
+            job.deleted_at = datetime.utcnow()
+            logger.info(f"Job {job.id} '{job.title}' archiviert (Deadline abgelaufen)")
+        
+        if expired_jobs:
+            db.commit()
+            logger.info(f"{len(expired_jobs)} Jobs wegen abgelaufener Deadline archiviert")
+        
+        # 2. Alte Archive endgültig löschen (nach konfigurierbarer Frist)
+        old_archived_jobs = db.query(JobPosting).filter(
+            JobPosting.is_archived == True,
+            JobPosting.archived_at != None,
+            JobPosting.archived_at < deletion_cutoff
+        ).all()
+        
+        deleted_count = 0
+        for job in old_archived_jobs:
+            # Bewerbungen über ORM löschen, damit abhängige Dokumente/Interviews
+            # per Cascade mitgelöscht werden (Bulk-DELETE umgeht die Cascade und
+            # verletzt den FK application_documents_application_id_fkey)
+            applications = db.query(Application).filter(Application.job_posting_id == job.id).all()
+            for application in applications:
+                db.delete(application)
+            db.flush()
+            db.delete(job)
+            deleted_count += 1
+            logger.info(f"Job {job.id} '{job.title}' endgültig gelöscht ({archive_deletion_days} Tage im Archiv)")
+        
+        if deleted_count > 0:
+            db.commit()
+            logger.info(f"{deleted_count} alte archivierte Jobs endgültig gelöscht")
+            
+    except Exception as e:
+        logger.error(f"Fehler beim Job-Cleanup: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@scheduled_job("job_cleanup", every(timedelta(hours=6)), max_delay=timedelta(hours=6))
+def periodic_cleanup(scheduled_for: datetime):
+    """Regelmäßiges Job-Cleanup (alle 6 Stunden)"""
+    logger.info("Starte periodisches Job-Cleanup...")
+    cleanup_jobs()
+
+
+def _telegram_promo_schedule(db, after: datetime):
+    """Wochentage: Python-Konvention (Montag=0 … Sonntag=6). Default: Mo & Do (2×/Woche)."""
+    from app.services.settings_service import get_setting
+    from app.services import telegram_service as tg
+
+    if not get_setting(db, "telegram_promo_enabled", True) or not tg.is_configured():
+        return None
+    hour = int(get_setting(db, "telegram_promo_hour", 10))
+    return next_daily_slot(after, hour, get_setting(db, "telegram_promo_days", [0, 3]))
+
+
+@scheduled_job("telegram_promo", _telegram_promo_schedule, max_delay=timedelta(hours=2))
+def telegram_daily_promo(scheduled_for: datetime):
+    """Postet an ausgewählten Wochentagen eine Abo-Werbung in die Gruppe."""
+    from app.services import telegram_service as tg
+
+    db = SessionLocal()
+    try:
+        tg.send_group_promo(db)
+        logger.info("Telegram-Promo in Gruppe gepostet")
+    finally:
+        db.close()
+
+
+def _weekly_digest_schedule(db, after: datetime):
+    """Wochentage im JS-Format (0=Sonntag), Default: Montag 9:00 UTC."""
+    from app.services.settings_service import get_setting
+
+    if not get_setting(db, "weekly_digest_enabled", True):
+        return None
+    digest_days = get_setting(db, "weekly_digest_days", [1])
+    digest_hour = int(get_setting(db, "weekly_digest_hour", 9))
+    # JS-Format (0=Sonntag) -> Python (0=Montag)
+    return next_daily_slot(after, digest_hour, [(day - 1) % 7 for day in digest_days or []])
+
+
+@scheduled_job("weekly_job_digest", _weekly_digest_schedule, max_delay=timedelta(days=1))
+def weekly_job_digest(scheduled_for: datetime):
+    """Wöchentliche Job-Digest E-Mails (konfigurierbare Wochentage und Uhrzeit)"""
+    from app.services.job_notification_service import send_weekly_job_digest
+
+    logger.info("Starte wöchentlichen Job-Digest...")
+    db = SessionLocal()
+    try:
+        emails_sent = send_weekly_job_digest(db)
+        logger.info(f"Weekly digest: {emails_sent} E-Mails gesendet")
+        return {"emails_sent": emails_sent}
+    finally:
+        db.close()
+
+
+@scheduled_job("company_applicant_digest", hourly(), max_delay=timedelta(hours=12))
+def company_applicant_digest(scheduled_for: datetime):
+    """Tägliche Bewerber-Digest E-Mails an Firmen. Läuft zu jeder vollen Stunde; fällige
+    Firmen wählt company_digest_service per SQL für den Slot aus (auch beim Nachholen)."""
+    from app.services.company_digest_service import send_company_applicant_digests
+
+    db = SessionLocal()
+    try:
+        return {"companies": send_company_applicant_digests(db, scheduled_for)}
+    finally:
+        db.close()
+
+
+@scheduled_job("company_weekly_report", daily_at(8, weekdays=[0]), max_delay=timedelta(days=1))
+def company_weekly_report(scheduled_for: datetime):
+    """Wöchentlicher Stellen-Report an Firmen (Montag 08:00 UTC):
+    offene Stellen, Aufrufe, Bewerbungen, Merkungen. Nur wenn aktiviert."""
+    from app.services.company_digest_service import send_company_weekly_reports
+
+    db = SessionLocal()
+    try:
+        return {"companies": send_company_weekly_reports(db)}
+    finally:
+        db.close()
+
+
+@scheduled_job("company_expiry_reminder", daily_at(9), max_delay=timedelta(days=1))
+def company_expiry_reminder(scheduled_for: datetime):
+    """Täglich (09:00 UTC): erinnert Firmen an Stellen, die in <=3 Tagen ablaufen.
+    Einmalig pro Stelle (Dedup über expiry_reminder_sent_at). Nur wenn aktiviert."""
+    from app.models.job_posting import JobPosting
+    from app.services.email_service import email_service
+
+    db = SessionLocal()
+    try:
+        today = scheduled_for.date()
+        window_end = today + timedelta(days=3)
+        jobs = db.query(JobPosting).filter(
+            JobPosting.is_active == True,
+            JobPosting.is_draft == False,
+            JobPosting.is_archived == False,
+            JobPosting.deadline != None,
+            JobPosting.deadline >= today,
+            JobPosting.deadline <= window_end,
+            JobPosting.expiry_reminder_sent_at == None,
+        ).all()
+
+        by_company = {}
+        for job in jobs:
+            company = job.company
+            if not company or not company.expiry_reminder_enabled or company.is_scraped:
+                continue
+            entry = by_company.setdefault(company.id, {"company": company, "jobs": []})
+            entry["jobs"].append({
+                "title": job.title,
+                "deadline": job.deadline.strftime("%d.%m.%Y"),
+                "days_left": (job.deadline - today).days,
+                "job_id": job.id,
+            })
+            job.expiry_reminder_sent_at = today
+
+        for entry in by_company.values():
+            company = entry["company"]
+            if company.user and company.user.email:
+                email_service.send_company_expiry_reminder(
+                    to_email=company.user.email,
+                    company_name=company.company_name,
+                    jobs=entry["jobs"],
+                )
+                logger.info(f"Ablauf-Erinnerung an {company.company_name} gesendet ({len(entry['jobs'])} Stellen)")
+        db.commit()  # sent_at-Flags persistieren
+        return {"companies": len(by_company)}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _blog_writer_schedule(db, after: datetime):
+    """Wochentags-Modus (Intervall 7/14 + Wochentage, 0=Montag) oder Tagesintervall ab dem
+    letzten erfolgreichen Lauf (blog_writer_last_run_date), jeweils zur Uhrzeit run_hour."""
+    from app.services.settings_service import get_setting
+
+    if not get_setting(db, "blog_writer_enabled", True):
+        return None
+    interval_days = int(get_setting(db, "blog_writer_interval_days", 7))
+    run_hour = int(get_setting(db, "blog_writer_hour", 8))
+    weekdays = get_setting(db, "blog_writer_weekdays", [0])
+
+    if interval_days in (7, 14) and weekdays:
+        return next_daily_slot(after, run_hour, weekdays)
+
+    # Tagesintervall-Modus
+    slot = next_daily_slot(after, run_hour)
+    last_run_str = get_setting(db, "blog_writer_last_run_date", "")  # "YYYY-MM-DD"
+    if last_run_str:
+        due_date = date.fromisoformat(last_run_str) + timedelta(days=interval_days)
+        slot = max(slot, datetime(due_date.year, due_date.month, due_date.day, run_hour))
+    return slot
+
+
+@scheduled_job("blog_writer", _blog_writer_schedule, max_delay=timedelta(days=1))
+async def weekly_blog_writer(scheduled_for: datetime):
+    """Generiert automatisch Blog-Posts mit Claude (Intervall und Modus konfigurierbar).
+    Speichert das Datum des letzten Laufs (Basis des Tagesintervall-Modus)."""
+    from app.services.settings_service import get_setting, set_setting
+    from app.services.blog_writer_service import generate_and_publish_blog_post
+
+    logger.info("Starte automatischen Blog-Writer...")
+    db = SessionLocal()
+    try:
+        auto_publish = get_setting(db, "blog_writer_auto_publish", False)
+        result = await generate_and_publish_blog_post(db, auto_publish=auto_publish)
+        if not result:
+            logger.warning("Blog-Writer: kein Post generiert (API-Key fehlt?)")
+            return {"created": False}
+        mode = "veröffentlicht" if auto_publish else "als Entwurf gespeichert"
+        logger.info(f"✅ Blog-Writer: '{result['title']}' {mode}")
+        set_setting(db, "blog_writer_last_run_date", datetime.utcnow().date().isoformat())
+        db.commit()
+        return {"created": True, "title": result["title"], "published": bool(auto_publish)}
+    finally:
+        db.close()
+
+
+@scheduled_job("telegram_post_pending_jobs", every(timedelta(seconds=90)), max_delay=timedelta(seconds=90))
+async def telegram_post_pending_jobs(scheduled_for: datetime):
+    """Postet neu veröffentlichte Stellen mit ~5 Min Verzögerung in Telegram –
+    und nur, wenn sie ausreichend ausgefüllt sind. Die Verzögerung verhindert Spam
+    bei versehentlichen oder sofort wieder gelöschten Posts."""
+    from app.models.job_posting import JobPosting
+    from app.services.settings_service import get_setting
+    from app.services import telegram_service as tg
+
+    def claim_ready_jobs() -> list:
+        """IDs der jetzt zu postenden Stellen; markiert sie (und zu alte) als gepostet."""
+        db = SessionLocal()
+        try:
+            min_score = int(get_setting(db, "telegram_min_job_score", 60))
+            delay_min = int(get_setting(db, "telegram_post_delay_minutes", 5))
+            now = datetime.utcnow()
+            ready_before = now - timedelta(minutes=delay_min)
+            window_start = now - timedelta(hours=2)
+
+            pending = db.query(JobPosting).filter(
+                JobPosting.is_active == True,
+                JobPosting.is_draft == False,
+                JobPosting.is_archived == False,
+                JobPosting.telegram_posted_at == None,
+            ).all()
+
+            ready = []
+            for job in pending:
+                pub = job.published_at or job.created_at
+                if not pub:
+                    continue
+                pub_naive = pub.replace(tzinfo=None) if getattr(pub, "tzinfo", None) else pub
+                # Zu alt (Backlog-Schutz): ausmustern, nie mehr prüfen
+                if pub_naive < window_start:
+                    job.telegram_posted_at = now
+                    continue
+                # Verzögerung noch nicht erreicht -> nächste Runde
+                if pub_naive > ready_before:
+                    continue
+                # Noch zu leer -> innerhalb des Fensters evtl. später (falls ausgefüllt wird)
+                if tg.job_completeness_score(job) < min_score:
+                    continue
+                # Vor dem Versand markieren: ein Neustart mitten im Broadcast postet nicht doppelt
+                job.telegram_posted_at = now
+                ready.append(job.id)
+            db.commit()
+            return ready
+        finally:
+            db.close()
+
+    if not tg.is_configured():
+        return {"posted": 0}
+    posted = 0
+    for job_id in await asyncio.to_thread(claim_ready_jobs):
+        try:
+            # Async + rate-limitiert: blockiert den Event-Loop (API) nicht
+            await tg.broadcast_new_job(job_id)
+            posted += 1
+        except Exception as e:
+            logger.warning(f"telegram_post_pending_jobs broadcast {job_id}: {e}")
+    return {"posted": posted}
+
+
+@scheduled_job("backfills", every(timedelta(minutes=1)), max_delay=timedelta(minutes=1))
+def run_backfills(scheduled_for: datetime):
+    """Arbeitet angeforderte Backfills (app.services.backfills) in ID-Blöcken ab –
+    höchstens ~50 s pro Slot, danach setzt der nächste Slot beim Checkpoint fort."""
+    from app.services.backfill_service import run_pending_backfills
+
+    return {"backfills": run_pending_backfills()}
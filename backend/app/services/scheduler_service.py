@@ -0,0 +1,472 @@
+"""
+Scheduler-Service: periodische Hintergrund-Jobs (Cleanup, Digests, Reports, Blog-Writer,
+Telegram) laufen genau einmal – unabhängig davon, wie viele uvicorn-Prozesse starten.
+
+- Leader-Wahl:  Postgres-Advisory-Lock (pg_try_advisory_lock) auf einer eigenen, offen
+                gehaltenen Verbindung. Nur der Leader führt Jobs aus; stirbt er, gibt
+                Postgres den Lock frei und ein anderer Prozess übernimmt. SQLite
+                (lokale Entwicklung, ein Prozess) ist immer Leader.
+- Zustand:      scheduled_jobs (ein Eintrag pro Job). Der nächste Slot wird aus dem
+                zuletzt beanspruchten Slot berechnet; beansprucht wird per bedingtem
+                UPDATE (last_scheduled_for = vorheriger Slot), sodass auch zwei
+                kurzzeitige Leader denselben Slot nicht doppelt ausführen.
+- Catch-up:     Slots, die während eines Deployments/Ausfalls verpasst wurden, laufen
+                nach dem Start nach – sofern nicht älter als max_delay des Jobs; ältere
+                werden übersprungen (skipped_count). Bricht ein Prozess mitten im Lauf
+                ab, wird der Slot nicht wiederholt (status "interrupted"), damit keine
+                E-Mails doppelt rausgehen.
+- Ausführung:   Sync-Handler laufen in einem begrenzten Job-Pool (JobExecutor) –
+                SCHEDULER_WORKERS Threads oder, mit SCHEDULER_EXECUTOR=process, eigene
+                Prozesse (spawn), damit Digests/Cleanup weder den Event-Loop noch per GIL
+                die API-Requests ausbremsen. Async-Handler laufen auf dem Event-Loop.
+                Pro Lauf werden Dauer, Wartezeit im Pool und CPU-Zeit festgehalten.
+
+Jobs werden mit @scheduled_job(name, schedule, max_delay) registriert. schedule(db, after)
+liefert den ersten Slot nach after (None = deaktiviert); der Handler bekommt den Slot
+(scheduled_for) und darf async oder sync sein.
+"""
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.scheduled_job import ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+# Fester Schlüssel des Advisory-Locks ("JOBON" als Zahl)
+SCHEDULER_LOCK_KEY = 0x4A4F424F4E
+
+# Höchstens so lange schläft der Leader (Einstellungsänderungen greifen spätestens dann);
+# Nicht-Leader versuchen in diesem Abstand, den Lock zu übernehmen
+SCHEDULER_TICK_SECONDS = 30
+LEADER_RETRY_SECONDS = 30
+
+Schedule = Callable[[Session, datetime], Optional[datetime]]
+
+
+@dataclass
+class JobDefinition:
+    name: str
+    schedule: Schedule
+    handler: Callable[[datetime], object]
+    max_delay: timedelta
+
+
+SCHEDULED_JOBS: Dict[str, JobDefinition] = {}
+
+
+def scheduled_job(name: str, schedule: Schedule, max_delay: timedelta):
+    """Registriert einen periodischen Job (Handler bekommt den Slot scheduled_for)."""
+    def decorator(func):
+        SCHEDULED_JOBS[name] = JobDefinition(name, schedule, func, max_delay)
+        return func
+    return decorator
+
+
+# ---------- Zeitpläne ----------
+
+def next_daily_slot(after: datetime, hour: int, weekdays: Optional[Iterable[int]] = None) -> Optional[datetime]:
+    """Erster Zeitpunkt hour:00 nach after, optional nur an weekdays (0=Montag).
+
+    Returns: None, wenn weekdays leer ist.
+    """
+    if weekdays is not None:
+        weekdays = set(weekdays)
+        if not weekdays:
+            return None
+    candidate = after.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if candidate <= after:
+        candidate += timedelta(days=1)
+    for _ in range(7):
+        if weekdays is None or candidate.weekday() in weekdays:
+            return candidate
+        candidate += timedelta(days=1)
+    return None
+
+
+def every(interval: timedelta) -> Schedule:
+    """Fester Abstand zum vorherigen Slot."""
+    return lambda db, after: after + interval
+
+
+def hourly() -> Schedule:
+    """Zu jeder vollen Stunde."""
+    return lambda db, after: after.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+
+def daily_at(hour: int, weekdays: Optional[Iterable[int]] = None) -> Schedule:
+    """Täglich um hour:00 UTC, optional nur an weekdays (0=Montag)."""
+    weekdays = None if weekdays is None else tuple(weekdays)
+    return lambda db, after: next_daily_slot(after, hour, weekdays)
+
+
+# ---------- Leader-Wahl ----------
+
+class LeaderLock:
+    """Session-Advisory-Lock auf einer dedizierten Verbindung (nur Postgres).
+
+    Der Lock gehört der Verbindung: bricht sie ab oder endet der Prozess, gibt Postgres
+    ihn frei. is_leader() prüft die Verbindung bei jedem Aufruf und versucht sonst,
+    den Lock (neu) zu bekommen.
+    """
+
+    def __init__(self, engine, key: int = SCHEDULER_LOCK_KEY):
+        self.engine = engine
+        self.key = key
+        self._conn = None
+
+    def is_leader(self) -> bool:
+        if self.engine.dialect.name != "postgresql":
+            return True
+        if self._conn is not None:
+            try:
+                self._conn.execute(text("SELECT 1"))
+                self._conn.commit()
+                return True
+            except Exception as e:
+                logger.warning(f"Scheduler: Leader-Verbindung verloren: {e}")
+                self._close()
+        conn = self.engine.connect()
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            # Keine offene Transaktion halten (idle_in_transaction_session_timeout)
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Scheduler: Lock-Freigabe fehlgeschlagen: {e}")
+        self._close()
+
+    def _close(self) -> None:
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+# ---------- Zustand & Beanspruchen ----------
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+def sync_job_rows(db: Session, now: datetime) -> Dict[str, ScheduledJob]:
+    """Legt fehlende Einträge an (Start ab jetzt, kein Nachholen der Vergangenheit).
+
+    Returns: {name: ScheduledJob}
+    """
+    rows = {row.name: row for row in db.query(ScheduledJob).all()}
+    missing = [name for name in SCHEDULED_JOBS if name not in rows]
+    if missing:
+        db.add_all(ScheduledJob(name=name, last_scheduled_for=now) for name in missing)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        rows = {row.name: row for row in db.query(ScheduledJob).all()}
+    return rows
+
+
+def mark_interrupted(db: Session, owner: str) -> int:
+    """Läufe anderer (beendeter) Prozesse, die noch als "running" stehen -> "interrupted"."""
+    count = db.query(ScheduledJob).filter(
+        ScheduledJob.status == "running",
+        ScheduledJob.owner != owner,
+    ).update({"status": "interrupted"}, synchronize_session=False)
+    db.commit()
+    return count
+
+
+def due_slot(job: JobDefinition, row: ScheduledJob, db: Session, now: datetime) -> tuple:
+    """Nächster Slot des Jobs und ob Slots wegen max_delay übersprungen werden.
+
+    Returns: (slot | None, skipped)
+    """
+    slot = job.schedule(db, row.last_scheduled_for)
+    cutoff = now - job.max_delay
+    if slot is not None and slot < cutoff:
+        # Zu alt zum Nachholen -> ältester Slot, der noch innerhalb von max_delay liegt
+        return job.schedule(db, cutoff), True
+    return slot, False
+
+
+def claim_slot(db: Session, name: str, previous: datetime, slot: datetime, skipped: bool,
+               owner: str, now: datetime) -> bool:
+    """Beansprucht slot, falls last_scheduled_for noch previous ist (sonst lief er schon)."""
+    values = {
+        ScheduledJob.last_scheduled_for: slot,
+        ScheduledJob.status: "running",
+        ScheduledJob.owner: owner,
+        ScheduledJob.started_at: now,
+    }
+    if skipped:
+        values[ScheduledJob.skipped_count] = ScheduledJob.skipped_count + 1
+    claimed = db.query(ScheduledJob).filter(
+        ScheduledJob.name == name,
+        ScheduledJob.last_scheduled_for == previous,
+    ).update(values, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+def record_run(db: Session, name: str, timing: dict, result=None, error: Optional[BaseException] = None) -> None:
+    """Hält Ergebnis und Laufzeiten fest (timing: duration_ms, wait_ms, cpu_ms)."""
+    now = datetime.utcnow()
+    values = {
+        "status": "failed" if error else "done",
+        "finished_at": now,
+        "last_duration_ms": timing.get("duration_ms"),
+        "last_wait_ms": timing.get("wait_ms"),
+        "last_cpu_ms": timing.get("cpu_ms"),
+        "last_error": f"{type(error).__name__}: {error}"[:500] if error else None,
+        "run_count": ScheduledJob.run_count + 1,
+    }
+    if not error:
+        values["last_result"] = result if isinstance(result, (dict, list, int, float, str, bool)) else None
+    db.query(ScheduledJob).filter(ScheduledJob.name == name).update(values, synchronize_session=False)
+    db.commit()
+
+
+# ---------- Ausführung ----------
+
+def _init_job_process(modules: tuple) -> None:
+    """Initialisierung eines Job-Prozesses: Logging + Module mit den Handlern importieren."""
+    logging.basicConfig(level=logging.INFO)
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _call_sync_job(name: str, scheduled_for: datetime, submitted_at: float) -> tuple:
+    """Führt einen Sync-Handler im Pool aus (Thread oder Job-Prozess).
+
+    Returns: (result, wait_ms, cpu_ms)
+    """
+    wait_ms = max(0, int((time.time() - submitted_at) * 1000))
+    cpu_started = time.thread_time()
+    result = SCHEDULED_JOBS[name].handler(scheduled_for)
+    return result, wait_ms, int((time.thread_time() - cpu_started) * 1000)
+
+
+class JobExecutor:
+    """Begrenzter Pool für Sync-Jobs: "thread" (Default) oder "process".
+
+    Im Prozess-Modus importieren die Worker nur die Module der registrierten Handler
+    (nicht app.main), Rückgabewerte müssen picklebar sein.
+    """
+
+    def __init__(self, kind: str = "thread", workers: int = 2):
+        self.kind = "process" if kind == "process" else "thread"
+        self.workers = max(1, workers)
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    modules = tuple(sorted({job.handler.__module__ for job in SCHEDULED_JOBS.values()}))
+                    # spawn statt fork: der Webserver-Prozess hat Threads und offene DB-Verbindungen
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_job_process,
+                        initargs=(modules,),
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scheduler-job")
+            return self._pool
+
+    async def run(self, job: JobDefinition, scheduled_for: datetime) -> tuple:
+        """Führt den Job aus; async-Handler direkt auf dem Event-Loop.
+
+        Returns: (result, {"duration_ms", "wait_ms", "cpu_ms"}) – cpu_ms None bei async
+        """
+        started = time.monotonic()
+        if asyncio.iscoroutinefunction(job.handler):
+            result = await job.handler(scheduled_for)
+            wait_ms, cpu_ms = 0, None
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                result, wait_ms, cpu_ms = await loop.run_in_executor(
+                    self._get_pool(), _call_sync_job, job.name, scheduled_for, time.time()
+                )
+            except BrokenProcessPool:
+                # Job-Prozess abgestürzt -> beim nächsten Lauf neuer Pool
+                with self._lock:
+                    self._pool = None
+                raise
+        timing = {"duration_ms": int((time.monotonic() - started) * 1000), "wait_ms": wait_ms, "cpu_ms": cpu_ms}
+        return result, timing
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+# ---------- Scheduler ----------
+
+class Scheduler:
+    """Leader-Schleife: prüft fällige Jobs und startet sie als eigene Tasks (ein Job läuft
+    nie parallel zu sich selbst; ein langer Blog-Lauf hält den Telegram-Poster nicht auf)."""
+
+    def __init__(self, session_factory, engine, executor: Optional[JobExecutor] = None):
+        self.session_factory = session_factory
+        self.lock = LeaderLock(engine)
+        self.executor = executor or JobExecutor()
+        self.owner = _owner()
+        self.running: Dict[str, asyncio.Task] = {}
+        self.leader = False
+
+    def _tick(self) -> tuple:
+        """Ein Durchlauf (Thread): beansprucht fällige Slots.
+
+        Returns: ([(job, slot)], Sekunden bis zum nächsten Slot)
+        """
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            rows = sync_job_rows(db, now)
+            claimed: List[tuple] = []
+            wait = SCHEDULER_TICK_SECONDS
+            for name, job in SCHEDULED_JOBS.items():
+                if name in self.running:
+                    continue
+                row = rows[name]
+                try:
+                    slot, skipped = due_slot(job, row, db, now)
+                except Exception as e:
+                    logger.error(f"Scheduler: Zeitplan von {name} fehlerhaft: {e}")
+                    db.rollback()
+                    continue
+                if slot is None or slot > now:
+                    if row.next_run_at != slot:
+                        row.next_run_at = slot
+                        db.commit()
+                    if slot is not None:
+                        wait = min(wait, (slot - now).total_seconds())
+                    continue
+                if skipped:
+                    logger.warning(f"Scheduler: {name} – verpasste Slots vor {slot} übersprungen (älter als {job.max_delay})")
+                if claim_slot(db, name, row.last_scheduled_for, slot, skipped, self.owner, now):
+                    claimed.append((job, slot))
+            return claimed, max(1.0, wait)
+        finally:
+            db.close()
+
+    def _record(self, name: str, timing: dict, result=None, error: Optional[BaseException] = None) -> None:
+        db = self.session_factory()
+        try:
+            record_run(db, name, timing, result, error)
+        finally:
+            db.close()
+
+    async def _run(self, job: JobDefinition, slot: datetime) -> None:
+        started = time.monotonic()
+        logger.info(f"Scheduler: starte {job.name} (Slot {slot:%Y-%m-%d %H:%M})")
+        try:
+            result, timing = await self.executor.run(job, slot)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Scheduler: {job.name} fehlgeschlagen: {e}")
+            timing = {"duration_ms": int((time.monotonic() - started) * 1000)}
+            await asyncio.to_thread(self._record, job.name, timing, None, e)
+        else:
+            cpu = f", CPU {timing['cpu_ms']} ms" if timing["cpu_ms"] is not None else ""
+            logger.info(f"Scheduler: {job.name} fertig in {timing['duration_ms']} ms "
+                        f"(Wartezeit {timing['wait_ms']} ms{cpu})")
+            await asyncio.to_thread(self._record, job.name, timing, result)
+        finally:
+            self.running.pop(job.name, None)
+
+    def _elect(self) -> bool:
+        leader = self.lock.is_leader()
+        if leader and not self.leader:
+            logger.info(f"Scheduler: {self.owner} ist Leader")
+            db = self.session_factory()
+            try:
+                mark_interrupted(db, self.owner)
+            finally:
+                db.close()
+        elif self.leader and not leader:
+            logger.warning(f"Scheduler: {self.owner} hat die Leader-Rolle verloren")
+        self.leader = leader
+        return leader
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                if not await asyncio.to_thread(self._elect):
+                    await asyncio.sleep(LEADER_RETRY_SECONDS)
+                    continue
+                claimed, wait = await asyncio.to_thread(self._tick)
+                for job, slot in claimed:
+                    self.running[job.name] = asyncio.create_task(self._run(job, slot))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Scheduler: {e}")
+                wait = SCHEDULER_TICK_SECONDS
+            await asyncio.sleep(wait)
+
+    async def stop(self) -> None:
+        """Laufende Jobs abbrechen, Job-Pool beenden und den Leader-Lock freigeben."""
+        tasks = list(self.running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.executor.shutdown()
+        await asyncio.to_thread(self.lock.release)
+
+
+def serialize_scheduled_job(row: ScheduledJob) -> dict:
+    def iso(value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value else None
+
+    return {
+        "name": row.name,
+        "status": row.status,
+        "owner": row.owner,
+        "last_scheduled_for": iso(row.last_scheduled_for),
+        "next_run_at": iso(row.next_run_at),
+        "started_at": iso(row.started_at),
+        "finished_at": iso(row.finished_at),
+        "last_duration_ms": row.last_duration_ms,
+        "last_wait_ms": row.last_wait_ms,
+        "last_cpu_ms": row.last_cpu_ms,
+        "last_error": row.last_error,
+        "last_result": row.last_result,
+        "run_count": row.run_count,
+        "skipped_count": row.skipped_count,
+    }
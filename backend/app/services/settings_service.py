@@ -19,6 +19,22 @@ def get_setting(db: Session, key: str, default=None):
     return _convert_value(setting.value, setting.value_type)
 
 
+def get_settings(db: Session, defaults: dict) -> dict:
+    """Holt mehrere Einstellungen mit EINER Query: {key: wert}.
+    Fehlende Keys wie bei get_setting: erst DEFAULT_SETTINGS, dann defaults[key]."""
+    rows = db.query(GlobalSettings).filter(GlobalSettings.key.in_(list(defaults))).all()
+    stored = {row.key: row for row in rows}
+    result = {}
+    for key, default in defaults.items():
+        if key in stored:
+            result[key] = _convert_value(stored[key].value, stored[key].value_type)
+        elif key in DEFAULT_SETTINGS:
+            result[key] = _convert_value(DEFAULT_SETTINGS[key]["value"], DEFAULT_SETTINGS[key]["value_type"])
+        else:
+            result[key] = default
+    return result
+
+
 def set_setting(db: Session, key: str, value, user_id: int = None):
     """Setzt eine Einstellung in der Datenbank"""
     setting = db.query(GlobalSettings).filter(GlobalSettings.key == key).first()
@@ -3,23 +3,24 @@ Storage Service - Cloudflare R2 (S3-kompatibel)
 
 Speichert Dokumente persistent in der Cloud statt lokal.
 Fallback auf lokales Filesystem wenn R2 nicht konfiguriert ist.
+
+boto3 und die R2-Verbindung (head_bucket) werden erst beim ersten Zugriff geladen
+bzw. geprüft – nicht beim Import, damit der Worker-Start schnell und schlank bleibt.
 """
+import asyncio
 import os
 import uuid
 import logging
+import threading
+from importlib.util import find_spec
 from typing import Optional, Tuple
 from io import BytesIO
 
 logger = logging.getLogger(__name__)
 
-# Versuche boto3 zu importieren (für S3/R2)
-try:
-    import boto3
-    from botocore.config import Config
-    from botocore.exceptions import ClientError
-    BOTO3_AVAILABLE = True
-except ImportError:
-    BOTO3_AVAILABLE = False
+# boto3 (für S3/R2) nur prüfen, nicht importieren
+BOTO3_AVAILABLE = find_spec("boto3") is not None
+if not BOTO3_AVAILABLE:
     logger.warning("boto3 nicht installiert - verwende lokalen Storage")
 
 
@@ -35,17 +36,55 @@ class StorageService:
     """
     
     def __init__(self):
-        self.use_r2 = False
-        self.s3_client = None
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _ensure_initialized(self):
+        if self._initialized:
+            return
+        with self._init_lock:
+            if not self._initialized:
+                self._initialize()
+                self._initialized = True
+
+    async def _ensure_initialized_async(self):
+        """Erster Zugriff aus async-Code: Verbindungsaufbau im Thread statt auf dem Event-Loop."""
+        if not self._initialized:
+            await asyncio.to_thread(self._ensure_initialized)
+
+    # Verbindungszustand – der erste Zugriff baut die Verbindung auf
+    @property
+    def use_r2(self) -> bool:
+        self._ensure_initialized()
+        return self._use_r2
+
+    @property
+    def r2_required(self) -> bool:
+        self._ensure_initialized()
+        return self._r2_required
+
+    @property
+    def s3_client(self):
+        self._ensure_initialized()
+        return self._s3_client
+
+    @property
+    def bucket_name(self) -> str:
+        self._ensure_initialized()
+        return self._bucket_name
+
+    def _initialize(self):
+        self._use_r2 = False
+        self._s3_client = None
         # Wenn R2-Zugangsdaten konfiguriert sind, ist R2 PFLICHT – dann wird NIE
         # still auf den (flüchtigen) lokalen Speicher zurückgefallen, um Datenverlust
         # zu vermeiden. Uploads schlagen dann lieber mit klarer Meldung fehl.
-        self.r2_required = False
+        self._r2_required = False
 
         # Lade Config aus settings (die lädt aus Environment Variables)
         from app.core.config import settings
 
-        self.bucket_name = settings.R2_BUCKET_NAME or 'jobon-documents'
+        self._bucket_name = settings.R2_BUCKET_NAME or 'jobon-documents'
         r2_account_id = settings.R2_ACCOUNT_ID
         r2_access_key = settings.R2_ACCESS_KEY_ID
         r2_secret_key = settings.R2_SECRET_ACCESS_KEY
@@ -56,12 +95,15 @@ class StorageService:
         
         if BOTO3_AVAILABLE and r2_account_id and r2_access_key and r2_secret_key:
             # R2 ist konfiguriert → ab jetzt PFLICHT (kein stiller lokaler Fallback)
-            self.r2_required = True
+            self._r2_required = True
             try:
+                import boto3
+                from botocore.config import Config
+
                 # R2 Endpoint
                 endpoint_url = f"https://{r2_account_id}.r2.cloudflarestorage.com"
 
-                self.s3_client = boto3.client(
+                self._s3_client = boto3.client(
                     's3',
                     endpoint_url=endpoint_url,
                     aws_access_key_id=r2_access_key,
@@ -73,16 +115,16 @@ class StorageService:
                 )
 
                 # Test-Verbindung - prüfe nur den spezifischen Bucket (nicht list_buckets!)
-                self.s3_client.head_bucket(Bucket=self.bucket_name)
-                self.use_r2 = True
-                logger.info(f"✅ Cloudflare R2 Storage aktiv (Bucket: {self.bucket_name})")
+                self._s3_client.head_bucket(Bucket=self._bucket_name)
+                self._use_r2 = True
+                logger.info(f"✅ Cloudflare R2 Storage aktiv (Bucket: {self._bucket_name})")
 
             except Exception as e:
                 # WICHTIG: NICHT auf lokal zurückfallen – sonst gehen Uploads beim
                 # nächsten Deploy verloren. Lieber später beim Upload klar fehlschlagen.
                 logger.critical(f"❌ R2 ist konfiguriert, aber die Verbindung schlug fehl: {e}. "
                                 f"Uploads werden abgelehnt, um Datenverlust zu vermeiden.")
-                self.use_r2 = False
+                self._use_r2 = False
         else:
             logger.info("📁 Lokaler Storage aktiv (R2 nicht konfiguriert)")
     
@@ -103,6 +145,7 @@ class StorageService:
         Returns:
             Tuple[success, file_path_or_key, error_message]
         """
+        await self._ensure_initialized_async()
         if self.use_r2:
             return await self._upload_to_r2(file_content, applicant_id, filename, content_type)
         if self.r2_required:
@@ -118,6 +161,8 @@ class StorageService:
         content_type: str
     ) -> Tuple[bool, str, str]:
         """Upload zu Cloudflare R2"""
+        from botocore.exceptions import ClientError
+
         try:
             key = self._get_r2_key(applicant_id, filename)
             
@@ -196,6 +241,7 @@ class StorageService:
         Returns:
             Tuple[success, file_content, error_message]
         """
+        await self._ensure_initialized_async()
         if self.use_r2:
             return await self._download_from_r2(file_path_or_key)
         else:
@@ -203,6 +249,8 @@ class StorageService:
     
     async def _download_from_r2(self, key: str) -> Tuple[bool, Optional[bytes], str]:
         """Download von Cloudflare R2"""
+        from botocore.exceptions import ClientError
+
         try:
             response = self.s3_client.get_object(
                 Bucket=self.bucket_name,
@@ -247,6 +295,7 @@ class StorageService:
         Returns:
             Tuple[success, error_message]
         """
+        await self._ensure_initialized_async()
         if self.use_r2:
             return await self._delete_from_r2(file_path_or_key)
         else:
@@ -311,6 +360,7 @@ class StorageService:
         Returns:
             Tuple[success, file_path_or_key, error_message]
         """
+        await self._ensure_initialized_async()
         if self.use_r2:
             try:
                 self.s3_client.put_object(
@@ -0,0 +1,359 @@
+"""
+Task-Queue-Service
+
+- enqueue_task / enqueue_tasks: legen typisierte Tasks (ein INSERT, auch für viele)
+                                in task_queue ab; ein vorhandener idempotency_key
+                                liefert den bestehenden Task statt eines neuen
+                                (replace_finished: abgeschlossene/fehlgeschlagene
+                                Tasks werden stattdessen neu angesetzt)
+- run_pending:                  Worker-Durchlauf – beansprucht fällige Tasks und führt
+                                sie mit begrenzter Parallelität aus (async Handler auf
+                                dem Event-Loop, sync Handler in Threads)
+- serialize_task:               Status für /admin/tasks
+
+Handler werden mit @task_handler("<typ>") registriert und bekommen das payload-dict;
+der Rückgabewert landet in task.result. Exceptions führen zu Retry mit Backoff.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import utc_now
+from app.models.task_queue import QueuedTask
+
+logger = logging.getLogger(__name__)
+
+# Tasks pro Worker-Durchlauf und gleichzeitig laufende Tasks
+TASK_BATCH = 20
+TASK_CONCURRENCY = 4
+
+# Retry: 30s, 1min, 2min, ... höchstens 1h; nach MAX_ATTEMPTS endgültig "failed"
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+# Laufende Tasks erneuern locked_at alle HEARTBEAT_SECONDS; "running" ohne Heartbeat
+# (Worker abgestürzt) wird nach STALE_RUNNING_MINUTES erneut freigegeben
+HEARTBEAT_SECONDS = 60
+STALE_RUNNING_MINUTES = 10
+
+TASK_HANDLERS: Dict[str, Callable[[dict], object]] = {}
+
+
+def task_handler(task_type: str):
+    """Registriert einen Handler für einen Task-Typ."""
+    def decorator(func):
+        TASK_HANDLERS[task_type] = func
+        return func
+    return decorator
+
+
+def enqueue_tasks(db: Session, tasks: List[dict], created_by_user_id: Optional[int] = None) -> List[QueuedTask]:
+    """Legt mehrere Tasks mit EINEM Insert an und committet.
+
+    tasks = [{"task_type": ..., "payload": {...}, "idempotency_key": ... (optional),
+              "replace_finished": bool (optional)}]
+    Returns: die Tasks in Eingabe-Reihenfolge (bereits vorhandene bei gleichem Schlüssel).
+    Ein Schlüssel mit replace_finished=True dedupliziert nur offene Tasks (pending/running);
+    ist der vorhandene Task done oder failed, wird er mit dem neuen payload neu angesetzt.
+    """
+    for task in tasks:
+        if task["task_type"] not in TASK_HANDLERS:
+            raise ValueError(f"Unbekannter Task-Typ: {task['task_type']}")
+
+    def existing_by_key() -> Dict[str, QueuedTask]:
+        keys = [t["idempotency_key"] for t in tasks if t.get("idempotency_key")]
+        if not keys:
+            return {}
+        return {row.idempotency_key: row for row in
+                db.query(QueuedTask).filter(QueuedTask.idempotency_key.in_(keys))}
+
+    existing = existing_by_key()
+    created: Dict[int, QueuedTask] = {}
+    renewed = 0
+    for index, task in enumerate(tasks):
+        key = task.get("idempotency_key")
+        if key and key in existing:
+            row = existing[key]
+            if task.get("replace_finished") and row.status in ("done", "failed"):
+                _renew(row, task.get("payload") or {}, created_by_user_id)
+                renewed += 1
+            continue
+        row = QueuedTask(task_type=task["task_type"], payload=task.get("payload") or {},
+                         idempotency_key=key, created_by_user_id=created_by_user_id)
+        created[index] = row
+        if key:
+            # Doppelter Schlüssel innerhalb desselben Aufrufs
+            existing[key] = row
+    if created or renewed:
+        db.add_all(created.values())
+        try:
+            db.commit()
+        except IntegrityError:
+            # Parallel angelegt (gleicher idempotency_key) -> erneut mit den jetzt vorhandenen
+            db.rollback()
+            return enqueue_tasks(db, tasks, created_by_user_id)
+    return [created.get(index) or existing[task["idempotency_key"]] for index, task in enumerate(tasks)]
+
+
+def _renew(row: QueuedTask, payload: dict, created_by_user_id: Optional[int]) -> None:
+    """Setzt einen abgeschlossenen Task als neuen an (gleiche Zeile, gleicher Schlüssel)."""
+    now = utc_now()
+    row.payload = payload
+    row.created_by_user_id = created_by_user_id
+    row.status = "pending"
+    row.attempts = 0
+    row.next_attempt_at = now
+    row.locked_at = None
+    row.last_error = None
+    row.result = None
+    row.created_at = now
+    row.finished_at = None
+
+
+def enqueue_task(db: Session, task_type: str, payload: Optional[dict] = None,
+                 idempotency_key: Optional[str] = None,
+                 created_by_user_id: Optional[int] = None) -> QueuedTask:
+    """Legt einen Task an (siehe enqueue_tasks)."""
+    return enqueue_tasks(db, [{"task_type": task_type, "payload": payload, "idempotency_key": idempotency_key}],
+                         created_by_user_id=created_by_user_id)[0]
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS))
+
+
+def _claim(db: Session, limit: int) -> List[dict]:
+    """Beansprucht fällige Tasks (status -> running) und gibt ihre Daten zurück."""
+    now = utc_now()
+    # Von abgestürzten Workern liegen gebliebene Tasks wieder freigeben
+    db.query(QueuedTask).filter(
+        QueuedTask.status == "running",
+        QueuedTask.locked_at < now - timedelta(minutes=STALE_RUNNING_MINUTES),
+    ).update({"status": "pending"}, synchronize_session=False)
+
+    rows = db.query(QueuedTask).filter(
+        QueuedTask.status == "pending",
+        QueuedTask.next_attempt_at <= now,
+    ).order_by(QueuedTask.id).limit(limit).with_for_update(skip_locked=True).all()
+    claimed = []
+    for row in rows:
+        row.status = "running"
+        row.locked_at = now
+        claimed.append({"id": row.id, "task_type": row.task_type,
+                        "payload": row.payload or {}, "attempts": row.attempts})
+    db.commit()
+    return claimed
+
+
+def _record(db: Session, outcomes: List[tuple]) -> None:
+    """Hält die Ergebnisse eines Durchlaufs fest: [(task, result, error)]."""
+    now = utc_now()
+    for task, result, error in outcomes:
+        attempts = task["attempts"] + 1
+        if error is None:
+            values = {"status": "done", "result": result, "finished_at": now, "last_error": None}
+        else:
+            # Fehlende Stelle / ungültiges Payload wird durch Wiederholen nicht besser
+            final = attempts >= MAX_ATTEMPTS or isinstance(error, (LookupError, ValueError))
+            values = {
+                "status": "failed" if final else "pending",
+                "next_attempt_at": now + _backoff(attempts),
+                "last_error": f"{type(error).__name__}: {error}"[:500],
+                "finished_at": now if final else None,
+            }
+            log = logger.error if final else logger.warning
+            log(f"Task {task['id']} ({task['task_type']}) fehlgeschlagen (Versuch {attempts}): {error}")
+        values.update({"attempts": attempts, "locked_at": None})
+        db.query(QueuedTask).filter(QueuedTask.id == task["id"]).update(values, synchronize_session=False)
+    db.commit()
+
+
+def _touch(task_id: int) -> None:
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.query(QueuedTask).filter(
+            QueuedTask.id == task_id, QueuedTask.status == "running"
+        ).update({"locked_at": utc_now()}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _heartbeat(task_id: int) -> None:
+    """Hält locked_at eines laufenden Tasks frisch, damit _claim lange Läufe (z.B.
+    notify_new_job für viele Bewerber) nicht als abgestürzt freigibt."""
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        try:
+            await asyncio.to_thread(_touch, task_id)
+        except Exception as e:
+            logger.warning(f"Task {task_id}: Heartbeat fehlgeschlagen: {e}")
+
+
+async def _execute(task: dict, semaphore: asyncio.Semaphore) -> tuple:
+    handler = TASK_HANDLERS.get(task["task_type"])
+    async with semaphore:
+        heartbeat = asyncio.create_task(_heartbeat(task["id"]))
+        try:
+            if handler is None:
+                raise LookupError(f"Kein Handler für Task-Typ {task['task_type']}")
+            if asyncio.iscoroutinefunction(handler):
+                result = await handler(task["payload"])
+            else:
+                result = await asyncio.to_thread(handler, task["payload"])
+            return task, result, None
+        except Exception as e:
+            return task, None, e
+        finally:
+            heartbeat.cancel()
+
+
+async def run_pending(limit: int = TASK_BATCH, concurrency: int = TASK_CONCURRENCY) -> int:
+    """Ein Durchlauf des Task-Workers.
+
+    Returns: Anzahl bearbeiteter Tasks (0 = nichts fällig).
+    """
+    from app.core.database import SessionLocal
+
+    def claim() -> List[dict]:
+        db = SessionLocal()
+        try:
+            return _claim(db, limit)
+        finally:
+            db.close()
+
+    def record(outcomes: List[tuple]) -> None:
+        db = SessionLocal()
+        try:
+            _record(db, outcomes)
+        finally:
+            db.close()
+
+    claimed = await asyncio.to_thread(claim)
+    if not claimed:
+        return 0
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    outcomes = await asyncio.gather(*(_execute(task, semaphore) for task in claimed))
+    await asyncio.to_thread(record, list(outcomes))
+    return len(claimed)
+
+
+def serialize_task(task: QueuedTask) -> dict:
+    def iso(value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value else None
+
+    return {
+        "id": task.id,
+        "task_type": task.task_type,
+        "payload": task.payload,
+        "status": task.status,
+        "attempts": task.attempts,
+        "last_error": task.last_error,
+        "result": task.result,
+        "created_at": iso(task.created_at),
+        "next_attempt_at": iso(task.next_attempt_at) if task.status == "pending" else None,
+        "finished_at": iso(task.finished_at),
+    }
+
+
+# ---------- Handler ----------
+
+def _load_job(db: Session, job_id: int):
+    from app.models.job_posting import JobPosting
+
+    job = db.query(JobPosting).filter(JobPosting.id == job_id).first()
+    if not job:
+        raise LookupError(f"Stelle {job_id} nicht gefunden")
+    return job
+
+
+@task_handler("notify_new_job")
+def notify_new_job(payload: dict) -> dict:
+    """Passende Bewerber über eine frisch veröffentlichte Stelle benachrichtigen (bereits
+    zu dieser Stelle benachrichtigte werden übersprungen – Wiederholung ist harmlos)."""
+    from app.core.database import SessionLocal
+    from app.services.job_notification_service import notify_applicants_about_new_job
+
+    db = SessionLocal()
+    try:
+        job = _load_job(db, payload["job_id"])
+        return {"notifications": notify_applicants_about_new_job(job, db)}
+    finally:
+        db.close()
+
+
+@task_handler("index_job")
+async def index_job(payload: dict) -> dict:
+    """Stellen-URL bei Google an-/abmelden (ohne Konfiguration: Sitemap-Ping)."""
+    from app.services.google_indexing_service import google_indexing_service
+
+    action = payload.get("action", "URL_UPDATED")
+    url = f"https://www.jobon.work/jobs/{payload['slug']}-{payload['job_id']}"
+    return {"url": url, "action": action,
+            "indexed": await google_indexing_service.request_indexing(url, action)}
+
+
+@task_handler("translate_job")
+async def translate_job(payload: dict) -> dict:
+    """Stellenanzeige per DeepL in payload["languages"] übersetzen (POST /jobs/{id}/translate)."""
+    from app.core.database import SessionLocal
+    from app.services.translation_service import translate_job_posting
+
+    db = SessionLocal()
+    try:
+        job = await asyncio.to_thread(_load_job, db, payload["job_id"])
+        translated, errors = await translate_job_posting(job, payload.get("languages") or [])
+        if translated:
+            await asyncio.to_thread(db.commit)
+        return {"translated_languages": translated, "errors": errors}
+    finally:
+        db.close()
+
+
+@task_handler("boost_job")
+def boost_job(payload: dict) -> dict:
+    """Boost-E-Mails einer Stelle an kern-geeignete Bewerber versenden und den Versand
+    (wie /facebook/boosted-jobs/{id}/send-emails) am Job-Post protokollieren."""
+    from app.core.database import SessionLocal
+    from app.models.facebook_post import FacebookJobPost
+    from app.services.job_notification_service import send_boost_emails_for_job
+
+    db = SessionLocal()
+    try:
+        job_id = payload["job_id"]
+        result = send_boost_emails_for_job(_load_job(db, job_id), db)
+        if result.get("error"):
+            raise ValueError(result["error"])
+        cached = db.query(FacebookJobPost).filter(FacebookJobPost.job_id == job_id).first()
+        if not cached:
+            cached = FacebookJobPost(job_id=job_id)
+            db.add(cached)
+        cached.boost_emails_sent_at = datetime.utcnow()
+        cached.boost_emails_count = result.get("sent", 0)
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def publish_job_tasks(job, notify: bool = True, index: bool = True) -> List[dict]:
+    """Standard-Tasks beim Live-Gehen einer Stelle (für enqueue_tasks).
+
+    Die Benachrichtigung ist pro Stelle idempotent, solange sie offen ist (doppelte
+    Freigaben); nach Abschluss oder endgültigem Fehlschlag setzt ein erneutes Live-Gehen
+    (z.B. Reaktivierung) sie neu an.
+    """
+    tasks = []
+    if notify:
+        tasks.append({"task_type": "notify_new_job", "payload": {"job_id": job.id},
+                      "idempotency_key": f"notify_new_job:{job.id}", "replace_finished": True})
+    if index:
+        tasks.append({"task_type": "index_job", "payload": {"job_id": job.id, "slug": job.slug}})
+    return tasks
@@ -9,6 +9,9 @@ Konfiguration über Environment-Variablen:
 - TELEGRAM_BOT_TOKEN:       Bot-Token von @BotFather (Pflicht)
 - TELEGRAM_WEBHOOK_SECRET:  Geheimnis zur Absicherung des Webhooks (optional, empfohlen)
 
+Broadcasts laufen async über einen gemeinsamen httpx.AsyncClient, begrenzt durch einen
+Token-Bucket (Telegram-Limits, 429 retry_after); der Text wird einmal pro Sprache gebaut.
+
 Settings (GlobalSettings):
 - telegram_group_chat_id:   Ziel-Gruppe (per /hier_posten gesetzt)
 - telegram_group_language:  Sprache der Gruppen-Posts (Default "de")
@@ -17,6 +20,8 @@ import os
 import re
 import json
 import html
+import time
+import asyncio
 import logging
 from typing import Optional
 
@@ -366,49 +371,236 @@ def job_completeness_score(job) -> int:
     return min(100, score)
 
 
-def broadcast_new_job(job, db: Session) -> dict:
-    """Postet eine neue Stelle in die Gruppe (Gruppen-Sprache) und an passende Abonnenten (deren Sprache)."""
-    if not is_configured():
-        return {"sent_group": False, "sent_subscribers": 0, "reason": "not_configured"}
+# ---- Broadcast (async, rate-limitiert) ----
+
+# Telegram-Limits: ~30 Nachrichten/s insgesamt, 1/s pro Privat-Chat, 20/min pro Gruppe
+BROADCAST_RATE_PER_SECOND = 25
+BROADCAST_BURST = 25
+PRIVATE_CHAT_INTERVAL = 1.0
+GROUP_CHAT_INTERVAL = 3.0
+BROADCAST_WORKERS = 10
+BROADCAST_MAX_ATTEMPTS = 4
+SUBSCRIBER_FETCH = 1000
+
+_async_client: Optional[httpx.AsyncClient] = None
+# Laufende Hintergrund-Broadcasts (Referenz halten, sonst räumt der GC die Tasks ab)
+_running_broadcasts: set = set()
+
+
+class TokenBucket:
+    """Token-Bucket für asyncio: rate Tokens pro Sekunde, höchstens capacity auf Vorrat.
+    pause() hält alle Sender an (429 retry_after)."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    self._updated = time.monotonic()
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Gemeinsamer AsyncClient (Connection-Pool) für alle Broadcasts."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=15,
+            limits=httpx.Limits(max_connections=BROADCAST_WORKERS, max_keepalive_connections=BROADCAST_WORKERS),
+        )
+    return _async_client
 
-    if not getattr(job, "is_active", False) or getattr(job, "is_draft", False):
-        return {"sent_group": False, "sent_subscribers": 0, "reason": "inactive"}
+
+async def close_async_client() -> None:
+    """Schließt den AsyncClient (App-Shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+async def _send_message_async(chat_id, text: str, bucket: TokenBucket) -> Optional[int]:
+    """sendMessage mit Rate-Limit und Retry.
+
+    Returns: None bei Erfolg, sonst den Telegram-Fehlercode (0 = Netzwerkfehler).
+    """
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML", "disable_web_page_preview": False}
+    error_code = 0
+    for attempt in range(BROADCAST_MAX_ATTEMPTS):
+        await bucket.acquire()
+        try:
+            resp = await _get_async_client().post(url, json=payload)
+            data = resp.json()
+        except Exception as exc:
+            logger.warning(f"Telegram sendMessage an {chat_id} Exception: {exc}")
+            error_code = 0
+            await asyncio.sleep(2 ** attempt)
+            continue
+        if data.get("ok"):
+            return None
+        error_code = data.get("error_code") or resp.status_code
+        if error_code == 429:
+            # Flood-Limit: alle Sender pausieren und dieselbe Nachricht erneut senden
+            retry_after = (data.get("parameters") or {}).get("retry_after", 5)
+            logger.warning(f"Telegram 429: Pause {retry_after}s")
+            bucket.pause(retry_after)
+            continue
+        if error_code >= 500:
+            await asyncio.sleep(2 ** attempt)
+            continue
+        logger.warning(f"Telegram sendMessage an {chat_id} Fehler: {data}")
+        return error_code
+    return error_code
+
+
+def prepare_broadcast(job, db: Session) -> dict:
+    """Empfänger und Texte eines Broadcasts (synchron, DB).
+
+    Der Text wird einmal pro Sprache formatiert; Abonnenten werden nur mit den
+    benötigten Spalten geladen.
+
+    Returns: {"job_id", "group": (chat_id, text) | None, "recipients": [(subscriber_id, chat_id, text)]}
+    """
+    from app.models.telegram_subscriber import TelegramSubscriber
 
     # KI-Teaser einmalig erzeugen/laden (für alle Empfänger wiederverwendet)
     ensure_teaser(job, db)
+    messages = {lang: format_job_message(job, lang) for lang in SUPPORTED_LANGUAGES}
 
-    # 1) In die Gruppe posten (in der konfigurierten Gruppen-Sprache)
-    sent_group = False
+    group = None
     group_chat_id = get_setting(db, GROUP_CHAT_SETTING, None)
     if group_chat_id:
         group_lang = _norm_lang(get_setting(db, GROUP_LANG_SETTING, DEFAULT_LANGUAGE))
-        result = send_message(group_chat_id, format_job_message(job, group_lang))
-        sent_group = result is not None
-
-    # 2) An Abonnenten senden (gefiltert, in deren Sprache)
-    from app.models.telegram_subscriber import TelegramSubscriber
-    subscribers = db.query(TelegramSubscriber).filter(
+        group = (group_chat_id, messages[group_lang])
+
+    subscribers = db.query(
+        TelegramSubscriber.id,
+        TelegramSubscriber.chat_id,
+        TelegramSubscriber.language,
+        TelegramSubscriber.position_type,
+        TelegramSubscriber.location,
+    ).filter(
         TelegramSubscriber.is_active == True  # noqa: E712
-    ).all()
+    ).yield_per(SUBSCRIBER_FETCH)
+    recipients = [
+        (sub.id, sub.chat_id, messages[_norm_lang(sub.language)])
+        for sub in subscribers if _subscriber_matches(sub, job)
+    ]
+    return {"job_id": job.id, "group": group, "recipients": recipients}
+
+
+async def send_broadcast(plan: dict) -> dict:
+    """Versendet einen vorbereiteten Broadcast: Gruppe + Abonnenten, begrenzt parallel
+    über einen gemeinsamen Token-Bucket. Abonnenten, die den Bot blockiert haben
+    (403) oder nicht mehr existieren (400), werden deaktiviert."""
+    bucket = TokenBucket(BROADCAST_RATE_PER_SECOND, BROADCAST_BURST)
+    chat_next_at: dict = {}
+
+    async def send(chat_id, text: str) -> Optional[int]:
+        # Abstand pro Chat (Gruppe strenger als Privat-Chat)
+        interval = GROUP_CHAT_INTERVAL if str(chat_id).startswith("-") else PRIVATE_CHAT_INTERVAL
+        wait = chat_next_at.get(chat_id, 0) - time.monotonic()
+        chat_next_at[chat_id] = max(time.monotonic(), chat_next_at.get(chat_id, 0)) + interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return await _send_message_async(chat_id, text, bucket)
+
+    sent_group = False
+    if plan.get("group"):
+        sent_group = await send(*plan["group"]) is None
 
+    recipients = plan.get("recipients") or []
     sent_count = 0
-    for sub in subscribers:
-        if not _subscriber_matches(sub, job):
-            continue
-        text = format_job_message(job, sub.language)
-        result = send_message(sub.chat_id, text)
-        if result is not None:
-            sent_count += 1
-        else:
-            # Wahrscheinlich hat der Nutzer den Bot blockiert -> deaktivieren
-            sub.is_active = False
-    if subscribers:
-        db.commit()
+    deactivate = []
+    position = 0
+
+    async def worker():
+        nonlocal position, sent_count
+        while position < len(recipients):
+            subscriber_id, chat_id, text = recipients[position]
+            position += 1
+            error_code = await send(chat_id, text)
+            if error_code is None:
+                sent_count += 1
+            elif error_code in (400, 403):
+                # Bot blockiert / Chat gelöscht -> deaktivieren
+                deactivate.append(subscriber_id)
+
+    await asyncio.gather(*(worker() for _ in range(min(BROADCAST_WORKERS, len(recipients)))))
+
+    if deactivate:
+        await asyncio.to_thread(_deactivate_subscribers, deactivate)
 
     logger.info(
-        f"Telegram-Broadcast Job {job.id}: Gruppe={sent_group}, Abonnenten={sent_count}"
+        f"Telegram-Broadcast Job {plan.get('job_id')}: Gruppe={sent_group}, "
+        f"Abonnenten={sent_count}/{len(recipients)}, deaktiviert={len(deactivate)}"
     )
-    return {"sent_group": sent_group, "sent_subscribers": sent_count}
+    return {"sent_group": sent_group, "sent_subscribers": sent_count, "deactivated": len(deactivate)}
+
+
+def _deactivate_subscribers(subscriber_ids: list) -> None:
+    from app.core.database import SessionLocal
+    from app.models.telegram_subscriber import TelegramSubscriber
+
+    db = SessionLocal()
+    try:
+        db.query(TelegramSubscriber).filter(TelegramSubscriber.id.in_(subscriber_ids)).update(
+            {"is_active": False}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def broadcast_new_job(job_id: int) -> dict:
+    """Postet eine neue Stelle in die Gruppe (Gruppen-Sprache) und an passende Abonnenten (deren Sprache)."""
+    from app.core.database import SessionLocal
+    from app.models.job_posting import JobPosting
+
+    if not is_configured():
+        return {"sent_group": False, "sent_subscribers": 0, "reason": "not_configured"}
+
+    def prepare() -> Optional[dict]:
+        db = SessionLocal()
+        try:
+            job = db.query(JobPosting).filter(JobPosting.id == job_id).first()
+            if not job or not job.is_active or getattr(job, "is_draft", False):
+                return None
+            return prepare_broadcast(job, db)
+        finally:
+            db.close()
+
+    plan = await asyncio.to_thread(prepare)
+    if plan is None:
+        return {"sent_group": False, "sent_subscribers": 0, "reason": "inactive"}
+    return await send_broadcast(plan)
+
+
+def start_broadcast(plan: dict) -> asyncio.Task:
+    """Startet send_broadcast im Hintergrund (aus einem laufenden Event-Loop heraus)."""
+    task = asyncio.get_running_loop().create_task(send_broadcast(plan))
+    _running_broadcasts.add(task)
+    task.add_done_callback(_running_broadcasts.discard)
+    return task
 
 
 # ---- Bot-Identität & Promo ----
@@ -4,7 +4,7 @@ Translation Service für DeepL API
 import os
 import html
 import httpx
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 DEEPL_API_KEY = os.getenv("DEEPL_API_KEY")
 DEEPL_API_URL = "https://api-free.deepl.com/v2/translate"  # Free API, für Pro: https://api.deepl.com/v2/translate
@@ -122,3 +122,52 @@ async def translate_job_fields(
         result["benefits"] = await translate_text(benefits, target_lang, source_lang)
     
     return result
+
+
+async def translate_job_posting(job, languages: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Übersetzt eine Stellenanzeige (deutsche Basisfelder) in die gewählten Sprachen
+    und trägt das Ergebnis in job.translations / job.available_languages ein
+    (ohne Commit).
+    
+    Returns:
+        (übersetzte Sprachen, Fehlermeldungen)
+    """
+    from sqlalchemy.orm.attributes import flag_modified
+
+    translations = job.translations or {}
+    available_languages = job.available_languages or ["de"]
+    
+    translated_languages = []
+    errors = []
+    
+    for target_lang in languages:
+        try:
+            translated = await translate_job_fields(
+                title=job.title,
+                description=job.description,
+                tasks=job.tasks,
+                requirements=job.requirements,
+                benefits=job.benefits,
+                target_lang=target_lang,
+                source_lang='de'
+            )
+            
+            if translated and translated.get('title'):
+                translations[target_lang] = translated
+                if target_lang not in available_languages:
+                    available_languages.append(target_lang)
+                translated_languages.append(target_lang)
+            else:
+                errors.append(f"{target_lang}: Übersetzung fehlgeschlagen")
+                
+        except Exception as e:
+            errors.append(f"{target_lang}: {str(e)}")
+    
+    if translated_languages:
+        job.translations = translations
+        job.available_languages = available_languages
+        flag_modified(job, "translations")
+        flag_modified(job, "available_languages")
+    
+    return translated_languages, errors
@@ -0,0 +1,78 @@
+"""
+Backfills ausführen (siehe app.services.backfills): benannte Daten-Nachträge in
+ID-Blöcken mit Checkpoint. Normalerweise arbeitet der Scheduler-Job "backfills"
+angeforderte Läufe ab (POST /admin/backfills/{name}); in der Render Shell geht es auch
+direkt im Vordergrund:
+
+    python backfill.py --list                          # Übersicht
+    python backfill.py is_filtered                     # anfordern + abarbeiten (setzt fort)
+    python backfill.py job_slugs --batch-size 200      # IDs pro Block/Commit
+    python backfill.py published_at --restart          # Checkpoint verwerfen
+"""
+import argparse
+import logging
+import sys
+
+sys.path.insert(0, '.')
+
+from app.core.database import SessionLocal
+from app.core.migrations import load_models
+from app.services.backfill_service import list_backfills, request_backfill, run_backfill
+
+
+def print_list():
+    db = SessionLocal()
+    try:
+        entries = list_backfills(db)
+    finally:
+        db.close()
+    for entry in entries:
+        if entry["status"] is None:
+            state = "nie gelaufen"
+        else:
+            state = f"{entry['status']}, ID {entry['last_id']}/{entry['max_id']}"
+            if entry["progress_percent"] is not None:
+                state += f" ({entry['progress_percent']}%)"
+            state += f", {entry['updated_count']} geändert"
+            if entry["last_error"]:
+                state += f", Fehler: {entry['last_error']}"
+        print(f"{entry['name']:<20} [{entry['table']}] {state}")
+        print(f"{'':<20} {entry['description']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill anfordern und abarbeiten")
+    parser.add_argument("name", nargs="?", help="Name des Backfills (siehe --list)")
+    parser.add_argument("--list", action="store_true", help="alle Backfills mit Stand anzeigen")
+    parser.add_argument("--batch-size", type=int, default=None, help="IDs pro Block/Commit")
+    parser.add_argument("--restart", action="store_true", help="Checkpoint verwerfen, bei ID 1 beginnen")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    load_models()
+    if args.list or not args.name:
+        print_list()
+        return
+
+    db = SessionLocal()
+    try:
+        run = request_backfill(db, args.name, batch_size=args.batch_size, restart=args.restart)
+        print(f"🚀 Backfill {args.name}: ab ID {run.last_id + 1} bis {run.max_id}, Blöcke à {run.batch_size}")
+    except KeyError:
+        print(f"❌ Unbekannter Backfill: {args.name}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    result = run_backfill(args.name, batch_size=args.batch_size)
+    if not result["claimed"]:
+        print(f"⏳ Läuft bereits in {result['owner']} (Stand: ID {result['last_id']}/{result['max_id']})")
+    elif result["status"] == "done":
+        print(f"✅ Fertig: {result['updated_count']} Zeilen in {result['batches']} Blöcken geändert")
+    else:
+        print(f"❌ Abgebrochen bei ID {result['last_id']}: {result['last_error']} – erneut starten setzt dort fort")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
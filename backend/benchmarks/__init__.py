@@ -0,0 +1,10 @@
+"""
+Benchmarks für das Matching
+
+- synthetic:      reproduzierbare synthetische Bewerber/Stellen (1k/10k/100k)
+- run_matching:   misst Scorer, Benachrichtigungen, Wochen-Digest und Top-Matches
+                  und schreibt das Ergebnis als JSON (Vergleich zwischen Commits)
+
+Nutzung (im backend/-Verzeichnis, venv aktiv):
+    python -m benchmarks.run_matching --scale 10k
+"""
@@ -0,0 +1,232 @@
+"""
+Matching-Benchmark
+
+Misst auf einer synthetischen Population (benchmarks.synthetic):
+- calculate_match_score (voll und score_only) für zufällige Paare
+- get_matching_applicants (Sofort-Benachrichtigung neuer Stellen)
+- send_weekly_job_digest (Sammelversand gestubbt, es wird NICHTS verschickt)
+- Top-Match-Endpunkte /admin/matching/job/{id} und /admin/matching/applicant/{id},
+  jeweils kalt (leere match_scores) und warm
+
+Nutzung (im backend/-Verzeichnis, venv aktiv):
+    python -m benchmarks.run_matching --scale 10k
+    python -m benchmarks.run_matching --scale 100k --database-url postgresql://localhost/jobon_bench
+    python -m benchmarks.run_matching --scale 1k --output benchmarks/results/1k.json
+
+Ohne --database-url wird eine SQLite-Datei pro Skala in /tmp verwendet und beim
+nächsten Lauf wiederverwendet. Die Datenbank wird vor dem ersten Lauf migriert
+(app.core.migrations.run_migrations). Das Ergebnis (Metadaten + Zeiten je Benchmark)
+wird als JSON geschrieben, damit Regressionen zwischen Commits sichtbar werden.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Stichprobengrößen (unabhängig von der Skala, damit Läufe vergleichbar bleiben)
+PAIR_SAMPLE = 500
+JOB_SAMPLE = 20
+APPLICANT_SAMPLE = 20
+TOP_LIMIT = 20
+
+
+# Skalen wie benchmarks.synthetic.SCALES – hier ohne Import, denn app darf erst
+# geladen werden, nachdem DATABASE_URL gesetzt ist
+SCALE_NAMES = ("1k", "10k", "100k")
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Matching-Benchmark auf synthetischen Daten")
+    parser.add_argument("--scale", choices=SCALE_NAMES, default="1k")
+    parser.add_argument("--database-url", default=None,
+                        help="SQLAlchemy-URL (Standard: sqlite:////tmp/jobon_bench_<scale>.db)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None,
+                        help="JSON-Datei (Standard: benchmarks/results/<scale>-<commit>.json)")
+    parser.add_argument("--skip", action="append", default=[],
+                        help="Benchmark auslassen (mehrfach möglich), z.B. --skip weekly_digest")
+    return parser.parse_args(argv)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(__file__), timeout=5,
+        ).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def _measure(fn: Callable, items: Iterable) -> dict:
+    """Ruft fn(item) für jedes item auf und fasst die Einzelzeiten zusammen."""
+    durations: List[float] = []
+    started = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        fn(item)
+        durations.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+    if not durations:
+        return {"count": 0, "total_s": 0.0}
+    durations.sort()
+    return {
+        "count": len(durations),
+        "total_s": round(total, 4),
+        "mean_ms": round(statistics.fmean(durations) * 1000, 3),
+        "p50_ms": round(durations[len(durations) // 2] * 1000, 3),
+        "p95_ms": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000, 3),
+        "max_ms": round(durations[-1] * 1000, 3),
+    }
+
+
+def _clear_match_scores(db) -> None:
+    from app.models.match_score import MatchScore
+
+    db.query(MatchScore).delete(synchronize_session=False)
+    db.commit()
+
+
+def run(args) -> dict:
+    from app.core.database import SessionLocal, engine
+    from app.core.migrations import run_migrations
+
+    # app.main prüft beim Import die Schema-Version – Bench-DB vorher migrieren
+    run_migrations()
+
+    from app.core.security import get_current_user
+    from app.main import app
+    from app.models.applicant import Applicant
+    from app.models.job_posting import JobPosting
+    from app.models.user import User, UserRole
+    from app.services import job_notification_service
+    from app.services.email_service import email_service
+    from app.services.matching_service import calculate_match_score
+    from benchmarks.synthetic import EMAIL_DOMAIN, generate_population
+    from fastapi.testclient import TestClient
+
+    # SQL-Echo (DEBUG=true) verfälscht die Zeiten
+    engine.echo = False
+    db = SessionLocal()
+    r = random.Random(args.seed)
+    results: Dict[str, dict] = {}
+    try:
+        population = generate_population(db, args.scale, args.seed)
+        applicant_ids = [row.id for row in db.query(Applicant.id).all()]
+        job_ids = [row.id for row in db.query(JobPosting.id).filter(JobPosting.is_active == True).all()]
+
+        if "calculate_match_score" not in args.skip:
+            id_pairs = [(r.choice(applicant_ids), r.choice(job_ids)) for _ in range(PAIR_SAMPLE)]
+            applicants = {a.id: a for a in db.query(Applicant).filter(Applicant.id.in_({a for a, _ in id_pairs}))}
+            jobs = {j.id: j for j in db.query(JobPosting).filter(JobPosting.id.in_({j for _, j in id_pairs}))}
+            pairs = [(applicants[a], jobs[j]) for a, j in id_pairs]
+            results["calculate_match_score"] = _measure(
+                lambda pair: calculate_match_score(pair[0], pair[1], db=db), pairs)
+            results["calculate_match_score_score_only"] = _measure(
+                lambda pair: calculate_match_score(pair[0], pair[1], db=db, score_only=True), pairs)
+
+        sample_jobs = db.query(JobPosting).filter(JobPosting.id.in_(r.sample(job_ids, min(JOB_SAMPLE, len(job_ids))))).all()
+        sample_applicant_ids = r.sample(applicant_ids, min(APPLICANT_SAMPLE, len(applicant_ids)))
+
+        if "get_matching_applicants" not in args.skip:
+            results["get_matching_applicants"] = _measure(
+                lambda job: job_notification_service.get_matching_applicants(job, db, 85), sample_jobs)
+
+        if "weekly_digest" not in args.skip:
+            # Versand stubben: nur zählen, nichts verschicken
+            sent = {"count": 0}
+
+            def _fake_send(digests):
+                sent["count"] += len(digests)
+                return True
+
+            original = email_service.send_weekly_job_digests
+            email_service.send_weekly_job_digests = _fake_send
+            try:
+                _clear_match_scores(db)
+                results["weekly_digest_cold"] = _measure(
+                    lambda _: job_notification_service.send_weekly_job_digest(db), [None])
+                results["weekly_digest_cold"]["emails"] = sent["count"]
+                sent["count"] = 0
+                results["weekly_digest_warm"] = _measure(
+                    lambda _: job_notification_service.send_weekly_job_digest(db), [None])
+                results["weekly_digest_warm"]["emails"] = sent["count"]
+            finally:
+                email_service.send_weekly_job_digests = original
+
+        if "top_matches" not in args.skip:
+            admin = db.query(User).filter(User.email == f"admin@{EMAIL_DOMAIN}").first()
+            if not admin:
+                admin = User(email=f"admin@{EMAIL_DOMAIN}", password_hash="x", role=UserRole.ADMIN, is_active=True)
+                db.add(admin)
+                db.commit()
+            app.dependency_overrides[get_current_user] = lambda: admin
+            client = TestClient(app)
+            prefix = "/api/v1/admin/matching"
+
+            def get(path):
+                response = client.get(path, params={"limit": TOP_LIMIT})
+                response.raise_for_status()
+
+            try:
+                _clear_match_scores(db)
+                for temperature in ("cold", "warm"):
+                    results[f"top_matches_job_{temperature}"] = _measure(
+                        lambda job: get(f"{prefix}/job/{job.id}"), sample_jobs)
+                    results[f"top_matches_applicant_{temperature}"] = _measure(
+                        lambda applicant_id: get(f"{prefix}/applicant/{applicant_id}"), sample_applicant_ids)
+            finally:
+                app.dependency_overrides.pop(get_current_user, None)
+
+        return {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "scale": args.scale,
+                "seed": args.seed,
+                "database": engine.dialect.name,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+                "population": population,
+            },
+            "results": results,
+        }
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    # Muss vor dem ersten app-Import gesetzt sein (Engine wird beim Import angelegt)
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:////tmp/jobon_bench_{args.scale}.db"
+    # App-Logging (INFO pro Bewerber/Stelle) nicht in die Messausgabe mischen
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("benchmarks").setLevel(logging.INFO)
+    report = run(args)
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"{args.scale}-{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    for name, stats in report["results"].items():
+        print(f"{name:40s} n={stats['count']:>4}  total={stats['total_s']:>9.3f}s  "
+              f"p50={stats.get('p50_ms', 0):>9.2f}ms  p95={stats.get('p95_ms', 0):>9.2f}ms")
+    print(f"-> {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
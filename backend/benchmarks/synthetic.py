@@ -0,0 +1,238 @@
+"""
+Synthetische Population für Matching-Benchmarks
+
+Erzeugt reproduzierbar (fester Seed) Bewerber mit work_experiences,
+other_languages, position_types und CV-artigem Freitext sowie Stellen mit
+Sprach-/Arbeitsberechtigungs-Anforderungen. Ein Teil der Bewerber bekommt einen
+Lebenslauf samt parsed_cvs-Eintrag, damit auch der CV-Pfad des Scorers läuft.
+
+Alle Datensätze werden über das ORM angelegt, damit die Mapper-Events
+(text_tokens, Filter-Spalten) wie im Betrieb greifen.
+"""
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict
+
+from sqlalchemy.orm import Session
+
+from app.models.applicant import Applicant, LanguageLevel, PositionType
+from app.models.company import Company
+from app.models.document import Document, DocumentType
+from app.models.job_posting import JobPosting, RequiredLanguageLevel
+from app.models.parsed_cv import ParsedCV
+from app.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Skalen: Anzahl Bewerber / Stellen / Firmen
+SCALES: Dict[str, Dict[str, int]] = {
+    "1k": {"applicants": 1_000, "jobs": 100, "companies": 10},
+    "10k": {"applicants": 10_000, "jobs": 500, "companies": 50},
+    "100k": {"applicants": 100_000, "jobs": 2_000, "companies": 200},
+}
+
+# Kennung der synthetischen Datensätze (E-Mail-Domain, nie zustellbar)
+EMAIL_DOMAIN = "bench.invalid"
+
+# Anteil Bewerber mit hochgeladenem (geparstem) Lebenslauf
+CV_SHARE = 0.3
+
+_CHUNK = 1000
+
+# Berufsfelder: (Stellentitel, Aufgaben-Wörter, Berufsbezeichnungen für Bewerber)
+_FIELDS = [
+    ("Koch / Köchin", "küche kochen speisen zubereiten gastro", ["Koch", "Küchenhilfe", "Beikoch"]),
+    ("Servicekraft Restaurant", "service gäste bedienung restaurant kellner", ["Kellner", "Servicekraft", "Barkeeper"]),
+    ("Rezeptionist/in", "rezeption empfang gäste check-in reservierung", ["Rezeptionist", "Front Desk Agent"]),
+    ("Zimmermädchen / Housekeeping", "housekeeping zimmerreinigung reinigung wäsche", ["Zimmermädchen", "Reinigungskraft"]),
+    ("Lagerhelfer/in", "lager kommissionierung versand logistik stapler", ["Lagerarbeiter", "Kommissionierer"]),
+    ("Erntehelfer/in", "ernte landwirtschaft obst gemüse feld", ["Erntehelfer", "Landwirt"]),
+    ("Pflegehelfer/in", "pflege altenpflege betreuung senioren", ["Pflegehelfer", "Krankenpfleger"]),
+    ("Bürokraft", "büro verwaltung office ablage telefon", ["Bürokaufmann", "Sekretärin"]),
+]
+
+_FIRST_NAMES = ["Anna", "Olga", "Dilnoza", "Carlos", "María", "Ivan", "Aziz", "Sofia", "Bekzod", "Lucía", "Timur", "Elena"]
+_LAST_NAMES = ["Petrova", "Karimov", "González", "Ivanova", "Rashidov", "López", "Smirnov", "Yusupova", "Pérez", "Alimov"]
+_NATIONALITIES = ["Usbekistan", "Kirgisistan", "Kolumbien", "Argentinien", "Ukraine", "Kasachstan", "Peru"]
+_OTHER_LANGUAGES = ["Russisch", "Spanisch", "Usbekisch", "Kirgisisch", "Französisch"]
+_OTHER_LEVELS = ["a2", "b1", "b2", "c1", "native"]
+_STUDY_FIELDS = ["Tourismus", "Hotelmanagement", "Agrarwissenschaft", "BWL", "Informatik", "Germanistik"]
+
+_REQUIRED_LEVELS = [
+    RequiredLanguageLevel.NOT_REQUIRED, RequiredLanguageLevel.A1, RequiredLanguageLevel.A2,
+    RequiredLanguageLevel.B1, RequiredLanguageLevel.B2,
+]
+_IMPORTANCE = ["required", "required", "preferred", "nice_to_have"]
+
+
+def _is_populated(db: Session, applicants: int, jobs: int) -> bool:
+    """True, wenn die synthetische Population dieser Größe schon angelegt ist."""
+    existing_applicants = db.query(User).filter(
+        User.email.like(f"%@{EMAIL_DOMAIN}"), User.role == UserRole.APPLICANT
+    ).count()
+    existing_jobs = db.query(JobPosting).join(Company).join(User, Company.user_id == User.id).filter(
+        User.email.like(f"%@{EMAIL_DOMAIN}")
+    ).count()
+    return existing_applicants >= applicants and existing_jobs >= jobs
+
+
+def _work_experiences(r: random.Random, field_index: int) -> list:
+    title, words, professions = _FIELDS[field_index]
+    entries = []
+    for _ in range(r.randint(0, 4)):
+        # Meist im eigenen Berufsfeld, manchmal fachfremd
+        _, other_words, other_professions = _FIELDS[field_index if r.random() < 0.7 else r.randrange(len(_FIELDS))]
+        entries.append({
+            "position": r.choice(other_professions),
+            "company": f"{r.choice(['Hotel', 'Restaurant', 'Farm', 'Logistik'])} {r.choice(_LAST_NAMES)}",
+            "description": " ".join(r.sample(other_words.split(), 3)),
+            "start_date": f"{r.randint(2012, 2022)}-0{r.randint(1, 9)}",
+            "end_date": f"{r.randint(2023, 2025)}-0{r.randint(1, 9)}",
+        })
+    return entries
+
+
+def _cv_text(r: random.Random, field_index: int, experiences: list) -> str:
+    """Freitext wie aus einem Lebenslauf (Motivation + Stationen)."""
+    _, words, professions = _FIELDS[field_index]
+    lines = [f"Ich arbeite als {r.choice(professions)} und suche eine Stelle in Deutschland."]
+    for exp in experiences:
+        lines.append(f"{exp['position']} bei {exp['company']}: {exp['description']}.")
+    lines.append(f"Kenntnisse: {' '.join(r.sample(words.split(), 3))}.")
+    return " ".join(lines)
+
+
+def _applicant(r: random.Random, user_id: int, i: int) -> Applicant:
+    field_index = r.randrange(len(_FIELDS))
+    experiences = _work_experiences(r, field_index)
+    position_types = r.sample([p.value for p in PositionType if p != PositionType.GENERAL], r.randint(1, 2))
+    today = date.today()
+    break_start = today + timedelta(days=r.randint(-30, 120))
+    return Applicant(
+        user_id=user_id,
+        first_name=r.choice(_FIRST_NAMES),
+        last_name=f"{r.choice(_LAST_NAMES)} {i}",
+        nationality=r.choice(_NATIONALITIES),
+        work_experiences=experiences,
+        work_experience=_cv_text(r, field_index, experiences) if r.random() < 0.6 else None,
+        work_experience_years=r.choice([0, 0, 1, 2, 3, 5, 8]),
+        german_level=r.choice(list(LanguageLevel)),
+        english_level=r.choice(list(LanguageLevel)),
+        other_languages=[
+            {"language": lang, "level": r.choice(_OTHER_LEVELS)}
+            for lang in r.sample(_OTHER_LANGUAGES, r.randint(0, 2))
+        ],
+        work_authorized=r.choice([None, True, False, False]),
+        position_types=position_types,
+        position_type=PositionType(position_types[0]),
+        field_of_study=r.choice(_STUDY_FIELDS) if "studentenferienjob" in position_types else None,
+        semester_break_start=break_start,
+        semester_break_end=break_start + timedelta(days=r.randint(30, 120)),
+        available_from=today + timedelta(days=r.randint(0, 90)),
+        profession=r.choice(_FIELDS[field_index][2]),
+        additional_info=r.choice([None, "Führerschein Klasse B", "Erfahrung im Team", "flexibel einsetzbar"]),
+    )
+
+
+def _job(r: random.Random, company_id: int, i: int, now: datetime) -> JobPosting:
+    title, words, _ = _FIELDS[r.randrange(len(_FIELDS))]
+    other_required = []
+    if r.random() < 0.15:
+        other_required.append({
+            "language": r.choice(_OTHER_LANGUAGES),
+            "level": r.choice(["a2", "b1"]),
+            "importance": r.choice(_IMPORTANCE),
+        })
+    return JobPosting(
+        company_id=company_id,
+        title=f"{title} #{i}",
+        position_type=r.choice([p for p in PositionType if p != PositionType.GENERAL]),
+        description=f"Wir suchen Verstärkung: {words}.",
+        tasks=" ".join(r.sample(words.split(), 3)),
+        requirements=r.choice(["Teamfähigkeit", "Erfahrung erwünscht", "Belastbarkeit", ""]),
+        benefits=r.choice(["Unterkunft", "Verpflegung", "Fahrtkosten", ""]),
+        german_required=r.choice(_REQUIRED_LEVELS),
+        english_required=r.choice(_REQUIRED_LEVELS[:3]),
+        german_importance=r.choice(_IMPORTANCE),
+        english_importance=r.choice(_IMPORTANCE),
+        other_languages_required=other_required,
+        work_authorization_requirement=r.choice(["not_relevant", "not_relevant", "required"]),
+        start_date=now.date() + timedelta(days=r.randint(0, 120)),
+        is_active=True,
+        is_draft=False,
+        # Hälfte der Stellen in den letzten 7 Tagen -> relevant für den Wochen-Digest
+        created_at=now - timedelta(days=r.uniform(0, 14)),
+        published_at=now - timedelta(days=r.uniform(0, 14)),
+    )
+
+
+def generate_population(db: Session, scale: str = "1k", seed: int = 42) -> dict:
+    """Legt die synthetische Population an (idempotent: vorhandene wird wiederverwendet).
+
+    Returns:
+        {"applicants": .., "jobs": .., "companies": .., "generated": bool, "seconds": ..}
+    """
+    sizes = SCALES[scale]
+    if _is_populated(db, sizes["applicants"], sizes["jobs"]):
+        logger.info(f"Synthetische Population '{scale}' bereits vorhanden")
+        return {**sizes, "generated": False, "seconds": 0.0}
+
+    started = time.perf_counter()
+    r = random.Random(seed)
+    now = datetime.now(timezone.utc)
+
+    # Firmen
+    company_ids = []
+    for i in range(sizes["companies"]):
+        user = User(email=f"company{i}@{EMAIL_DOMAIN}", password_hash="x", role=UserRole.COMPANY, is_active=True)
+        db.add(user)
+        db.flush()
+        company = Company(user_id=user.id, company_name=f"Benchmark Betrieb {i}")
+        db.add(company)
+        db.flush()
+        company_ids.append(company.id)
+    db.commit()
+
+    # Stellen
+    for start in range(0, sizes["jobs"], _CHUNK):
+        db.add_all([
+            _job(r, r.choice(company_ids), i, now)
+            for i in range(start, min(start + _CHUNK, sizes["jobs"]))
+        ])
+        db.commit()
+
+    # Bewerber (+ Lebenslauf/parsed_cvs für CV_SHARE)
+    for start in range(0, sizes["applicants"], _CHUNK):
+        indices = range(start, min(start + _CHUNK, sizes["applicants"]))
+        users = [
+            User(email=f"applicant{i}@{EMAIL_DOMAIN}", password_hash="x", role=UserRole.APPLICANT,
+                 is_active=True, email_job_alerts=r.random() < 0.9)
+            for i in indices
+        ]
+        db.add_all(users)
+        db.flush()
+        applicants = [_applicant(r, user.id, i) for user, i in zip(users, indices)]
+        db.add_all(applicants)
+        db.flush()
+
+        with_cv = [a for a in applicants if r.random() < CV_SHARE]
+        documents = [
+            Document(applicant_id=a.id, document_type=DocumentType.CV, file_name=f"cv_{a.id}.pdf",
+                     original_name="Lebenslauf.pdf", file_path=f"bench/cv_{a.id}.pdf")
+            for a in with_cv
+        ]
+        db.add_all(documents)
+        db.flush()
+        db.add_all([
+            ParsedCV(document_id=d.id, applicant_id=a.id, content_hash=f"bench{a.id}", data={
+                "work_experience_years": r.randint(1, 10),
+                "work_experiences": _work_experiences(r, r.randrange(len(_FIELDS))),
+            })
+            for a, d in zip(with_cv, documents)
+        ])
+        db.commit()
+        logger.info(f"{min(start + _CHUNK, sizes['applicants'])}/{sizes['applicants']} Bewerber angelegt")
+
+    return {**sizes, "generated": True, "seconds": round(time.perf_counter() - started, 3)}
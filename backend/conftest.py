@@ -0,0 +1,35 @@
+"""
+Gemeinsame Test-Einstellungen (pytest): eigene, temporäre SQLite-Datenbank statt
+ijp_portal.db bzw. einer DATABASE_URL aus der Umgebung – muss vor dem ersten
+app-Import gesetzt sein (app.core.database liest die URL beim Import).
+Run with: python -m pytest
+"""
+import os
+import tempfile
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="jobon-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DEBUG", "false")
+
+
+@pytest.fixture(scope="session")
+def migrated():
+    """Datenbank einmal pro Testlauf über den Migrations-Runner aufsetzen."""
+    from app.core.migrations import run_migrations
+
+    return run_migrations()
+
+
+@pytest.fixture
+def db(migrated):
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
@@ -0,0 +1,69 @@
+"""
+Migrations-Runner: wendet ausstehende Schema-Migrationen an (siehe app.core.migrations).
+Die API prüft beim Start nur die Schema-Version – vor dem Start (Dockerfile) bzw. nach
+einem Deployment in der Render Shell ausführen:
+
+    python migrate.py            # alle ausstehenden Migrationen
+    python migrate.py --status   # Übersicht (angewendet / ausstehend / geändert)
+    python migrate.py --target N # nur bis Version N
+    python migrate.py --stamp-baseline  # historische SQL-Dateien nur eintragen (waren von Hand angewendet)
+
+Der erste Lauf auf einer bestehenden Datenbank (ohne schema_migrations) trägt die
+historischen SQL-Dateien automatisch nur ein. Manuelle Korrekturen (fix_*.sql) laufen nie
+automatisch.
+"""
+import argparse
+import logging
+import sys
+
+sys.path.insert(0, '.')
+
+from app.core.migrations import current_version, latest_version, migration_status, run_migrations, stamp_baseline
+
+
+def print_status():
+    for entry in migration_status():
+        mark = "✓" if entry["applied"] else "·"
+        notes = []
+        if entry["skipped"]:
+            notes.append("übersprungen")
+        if entry["changed"]:
+            notes.append("Datei nach Anwendung geändert!")
+        if entry.get("mismatch"):
+            notes.append(f"in der DB: {entry['mismatch']}!")
+        suffix = f"  ({', '.join(notes)})" if notes else ""
+        print(f"{mark} {entry['version']:>3}  {entry['name']}{suffix}")
+    print(f"\nSchema-Version {current_version() or 0} von {latest_version()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schema-Migrationen anwenden")
+    parser.add_argument("--status", action="store_true", help="nur Übersicht anzeigen")
+    parser.add_argument("--target", type=int, default=None, help="nur bis zu dieser Version")
+    parser.add_argument("--stamp-baseline", action="store_true",
+                        help="historische SQL-Dateien als angewendet eintragen, ohne sie auszuführen")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.status:
+        print_status()
+        return
+    if args.stamp_baseline:
+        stamped = stamp_baseline()
+        print(f"✅ {len(stamped)} historische SQL-Dateien eingetragen (nicht ausgeführt)")
+        return
+
+    print(f"🚀 Migrationen: Schema-Version {current_version() or 0} -> {args.target or latest_version()}")
+    try:
+        applied = run_migrations(target=args.target)
+    except Exception as e:
+        print(f"❌ Migration fehlgeschlagen: {e}")
+        sys.exit(1)
+    if applied:
+        print(f"✅ {len(applied)} Migrationen angewendet")
+    else:
+        print("✅ Schema ist aktuell")
+
+
+if __name__ == "__main__":
+    main()
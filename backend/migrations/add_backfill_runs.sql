@@ -0,0 +1,21 @@
+-- Migration: Checkpoint-Tabelle für Backfills (Daten-Nachträge in ID-Blöcken)
+-- Datum: 2026-10-17
+-- Beschreibung: Ein Eintrag pro Backfill (is_filtered, job_slugs, published_at,
+-- telegram_posted_at). Läufe arbeiten 1..max_id in Blöcken ab und committen Daten und
+-- last_id gemeinsam; abgebrochene Läufe setzen dort fort. Nicht mehr beim API-Start.
+
+CREATE TABLE IF NOT EXISTS backfill_runs (
+    name VARCHAR(100) PRIMARY KEY,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    last_id INTEGER NOT NULL DEFAULT 0,
+    max_id INTEGER,
+    batch_size INTEGER NOT NULL DEFAULT 500,
+    batches INTEGER NOT NULL DEFAULT 0,
+    updated_count INTEGER NOT NULL DEFAULT 0,
+    owner VARCHAR(100),
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    requested_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    last_error VARCHAR(500)
+);
@@ -0,0 +1,27 @@
+-- Migration: E-Mail-Outbox
+-- Datum: 2026-10-17
+-- Beschreibung: Fertig gerenderte E-Mails warten hier auf den Versand durch den
+-- Delivery-Worker (statt synchronem SendGrid-Aufruf im Request). Fehlschläge
+-- werden mit Backoff wiederholt, das Ergebnis steht in status/last_error.
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id SERIAL PRIMARY KEY,
+    to_email VARCHAR(255) NOT NULL,
+    subject VARCHAR(500) NOT NULL,
+    html_content TEXT NOT NULL,
+    text_content TEXT,
+    email_type VARCHAR(50) NOT NULL DEFAULT 'other',
+    from_email VARCHAR(255),
+    from_name VARCHAR(255),
+    attachments JSON,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    locked_at TIMESTAMP WITH TIME ZONE,
+    last_error VARCHAR(500),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    sent_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS ix_email_outbox_id ON email_outbox(id);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_status_next_attempt ON email_outbox(status, next_attempt_at);
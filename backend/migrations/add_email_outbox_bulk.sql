@@ -0,0 +1,6 @@
+-- Migration: Sammelversand über die E-Mail-Outbox
+-- Datum: 2026-10-17
+-- Beschreibung: Eine Outbox-Zeile kann einen ganzen SendGrid-Request mit bis zu
+-- 1000 Empfängern (Personalizations + Substitutionen) enthalten.
+
+ALTER TABLE email_outbox ADD COLUMN IF NOT EXISTS bulk_payload JSON;
@@ -0,0 +1,21 @@
+-- Migration: SQL-Vorfilter für das Matching
+-- Datum: 2026-10-17
+-- Beschreibung: Stellenart-Bitmaske und Sprachniveau als Zahl auf Bewerbern und
+-- Stellen, damit harte Filter (Stellenart, Pflicht-Sprachen) in SQL laufen.
+-- Bits: studentenferienjob=1, saisonjob=2, workandholiday=4, fachkraft=8,
+--       ausbildung=16, general=32 (siehe services/position_groups.py).
+-- Bestehende Zeilen befüllen die Backfills applicant_match_filters / job_match_filters
+-- (angefordert von der Migration request_match_filter_backfills); bis dahin lassen
+-- die Filter Zeilen ohne Werte durch.
+
+ALTER TABLE applicants ADD COLUMN IF NOT EXISTS position_mask INTEGER;
+ALTER TABLE applicants ADD COLUMN IF NOT EXISTS german_level_ord INTEGER;
+ALTER TABLE applicants ADD COLUMN IF NOT EXISTS english_level_ord INTEGER;
+ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS position_mask INTEGER;
+ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS german_required_ord INTEGER;
+ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS english_required_ord INTEGER;
+
+CREATE INDEX IF NOT EXISTS ix_applicants_position_mask ON applicants (position_mask);
+CREATE INDEX IF NOT EXISTS ix_applicants_german_level_ord ON applicants (german_level_ord);
+CREATE INDEX IF NOT EXISTS ix_applicants_english_level_ord ON applicants (english_level_ord);
+CREATE INDEX IF NOT EXISTS ix_job_postings_position_mask ON job_postings (position_mask);
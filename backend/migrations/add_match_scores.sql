@@ -0,0 +1,18 @@
+-- Migration: Materialisierte Matching-Scores
+-- Datum: 2026-10-17
+-- Beschreibung: Speichert den total_score je Bewerber × Stelle inkl. Scorer-Version,
+-- damit Digest und Admin-Matching per Index lesen statt live zu rechnen.
+
+CREATE TABLE IF NOT EXISTS match_scores (
+    id SERIAL PRIMARY KEY,
+    applicant_id INTEGER NOT NULL REFERENCES applicants(id) ON DELETE CASCADE,
+    job_id INTEGER NOT NULL REFERENCES job_postings(id) ON DELETE CASCADE,
+    score INTEGER NOT NULL,
+    scorer_version VARCHAR(20) NOT NULL,
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_match_scores_applicant_job UNIQUE (applicant_id, job_id)
+);
+
+-- Lesepfade: "beste Bewerber für Stelle X" und "beste Stellen für Bewerber Y"
+CREATE INDEX IF NOT EXISTS ix_match_scores_job_score ON match_scores(job_id, score);
+CREATE INDEX IF NOT EXISTS ix_match_scores_applicant_score ON match_scores(applicant_id, score);
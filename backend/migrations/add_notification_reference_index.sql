@@ -0,0 +1,6 @@
+-- Migration: Index für Benachrichtigungen je Referenz
+-- Datum: 2026-10-17
+-- Beschreibung: notify_new_job überspringt Nutzer, die zu einer Stelle schon eine
+-- "new_job"-Benachrichtigung haben (wiederholte Task-Läufe, Reaktivierung).
+
+CREATE INDEX IF NOT EXISTS ix_notifications_reference ON notifications (reference_id, type);
@@ -0,0 +1,16 @@
+-- Migration: Parsed-CV-Cache für das Matching
+-- Datum: 2026-10-17
+-- Beschreibung: Speichert die geparsten Lebenslauf-Daten je Dokument (gebunden an
+-- den SHA-256 der Datei), damit das Matching keine PDFs mehr aus R2 lädt und parst.
+
+CREATE TABLE IF NOT EXISTS parsed_cvs (
+    id SERIAL PRIMARY KEY,
+    document_id INTEGER NOT NULL UNIQUE REFERENCES documents(id) ON DELETE CASCADE,
+    applicant_id INTEGER NOT NULL REFERENCES applicants(id) ON DELETE CASCADE,
+    content_hash VARCHAR(64) NOT NULL,
+    data JSON,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_parsed_cvs_document_id ON parsed_cvs(document_id);
+CREATE INDEX IF NOT EXISTS ix_parsed_cvs_applicant_id ON parsed_cvs(applicant_id);
@@ -0,0 +1,21 @@
+-- Migration: Persistenter Scheduler für periodische Hintergrund-Jobs
+-- Datum: 2026-10-17
+-- Beschreibung: Ein Eintrag pro Job (Cleanup, Digests, Reports, Blog-Writer, Telegram).
+-- Nur der per Advisory-Lock gewählte Leader-Prozess führt Jobs aus; last_scheduled_for
+-- wird beim Beanspruchen bedingt vorgerückt, damit jeder Slot genau einmal läuft.
+-- Zeiten naiv in UTC.
+
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    name VARCHAR(100) PRIMARY KEY,
+    last_scheduled_for TIMESTAMP NOT NULL,
+    next_run_at TIMESTAMP,
+    status VARCHAR(20) NOT NULL DEFAULT 'idle',
+    owner VARCHAR(100),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    last_duration_ms INTEGER,
+    last_error VARCHAR(500),
+    last_result JSON,
+    run_count INTEGER NOT NULL DEFAULT 0,
+    skipped_count INTEGER NOT NULL DEFAULT 0
+);
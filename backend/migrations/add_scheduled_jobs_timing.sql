@@ -0,0 +1,8 @@
+-- Migration: Laufzeiten der Scheduler-Jobs
+-- Datum: 2026-10-17
+-- Beschreibung: Sync-Jobs laufen in einem begrenzten Job-Pool (Threads oder Prozesse).
+-- Neben der Gesamtdauer wird die Wartezeit im Pool und die CPU-Zeit des Handlers
+-- festgehalten (sichtbar über /admin/scheduler).
+
+ALTER TABLE scheduled_jobs ADD COLUMN IF NOT EXISTS last_wait_ms INTEGER;
+ALTER TABLE scheduled_jobs ADD COLUMN IF NOT EXISTS last_cpu_ms INTEGER;
@@ -0,0 +1,14 @@
+-- Migration: Schema-Versionstabelle für den Migrations-Runner
+-- Datum: 2026-10-17
+-- Beschreibung: Ein Eintrag pro angewendeter Migration (SQL-Datei oder Python-Schritt).
+-- Die API prüft beim Start nur max(version); angewendet wird per `python migrate.py`.
+-- (Legt der Runner selbst an – die Datei dokumentiert das Schema.)
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    checksum VARCHAR(64),
+    skipped BOOLEAN NOT NULL DEFAULT FALSE,
+    duration_ms INTEGER,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
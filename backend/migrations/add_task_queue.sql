@@ -0,0 +1,25 @@
+-- Migration: Task-Queue für Hintergrund-Aufgaben
+-- Datum: 2026-10-17
+-- Beschreibung: Veröffentlichungs-Nebenwirkungen (Bewerber benachrichtigen,
+-- Google-Indexierung, Übersetzung, Boost-Mails) laufen als persistente Tasks
+-- statt im Request. idempotency_key verhindert Doppel-Ausführungen.
+
+CREATE TABLE IF NOT EXISTS task_queue (
+    id SERIAL PRIMARY KEY,
+    task_type VARCHAR(50) NOT NULL,
+    payload JSON,
+    idempotency_key VARCHAR(255) UNIQUE,
+    created_by_user_id INTEGER,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    locked_at TIMESTAMP WITH TIME ZONE,
+    last_error VARCHAR(500),
+    result JSON,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS ix_task_queue_id ON task_queue(id);
+CREATE INDEX IF NOT EXISTS ix_task_queue_task_type ON task_queue(task_type);
+CREATE INDEX IF NOT EXISTS ix_task_queue_status_next_attempt ON task_queue(status, next_attempt_at);
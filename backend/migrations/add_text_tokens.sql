@@ -0,0 +1,9 @@
+-- Migration: Keyword-Sets für den Text-Match
+-- Datum: 2026-10-17
+-- Beschreibung: Speichert die normalisierten, um Synonyme erweiterten Keywords je
+-- Stelle und Bewerber, damit der Text-Match nicht pro Paar neu tokenisiert.
+-- Bestehende Zeilen befüllen die Backfills job_text_tokens / applicant_text_tokens
+-- (angefordert von der Migration request_text_tokens_backfills).
+
+ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS text_tokens JSON;
+ALTER TABLE applicants ADD COLUMN IF NOT EXISTS text_tokens JSON;
@@ -0,0 +1,60 @@
+"""
+Startup-Profil der API: Import-Zeit und RSS-Zuwachs pro Paket bzw. app-Modul
+(siehe app.core.startup_profile). Zeigt, welche Abhängigkeiten beim Worker-Start
+geladen werden und über welches app-Modul – Kandidaten für Lazy-Loading.
+
+    python startup_profile.py                 # import app.main, Top 25
+    python startup_profile.py --top 50
+    python startup_profile.py --module app.services.scheduled_jobs
+    python startup_profile.py --json          # maschinenlesbar (z.B. für CI-Vergleiche)
+"""
+import argparse
+import json
+import sys
+
+sys.path.insert(0, '.')
+
+from app.core.startup_profile import by_package, profile_import
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-Zeit und RSS pro Modul messen")
+    parser.add_argument("--module", default="app.main", help="zu importierendes Modul")
+    parser.add_argument("--top", type=int, default=25, help="Anzahl Einträge je Liste")
+    parser.add_argument("--json", action="store_true", help="Ausgabe als JSON")
+    args = parser.parse_args()
+
+    profile = profile_import(args.module)
+    records = profile["records"]
+    packages = by_package(records)
+    app_modules = sorted((r for r in records.values() if r.name.startswith("app.")),
+                         key=lambda r: -r.total_ms)
+    rss_delta = profile["rss_after_kb"] - profile["rss_before_kb"]
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            "import_ms": round(profile["total_ms"], 1),
+            "rss_kb": profile["rss_after_kb"],
+            "rss_delta_kb": rss_delta,
+            "modules": len(records),
+            "packages": [{**p, "ms": round(p["ms"], 1)} for p in packages[:args.top]],
+            "app_modules": [{"name": r.name, "total_ms": round(r.total_ms, 1), "self_ms": round(r.self_ms, 1),
+                             "rss_kb": r.rss_kb} for r in app_modules[:args.top]],
+        }, indent=2))
+        return
+
+    print(f"⏱  import {args.module}: {profile['total_ms']:.0f} ms, {len(records)} Module, "
+          f"RSS +{rss_delta / 1024:.1f} MB (gesamt {profile['rss_after_kb'] / 1024:.1f} MB)")
+    print(f"\nPakete nach eigener Import-Zeit (Top {args.top}):")
+    print(f"  {'Paket':<40} {'ms':>7} {'RSS MB':>8}  geladen über")
+    for p in packages[:args.top]:
+        print(f"  {p['name']:<40} {p['ms']:>7.0f} {p['rss_kb'] / 1024:>8.1f}  {p['via'] or '-'}")
+    print(f"\napp-Module inklusive Abhängigkeiten (Top {args.top}):")
+    print(f"  {'Modul':<40} {'ms':>7} {'RSS MB':>8}")
+    for r in app_modules[:args.top]:
+        print(f"  {r.name:<40} {r.total_ms:>7.0f} {r.rss_kb / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Test: Backfill-Framework (backfill_service) auf SQLite mit einem Test-Backfill über
+email_logs – Checkpoint je Block, Abbruch und Fortsetzen bei last_id, Pause per
+Zeitbudget, Claim (nie zweimal parallel) und Neustart.
+Run with: python -m pytest test_backfills.py
+"""
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.database import utc_now
+from app.models.backfill_run import BackfillRun
+from app.models.email_log import EmailLog
+from app.services.backfill_service import BACKFILLS, BackfillDefinition, request_backfill, run_backfill
+
+NAME = "test_mark_logs"
+ROWS = 23
+BATCH = 5
+
+
+class Marker:
+    """Handler: setzt subject der Zeilen lo..hi auf "done"; fail_at lässt den Block mit
+    dieser ID (einmal) fehlschlagen, delay bremst jeden Block."""
+
+    def __init__(self):
+        self.blocks = []
+        self.fail_at = None
+        self.delay = 0.0
+
+    def __call__(self, db, lo: int, hi: int) -> int:
+        self.blocks.append((lo, hi))
+        updated = db.query(EmailLog).filter(EmailLog.id.between(lo, hi)).update(
+            {"subject": "done"}, synchronize_session=False)
+        if self.fail_at is not None and lo <= self.fail_at <= hi:
+            self.fail_at = None
+            raise RuntimeError("kaputt")
+        time.sleep(self.delay)
+        return updated
+
+
+@pytest.fixture
+def marker(db, monkeypatch):
+    db.query(BackfillRun).filter(BackfillRun.name == NAME).delete()
+    db.query(EmailLog).delete()
+    db.commit()
+    db.execute(insert(EmailLog), [{"email_type": "other", "recipient_email": f"{i}@example.com",
+                                   "subject": "todo", "success": 1} for i in range(ROWS)])
+    db.commit()
+    handler = Marker()
+    monkeypatch.setitem(BACKFILLS, NAME, BackfillDefinition(NAME, EmailLog, handler, batch_size=BATCH))
+    return handler
+
+
+def _ids(db, subject: str):
+    db.expire_all()
+    return [i for (i,) in db.query(EmailLog.id).filter(EmailLog.subject == subject).order_by(EmailLog.id)]
+
+
+def _run(db) -> BackfillRun:
+    db.expire_all()
+    return db.query(BackfillRun).filter(BackfillRun.name == NAME).one()
+
+
+def test_runs_all_blocks_with_checkpoints(db, marker):
+    run = request_backfill(db, NAME)
+    first, last = run.last_id + 1, run.max_id
+    result = run_backfill(NAME)
+    assert (result["claimed"], result["status"], result["progress_percent"]) == (True, "done", 100.0)
+    assert _ids(db, "todo") == []
+    run = _run(db)
+    assert (run.last_id, run.updated_count, run.batches) == (last, ROWS, len(marker.blocks))
+    # lückenlose, überschneidungsfreie Blöcke à BATCH IDs
+    assert marker.blocks[0][0] == first
+    assert all(hi - lo < BATCH for lo, hi in marker.blocks)
+    assert all(b[0] == a[1] + 1 for a, b in zip(marker.blocks, marker.blocks[1:]))
+
+
+def test_failed_block_is_rolled_back_and_resumed(db, marker):
+    ids = _ids(db, "todo")
+    marker.fail_at = ids[12]
+    request_backfill(db, NAME)
+    result = run_backfill(NAME)
+    assert (result["status"], result["last_error"]) == ("failed", "kaputt")
+    failed_lo = marker.blocks[-1][0]
+    # Checkpoint = Ende des letzten erfolgreichen Blocks, Daten des Fehlerblocks verworfen
+    assert _run(db).last_id == failed_lo - 1
+    assert _ids(db, "done") == [i for i in ids if i < failed_lo]
+
+    done_blocks = len(marker.blocks) - 1
+    request_backfill(db, NAME)
+    assert run_backfill(NAME)["status"] == "done"
+    # Fortsetzung beim Fehlerblock, erledigte Blöcke nicht erneut
+    assert marker.blocks[done_blocks][0] == failed_lo
+    assert marker.blocks[done_blocks + 1][0] == failed_lo
+    assert _ids(db, "todo") == []
+    assert _run(db).updated_count == ROWS
+
+
+def test_time_budget_pauses_and_resumes(db, marker):
+    marker.delay = 0.05
+    request_backfill(db, NAME)
+    result = run_backfill(NAME, max_seconds=0.12)
+    assert result["status"] == "pending"
+    paused_at = _run(db).last_id
+    assert 0 < paused_at < _run(db).max_id
+
+    calls = len(marker.blocks)
+    assert run_backfill(NAME)["status"] == "done"
+    assert marker.blocks[calls][0] == paused_at + 1
+    assert _ids(db, "todo") == []
+
+
+def test_claim_only_once_and_takes_over_stale_runs(db, marker):
+    # Nicht angefordert
+    assert run_backfill(NAME)["claimed"] is False
+
+    request_backfill(db, NAME)
+    run = _run(db)
+    run.status, run.heartbeat_at = "running", utc_now()
+    db.commit()
+    # Läuft (frischer Heartbeat) in einem anderen Prozess
+    assert run_backfill(NAME)["claimed"] is False
+    # Erneutes Anfordern ändert einen laufenden Lauf nicht
+    assert request_backfill(db, NAME).status == "running"
+
+    run = _run(db)
+    run.heartbeat_at = utc_now() - timedelta(hours=1)
+    db.commit()
+    result = run_backfill(NAME)
+    assert (result["claimed"], result["status"]) == (True, "done")
+
+
+def test_request_after_done_starts_over(db, marker):
+    request_backfill(db, NAME)
+    run_backfill(NAME)
+    run = request_backfill(db, NAME)
+    assert (run.status, run.last_id, run.batches, run.updated_count) == ("pending", 0, 0, 0)
@@ -0,0 +1,143 @@
+"""
+Test: E-Mail-Outbox (email_outbox_service) auf SQLite mit einem Fake-SendGrid-Client –
+send_email/send_bulk legen nur ab, deliver_pending beansprucht, versendet, wiederholt
+mit Backoff und loggt nur das Endergebnis (eine Zeile je Empfänger).
+Run with: python -m pytest test_email_outbox.py
+"""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.database import utc_now
+from app.models.email_log import EmailLog
+from app.models.email_outbox import EmailOutbox
+from app.services.email_log_service import flush_email_logs
+from app.services.email_outbox_service import MAX_ATTEMPTS, deliver_pending
+from app.services.email_service import bulk_tag, email_service
+
+
+class FakeSendGrid:
+    """Antwortet mit status_code (bzw. wirft error) und merkt sich die Requests."""
+
+    def __init__(self, status_code: int = 202, error: Exception = None):
+        self.status_code = status_code
+        self.error = error
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(message)
+        if self.error:
+            raise self.error
+        return SimpleNamespace(status_code=self.status_code, body=b"")
+
+
+@pytest.fixture
+def sendgrid(db, monkeypatch):
+    db.query(EmailOutbox).delete()
+    db.query(EmailLog).delete()
+    db.commit()
+    flush_email_logs()
+    client = FakeSendGrid()
+    monkeypatch.setattr(email_service, "enabled", True)
+    monkeypatch.setattr(email_service, "debug", False)
+    monkeypatch.setattr(email_service, "use_outbox", True)
+    monkeypatch.setattr(email_service, "_sendgrid", client)
+    return client
+
+
+def _rows(db):
+    db.expire_all()
+    return db.query(EmailOutbox).order_by(EmailOutbox.id).all()
+
+
+def _logs(db):
+    flush_email_logs()
+    return [(log.recipient_email, log.success)
+            for log in db.query(EmailLog).order_by(EmailLog.recipient_email).all()]
+
+
+def _make_due(db):
+    db.query(EmailOutbox).update({"next_attempt_at": utc_now() - timedelta(hours=2)})
+    db.commit()
+
+
+def _send_bulk():
+    return email_service.send_bulk(
+        f"Hallo {bulk_tag('name')}", f"<p>{bulk_tag('name')}</p>",
+        [{"to_email": "a@example.com", "substitutions": {bulk_tag("name"): "Anna"}},
+         {"to_email": "b@example.com", "substitutions": {bulk_tag("name"): "Ben"}}],
+        email_type="job_match",
+    )
+
+
+def test_send_email_only_enqueues(db, sendgrid):
+    assert email_service.send_email("a@example.com", "Betreff", "<p>Hi</p>", email_type="other") is True
+    rows = _rows(db)
+    assert [(r.to_email, r.status, r.attempts) for r in rows] == [("a@example.com", "pending", 0)]
+    assert sendgrid.sent == []
+    assert _logs(db) == []
+
+
+def test_deliver_pending_sends_once_and_logs_success(db, sendgrid):
+    email_service.send_email("a@example.com", "Betreff", "<p>Hi</p>")
+    assert deliver_pending(db) == 1
+    row = _rows(db)[0]
+    assert (row.status, row.attempts, row.locked_at) == ("sent", 1, None)
+    assert len(sendgrid.sent) == 1
+    # Bereits versendet: wird nicht erneut beansprucht
+    assert deliver_pending(db) == 0
+    assert _logs(db) == [("a@example.com", 1)]
+
+
+def test_bulk_is_one_request_with_one_log_row_per_recipient(db, sendgrid):
+    assert _send_bulk() is True
+    assert len(_rows(db)) == 1
+    assert deliver_pending(db) == 1
+    assert len(sendgrid.sent) == 1
+    assert len(sendgrid.sent[0]["personalizations"]) == 2
+    assert _logs(db) == [("a@example.com", 1), ("b@example.com", 1)]
+
+
+def test_retries_with_backoff_and_logs_only_final_failure(db, sendgrid):
+    sendgrid.status_code = 500
+    _send_bulk()
+    for attempt in range(1, MAX_ATTEMPTS):
+        assert deliver_pending(db) == 1
+        row = _rows(db)[0]
+        assert (row.status, row.attempts) == ("pending", attempt)
+        # Backoff: vor next_attempt_at wird nicht erneut versucht
+        assert deliver_pending(db) == 0
+        assert _logs(db) == []
+        _make_due(db)
+
+    assert deliver_pending(db) == 1
+    row = _rows(db)[0]
+    assert (row.status, row.attempts) == ("failed", MAX_ATTEMPTS)
+    assert len(sendgrid.sent) == MAX_ATTEMPTS
+    assert _logs(db) == [("a@example.com", 0), ("b@example.com", 0)]
+
+
+def test_permanent_error_fails_without_retry(db, sendgrid):
+    error = RuntimeError("Bad Request")
+    error.status_code = 400
+    sendgrid.error = error
+    email_service.send_email("a@example.com", "Betreff", "<p>Hi</p>")
+    assert deliver_pending(db) == 1
+    row = _rows(db)[0]
+    assert (row.status, row.attempts) == ("failed", 1)
+    assert "Bad Request" in row.last_error
+    assert _logs(db) == [("a@example.com", 0)]
+
+
+def test_stale_sending_row_is_reclaimed(db, sendgrid):
+    email_service.send_email("a@example.com", "Betreff", "<p>Hi</p>")
+    email_service.send_email("b@example.com", "Betreff", "<p>Hi</p>")
+    stale, fresh = _rows(db)
+    # Worker abgestürzt (stale) bzw. gerade aktiv (fresh)
+    stale.status, stale.locked_at = "sending", utc_now() - timedelta(hours=1)
+    fresh.status, fresh.locked_at = "sending", utc_now()
+    db.commit()
+
+    assert deliver_pending(db) == 1
+    assert [(r.to_email, r.status) for r in _rows(db)] == [("a@example.com", "sent"), ("b@example.com", "sending")]
@@ -0,0 +1,123 @@
+"""
+Test: Batch-Scorer (calculate_match_scores_batch, calculate_match_scores_for_applicant,
+top_k_matches_for_job) und der Prozess-Pool (parallel_matching) liefern dieselben
+Scores wie calculate_match_score pro Paar – über ein fest geseedetes Korpus aus
+benchmarks.synthetic, ohne DB (CV-Cache des MatchingContext vorbelegt).
+Run with: python -m pytest test_match_batch.py
+"""
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.migrations import load_models
+from app.services import parallel_matching
+from app.services.matching_service import (
+    MatchingContext,
+    calculate_match_score,
+    calculate_match_scores_batch,
+    calculate_match_scores_for_applicant,
+    top_k_matches_for_job,
+)
+from benchmarks.synthetic import _FIELDS, _applicant, _job, _work_experiences
+
+load_models()
+
+SEED = 1234
+# Über PARALLEL_MIN_BATCH, damit der Prozess-Pool tatsächlich greift
+APPLICANTS = 600
+JOBS = 8
+CV_SHARE = 0.4
+
+
+def _corpus(seed: int):
+    r = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    jobs = [_job(r, company_id=1, i=i, now=now) for i in range(JOBS)]
+    for job_id, job in enumerate(jobs, start=1):
+        job.id = job_id
+    applicants = [_applicant(r, user_id=i, i=i) for i in range(APPLICANTS)]
+    for applicant_id, applicant in enumerate(applicants, start=1):
+        applicant.id = applicant_id
+    cvs = {
+        a.id: {
+            "work_experience_years": r.randint(1, 10),
+            "work_experiences": _work_experiences(r, r.randrange(len(_FIELDS))),
+        }
+        for a in applicants if r.random() < CV_SHARE
+    }
+    return jobs, applicants, cvs
+
+
+def _context(cvs: dict, applicants, parallel_workers: int = 0) -> MatchingContext:
+    ctx = MatchingContext({
+        **MatchingContext.SETTINGS,
+        "matching_parallel_enabled": parallel_workers > 0,
+        "matching_parallel_workers": parallel_workers,
+    })
+    # CV-Cache vorbelegen: kein DB-Zugriff, Bewerber ohne CV explizit None
+    for applicant in applicants:
+        ctx._cv_cache[applicant.id] = cvs.get(applicant.id)
+    return ctx
+
+
+def _pair_scores(job, applicants, ctx=None):
+    return [calculate_match_score(a, job, ctx=ctx)["total_score"] for a in applicants]
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return _corpus(SEED)
+
+
+@pytest.fixture
+def pool():
+    yield
+    parallel_matching.shutdown_executor()
+
+
+def test_batch_matches_pair_scores_without_ctx(corpus):
+    jobs, applicants, _ = corpus
+    for job in jobs:
+        assert calculate_match_scores_batch(job, applicants) == _pair_scores(job, applicants)
+
+
+def test_batch_matches_pair_scores_with_ctx(corpus):
+    jobs, applicants, cvs = corpus
+    ctx = _context(cvs, applicants)
+    for job in jobs:
+        assert calculate_match_scores_batch(job, applicants, ctx=ctx) == _pair_scores(job, applicants, ctx)
+
+
+def test_applicant_batch_matches_pair_scores(corpus):
+    jobs, applicants, cvs = corpus
+    ctx = _context(cvs, applicants)
+    for applicant in applicants[:50]:
+        expected = [calculate_match_score(applicant, job, ctx=ctx)["total_score"] for job in jobs]
+        assert calculate_match_scores_for_applicant(applicant, jobs, ctx=ctx) == expected
+
+
+def test_process_pool_matches_pair_scores(corpus, pool, monkeypatch):
+    jobs, applicants, cvs = corpus
+    ctx = _context(cvs, applicants, parallel_workers=2)
+    calls = []
+    real = parallel_matching.score_job_parallel
+
+    def spy(*args, **kwargs):
+        totals = real(*args, **kwargs)
+        calls.append(totals is not None)
+        return totals
+
+    monkeypatch.setattr(parallel_matching, "score_job_parallel", spy)
+    for job in jobs[:3]:
+        assert calculate_match_scores_batch(job, applicants, ctx=ctx) == _pair_scores(job, applicants, ctx)
+    # Pool wurde benutzt und lieferte Ergebnisse (kein stiller Fallback in den Prozess)
+    assert calls == [True, True, True]
+
+
+def test_top_k_matches_best_pair_scores(corpus):
+    jobs, applicants, cvs = corpus
+    ctx = _context(cvs, applicants)
+    for job in jobs:
+        expected = sorted(_pair_scores(job, applicants, ctx), reverse=True)[:20]
+        assert [score for score, _ in top_k_matches_for_job(job, applicants, 20, ctx=ctx)] == expected
@@ -0,0 +1,88 @@
+"""
+Test: calculate_match_score(score_only=True) liefert denselben total_score wie der
+volle Pfad – über ein zufälliges (fest geseedetes) Korpus aus benchmarks.synthetic,
+ohne und mit MatchingContext (CV immer / nur als Fallback analysieren).
+Run with: python -m pytest test_match_score_only.py
+"""
+import os
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+# Lokale Entwicklung: Default-SECRET_KEY zulassen (es wird keine DB benutzt)
+os.environ.setdefault("DEBUG", "true")
+
+from app.core.migrations import load_models
+from app.services.matching_service import MatchingContext, calculate_match_score
+from benchmarks.synthetic import _FIELDS, _applicant, _job, _work_experiences
+
+load_models()
+
+SEED = 4711
+APPLICANTS = 300
+JOBS = 150
+PAIRS = 3000
+CV_SHARE = 0.4
+
+
+def _corpus(seed: int):
+    r = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    jobs = [_job(r, company_id=1, i=i, now=now) for i in range(JOBS)]
+    applicants = [_applicant(r, user_id=i, i=i) for i in range(APPLICANTS)]
+    for applicant_id, applicant in enumerate(applicants, start=1):
+        applicant.id = applicant_id
+    cvs = {
+        a.id: {
+            "work_experience_years": r.randint(1, 10),
+            "work_experiences": _work_experiences(r, r.randrange(len(_FIELDS))),
+        }
+        for a in applicants if r.random() < CV_SHARE
+    }
+    pairs = [(r.choice(applicants), r.choice(jobs)) for _ in range(PAIRS)]
+    return pairs, cvs
+
+
+def _context(always_analyze_cv: bool, cvs: dict, applicant_ids) -> MatchingContext:
+    ctx = MatchingContext({**MatchingContext.SETTINGS, "matching_always_analyze_cv": always_analyze_cv})
+    # CV-Cache vorbelegen: kein DB-Zugriff, Bewerber ohne CV explizit None
+    for applicant_id in applicant_ids:
+        ctx._cv_cache[applicant_id] = cvs.get(applicant_id)
+    return ctx
+
+
+def _mismatches(pairs, ctx=None):
+    return [
+        (applicant.id, job.title, fast, full)
+        for applicant, job in pairs
+        for fast, full in [(
+            calculate_match_score(applicant, job, ctx=ctx, score_only=True),
+            calculate_match_score(applicant, job, ctx=ctx)["total_score"],
+        )]
+        if fast != full
+    ]
+
+
+def test_score_only_matches_full_score_without_ctx():
+    pairs, _ = _corpus(SEED)
+    assert _mismatches(pairs) == []
+
+
+@pytest.mark.parametrize("always_analyze_cv", [True, False])
+def test_score_only_matches_full_score_with_ctx(always_analyze_cv):
+    pairs, cvs = _corpus(SEED)
+    ctx = _context(always_analyze_cv, cvs, {applicant.id for applicant, _ in pairs})
+    assert _mismatches(pairs, ctx) == []
+
+
+def test_corpus_covers_cv_fallback():
+    """Das Korpus enthält Bewerber ohne Profil-Erfahrung mit CV (CV-Fallback-Pfad)."""
+    pairs, cvs = _corpus(SEED)
+    fallback = {
+        applicant.id for applicant, _ in pairs
+        if applicant.id in cvs and not (
+            applicant.work_experience_years or applicant.work_experiences or applicant.work_experience
+        )
+    }
+    assert fallback
@@ -0,0 +1,106 @@
+"""
+Test: Migrations-Runner (app.core.migrations) auf SQLite – jede Version wird genau
+einmal eingetragen, ein fehlgeschlagener Schritt bricht ab, ohne seine Version
+einzutragen, und der nächste Lauf setzt dort fort.
+Run with: python -m pytest test_migrations.py
+"""
+import pytest
+
+from app.core import migrations
+from app.core.database import SessionLocal
+from app.core.migrations import Migration, current_version, get_migrations, latest_version, run_migrations
+from app.models.schema_migration import SchemaMigration
+
+
+def _rows():
+    db = SessionLocal()
+    try:
+        return {row.version: row for row in db.query(SchemaMigration).all()}
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def extra_migrations(monkeypatch):
+    """Hängt Test-Migrationen hinter die echten an und räumt ihre Einträge wieder ab."""
+    extra = []
+    real = get_migrations
+    monkeypatch.setattr(migrations, "get_migrations", lambda: real() + extra)
+    yield extra
+    db = SessionLocal()
+    try:
+        db.query(SchemaMigration).filter(SchemaMigration.version > latest_version()).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_fresh_database_is_stamped_to_latest(migrated):
+    assert current_version() == latest_version()
+    rows = _rows()
+    assert sorted(rows) == list(range(1, latest_version() + 1))
+    assert [rows[m.version].name for m in get_migrations()] == [m.name for m in get_migrations()]
+    assert len(migrated) == latest_version()
+
+
+def test_postgres_only_steps_are_stamped_as_skipped(migrated):
+    from app.core.schema_steps import PYTHON_STEPS
+
+    rows = _rows()
+    by_name = {row.name: row for row in rows.values()}
+    for step in PYTHON_STEPS:
+        assert by_name[f"py:{step.__name__}"].skipped == getattr(step, "postgres_only", False)
+    assert by_name["create_all"].skipped is False
+
+
+def test_second_run_applies_nothing(migrated):
+    assert run_migrations() == []
+    assert current_version() == latest_version()
+
+
+def test_failed_step_is_not_stamped_and_resumes(migrated, extra_migrations):
+    calls = []
+    fail = {"broken": True}
+
+    def broken() -> bool:
+        calls.append("broken")
+        if fail["broken"]:
+            raise RuntimeError("kaputt")
+        return True
+
+    def after() -> bool:
+        calls.append("after")
+        return True
+
+    latest = latest_version()
+    extra_migrations += [Migration(latest + 1, "py:broken", broken), Migration(latest + 2, "py:after", after)]
+
+    with pytest.raises(RuntimeError, match="kaputt"):
+        run_migrations()
+    assert calls == ["broken"]
+    assert current_version() == latest
+
+    fail["broken"] = False
+    assert run_migrations() == ["py:broken", "py:after"]
+    assert calls == ["broken", "broken", "after"]
+    assert current_version() == latest + 2
+
+
+def test_target_stops_before_later_versions(migrated, extra_migrations):
+    latest = latest_version()
+    extra_migrations += [Migration(latest + 1, "py:one", lambda: True),
+                         Migration(latest + 2, "py:two", lambda: False)]
+
+    assert run_migrations(target=latest + 1) == ["py:one"]
+    assert current_version() == latest + 1
+    assert run_migrations() == ["py:two"]
+    assert _rows()[latest + 2].skipped is True
+
+
+def test_renamed_version_is_rejected(migrated, monkeypatch):
+    real = get_migrations()
+    renamed = [Migration(m.version, f"{m.name}-umbenannt" if m.version == 2 else m.name, m.apply, m.sql_file)
+               for m in real]
+    monkeypatch.setattr(migrations, "get_migrations", lambda: renamed)
+    with pytest.raises(RuntimeError, match="nur angehängt"):
+        run_migrations()
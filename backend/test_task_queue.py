@@ -0,0 +1,159 @@
+"""
+Test: Task-Queue (task_queue_service) auf SQLite – idempotency_key dedupliziert,
+replace_finished setzt nur abgeschlossene Tasks neu an, run_pending hält Ergebnis,
+Retry und endgültigen Fehlschlag fest und der Heartbeat hält locked_at frisch.
+Run with: python -m pytest test_task_queue.py
+"""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.core.database import SessionLocal, utc_now
+from app.models.task_queue import QueuedTask
+from app.services import task_queue_service
+from app.services.task_queue_service import TASK_HANDLERS, enqueue_task, enqueue_tasks, run_pending
+
+
+@pytest.fixture
+def handlers(db, monkeypatch):
+    db.query(QueuedTask).delete()
+    db.commit()
+
+    def echo(payload: dict) -> dict:
+        return {"echo": payload.get("value")}
+
+    async def echo_async(payload: dict) -> dict:
+        await asyncio.sleep(0)
+        return {"echo": payload.get("value")}
+
+    def flaky(payload: dict) -> dict:
+        raise RuntimeError("SendGrid down")
+
+    def missing(payload: dict) -> dict:
+        raise LookupError("Stelle 0 nicht gefunden")
+
+    for name, handler in [("test_echo", echo), ("test_echo_async", echo_async),
+                          ("test_flaky", flaky), ("test_missing", missing)]:
+        monkeypatch.setitem(TASK_HANDLERS, name, handler)
+    return monkeypatch
+
+
+def _task(db, task_id: int) -> QueuedTask:
+    db.expire_all()
+    return db.get(QueuedTask, task_id)
+
+
+def test_unknown_task_type_is_rejected(handlers, db):
+    with pytest.raises(ValueError):
+        enqueue_task(db, "gibt_es_nicht")
+
+
+def test_same_key_returns_existing_task(handlers, db):
+    first = enqueue_task(db, "test_echo", {"value": 1}, idempotency_key="k")
+    second = enqueue_task(db, "test_echo", {"value": 2}, idempotency_key="k")
+    assert second.id == first.id
+    assert _task(db, first.id).payload == {"value": 1}
+
+    # Doppelter Schlüssel innerhalb eines Aufrufs: ein Task
+    a, b = enqueue_tasks(db, [{"task_type": "test_echo", "idempotency_key": "x"},
+                              {"task_type": "test_echo", "idempotency_key": "x"}])
+    assert a.id == b.id
+    assert db.query(QueuedTask).count() == 2
+
+
+def test_replace_finished_renews_only_finished_tasks(handlers, db):
+    spec = {"task_type": "test_echo", "payload": {"value": 1}, "idempotency_key": "notify:1",
+            "replace_finished": True}
+    task_id = enqueue_tasks(db, [spec])[0].id
+
+    # Noch offen: dedupliziert, payload bleibt
+    enqueue_tasks(db, [{**spec, "payload": {"value": 2}}])
+    assert _task(db, task_id).payload == {"value": 1}
+
+    assert asyncio.run(run_pending()) == 1
+    assert _task(db, task_id).status == "done"
+
+    # Abgeschlossen: dieselbe Zeile wird mit neuem payload neu angesetzt
+    renewed = enqueue_tasks(db, [{**spec, "payload": {"value": 3}}])[0]
+    task = _task(db, task_id)
+    assert renewed.id == task_id
+    assert (task.status, task.attempts, task.payload, task.result) == ("pending", 0, {"value": 3}, None)
+    assert db.query(QueuedTask).count() == 1
+
+
+def test_finished_task_without_replace_stays_done(handlers, db):
+    task_id = enqueue_task(db, "test_echo", {"value": 1}, idempotency_key="once").id
+    asyncio.run(run_pending())
+    assert enqueue_task(db, "test_echo", {"value": 2}, idempotency_key="once").id == task_id
+    task = _task(db, task_id)
+    assert (task.status, task.result) == ("done", {"echo": 1})
+    assert asyncio.run(run_pending()) == 0
+
+
+def test_run_pending_records_results_and_retries(handlers, db):
+    ok = enqueue_task(db, "test_echo", {"value": "sync"}).id
+    ok_async = enqueue_task(db, "test_echo_async", {"value": "async"}).id
+    flaky = enqueue_task(db, "test_flaky").id
+    missing = enqueue_task(db, "test_missing").id
+
+    assert asyncio.run(run_pending()) == 4
+    assert _task(db, ok).result == {"echo": "sync"}
+    assert _task(db, ok_async).result == {"echo": "async"}
+
+    task = _task(db, flaky)
+    assert (task.status, task.attempts, task.finished_at) == ("pending", 1, None)
+    assert "SendGrid down" in task.last_error
+    # LookupError/ValueError: kein Retry
+    task = _task(db, missing)
+    assert (task.status, task.attempts) == ("failed", 1)
+
+    # Backoff: vor next_attempt_at nichts fällig
+    assert asyncio.run(run_pending()) == 0
+
+
+def test_flaky_task_fails_after_max_attempts(handlers, db):
+    task_id = enqueue_task(db, "test_flaky").id
+    for _ in range(task_queue_service.MAX_ATTEMPTS):
+        db.query(QueuedTask).update({"next_attempt_at": utc_now() - timedelta(hours=2)})
+        db.commit()
+        assert asyncio.run(run_pending()) == 1
+    task = _task(db, task_id)
+    assert (task.status, task.attempts) == ("failed", task_queue_service.MAX_ATTEMPTS)
+
+
+def test_stale_running_task_is_reclaimed(handlers, db):
+    stale = enqueue_task(db, "test_echo", {"value": 1}).id
+    fresh = enqueue_task(db, "test_echo", {"value": 2}).id
+    db.query(QueuedTask).filter(QueuedTask.id == stale).update(
+        {"status": "running", "locked_at": utc_now() - timedelta(hours=1)})
+    db.query(QueuedTask).filter(QueuedTask.id == fresh).update({"status": "running", "locked_at": utc_now()})
+    db.commit()
+
+    assert asyncio.run(run_pending()) == 1
+    assert (_task(db, stale).status, _task(db, fresh).status) == ("done", "running")
+
+
+def test_heartbeat_keeps_locked_at_fresh(handlers, db):
+    handlers.setattr(task_queue_service, "HEARTBEAT_SECONDS", 0.05)
+
+    def locked_at(task_id: int):
+        session = SessionLocal()
+        try:
+            return session.get(QueuedTask, task_id).locked_at
+        finally:
+            session.close()
+
+    async def slow(payload: dict) -> dict:
+        before = await asyncio.to_thread(locked_at, payload["id"])
+        await asyncio.sleep(0.3)
+        after = await asyncio.to_thread(locked_at, payload["id"])
+        return {"renewed": after > before}
+
+    handlers.setitem(TASK_HANDLERS, "test_slow", slow)
+    task = enqueue_task(db, "test_slow")
+    task.payload = {"id": task.id}
+    db.commit()
+
+    assert asyncio.run(run_pending()) == 1
+    assert _task(db, task.id).result == {"renewed": True}
@@ -129,8 +129,8 @@ export default function BoostEmailsPage() {
     setSendingTg(jobId);
     try {
       const r = await telegramAPI.boostJob(jobId);
-      const grp = r.data?.sent_group ? "Gruppe ✓" : "Gruppe –";
-      toast.success(`Telegram: ${grp} · ${r.data?.sent_subscribers ?? 0} Abonnenten`);
+      const grp = r.data?.group ? "Gruppe ✓" : "Gruppe –";
+      toast.success(`Telegram: ${grp} · ${r.data?.subscribers ?? 0} Abonnenten (Versand läuft)`);
     } catch (e: unknown) {
       const detail = (e as { response?: { data?: { detail?: string } } })?.response?.data?.detail;
       toast.error(detail || "Telegram-Versand fehlgeschlagen");